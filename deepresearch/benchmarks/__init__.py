@@ -0,0 +1 @@
+"""Offline benchmarks for DeepSearch agent components."""
@@ -0,0 +1,123 @@
+"""
+Benchmark: recovering from a transient model stream error, restart vs resume.
+
+Runs runtime.run_research with stub models and a stub search provider. The
+lead model fails once with "Response ended prematurely" after the subagents
+have finished and before the report is written, then:
+
+- restart: checkpoints disabled, the run starts over from the prompt (what
+  main.main() and the runtime did before checkpoints).
+- resume: the run continues from its last checkpoint.
+
+Reports the total time of each mode and how many subagent and lead model
+calls it made.
+
+Usage (from the deepresearch/ directory):
+    python -m benchmarks.checkpoint_resume --subagents 4 --model-latency 0.5
+"""
+
+import argparse
+import contextlib
+import io
+import logging
+import os
+import tempfile
+import time
+
+os.environ.setdefault("BYPASS_TOOL_CONSENT", "true")
+os.environ.setdefault("SEARCH_CACHE_ENABLED", "false")
+os.environ.setdefault("SEARCH_PROVIDERS", "stub")
+os.environ["CHECKPOINT_RETRY_DELAY_SECONDS"] = "0"
+os.environ.pop("OUTPUTS_BUCKET_NAME", None)
+
+from urllib3.exceptions import ProtocolError  # noqa: E402
+
+import runtime  # noqa: E402
+from benchmarks.streaming import lead_policy, subagent_policy  # noqa: E402
+from benchmarks.stubs import (  # noqa: E402
+    ScriptedModel,
+    StubSearchProvider,
+    assistant_turns,
+)
+from deepresearch.main import create_deepsearch_agent  # noqa: E402
+from deepresearch.search import register_search_provider  # noqa: E402
+from deepresearch.tools import internet_search, internet_search_batch  # noqa: E402
+
+
+def flaky_policy(policy, fail_at_turn: int):
+    """Wrap a lead policy so its first call at `fail_at_turn` drops the stream."""
+    failed = False
+
+    def wrapped(messages, system_prompt):
+        nonlocal failed
+        if not failed and assistant_turns(messages) == fail_at_turn:
+            failed = True
+            raise ProtocolError("Response ended prematurely")
+        return policy(messages, system_prompt)
+
+    return wrapped
+
+
+def run_mode(checkpoints: bool, subagents: int, model_latency: float) -> dict:
+    os.environ["CHECKPOINTS_ENABLED"] = "true" if checkpoints else "false"
+    lead = ScriptedModel(
+        flaky_policy(lead_policy(subagents), fail_at_turn=2), latency=model_latency
+    )
+    subagent = ScriptedModel(subagent_policy, latency=model_latency)
+
+    def create_agent(session_id: str):
+        return create_deepsearch_agent(
+            research_tool=internet_search,
+            tool_name="internet_search",
+            batch_research_tool=internet_search_batch,
+            research_tool_saves_sources=True,
+            session_id=session_id,
+            lead_model=lead,
+            subagent_model=subagent,
+            citations_model=ScriptedModel(lambda m, s: [{"text": "none"}]),
+        )
+
+    runtime.create_agent = create_agent
+    start = time.perf_counter()
+    response = runtime.run_research("Benchmark research question", f"resume-{checkpoints}")
+    total = time.perf_counter() - start
+    assert "error" not in response, response
+    return {
+        "total": total,
+        "lead_calls": lead.calls,
+        "subagent_calls": subagent.calls,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--subagents", type=int, default=4)
+    parser.add_argument("--model-latency", type=float, default=0.5)
+    parser.add_argument("--search-latency", type=float, default=0.3)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    for name in ("deepsearch", "strands_deep_agents", "strands", "__main__"):
+        logging.getLogger(name).setLevel(logging.CRITICAL)
+
+    register_search_provider("stub", lambda: StubSearchProvider(latency=args.search_latency))
+
+    results = {}
+    with tempfile.TemporaryDirectory() as root:
+        os.environ["SESSION_WORKSPACE_ROOT"] = root
+        runtime.get_workspace_manager.cache_clear()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for name, checkpoints in (("restart", False), ("resume", True)):
+                results[name] = run_mode(checkpoints, args.subagents, args.model_latency)
+
+    print(f"{'mode':<9} {'complete':>9} {'lead calls':>11} {'subagent calls':>15}")
+    for name, stats in results.items():
+        print(
+            f"{name:<9} {stats['total']:8.2f}s {stats['lead_calls']:11d} "
+            f"{stats['subagent_calls']:15d}"
+        )
+    saved = results["restart"]["total"] - results["resume"]["total"]
+    print(f"\nresuming saved {saved:.2f}s of repeated work after the stream error")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Benchmark: local citation engine vs the LLM citations agent.
+
+Runs both citation paths over the synthetic fixture in
+benchmarks/fixtures/citations/ (a hand-written report plus source documents
+in the layout the search tools write, with placeholder URLs):
+
+- agent: the citations agent configuration from main.py (CITATIONS_AGENT_PROMPT,
+  file_read, file_write) driven by a scripted model replaying its usual
+  trajectory: read the report, read every source document, write the report.
+- local: CitationEngine with the LLM fallback on a scripted model.
+
+Token counts come from the conversation actually sent to the model (about four
+characters per token). Model time is not measured offline, so it is estimated
+from the number of model calls and output tokens (--ttft, --output-tps). The
+local engine is also scored against the hand-labelled expected_citations.json.
+
+Usage (from the deepresearch/ directory):
+    python -m benchmarks.citation_engine
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("BYPASS_TOOL_CONSENT", "true")
+
+from strands import Agent  # noqa: E402
+from strands_tools import file_read, file_write  # noqa: E402
+
+from benchmarks.stubs import ScriptedModel, assistant_turns, tool_use  # noqa: E402
+from deepresearch.citations import CitationEngine, LLMCitationResolver  # noqa: E402
+from deepresearch.prompts.citations_agent import CITATIONS_AGENT_PROMPT  # noqa: E402
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures" / "citations"
+
+
+def citations_agent_policy(report_name: str, source_paths: list[str], cited_text: str):
+    def policy(messages, system_prompt):
+        turn = assistant_turns(messages)
+        if turn == 0:
+            return [tool_use("file_read", {"path": f"./{report_name}", "mode": "view"})]
+        if turn == 1:
+            return [
+                tool_use("file_read", {"path": f"./{path}", "mode": "view"})
+                for path in source_paths
+            ]
+        if turn == 2:
+            return [
+                tool_use("file_write", {"path": f"./{report_name}", "content": cited_text})
+            ]
+        return [{"text": f"Added citations to ./{report_name}."}]
+
+    return policy
+
+
+def fallback_policy(messages, system_prompt):
+    # Decline every uncertain sentence, the cheapest realistic reply
+    request = messages[-1]["content"][0]["text"]
+    ids = re.findall(r'<sentence id="(\d+)">', request)
+    return [{"text": "\n".join(f"{sentence_id}: none" for sentence_id in ids)}]
+
+
+def estimate_model_seconds(calls: int, output_tokens: int, ttft: float, tps: float) -> float:
+    return calls * ttft + output_tokens / tps
+
+
+def cited_urls(text: str, gold: list[dict]) -> dict[str, set[str]]:
+    """Map each gold sentence to the URLs cited right after it in the report."""
+    references = dict(re.findall(r"^\[(\d+)\] (\S+)$", text, re.MULTILINE))
+    positions = sorted(text.find(item["contains"]) for item in gold)
+    result = {}
+    for item in gold:
+        start = text.find(item["contains"])
+        line_end = text.find("\n", start)
+        following = [p for p in positions if p > start]
+        end = min(following + [line_end if line_end != -1 else len(text)])
+        numbers = re.findall(r"\d+", " ".join(re.findall(r"\[([\d, ]+)\]", text[start:end])))
+        result[item["contains"]] = {references[n] for n in numbers if n in references}
+    return result
+
+
+def score(text: str, gold: list[dict]) -> dict:
+    found = cited_urls(text, gold)
+    true_positive = cited = expected = 0
+    for item in gold:
+        urls = found[item["contains"]]
+        expected_urls = set(item["urls"])
+        true_positive += len(urls & expected_urls)
+        cited += len(urls)
+        expected += len(expected_urls)
+    return {
+        "precision": true_positive / cited if cited else 1.0,
+        "recall": true_positive / expected if expected else 1.0,
+    }
+
+
+def run_agent(work_dir: Path, report_name: str, cited_text: str) -> dict:
+    source_paths = sorted(
+        path.relative_to(work_dir).as_posix()
+        for path in work_dir.glob("research_documents_*/*.md")
+    )
+    model = ScriptedModel(citations_agent_policy(report_name, source_paths, cited_text))
+    agent = Agent(
+        model=model,
+        system_prompt=CITATIONS_AGENT_PROMPT,
+        tools=[file_read, file_write],
+        callback_handler=None,
+    )
+    start = time.perf_counter()
+    result = agent(f"Add citations to ./{report_name}")
+    usage = result.metrics.accumulated_usage
+    return {
+        "local_seconds": time.perf_counter() - start,
+        "calls": model.calls,
+        "input_tokens": usage["inputTokens"],
+        "output_tokens": usage["outputTokens"],
+    }
+
+
+def run_engine(work_dir: Path, report: str) -> tuple[dict, str]:
+    start = time.perf_counter()
+    engine = CitationEngine.from_directory(work_dir)
+    resolver = LLMCitationResolver(ScriptedModel(fallback_policy))
+    result = engine.cite(report, resolver=resolver)
+    elapsed = time.perf_counter() - start
+    return (
+        {
+            "local_seconds": elapsed,
+            "calls": resolver.usage["calls"],
+            "input_tokens": resolver.usage["inputTokens"],
+            "output_tokens": resolver.usage["outputTokens"],
+            "sentences": result.sentences,
+            "cited": result.cited,
+            "fallback_sentences": result.resolved_by_fallback + result.uncited_low_confidence,
+        },
+        result.text,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ttft", type=float, default=1.0, help="Seconds per model call")
+    parser.add_argument("--output-tps", type=float, default=150.0, help="Output tokens/second")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    gold = json.loads((FIXTURE_DIR / "expected_citations.json").read_text())
+    report_name = gold["report"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        work_dir = Path(tmp) / "citations"
+        shutil.copytree(FIXTURE_DIR, work_dir)
+        report = (work_dir / report_name).read_text()
+
+        engine_stats, cited_text = run_engine(work_dir, report)
+        original_cwd = Path.cwd()
+        os.chdir(work_dir)
+        try:
+            agent_stats = run_agent(work_dir, report_name, cited_text)
+        finally:
+            os.chdir(original_cwd)
+
+    print(f"{'path':<8} {'local':>8} {'model est.':>11} {'calls':>6} {'in tok':>8} {'out tok':>8}")
+    for name, stats in (("agent", agent_stats), ("local", engine_stats)):
+        estimate = estimate_model_seconds(
+            stats["calls"], stats["output_tokens"], args.ttft, args.output_tps
+        )
+        stats["estimated_total_seconds"] = stats["local_seconds"] + estimate
+        print(
+            f"{name:<8} {stats['local_seconds']:7.3f}s {estimate:10.2f}s "
+            f"{stats['calls']:>6} {stats['input_tokens']:>8} {stats['output_tokens']:>8}"
+        )
+
+    quality = score(cited_text, gold["sentences"])
+    print(
+        f"\nlocal engine: {engine_stats['cited']}/{engine_stats['sentences']} sentences cited "
+        f"directly, {engine_stats['fallback_sentences']} sent to fallback; "
+        f"precision={quality['precision']:.2f} recall={quality['recall']:.2f}"
+    )
+    total_agent = agent_stats["input_tokens"] + agent_stats["output_tokens"]
+    total_local = engine_stats["input_tokens"] + engine_stats["output_tokens"]
+    print(
+        f"tokens: {total_agent} -> {total_local} "
+        f"({100 * (1 - total_local / total_agent):.0f}% fewer), "
+        f"estimated time: {agent_stats['estimated_total_seconds']:.1f}s -> "
+        f"{engine_stats['estimated_total_seconds']:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
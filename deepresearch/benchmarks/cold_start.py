@@ -0,0 +1,114 @@
+"""
+Benchmark: cold-start import cost of the runtime entrypoint, with a budget.
+
+Imports `runtime` in fresh interpreters under `python -X importtime` and
+reports the median cumulative import time and the slowest top-level imports.
+Heavy SDKs (strands, boto3, httpx, the Linkup client, OpenTelemetry) must not
+be loaded by the import itself: they are imported by the warm-up thread or on
+first use.
+
+Exits with status 1 if the median import time exceeds --max-ms or a deferred
+module was imported, so the command can gate CI against regressions.
+
+Usage (from the deepresearch/ directory):
+    python -m benchmarks.cold_start --runs 5 --max-ms 600
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+# Modules that importing the runtime entrypoint must not load
+DEFERRED_MODULES = (
+    "strands",
+    "strands_tools",
+    "strands_deep_agents",
+    "boto3",
+    "httpx",
+    "linkup",
+    "opentelemetry.exporter",
+)
+
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def measure_import(module: str) -> dict[str, tuple[int, int]]:
+    """
+    Import a module in a fresh interpreter and parse its -X importtime output.
+
+    Returns:
+        Imported module -> (cumulative microseconds, nesting level).
+    """
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    env.pop("OTEL_EXPORTER_OTLP_ENDPOINT", None)
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    timings = {}
+    for line in completed.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            _, cumulative, indent, name = match.groups()
+            timings[name] = (int(cumulative), (len(indent) - 1) // 2)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default="runtime")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--max-ms",
+        type=float,
+        default=600,
+        help="Budget for the median cumulative import time",
+    )
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    runs = [measure_import(args.module) for _ in range(args.runs)]
+    totals = [run[args.module][0] / 1000 for run in runs]
+    median_ms = statistics.median(totals)
+
+    last = runs[-1]
+    top_level = sorted(
+        ((name, cumulative) for name, (cumulative, level) in last.items() if level == 1),
+        key=lambda item: item[1],
+        reverse=True,
+    )
+    print(
+        f"import {args.module}: median {median_ms:.0f} ms over {args.runs} runs "
+        f"(min {min(totals):.0f} ms, max {max(totals):.0f} ms)"
+    )
+    print(f"\n{'slowest imports':<40} {'cumulative':>11}")
+    for name, cumulative in top_level[: args.top]:
+        print(f"{name:<40} {cumulative / 1000:9.1f}ms")
+
+    loaded = sorted(
+        name
+        for name in last
+        if any(name == module or name.startswith(module + ".") for module in DEFERRED_MODULES)
+    )
+    roots = sorted({name.split(".")[0] for name in loaded})
+
+    failures = []
+    if median_ms > args.max_ms:
+        failures.append(f"median import time {median_ms:.0f} ms exceeds {args.max_ms:.0f} ms")
+    if roots:
+        failures.append(f"deferred modules imported at startup: {', '.join(roots)}")
+
+    if failures:
+        print("\nFAIL: " + "; ".join(failures))
+        sys.exit(1)
+    print(f"\nOK: within {args.max_ms:.0f} ms, no deferred modules imported")
+
+
+if __name__ == "__main__":
+    main()
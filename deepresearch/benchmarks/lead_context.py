@@ -0,0 +1,214 @@
+"""
+Benchmark: size of the lead agent's context during synthesis.
+
+The lead (stub model) dispatches --subagents research subagents in one turn;
+each writes a findings file of about --findings-chars characters built from
+the synthetic search fixtures. The lead then reads the findings, writes a
+report draft, revises it and finishes. Four modes:
+
+- file_read: the lead reads every findings file in full and nothing is
+  compacted (FINDINGS_DIGEST_ENABLED=false, LEAD_COMPACTION_ENABLED=false)
+- compaction: same reads, with the lead conversation compacted before each
+  model call
+- digest: the lead reads the findings digest instead, with compaction
+- digest_reads: the lead reads the digest, then --reads findings files one
+  call at a time before writing, which pushes the digest out of the latest
+  messages
+
+Reports, per mode, the input tokens of the lead's largest model call, of its
+last one and in total (estimated from the conversation size, as the stub
+model does), whether the digest was still whole when the lead wrote the
+report, and the time.
+
+Usage (from the deepresearch/ directory):
+    python -m benchmarks.lead_context --subagents 16 --findings-chars 12000
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("BYPASS_TOOL_CONSENT", "true")
+os.environ.setdefault("SEARCH_CACHE_ENABLED", "false")
+
+from benchmarks.stubs import (  # noqa: E402
+    ScriptedModel,
+    assistant_turns,
+    first_user_text,
+    tool_use,
+)
+from deepresearch.main import create_deepsearch_agent  # noqa: E402
+from deepresearch.tools import internet_search  # noqa: E402
+from deepresearch.utils.compaction import COMPACTED_PREFIX  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "searches"
+
+MODES = {
+    "file_read": {"FINDINGS_DIGEST_ENABLED": "false", "LEAD_COMPACTION_ENABLED": "false"},
+    "compaction": {"FINDINGS_DIGEST_ENABLED": "false", "LEAD_COMPACTION_ENABLED": "true"},
+    "digest": {"FINDINGS_DIGEST_ENABLED": "true", "LEAD_COMPACTION_ENABLED": "true"},
+    "digest_reads": {"FINDINGS_DIGEST_ENABLED": "true", "LEAD_COMPACTION_ENABLED": "true"},
+}
+
+
+def fixture_paragraphs() -> list[str]:
+    paragraphs = []
+    for path in sorted(FIXTURES_DIR.glob("*.json")):
+        for query, entry in json.loads(path.read_text(encoding="utf-8"))["searches"].items():
+            paragraphs.append(f"## {query}\n\n{entry['answer']}")
+            paragraphs.extend(
+                f"- {source['snippet']} (Source: {source['url']})"
+                for source in entry["sources"]
+                if source.get("snippet")
+            )
+    return paragraphs
+
+
+def findings_text(topic: int, chars: int, paragraphs: list[str]) -> str:
+    # Neighbouring topics share paragraphs, as overlapping subagents do
+    parts = [f"# Findings for topic {topic}"]
+    index = topic * 7
+    while sum(len(part) for part in parts) < chars:
+        parts.append(paragraphs[index % len(paragraphs)])
+        index += 1
+    return "\n\n".join(parts)
+
+
+def digest_state(messages) -> str:
+    """Whether the conversation holds the findings digest whole ("-" without one)."""
+    digest_ids = {
+        block["toolUse"]["toolUseId"]
+        for message in messages
+        for block in message["content"]
+        if "toolUse" in block and block["toolUse"]["name"] == "read_findings_digest"
+    }
+    for message in messages:
+        for block in message["content"]:
+            if "toolResult" in block and block["toolResult"]["toolUseId"] in digest_ids:
+                text = "".join(item.get("text", "") for item in block["toolResult"]["content"])
+                return "compacted" if text.startswith(COMPACTED_PREFIX) else "whole"
+    return "-"
+
+
+def lead_policy(subagents: int, digest: bool, reads: int, calls: list[int], stats: dict):
+    report = "\n\n".join(
+        f"## Topic {i}\n\nSynthesis of the findings on topic {i}. " * 4 for i in range(subagents)
+    )
+
+    def read(i):
+        return ("file_read", {"path": f"./research_findings_topic_{i}.md", "mode": "view"})
+
+    # (tool name, input) calls of each lead turn
+    steps = [
+        [
+            ("task", {"description": f"Research topic {i}", "subagent_type": "research_subagent"})
+            for i in range(subagents)
+        ]
+    ]
+    if digest:
+        steps.append([("read_findings_digest", {})])
+        # Detail the digest lacks, read one file per call
+        steps.extend([read(i)] for i in range(reads))
+    else:
+        steps.append([read(i) for i in range(subagents)])
+    write_turn = len(steps)
+    steps.append([("file_write", {"path": "./report.md", "content": report})])
+    steps.append(
+        [("file_write", {"path": "./report.md", "content": report + "\n\n## Conclusion\n\nDone."})]
+    )
+
+    def policy(messages, system_prompt):
+        calls.append(len(json.dumps(messages, default=str)) // 4)
+        turn = assistant_turns(messages)
+        if turn == write_turn:
+            stats["digest"] = digest_state(messages)
+        if turn < len(steps):
+            return [tool_use(name, tool_input) for name, tool_input in steps[turn]]
+        return [{"text": "The report is in ./report.md."}]
+
+    return policy
+
+
+def subagent_policy(findings_chars: int, paragraphs: list[str]):
+    def policy(messages, system_prompt):
+        topic = int(first_user_text(messages).splitlines()[0].split()[-1])
+        if assistant_turns(messages) == 0:
+            return [
+                tool_use(
+                    "file_write",
+                    {
+                        "path": f"./research_findings_topic_{topic}.md",
+                        "content": findings_text(topic, findings_chars, paragraphs),
+                    },
+                )
+            ]
+        return [{"text": f"Findings for topic {topic} are in ./research_findings_topic_{topic}.md."}]
+
+    return policy
+
+
+def run_mode(mode: str, args, paragraphs: list[str]) -> dict:
+    os.environ.update(MODES[mode])
+    calls: list[int] = []
+    stats: dict = {}
+    reads = args.reads if mode == "digest_reads" else 0
+    digest = mode.startswith("digest")
+    agent = create_deepsearch_agent(
+        research_tool=internet_search,
+        tool_name="internet_search",
+        research_tool_saves_sources=True,
+        parallel_subagents=True,
+        max_concurrent_subagents=args.subagents,
+        lead_model=ScriptedModel(lead_policy(args.subagents, digest, reads, calls, stats)),
+        subagent_model=ScriptedModel(subagent_policy(args.findings_chars, paragraphs)),
+        citations_model=ScriptedModel(lambda m, s: [{"text": "none"}]),
+    )
+    start = time.perf_counter()
+    agent("Benchmark research question")
+    return {
+        "digest": stats.get("digest", "-"),
+        "seconds": time.perf_counter() - start,
+        "max": max(calls),
+        "last": calls[-1],
+        "total": sum(calls),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--subagents", type=int, default=16)
+    parser.add_argument("--findings-chars", type=int, default=12000)
+    parser.add_argument("--reads", type=int, default=3)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    for name in ("deepsearch", "strands_deep_agents", "strands", "__main__"):
+        logging.getLogger(name).setLevel(logging.CRITICAL)
+
+    paragraphs = fixture_paragraphs()
+    print(
+        f"{'mode':<13} {'max input':>10} {'last input':>11} {'total input':>12} "
+        f"{'digest':>10} {'time':>8}"
+    )
+    cwd = os.getcwd()
+    for mode in MODES:
+        with tempfile.TemporaryDirectory() as root:
+            os.chdir(root)
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    stats = run_mode(mode, args, paragraphs)
+            finally:
+                os.chdir(cwd)
+        print(
+            f"{mode:<13} {stats['max']:10d} {stats['last']:11d} {stats['total']:12d} "
+            f"{stats['digest']:>10} {stats['seconds']:7.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
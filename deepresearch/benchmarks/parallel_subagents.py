@@ -0,0 +1,145 @@
+"""
+Benchmark: sequential vs parallel research subagents.
+
+Builds the real DeepSearch agent with stub models and a stub search provider
+(going through the shared cache, rate limiter and search loop), has the lead dispatch N research
+subagents in a single turn, and compares wall-clock time of both modes.
+
+Usage (from the deepresearch/ directory):
+    python -m benchmarks.parallel_subagents --subagents 6 --max-concurrent 4
+"""
+
+import argparse
+import contextlib
+import io
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("BYPASS_TOOL_CONSENT", "true")
+os.environ.setdefault("SEARCH_CACHE_ENABLED", "false")
+
+from strands import tool  # noqa: E402
+
+from benchmarks.stubs import (  # noqa: E402
+    ScriptedModel,
+    StubSearchProvider,
+    assistant_turns,
+    first_user_text,
+    tool_use,
+)
+from deepresearch.main import create_deepsearch_agent  # noqa: E402
+from deepresearch.search import register_search_provider  # noqa: E402
+from deepresearch.tools.internet_search import search  # noqa: E402
+
+SEARCH_LATENCY = 0.3
+MODEL_LATENCY = 0.2
+SEARCHES_PER_SUBAGENT = 2
+
+
+@tool
+def internet_search(query: str) -> str:
+    """Search the web using the internet
+
+    Args:
+        query: The query to search for
+
+    Returns:
+        The search results
+    """
+    return search(query=query, provider="stub").text
+
+
+def lead_policy(subagents: int):
+    def policy(messages, system_prompt):
+        if assistant_turns(messages) == 0:
+            return [
+                tool_use(
+                    "task",
+                    {
+                        "description": f"Research topic {i}",
+                        "subagent_type": "research_subagent",
+                    },
+                )
+                for i in range(subagents)
+            ]
+        return [{"text": "Synthesis complete."}]
+
+    return policy
+
+
+def subagent_policy(messages, system_prompt):
+    task = first_user_text(messages)
+    topic = task.splitlines()[0].split()[-1]
+    suffix = ""
+    if "Append the suffix `" in task:
+        suffix = task.split("Append the suffix `", 1)[1].split("`", 1)[0]
+
+    turn = assistant_turns(messages)
+    if turn < SEARCHES_PER_SUBAGENT:
+        return [tool_use("internet_search", {"query": f"topic {topic} query {turn}"})]
+    if turn == SEARCHES_PER_SUBAGENT:
+        return [
+            tool_use(
+                "file_write",
+                {
+                    "path": f"./research_findings_topic_{topic}{suffix}.md",
+                    "content": f"Findings for topic {topic}",
+                },
+            )
+        ]
+    return [{"text": f"Wrote findings for topic {topic}."}]
+
+
+def run_mode(parallel: bool, subagents: int, max_concurrent: int) -> float:
+    agent = create_deepsearch_agent(
+        research_tool=internet_search,
+        tool_name="internet_search",
+        parallel_subagents=parallel,
+        max_concurrent_subagents=max_concurrent,
+        lead_model=ScriptedModel(lead_policy(subagents), latency=MODEL_LATENCY),
+        subagent_model=ScriptedModel(subagent_policy, latency=MODEL_LATENCY),
+        citations_model=ScriptedModel(lambda m, s: [{"text": "done"}]),
+    )
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        agent("Benchmark research question")
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--subagents", type=int, default=6)
+    parser.add_argument("--max-concurrent", type=int, default=4)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    for name in ("deepsearch", "strands_deep_agents"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    register_search_provider("stub", lambda: StubSearchProvider(latency=SEARCH_LATENCY))
+
+    original_cwd = Path.cwd()
+    results = {}
+    for parallel in (False, True):
+        with tempfile.TemporaryDirectory() as work_dir:
+            os.chdir(work_dir)
+            try:
+                results[parallel] = run_mode(
+                    parallel, args.subagents, args.max_concurrent
+                )
+                findings = sorted(p.name for p in Path(work_dir).glob("research_findings_*"))
+            finally:
+                os.chdir(original_cwd)
+        mode = f"parallel (max {args.max_concurrent})" if parallel else "sequential"
+        print(
+            f"{mode:<20} {results[parallel]:.2f}s  "
+            f"({len(findings)} findings files written)"
+        )
+
+    print(f"speedup: {results[False] / results[True]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+"""
+Benchmark: the whole research pipeline offline, against a JSON baseline.
+
+Runs create_deepsearch_agent end to end with deterministic stub models and
+replayed internet_search responses (benchmarks/fixtures/searches/), so it
+needs no network, Bedrock or search API keys. Each scenario fixture holds the
+research question, the subagent tasks the lead dispatches (in waves) with the
+queries each subagent searches, and the response and latency of every query.
+The shipped fixtures are synthetic (`"synthetic": true`): hand-written answers
+and snippets with placeholder URLs and latencies, shaped like provider
+responses:
+
+- straightforward: one subagent, two searches.
+- breadth: five subagents in one wave, some using internet_search_batch.
+- depth: three sequential subagents, each building on the previous one.
+
+The lead writes todos, dispatches each wave, reads the findings, writes the
+report and runs add_citations. For every scenario the benchmark reports the
+end-to-end time, time per stage and the critical path (from the run's
+performance summary), tool and model calls, tokens, bytes written to the
+workspace and the peak Python memory (tracemalloc, which also adds a little
+overhead to the timings).
+
+Results are compared with benchmarks/baselines/pipeline.json: the run exits
+with status 1 when a scenario is slower, uses more memory or writes more
+bytes than the baseline beyond the tolerance, or makes a different number of
+tool calls. Refresh the baseline with --write-baseline after an intended
+change. Fixture latencies are scaled by --latency-scale; replace a
+fixture's responses with real ones recorded from the live providers with
+--record (needs network and API keys).
+
+Usage (from the deepresearch/ directory):
+    python -m benchmarks.pipeline
+    python -m benchmarks.pipeline --scenario breadth --write-baseline
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+os.environ.setdefault("BYPASS_TOOL_CONSENT", "true")
+os.environ.setdefault("SEARCH_CACHE_ENABLED", "false")
+os.environ.pop("OUTPUTS_BUCKET_NAME", None)
+
+from benchmarks.stubs import (  # noqa: E402
+    ReplaySearchProvider,
+    ScriptedModel,
+    assistant_turns,
+    first_user_text,
+    tool_use,
+)
+from deepresearch.main import create_deepsearch_agent  # noqa: E402
+from deepresearch.search import register_search_provider  # noqa: E402
+from deepresearch.tools import internet_search, internet_search_batch  # noqa: E402
+from deepresearch.utils.performance import (  # noqa: E402
+    PerformanceRecorder,
+    bind_performance_recorder,
+    unbind_performance_recorder,
+)
+from deepresearch.utils.source_store import (  # noqa: E402
+    SourceStore,
+    bind_source_store,
+    unbind_source_store,
+)
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures" / "searches"
+BASELINE_PATH = Path(__file__).parent / "baselines" / "pipeline.json"
+SCENARIOS = ("straightforward", "breadth", "depth")
+
+
+def load_scenario(name: str) -> dict:
+    return json.loads((FIXTURE_DIR / f"{name}.json").read_text(encoding="utf-8"))
+
+
+def scenario_tasks(scenario: dict) -> dict[str, dict]:
+    return {task["topic"]: task for wave in scenario["waves"] for task in wave}
+
+
+def lead_policy(scenario: dict):
+    tasks = scenario_tasks(scenario)
+    report_path = f"./{scenario['name']}_report.md"
+    report = f"# {scenario['prompt']}\n\n" + "\n\n".join(
+        f"## {topic.replace('_', ' ').title()}\n\n"
+        + " ".join(scenario["searches"][query]["answer"] for query in task["queries"])
+        for topic, task in tasks.items()
+    )
+
+    steps = [
+        lambda: [
+            {"text": "Planning the research."},
+            tool_use(
+                "write_todos",
+                {
+                    "todos": [
+                        {"id": topic, "content": task["task"], "status": "pending"}
+                        for topic, task in tasks.items()
+                    ]
+                },
+            ),
+        ]
+    ]
+    for wave in scenario["waves"]:
+        steps.append(
+            lambda wave=wave: [
+                tool_use(
+                    "task",
+                    {
+                        "description": f"[{task['topic']}] {task['task']}",
+                        "subagent_type": "research_subagent",
+                    },
+                )
+                for task in wave
+            ]
+        )
+        steps.append(
+            lambda wave=wave: [
+                tool_use(
+                    "file_read",
+                    {"path": f"./research_findings_{task['topic']}.md", "mode": "view"},
+                )
+                for task in wave
+            ]
+        )
+    steps.append(lambda: [tool_use("file_write", {"path": report_path, "content": report})])
+    steps.append(lambda: [tool_use("add_citations", {"report_path": report_path})])
+
+    def policy(messages, system_prompt):
+        turn = assistant_turns(messages)
+        if turn < len(steps):
+            return steps[turn]()
+        return [{"text": f"The report is in {report_path}."}]
+
+    return policy
+
+
+def subagent_policy(scenario: dict):
+    tasks = scenario_tasks(scenario)
+
+    def policy(messages, system_prompt):
+        topic = first_user_text(messages).split("]", 1)[0].lstrip("[")
+        task = tasks[topic]
+        if task["batch"]:
+            steps = [
+                [tool_use("internet_search_batch", {"queries": task["queries"], "topic": topic})]
+            ]
+        else:
+            steps = [
+                [tool_use("internet_search", {"query": query, "topic": topic})]
+                for query in task["queries"]
+            ]
+        findings = f"# Findings: {task['task']}\n\n" + "\n".join(
+            f"- {scenario['searches'][query]['answer']}" for query in task["queries"]
+        )
+        steps.append(
+            [
+                tool_use(
+                    "file_write",
+                    {"path": f"./research_findings_{topic}.md", "content": findings},
+                )
+            ]
+        )
+
+        turn = assistant_turns(messages)
+        if turn < len(steps):
+            return steps[turn]
+        return [{"text": f"Findings for {topic} are in ./research_findings_{topic}.md."}]
+
+    return policy
+
+
+def bytes_written(root: Path) -> dict[str, int]:
+    written = Counter()
+    for path in root.rglob("*"):
+        if not path.is_file():
+            continue
+        relative = path.relative_to(root)
+        if relative.parts[0].startswith("research_documents_"):
+            kind = "sources"
+        elif path.name.startswith("research_findings_"):
+            kind = "findings"
+        elif path.name.endswith("_report.md"):
+            kind = "report"
+        else:
+            kind = "other"
+        written[kind] += path.stat().st_size
+    written["total"] = sum(written.values())
+    return dict(written)
+
+
+def run_scenario(name: str, args) -> dict:
+    scenario = load_scenario(name)
+    provider = ReplaySearchProvider(scenario["searches"], latency_scale=args.latency_scale)
+    register_search_provider("replay", lambda: provider)
+    lead = ScriptedModel(lead_policy(scenario), latency=args.model_latency)
+    subagent = ScriptedModel(subagent_policy(scenario), latency=args.model_latency)
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as root:
+        os.chdir(root)
+        tracemalloc.reset_peak()
+        recorder = PerformanceRecorder(name)
+        recorder_token = bind_performance_recorder(recorder)
+        store_token = bind_source_store(SourceStore(root))
+        try:
+            start = time.perf_counter()
+            agent = create_deepsearch_agent(
+                research_tool=internet_search,
+                tool_name="internet_search",
+                batch_research_tool=internet_search_batch,
+                research_tool_saves_sources=True,
+                lead_model=lead,
+                subagent_model=subagent,
+                citations_model=ScriptedModel(lambda m, s: [{"text": "none"}]),
+                citation_mode="local",
+            )
+            setup = time.perf_counter() - start
+            with contextlib.redirect_stdout(io.StringIO()):
+                agent(scenario["prompt"])
+            total = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            summary = recorder.summary()
+            written = bytes_written(Path(root))
+        finally:
+            unbind_source_store(store_token)
+            unbind_performance_recorder(recorder_token)
+            os.chdir(cwd)
+
+    spans = [span for span in recorder.spans if span.stage != "model"]
+    return {
+        "e2e_seconds": round(total, 3),
+        "setup_seconds": round(setup, 3),
+        "stage_seconds": {
+            stage: stats["total_seconds"] for stage, stats in summary["stages"].items()
+        },
+        "critical_path": summary["critical_path"],
+        "tool_calls": dict(sorted(Counter(span.name for span in spans).items())),
+        "model_calls": {"lead": lead.calls, "subagents": subagent.calls},
+        "tokens": {
+            "input": sum(s["input_tokens"] for s in summary["stages"].values()),
+            "output": sum(s["output_tokens"] for s in summary["stages"].values()),
+        },
+        "searches": {"upstream": provider.calls, "unrecorded": provider.misses},
+        "bytes_written": written,
+        "peak_memory_mb": round(peak / 1024 / 1024, 2),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """List the regressions of `results` against the baseline scenarios."""
+    regressions = []
+    for name, result in results.items():
+        expected = baseline["scenarios"].get(name)
+        if expected is None:
+            continue
+        for metric, actual, reference in (
+            ("e2e time", result["e2e_seconds"], expected["e2e_seconds"]),
+            ("peak memory", result["peak_memory_mb"], expected["peak_memory_mb"]),
+            (
+                "bytes written",
+                result["bytes_written"]["total"],
+                expected["bytes_written"]["total"],
+            ),
+        ):
+            if actual > reference * (1 + tolerance):
+                regressions.append(
+                    f"{name}: {metric} {actual} vs baseline {reference} "
+                    f"(+{(actual / reference - 1) * 100:.0f}%)"
+                )
+        if result["tool_calls"] != expected["tool_calls"]:
+            regressions.append(
+                f"{name}: tool calls {result['tool_calls']} vs baseline {expected['tool_calls']}"
+            )
+    return regressions
+
+
+def record(names: list[str]) -> None:
+    """Re-record the search responses of scenarios from the live providers."""
+    import dataclasses
+
+    from deepresearch.tools.internet_search import search
+
+    for name in names:
+        scenario = load_scenario(name)
+        for query in scenario["searches"]:
+            start = time.perf_counter()
+            result = search(query)
+            entry = dataclasses.asdict(result)
+            scenario["searches"][query] = {
+                "latency_ms": round((time.perf_counter() - start) * 1000),
+                "answer": entry["answer"],
+                "sources": entry["sources"],
+                "text": entry["text"],
+            }
+            print(f"{name}: recorded {query!r} from {result.provider}")
+        scenario["synthetic"] = False
+        (FIXTURE_DIR / f"{name}.json").write_text(
+            json.dumps(scenario, indent=2) + "\n", encoding="utf-8"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenario", choices=SCENARIOS, action="append")
+    parser.add_argument("--model-latency", type=float, default=0.05)
+    parser.add_argument("--latency-scale", type=float, default=0.1)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--write-baseline", action="store_true")
+    parser.add_argument("--output", type=Path, help="Also write the results to this file")
+    parser.add_argument("--record", action="store_true")
+    args = parser.parse_args()
+    names = args.scenario or list(SCENARIOS)
+    if args.record:
+        record(names)
+        return
+
+    # Only the replayed fixtures are searched, whatever the environment configures
+    os.environ["SEARCH_PROVIDERS"] = "replay"
+    os.environ["SEARCH_HEDGING"] = "false"
+    logging.getLogger().setLevel(logging.WARNING)
+    for name in ("deepsearch", "strands_deep_agents", "strands", "__main__"):
+        logging.getLogger(name).setLevel(logging.CRITICAL)
+
+    tracemalloc.start()
+    results = {name: run_scenario(name, args) for name in names}
+    tracemalloc.stop()
+
+    print(
+        f"{'scenario':<16} {'e2e':>7} {'model':>7} {'search':>7} {'subagent':>9} "
+        f"{'tools':>6} {'tokens':>7} {'written':>9} {'peak':>8}"
+    )
+    for name, result in results.items():
+        stages = result["stage_seconds"]
+        print(
+            f"{name:<16} {result['e2e_seconds']:6.2f}s {stages.get('model', 0):6.2f}s "
+            f"{stages.get('search', 0):6.2f}s {stages.get('subagent', 0):8.2f}s "
+            f"{sum(result['tool_calls'].values()):6d} "
+            f"{result['tokens']['input'] + result['tokens']['output']:7d} "
+            f"{result['bytes_written']['total'] / 1024:7.1f}KB "
+            f"{result['peak_memory_mb']:6.2f}MB"
+        )
+
+    settings = {
+        "model_latency": args.model_latency,
+        "latency_scale": args.latency_scale,
+        "parallel_subagents": os.environ.get("PARALLEL_SUBAGENTS", "false").lower() == "true",
+    }
+    report = {"settings": settings, "scenarios": results}
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    if args.write_baseline:
+        baseline = {"settings": settings, "scenarios": {}}
+        if args.baseline.exists():
+            baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+            baseline["settings"] = settings
+        baseline["scenarios"].update(results)
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(baseline, indent=2) + "\n", encoding="utf-8")
+        print(f"\nbaseline written to {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"\nno baseline at {args.baseline}, create one with --write-baseline")
+        return
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    if baseline["settings"] != settings:
+        print(f"\nwarning: baseline recorded with {baseline['settings']}, running with {settings}")
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("\nREGRESSIONS against the baseline:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print(f"\nOK: within {args.tolerance:.0%} of the baseline")
+
+
+if __name__ == "__main__":
+    main()
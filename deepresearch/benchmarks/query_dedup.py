@@ -0,0 +1,136 @@
+"""
+Benchmark: overlapping queries from parallel subagents with and without the query log.
+
+--subagents threads search concurrently through the routed `search` path
+(stub provider, result cache disabled), as subagents of one session do. Each
+subagent searches every topic below once in its own wording: reordered,
+reworded with stopwords, plurals, punctuation or one extra term, the overlap
+seen when parallel subagents cover related ground. Some topics are close but
+distinct, and must not be merged.
+
+Reports, per mode, upstream searches, searches served from the log (reused
+or coalesced onto an in-flight search), wrongly merged queries and wall time.
+
+Usage (from the deepresearch/ directory):
+    python -m benchmarks.query_dedup --subagents 6 --search-latency 0.3
+"""
+
+import argparse
+import contextvars
+import logging
+import os
+import threading
+import time
+
+os.environ.setdefault("SEARCH_CACHE_ENABLED", "false")
+os.environ.setdefault("SEARCH_PROVIDERS", "stub")
+
+from benchmarks.stubs import StubSearchProvider  # noqa: E402
+from deepresearch.search import register_search_provider  # noqa: E402
+from deepresearch.tools.internet_search import search  # noqa: E402
+from deepresearch.utils.query_log import bind_query_log, create_query_log  # noqa: E402
+
+# Spellings of each topic; subagent i uses spelling i % len(spellings)
+TOPICS = [
+    [
+        "AI safety research 2025",
+        "2025 AI safety research",
+        "AI Safety Research in 2025?",
+        "latest research on AI safety 2025",
+    ],
+    [
+        "sodium ion battery energy density",
+        "energy density of sodium ion batteries",
+        "Sodium-ion batteries: energy density",
+        "sodium ion battery cell energy density",
+    ],
+    [
+        "lithium ion battery pack prices 2024",
+        "2024 lithium-ion battery pack prices",
+        "battery pack prices lithium ion 2024",
+        "what were lithium ion battery pack prices in 2024",
+    ],
+    [
+        "grid scale battery storage safety incidents",
+        "safety incidents of grid-scale battery storage",
+        "grid scale battery storage safety incidents",
+        "Grid-scale battery storage: safety incidents",
+    ],
+    # Close to the previous topic, but a different question
+    [
+        "grid scale battery storage deployment forecast",
+        "deployment forecast for grid-scale battery storage",
+        "grid scale battery storage deployment forecasts",
+        "forecast of global grid scale battery storage deployment",
+    ],
+    [
+        "iron air battery long duration storage cost",
+        "cost of iron-air batteries for long duration storage",
+        "long duration storage iron air battery costs",
+        "iron air battery system cost long-duration storage",
+    ],
+]
+
+
+def run_mode(dedup: bool, args) -> dict:
+    os.environ["QUERY_DEDUP_ENABLED"] = "true" if dedup else "false"
+    provider = StubSearchProvider(latency=args.search_latency)
+    register_search_provider("stub", lambda: provider)
+
+    query_log = create_query_log()
+    bind_query_log(query_log)
+    topic_of = {
+        spelling: index for index, spellings in enumerate(TOPICS) for spelling in spellings
+    }
+    wrong = []
+
+    def subagent(i: int) -> None:
+        for spellings in TOPICS:
+            query = spellings[i % len(spellings)]
+            result = search(query)
+            if topic_of[result.query] != topic_of[query]:
+                wrong.append((query, result.query))
+
+    # Threads get a copy of the context, as strands' tool threads do
+    threads = [
+        threading.Thread(target=contextvars.copy_context().run, args=(subagent, i))
+        for i in range(args.subagents)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = query_log.stats()
+    return {
+        "seconds": time.perf_counter() - start,
+        "searches": args.subagents * len(TOPICS),
+        "upstream": provider.calls,
+        "reused": stats["reused"] if dedup else 0,
+        "coalesced": stats["coalesced"] if dedup else 0,
+        "wrong": len(wrong),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--subagents", type=int, default=6)
+    parser.add_argument("--search-latency", type=float, default=0.3)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger("deepsearch").setLevel(logging.WARNING)
+
+    print(
+        f"{'mode':<9} {'searches':>9} {'upstream':>9} {'reused':>7} "
+        f"{'coalesced':>10} {'wrong':>6} {'time':>8}"
+    )
+    for name, dedup in (("no dedup", False), ("dedup", True)):
+        stats = run_mode(dedup, args)
+        print(
+            f"{name:<9} {stats['searches']:9d} {stats['upstream']:9d} {stats['reused']:7d} "
+            f"{stats['coalesced']:10d} {stats['wrong']:6d} {stats['seconds']:7.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
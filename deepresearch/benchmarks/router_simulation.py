@@ -0,0 +1,164 @@
+"""
+Simulation harness for the search router.
+
+Fake providers draw latencies from configurable log-normal distributions and
+fail with a configurable probability, optionally going fully down for a window
+of the run. Each scenario is replayed with random provider choice (the old
+behaviour), routing, and routing with hedging, reporting latency percentiles,
+failed queries and extra upstream calls spent on hedges.
+
+Usage (from the deepresearch/ directory):
+    python -m benchmarks.router_simulation --queries 400 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+
+from deepresearch.search.base import SearchProvider, SearchResult
+from deepresearch.search.router import SearchRouter, percentile, timed_upstream_call
+
+
+@dataclass
+class ProviderProfile:
+    """
+    Latency/error profile of a simulated provider.
+
+    Attributes:
+        median: Median latency in seconds.
+        sigma: Log-normal shape; larger values give a heavier tail.
+        error_rate: Probability that a call fails.
+        outage: Optional (start, end) fraction of the run during which every call fails.
+    """
+
+    median: float
+    sigma: float
+    error_rate: float = 0.0
+    outage: tuple[float, float] | None = None
+
+
+SCENARIOS = {
+    "fast_vs_slow": {
+        "linkup": ProviderProfile(median=0.08, sigma=0.3),
+        "tavily": ProviderProfile(median=0.20, sigma=0.3),
+    },
+    "heavy_tail": {
+        "linkup": ProviderProfile(median=0.06, sigma=1.0),
+        "tavily": ProviderProfile(median=0.09, sigma=0.3),
+    },
+    "outage": {
+        "linkup": ProviderProfile(median=0.06, sigma=0.4, outage=(0.3, 0.6)),
+        "tavily": ProviderProfile(median=0.10, sigma=0.4, error_rate=0.02),
+    },
+}
+
+
+class SimulatedProvider(SearchProvider):
+    """Provider sleeping for a sampled latency and failing at random."""
+
+    def __init__(self, name: str, profile: ProviderProfile, rng: random.Random, clock):
+        self.name = name
+        self.profile = profile
+        self.rng = rng
+        self.clock = clock
+        self.calls = 0
+
+    async def search(self, query: str) -> SearchResult:
+        self.calls += 1
+        latency = self.rng.lognormvariate(0, self.profile.sigma) * self.profile.median
+        progress = self.clock()
+        in_outage = self.profile.outage and (
+            self.profile.outage[0] <= progress < self.profile.outage[1]
+        )
+        if in_outage:
+            await asyncio.sleep(min(latency, 0.05))
+            raise ConnectionError(f"{self.name} outage")
+        await asyncio.sleep(latency)
+        if self.rng.random() < self.profile.error_rate:
+            raise ConnectionError(f"{self.name} error")
+        return SearchResult(provider=self.name, query=query, text=f"{self.name}: {query}")
+
+
+async def random_choice_search(query, providers, rng):
+    provider = providers[rng.choice(list(providers))]
+    return await provider.search(query)
+
+
+async def simulate(mode: str, scenario: dict, queries: int, concurrency: int, seed: int):
+    rng = random.Random(seed)
+    done_count = 0
+
+    def clock() -> float:
+        return done_count / queries
+
+    providers = {
+        name: SimulatedProvider(name, profile, random.Random(f"{seed}-{name}"), clock)
+        for name, profile in scenario.items()
+    }
+    router = SearchRouter(
+        providers=list(providers),
+        hedging=mode == "routed+hedged",
+        hedge_min_delay=0.05,
+        cooldown_seconds=1.0,
+    )
+
+    async def search_fn(query, provider):
+        with timed_upstream_call():
+            return await providers[provider].search(query)
+
+    latencies, failures = [], 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_query(i: int):
+        nonlocal done_count, failures
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                if mode == "random":
+                    await random_choice_search(f"query {i}", providers, rng)
+                else:
+                    await router.search(f"query {i}", search_fn=search_fn)
+                latencies.append(time.perf_counter() - start)
+            except ConnectionError:
+                failures += 1
+            done_count += 1
+
+    await asyncio.gather(*(run_query(i) for i in range(queries)))
+    upstream_calls = sum(provider.calls for provider in providers.values())
+    return {
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "failures": failures,
+        "extra_calls": upstream_calls - queries,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default=None)
+    args = parser.parse_args()
+    logging.getLogger("deepsearch.search_router").setLevel(logging.ERROR)
+
+    scenarios = [args.scenario] if args.scenario else list(SCENARIOS)
+    for name in scenarios:
+        print(f"\n== {name} ==")
+        for mode in ("random", "routed", "routed+hedged"):
+            result = asyncio.run(
+                simulate(mode, SCENARIOS[name], args.queries, args.concurrency, args.seed)
+            )
+            print(
+                f"{mode:<14} p50={result['p50'] * 1000:6.1f}ms "
+                f"p95={result['p95'] * 1000:6.1f}ms p99={result['p99'] * 1000:6.1f}ms "
+                f"failed={result['failures']:<3} extra_calls={result['extra_calls']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
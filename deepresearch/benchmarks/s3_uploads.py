@@ -0,0 +1,192 @@
+"""
+Benchmark: serial S3 output uploads vs the concurrent shared-client uploader.
+
+Writes a session workspace with the usual layout (research_documents_{topic}/
+source_*.md, research_findings_*.md, a report) and uploads it to an in-process
+S3 stand-in (moto). Every request is delayed by --rtt-ms to stand in for the
+network round trip to S3, which is what dominates real uploads of many small
+files.
+
+Compared paths:
+- serial-new-client: a new client per file (upload_single_file before the
+  shared client).
+- serial: one client, one file at a time (upload_session_outputs before).
+- parallel: upload_session_outputs with the cached client and thread pool.
+- archive: upload_session_outputs with OUTPUTS_FORMAT=archive (one archive
+  and index instead of one object per source document).
+- synced: OutputSyncer polling while the files are written over --run-seconds,
+  timed from the end of the run (what remains on the critical path).
+
+Usage (from the deepresearch/ directory):
+    python -m benchmarks.s3_uploads --sources 300 --rtt-ms 20
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import boto3
+from moto import mock_aws
+
+from deepresearch.utils.clients import get_client_registry
+from deepresearch.utils.output_sync import OutputSyncer
+from deepresearch.utils.s3_outputs import (
+    RESEARCH_DOCUMENTS_PATTERN,
+    collect_output_files,
+    get_s3_client,
+    upload_session_outputs,
+)
+
+BUCKET = "deepsearch-benchmark-outputs"
+REGION = "us-east-1"
+TOPICS = ["market_overview", "technology_trends", "policy_landscape", "key_players"]
+
+
+def write_workspace(root: Path, sources: int, source_bytes: int) -> int:
+    body = ("Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 100)[:source_bytes]
+    for i in range(sources):
+        topic = TOPICS[i % len(TOPICS)]
+        directory = root / f"{RESEARCH_DOCUMENTS_PATTERN}{topic}"
+        directory.mkdir(exist_ok=True)
+        (directory / f"source_{i // len(TOPICS) + 1}.md").write_text(
+            f"source_url: https://example.com/{topic}/{i}\n\n{body}\n"
+        )
+    for topic in TOPICS:
+        (root / f"research_findings_{topic}.md").write_text(f"# Findings: {topic}\n\n{body * 4}")
+    (root / "benchmark_report.md").write_text(f"# Report\n\n{body * 20}")
+    return sources + len(TOPICS) + 1
+
+
+def add_latency(client, rtt: float) -> None:
+    def delay(**kwargs):
+        time.sleep(rtt)
+
+    client.meta.events.register("before-send.s3", delay)
+
+
+def new_client(rtt: float):
+    client = boto3.client("s3", region_name=REGION)
+    add_latency(client, rtt)
+    return client
+
+
+def upload_serial(root: Path, session_id: str, rtt: float, client_per_file: bool) -> int:
+    outputs = collect_output_files(root)
+    client = None if client_per_file else new_client(rtt)
+    uploaded = 0
+    for output_type, paths in outputs.items():
+        for path in paths:
+            if output_type == "intermediate":
+                topic = path.parent.name.replace(RESEARCH_DOCUMENTS_PATTERN, "")
+                key = f"{session_id}/intermediate/{topic}/{path.name}"
+            else:
+                key = f"{session_id}/final/{path.name}"
+            s3 = new_client(rtt) if client_per_file else client
+            s3.upload_file(str(path), BUCKET, key)
+            uploaded += 1
+    return uploaded
+
+
+def upload_parallel(
+    root: Path, session_id: str, rtt: float, output_format: str = "files"
+) -> int:
+    get_client_registry().reset(f"s3:{REGION}")
+    add_latency(get_s3_client(REGION), rtt)
+    os.environ["OUTPUTS_FORMAT"] = output_format
+    try:
+        result = upload_session_outputs(session_id, BUCKET, working_dir=root, region_name=REGION)
+    finally:
+        os.environ.pop("OUTPUTS_FORMAT")
+    assert not result["failed"], result["failed"]
+    return len(result["uploaded"])
+
+
+def upload_synced(
+    root: Path, session_id: str, rtt: float, run_seconds: float
+) -> tuple[int, float]:
+    """Write the workspace gradually with the syncer running; time only finish()."""
+    get_client_registry().reset(f"s3:{REGION}")
+    add_latency(get_s3_client(REGION), rtt)
+    files = sorted(
+        (path for path in root.rglob("*.md") if not path.name.endswith("_report.md")),
+        key=lambda path: (path.name.startswith("research_findings_"), str(path)),
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        target = Path(tmp)
+        syncer = OutputSyncer(session_id, BUCKET, target, REGION, interval_seconds=0.2)
+        syncer.start()
+        for path in files:
+            destination = target / path.relative_to(root)
+            destination.parent.mkdir(exist_ok=True)
+            shutil.copy(path, destination)
+            time.sleep(run_seconds / len(files))
+        shutil.copy(root / "benchmark_report.md", target / "benchmark_report.md")
+
+        start = time.perf_counter()
+        result = syncer.finish()
+        elapsed = time.perf_counter() - start
+    assert not result["failed"], result["failed"]
+    return len(result["uploaded"]), elapsed
+
+
+def count_objects(prefix: str) -> int:
+    paginator = boto3.client("s3", region_name=REGION).get_paginator("list_objects_v2")
+    return sum(page.get("KeyCount", 0) for page in paginator.paginate(Bucket=BUCKET, Prefix=prefix))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sources", type=int, default=300, help="Source documents")
+    parser.add_argument("--source-bytes", type=int, default=2000)
+    parser.add_argument("--rtt-ms", type=float, default=20.0, help="Simulated S3 round trip")
+    parser.add_argument(
+        "--run-seconds", type=float, default=5.0, help="Agent run the synced files are spread over"
+    )
+    args = parser.parse_args()
+    rtt = args.rtt_ms / 1000
+
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+    os.environ["AWS_REGION"] = REGION
+
+    with mock_aws(), tempfile.TemporaryDirectory() as tmp:
+        boto3.client("s3", region_name=REGION).create_bucket(Bucket=BUCKET)
+        root = Path(tmp)
+        files = write_workspace(root, args.sources, args.source_bytes)
+        print(f"{files} files, {args.rtt_ms:.0f} ms simulated round trip")
+
+        runs = [
+            ("serial-new-client", lambda: upload_serial(root, "a", rtt, client_per_file=True)),
+            ("serial", lambda: upload_serial(root, "b", rtt, client_per_file=False)),
+            ("parallel", lambda: upload_parallel(root, "c", rtt)),
+            ("archive", lambda: upload_parallel(root, "e", rtt, output_format="archive")),
+        ]
+        timings = {}
+        for (name, run), prefix in zip(runs, "abce"):
+            start = time.perf_counter()
+            uploaded = run()
+            timings[name] = time.perf_counter() - start
+            objects = count_objects(f"{prefix}/")
+            assert uploaded == objects, (name, uploaded, objects)
+            print(
+                f"{name:<18} {timings[name]:7.2f}s  {files / timings[name]:7.1f} files/s "
+                f"{objects:>5} objects"
+            )
+
+        uploaded, timings["synced"] = upload_synced(root, "d", rtt, args.run_seconds)
+        assert uploaded == files == count_objects("d/"), ("synced", uploaded)
+        print(f"{'synced':<18} {timings['synced']:7.2f}s  after the run")
+
+    print(
+        f"\nparallel vs serial: {timings['serial'] / timings['parallel']:.1f}x, "
+        f"vs serial-new-client: {timings['serial-new-client'] / timings['parallel']:.1f}x, "
+        f"archive vs serial: {timings['serial'] / timings['archive']:.1f}x; "
+        f"upload time after the run with sync: {timings['synced']:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
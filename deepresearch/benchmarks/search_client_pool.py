@@ -0,0 +1,109 @@
+"""
+Micro-benchmark: per-search Linkup client vs shared pooled client.
+
+Runs a local fake Linkup API over HTTP/1.1 keep-alive and measures per-call
+latency of `LinkupClient().search(...)` (a new client and connection per call,
+as `linkup_search` used to do) against the shared registry client.
+
+Usage (from the deepresearch/ directory):
+    python -m benchmarks.search_client_pool --calls 200
+"""
+
+import argparse
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from linkup import LinkupClient
+
+from deepresearch.utils.clients import PooledLinkupClient, get_http_limits
+
+FAKE_RESPONSE = json.dumps(
+    {
+        "answer": "Paris is the capital of France.",
+        "sources": [
+            {
+                "name": "Example",
+                "url": "https://example.com/paris",
+                "snippet": "Paris is the capital and largest city of France.",
+            }
+        ],
+    }
+).encode("utf-8")
+
+
+class FakeLinkupHandler(BaseHTTPRequestHandler):
+    """Answers every POST with a canned sourcedAnswer payload."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(FAKE_RESPONSE)))
+        self.end_headers()
+        self.wfile.write(FAKE_RESPONSE)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run_calls(get_client, calls: int) -> list[float]:
+    latencies = []
+    for i in range(calls):
+        start = time.perf_counter()
+        get_client().search(
+            query=f"benchmark query {i}",
+            depth="standard",
+            output_type="sourcedAnswer",
+        )
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def summarize(name: str, latencies: list[float]) -> dict[str, float]:
+    ordered = sorted(latencies)
+    summary = {
+        "mean_ms": statistics.mean(ordered) * 1000,
+        "p50_ms": ordered[len(ordered) // 2] * 1000,
+        "p95_ms": ordered[int(len(ordered) * 0.95) - 1] * 1000,
+    }
+    print(
+        f"{name:<28} mean={summary['mean_ms']:.2f}ms "
+        f"p50={summary['p50_ms']:.2f}ms p95={summary['p95_ms']:.2f}ms"
+    )
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeLinkupHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    try:
+        before = run_calls(
+            lambda: LinkupClient(api_key="bench", base_url=base_url), args.calls
+        )
+        pooled = PooledLinkupClient(
+            api_key="bench", base_url=base_url, limits=get_http_limits()
+        )
+        after = run_calls(lambda: pooled, args.calls)
+        pooled.close()
+    finally:
+        server.shutdown()
+
+    before_summary = summarize("new client per call", before)
+    after_summary = summarize("shared pooled client", after)
+    print(f"speedup (mean): {before_summary['mean_ms'] / after_summary['mean_ms']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
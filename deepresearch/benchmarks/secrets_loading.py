@@ -0,0 +1,96 @@
+"""
+Benchmark: serial secrets loading vs the concurrent secrets cache.
+
+Creates --secrets secrets in an in-process Secrets Manager stand-in (moto),
+with every request delayed by --rtt-ms to stand in for the network round trip,
+and compares:
+
+- serial: one GetSecretValue after the other (load_secrets_from_secrets_manager
+  before the cache).
+- cache: SecretsCache.load, fetching all secrets concurrently.
+
+Then rotates one secret and makes the next refresh fail for another, and
+checks that the rotation is picked up while the failing secret keeps its last
+good value.
+
+Usage (from the deepresearch/ directory):
+    python -m benchmarks.secrets_loading --secrets 6 --rtt-ms 50
+"""
+
+import argparse
+import logging
+import os
+import time
+
+import boto3
+from moto import mock_aws
+
+from deepresearch.utils.secrets import SecretsCache
+
+REGION = "us-east-1"
+
+
+def add_latency(client, rtt: float) -> None:
+    def delay(**kwargs):
+        time.sleep(rtt)
+
+    client.meta.events.register("before-send.secrets-manager", delay)
+
+
+def load_serial(secrets_config: dict[str, str], rtt: float) -> dict[str, str]:
+    client = boto3.client("secretsmanager", region_name=REGION)
+    add_latency(client, rtt)
+    return {
+        env_var_name: client.get_secret_value(SecretId=secret_name)["SecretString"]
+        for env_var_name, secret_name in secrets_config.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--secrets", type=int, default=6)
+    parser.add_argument("--rtt-ms", type=float, default=50)
+    args = parser.parse_args()
+    logging.getLogger("deepresearch.utils.secrets").setLevel(logging.CRITICAL)
+    rtt = args.rtt_ms / 1000
+
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+    with mock_aws():
+        admin = boto3.client("secretsmanager", region_name=REGION)
+        secrets_config = {}
+        for i in range(args.secrets):
+            admin.create_secret(Name=f"provider-{i}/api-key", SecretString=f"key-{i}-v1")
+            secrets_config[f"BENCHMARK_PROVIDER_{i}_API_KEY"] = f"provider-{i}/api-key"
+
+        start = time.perf_counter()
+        serial = load_serial(secrets_config, rtt)
+        serial_seconds = time.perf_counter() - start
+
+        cache = SecretsCache(secrets_config, region_name=REGION, refresh_seconds=0)
+        add_latency(cache._get_client(), rtt)
+        start = time.perf_counter()
+        cached = cache.load()
+        cache_seconds = time.perf_counter() - start
+        assert cached == serial
+
+        # Rotate the first secret, delete the second: the refresh keeps its last value
+        rotated, failing = list(secrets_config)[:2]
+        admin.put_secret_value(SecretId=secrets_config[rotated], SecretString="key-0-v2")
+        admin.delete_secret(SecretId=secrets_config[failing], ForceDeleteWithoutRecovery=True)
+        errors = cache.refresh()
+        values = cache.load()
+
+    print(f"{args.secrets} secrets, {args.rtt_ms:.0f} ms simulated round trip")
+    print(f"serial     {serial_seconds * 1000:7.0f} ms")
+    print(f"cache      {cache_seconds * 1000:7.0f} ms  ({serial_seconds / cache_seconds:.1f}x)")
+    print(
+        f"\nrefresh: rotated value picked up: {values[rotated] == 'key-0-v2'}, "
+        f"failed secret kept last good value: "
+        f"{failing in errors and values[failing] == serial[failing]}"
+    )
+    print(f"stats: {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Benchmark: time to first byte of the blocking vs streaming runtime entrypoint.
+
+Calls runtime.invoke with stub models and a stub search provider, once with a
+plain payload (one dict after the whole run) and once with `"stream": true`,
+and reports when the caller sees its first data, its first subagent event and
+the final result. The lead writes todos, dispatches research subagents that
+search and write findings, then writes and cites a report.
+
+Usage (from the deepresearch/ directory):
+    python -m benchmarks.streaming --subagents 4 --model-latency 0.5
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import logging
+import os
+import tempfile
+import time
+from collections import Counter
+
+os.environ.setdefault("BYPASS_TOOL_CONSENT", "true")
+os.environ.setdefault("SEARCH_CACHE_ENABLED", "false")
+os.environ.setdefault("SEARCH_PROVIDERS", "stub")
+os.environ.pop("OUTPUTS_BUCKET_NAME", None)
+
+import runtime  # noqa: E402
+from benchmarks.stubs import (  # noqa: E402
+    ScriptedModel,
+    StubSearchProvider,
+    assistant_turns,
+    first_user_text,
+    tool_use,
+)
+from deepresearch.main import create_deepsearch_agent  # noqa: E402
+from deepresearch.search import register_search_provider  # noqa: E402
+from deepresearch.tools import internet_search, internet_search_batch  # noqa: E402
+
+REPORT = (
+    "# Benchmark Report\n\n"
+    + "Grid-scale storage deployments grew quickly across several markets. " * 40
+)
+
+
+def lead_policy(subagents: int):
+    def policy(messages, system_prompt):
+        turn = assistant_turns(messages)
+        if turn == 0:
+            todos = [
+                {"id": str(i), "content": f"Research topic {i}", "status": "pending"}
+                for i in range(subagents)
+            ]
+            return [{"text": "Planning the research."}, tool_use("write_todos", {"todos": todos})]
+        if turn == 1:
+            return [
+                tool_use(
+                    "task",
+                    {"description": f"Research topic {i}", "subagent_type": "research_subagent"},
+                )
+                for i in range(subagents)
+            ]
+        if turn == 2:
+            return [tool_use("file_write", {"path": "./benchmark_report.md", "content": REPORT})]
+        if turn == 3:
+            return [tool_use("add_citations", {"report_path": "./benchmark_report.md"})]
+        return [{"text": "The report is in ./benchmark_report.md."}]
+
+    return policy
+
+
+def subagent_policy(messages, system_prompt):
+    task = first_user_text(messages)
+    topic = task.splitlines()[0].split()[-1]
+    suffix = ""
+    if "Append the suffix `" in task:
+        suffix = task.split("Append the suffix `", 1)[1].split("`", 1)[0]
+    turn = assistant_turns(messages)
+    if turn < 2:
+        return [
+            tool_use(
+                "internet_search",
+                {"query": f"topic {topic} query {turn}", "topic": f"topic_{topic}{suffix}"},
+            )
+        ]
+    if turn == 2:
+        return [
+            tool_use(
+                "file_write",
+                {
+                    "path": f"./research_findings_topic_{topic}{suffix}.md",
+                    "content": f"Findings for topic {topic}",
+                },
+            )
+        ]
+    return [{"text": f"Wrote findings for topic {topic}."}]
+
+
+def install_stub_agent(subagents: int, model_latency: float) -> None:
+    def create_agent(session_id: str):
+        return create_deepsearch_agent(
+            research_tool=internet_search,
+            tool_name="internet_search",
+            batch_research_tool=internet_search_batch,
+            research_tool_saves_sources=True,
+            session_id=session_id,
+            lead_model=ScriptedModel(lead_policy(subagents), latency=model_latency),
+            subagent_model=ScriptedModel(subagent_policy, latency=model_latency),
+            citations_model=ScriptedModel(lambda m, s: [{"text": "none"}]),
+        )
+
+    runtime.create_agent = create_agent
+
+
+def run_blocking(prompt: str) -> dict:
+    start = time.perf_counter()
+    response = runtime.invoke({"prompt": prompt}, None)
+    total = time.perf_counter() - start
+    assert "error" not in response, response
+    return {"first_event": total, "first_subagent": total, "total": total, "events": Counter()}
+
+
+async def run_streaming(prompt: str) -> dict:
+    start = time.perf_counter()
+    stream = await asyncio.to_thread(runtime.invoke, {"prompt": prompt, "stream": True}, None)
+    stats = {"first_event": None, "first_subagent": None, "events": Counter()}
+    async for event in stream:
+        now = time.perf_counter() - start
+        stats["events"][event["type"]] += 1
+        if stats["first_event"] is None:
+            stats["first_event"] = now
+        if event["type"] == "subagent_started" and stats["first_subagent"] is None:
+            stats["first_subagent"] = now
+        assert event["type"] != "error", event
+    stats["total"] = time.perf_counter() - start
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--subagents", type=int, default=4)
+    parser.add_argument("--model-latency", type=float, default=0.5)
+    parser.add_argument("--search-latency", type=float, default=0.3)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    for name in ("deepsearch", "strands_deep_agents", "strands", "__main__"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    register_search_provider("stub", lambda: StubSearchProvider(latency=args.search_latency))
+    install_stub_agent(args.subagents, args.model_latency)
+
+    with tempfile.TemporaryDirectory() as root:
+        os.environ["SESSION_WORKSPACE_ROOT"] = root
+        runtime.get_workspace_manager.cache_clear()
+        with contextlib.redirect_stdout(io.StringIO()):
+            blocking = run_blocking("Benchmark research question")
+            streaming = asyncio.run(run_streaming("Benchmark research question"))
+
+    print(f"{'mode':<10} {'first data':>11} {'first subagent':>15} {'complete':>9}")
+    for name, stats in (("blocking", blocking), ("streaming", streaming)):
+        print(
+            f"{name:<10} {stats['first_event']:10.2f}s {stats['first_subagent']:14.2f}s "
+            f"{stats['total']:8.2f}s"
+        )
+    print(f"\nstreamed events: {dict(streaming['events'])}")
+
+
+if __name__ == "__main__":
+    main()
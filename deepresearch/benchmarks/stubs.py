@@ -0,0 +1,220 @@
+"""
+Deterministic stand-ins for Bedrock models and search providers used by the
+offline benchmarks.
+"""
+
+import asyncio
+import hashlib
+import itertools
+import json
+from typing import Any, AsyncIterable, Callable
+
+from strands.models import Model
+from strands.types.content import ContentBlock, Messages
+
+from deepresearch.search import SearchProvider, SearchResult, SearchSource
+
+_tool_use_ids = itertools.count(1)
+
+Policy = Callable[[Messages, str | None], list[ContentBlock]]
+
+
+def tool_use(name: str, tool_input: dict[str, Any]) -> ContentBlock:
+    """
+    Build a toolUse content block with a unique id.
+
+    Args:
+        name: Tool name.
+        tool_input: Tool input arguments.
+
+    Returns:
+        ContentBlock requesting the tool call.
+    """
+    return {
+        "toolUse": {
+            "toolUseId": f"tooluse_{next(_tool_use_ids)}",
+            "name": name,
+            "input": tool_input,
+        }
+    }
+
+
+def assistant_turns(messages: Messages) -> int:
+    """Count assistant turns already present in the conversation."""
+    return sum(1 for message in messages if message["role"] == "assistant")
+
+
+def first_user_text(messages: Messages) -> str:
+    """Get the text of the first user message (the task description)."""
+    for block in messages[0]["content"]:
+        if "text" in block:
+            return block["text"]
+    return ""
+
+
+class ScriptedModel(Model):
+    """
+    Model whose replies are produced by a deterministic policy function.
+
+    Each call sleeps for `latency` seconds to stand in for model inference time,
+    then streams the content blocks returned by the policy.
+    """
+
+    def __init__(self, policy: Policy, latency: float = 0.0, name: str = "stub"):
+        """
+        Initialize the model.
+
+        Args:
+            policy: Callable mapping (messages, system_prompt) to reply blocks.
+            latency: Simulated inference time per call, in seconds.
+            name: Model id reported by get_config.
+        """
+        self.policy = policy
+        self.latency = latency
+        self.config = {"model_id": name}
+        self.calls = 0
+
+    def update_config(self, **model_config: Any) -> None:
+        self.config.update(model_config)
+
+    def get_config(self) -> dict[str, Any]:
+        return self.config
+
+    async def structured_output(self, output_model, prompt, system_prompt=None, **kwargs):
+        raise NotImplementedError("ScriptedModel does not support structured output")
+        yield  # pragma: no cover
+
+    async def stream(
+        self,
+        messages: Messages,
+        tool_specs=None,
+        system_prompt: str | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterable[dict[str, Any]]:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        blocks = self.policy(messages, system_prompt)
+        output_tokens = 0
+
+        yield {"messageStart": {"role": "assistant"}}
+        for block in blocks:
+            if "toolUse" in block:
+                tool = block["toolUse"]
+                payload = json.dumps(tool["input"])
+                output_tokens += len(payload) // 4
+                yield {
+                    "contentBlockStart": {
+                        "start": {
+                            "toolUse": {
+                                "toolUseId": tool["toolUseId"],
+                                "name": tool["name"],
+                            }
+                        }
+                    }
+                }
+                yield {"contentBlockDelta": {"delta": {"toolUse": {"input": payload}}}}
+            else:
+                output_tokens += len(block["text"]) // 4
+                yield {"contentBlockStart": {"start": {}}}
+                yield {"contentBlockDelta": {"delta": {"text": block["text"]}}}
+            yield {"contentBlockStop": {}}
+
+        stop_reason = (
+            "tool_use" if any("toolUse" in block for block in blocks) else "end_turn"
+        )
+        input_tokens = len(json.dumps(messages, default=str)) // 4
+        yield {"messageStop": {"stopReason": stop_reason}}
+        yield {
+            "metadata": {
+                "usage": {
+                    "inputTokens": input_tokens,
+                    "outputTokens": output_tokens,
+                    "totalTokens": input_tokens + output_tokens,
+                },
+                "metrics": {"latencyMs": int(self.latency * 1000)},
+            }
+        }
+
+
+class StubSearchProvider(SearchProvider):
+    """Search provider returning synthetic results after a fixed delay."""
+
+    def __init__(self, name: str = "stub", latency: float = 0.0):
+        """
+        Initialize the provider.
+
+        Args:
+            name: Provider name to register under.
+            latency: Simulated upstream latency per search, in seconds.
+        """
+        self.name = name
+        self.latency = latency
+        self.calls = 0
+
+    async def search(self, query: str) -> SearchResult:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        digest = hashlib.sha256(query.encode("utf-8")).hexdigest()[:12]
+        url = f"https://example.com/{digest}"
+        snippet = f"Synthetic result for {query}."
+        return SearchResult(
+            provider=self.name,
+            query=query,
+            text=f"answer='{snippet}' sources=[url='{url}']",
+            answer=snippet,
+            sources=[SearchSource(title=f"Source {digest}", url=url, snippet=snippet)],
+        )
+
+
+class ReplaySearchProvider(SearchProvider):
+    """
+    Search provider replaying responses from a fixture.
+
+    Fixtures map each query to its `answer`, `sources`, raw `text` and
+    upstream `latency_ms` (see benchmarks/fixtures/searches/, synthetic unless
+    re-recorded with `benchmarks.pipeline --record`). Queries are
+    matched after normalization; unknown queries return an empty result and
+    are counted in `misses`.
+    """
+
+    def __init__(
+        self,
+        searches: dict[str, dict],
+        name: str = "replay",
+        latency_scale: float = 1.0,
+    ):
+        """
+        Initialize the provider.
+
+        Args:
+            searches: Responses keyed by query.
+            name: Provider name to register under.
+            latency_scale: Factor applied to the fixture latencies (0 for none).
+        """
+        from deepresearch.utils.search_cache import normalize_query
+
+        self._normalize = normalize_query
+        self.searches = {normalize_query(query): entry for query, entry in searches.items()}
+        self.name = name
+        self.latency_scale = latency_scale
+        self.calls = 0
+        self.misses = 0
+
+    async def search(self, query: str) -> SearchResult:
+        self.calls += 1
+        entry = self.searches.get(self._normalize(query))
+        if entry is None:
+            self.misses += 1
+            return SearchResult(provider=self.name, query=query, text="No results found.")
+        if self.latency_scale:
+            await asyncio.sleep(entry.get("latency_ms", 0) / 1000 * self.latency_scale)
+        return SearchResult(
+            provider=self.name,
+            query=query,
+            text=entry["text"],
+            answer=entry.get("answer"),
+            sources=[SearchSource(**source) for source in entry.get("sources", [])],
+        )
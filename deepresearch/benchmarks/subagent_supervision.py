@@ -0,0 +1,177 @@
+"""
+Benchmark: subagent failures with and without the supervision layer.
+
+The lead dispatches --subagents research subagents in one turn (stub models,
+stub search provider), two of which misbehave:
+
+- flaky: its model stream drops once ("Response ended prematurely").
+- runaway: it keeps searching and never writes its findings on its own.
+
+Without supervision (no retries, no budgets) the flaky subagent's task comes
+back as an error and the runaway one searches --runaway-searches times. With
+supervision the flaky subagent is retried after a short backoff, and the
+runaway one is refused further searches after SUBAGENT_MAX_TOOL_CALLS and
+writes its findings. Reports, per mode, how many task results the lead got
+back as complete, partial or error, the number of searches and the time.
+
+Usage (from the deepresearch/ directory):
+    python -m benchmarks.subagent_supervision --subagents 4 --max-tool-calls 6
+"""
+
+import argparse
+import contextlib
+import io
+import logging
+import os
+import tempfile
+import time
+
+os.environ.setdefault("BYPASS_TOOL_CONSENT", "true")
+os.environ.setdefault("SEARCH_CACHE_ENABLED", "false")
+os.environ.setdefault("SEARCH_PROVIDERS", "stub")
+
+from urllib3.exceptions import ProtocolError  # noqa: E402
+
+from benchmarks.stubs import (  # noqa: E402
+    ScriptedModel,
+    StubSearchProvider,
+    assistant_turns,
+    first_user_text,
+    tool_use,
+)
+from deepresearch.main import create_deepsearch_agent  # noqa: E402
+from deepresearch.search import register_search_provider  # noqa: E402
+from deepresearch.tools import internet_search, internet_search_batch  # noqa: E402
+
+FLAKY_TOPIC = "0"
+RUNAWAY_TOPIC = "1"
+
+
+def lead_policy(subagents: int, results: list):
+    def policy(messages, system_prompt):
+        turn = assistant_turns(messages)
+        if turn == 0:
+            return [
+                tool_use(
+                    "task",
+                    {"description": f"Research topic {i}", "subagent_type": "research_subagent"},
+                )
+                for i in range(subagents)
+            ]
+        if turn == 1:
+            for block in messages[-1]["content"]:
+                if "toolResult" in block:
+                    results.append(block["toolResult"]["content"][0].get("text", ""))
+        return [{"text": "Synthesized the report."}]
+
+    return policy
+
+
+def subagent_policy(runaway_searches: int):
+    dropped = set()
+
+    def policy(messages, system_prompt):
+        topic = first_user_text(messages).splitlines()[0].split()[-1]
+        turn = assistant_turns(messages)
+        if topic == FLAKY_TOPIC and turn == 1 and topic not in dropped:
+            dropped.add(topic)
+            raise ProtocolError("Response ended prematurely")
+
+        refused = any(
+            "budget" in str(block.get("toolResult", {}).get("content", ""))
+            for message in messages
+            for block in message["content"]
+        )
+        searches = runaway_searches if topic == RUNAWAY_TOPIC else 2
+        if turn < searches and not refused:
+            return [
+                tool_use(
+                    "internet_search",
+                    {"query": f"topic {topic} query {turn}", "topic": f"topic_{topic}"},
+                )
+            ]
+        if not any(
+            "toolUse" in block and block["toolUse"]["name"] == "file_write"
+            for message in messages
+            for block in message["content"]
+        ):
+            return [
+                tool_use(
+                    "file_write",
+                    {
+                        "path": f"./research_findings_topic_{topic}.md",
+                        "content": f"Findings for topic {topic}",
+                    },
+                )
+            ]
+        return [{"text": f"Findings for topic {topic} are in its findings file."}]
+
+    return policy
+
+
+def run_mode(supervised: bool, args) -> dict:
+    os.environ["SUBAGENT_MAX_RETRIES"] = "2" if supervised else "0"
+    os.environ["SUBAGENT_RETRY_BASE_SECONDS"] = "0.2"
+    os.environ["SUBAGENT_MAX_TOOL_CALLS"] = str(args.max_tool_calls) if supervised else "0"
+    os.environ["SUBAGENT_TIMEOUT_SECONDS"] = "60" if supervised else "0"
+
+    results = []
+    provider = StubSearchProvider(latency=args.search_latency)
+    register_search_provider("stub", lambda: provider)
+    agent = create_deepsearch_agent(
+        research_tool=internet_search,
+        tool_name="internet_search",
+        batch_research_tool=internet_search_batch,
+        research_tool_saves_sources=True,
+        lead_model=ScriptedModel(lead_policy(args.subagents, results)),
+        subagent_model=ScriptedModel(
+            subagent_policy(args.runaway_searches), latency=args.model_latency
+        ),
+        citations_model=ScriptedModel(lambda m, s: [{"text": "none"}]),
+    )
+    start = time.perf_counter()
+    agent("Benchmark research question")
+    return {
+        "seconds": time.perf_counter() - start,
+        "complete": sum(1 for r in results if r.startswith("Findings")),
+        "partial": sum(1 for r in results if r.startswith("[Partial")),
+        "error": sum(1 for r in results if r.startswith("Error")),
+        "searches": provider.calls,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--subagents", type=int, default=4)
+    parser.add_argument("--max-tool-calls", type=int, default=6)
+    parser.add_argument("--runaway-searches", type=int, default=30)
+    parser.add_argument("--model-latency", type=float, default=0.05)
+    parser.add_argument("--search-latency", type=float, default=0.05)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    for name in ("deepsearch", "strands_deep_agents", "strands", "__main__"):
+        logging.getLogger(name).setLevel(logging.CRITICAL)
+
+    results = {}
+    cwd = os.getcwd()
+    for name, supervised in (("unsupervised", False), ("supervised", True)):
+        with tempfile.TemporaryDirectory() as root:
+            os.chdir(root)
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    results[name] = run_mode(supervised, args)
+            finally:
+                os.chdir(cwd)
+
+    print(
+        f"{'mode':<13} {'complete':>9} {'partial':>8} {'error':>6} {'searches':>9} {'time':>8}"
+    )
+    for name, stats in results.items():
+        print(
+            f"{name:<13} {stats['complete']:9d} {stats['partial']:8d} {stats['error']:6d} "
+            f"{stats['searches']:9d} {stats['seconds']:7.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
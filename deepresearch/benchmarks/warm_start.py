@@ -0,0 +1,107 @@
+"""
+Benchmark: per-invocation setup cost with and without the warm-start layer.
+
+Measures what runtime.invoke spends before the agent starts working:
+
+- rebuild: what every invocation used to do, re-initializing telemetry (a new
+  OTLP exporter) and building prompts, subagents and model clients from scratch
+  with create_deepsearch_agent.
+- warm: runtime.create_agent, which binds the session to the process-wide
+  blueprint (telemetry initialized once).
+
+Also reports the one-off startup cost (importing runtime, warm_up). Nothing is
+sent over the network: model clients are created but never called, and the
+OTLP endpoint is a local address that is never reached during the benchmark.
+
+Usage (from the deepresearch/ directory):
+    python -m benchmarks.warm_start --requests 20
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import threading
+import time
+
+os.environ.setdefault("AWS_REGION", "us-east-1")
+os.environ.setdefault("BYPASS_TOOL_CONSENT", "true")
+os.environ.setdefault("OTEL_EXPORTER_OTLP_ENDPOINT", "http://127.0.0.1:4318")
+os.environ.pop("SECRETS_CONFIG", None)
+
+start = time.perf_counter()
+import runtime  # noqa: E402
+
+IMPORT_SECONDS = time.perf_counter() - start
+
+from deepresearch.config import get_source_store_config  # noqa: E402
+from deepresearch.main import create_deepsearch_agent  # noqa: E402
+from deepresearch.tools import internet_search, internet_search_batch  # noqa: E402
+from deepresearch.utils.session import create_session_manager  # noqa: E402
+from deepresearch.utils import telemetry  # noqa: E402
+
+
+def rebuild(session_id: str):
+    telemetry._setup_telemetry.__wrapped__()
+    return create_deepsearch_agent(
+        research_tool=internet_search,
+        tool_name="internet_search",
+        batch_research_tool=internet_search_batch,
+        research_tool_saves_sources=get_source_store_config()["enabled"],
+        session_manager=create_session_manager(session_id=session_id),
+        session_id=session_id,
+    )
+
+
+def warm(session_id: str):
+    telemetry.initialize_telemetry()
+    return runtime.create_agent(session_id=session_id)
+
+
+def measure(setup, requests: int) -> list[float]:
+    timings = []
+    for i in range(requests):
+        start = time.perf_counter()
+        setup(f"benchmark-session-{i}")
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    for name in ("deepsearch", "strands_deep_agents", "strands", "opentelemetry"):
+        logging.getLogger(name).setLevel(logging.ERROR)
+
+    start = time.perf_counter()
+    runtime.warm_up()
+    warm_up_seconds = time.perf_counter() - start
+    print(
+        f"startup: import runtime {IMPORT_SECONDS * 1000:.0f} ms, "
+        f"warm_up {warm_up_seconds * 1000:.0f} ms"
+    )
+
+    threads_before = threading.active_count()
+    results = {"rebuild": measure(rebuild, args.requests)}
+    leaked_threads = threading.active_count() - threads_before
+    results["warm"] = measure(warm, args.requests)
+
+    print(f"\n{'per request':<12} {'median':>9} {'p95':>9} {'max':>9}")
+    for name, timings in results.items():
+        ordered = sorted(timings)
+        p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+        print(
+            f"{name:<12} {statistics.median(timings) * 1000:7.1f}ms {p95 * 1000:7.1f}ms "
+            f"{ordered[-1] * 1000:7.1f}ms"
+        )
+    speedup = statistics.median(results["rebuild"]) / statistics.median(results["warm"])
+    print(
+        f"\nper-request setup {speedup:.0f}x faster; rebuilding left "
+        f"{leaked_threads} extra threads after {args.requests} requests"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+"""Deterministic citation engine for DeepSearch reports."""
+
+from deepresearch.citations.engine import (
+    CitationEngine,
+    CitationResult,
+    has_references,
+    load_sources,
+    split_sentences,
+)
+from deepresearch.citations.fallback import LLMCitationResolver
+from deepresearch.citations.index import BM25Index, tokenize
+
+__all__ = [
+    "BM25Index",
+    "CitationEngine",
+    "CitationResult",
+    "LLMCitationResolver",
+    "has_references",
+    "load_sources",
+    "split_sentences",
+    "tokenize",
+]
@@ -0,0 +1,386 @@
+"""
+Deterministic citation engine.
+
+Matches the sentences of a synthesized report against the source documents
+saved under research_documents_*/ and writes inline `[n]` markers and a
+References section, without sending the report or the sources to a model.
+Sentences whose best match falls between the fallback and the citation
+thresholds can be handed to a resolver (see fallback.py) for an LLM decision.
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from deepresearch.citations.index import BM25Index, tokenize
+from deepresearch.utils.s3_outputs import RESEARCH_DOCUMENTS_PATTERN
+
+logger = logging.getLogger("deepsearch.citations")
+
+REFERENCES_HEADING_RE = re.compile(r"^#{1,6}\s*(references|sources)\s*$", re.IGNORECASE)
+_CITATION_MARKER_RE = re.compile(r"\[\d+(?:,\s*\d+)*\]")
+_SENTENCE_END_RE = re.compile(r"[.!?](?=[\"')\]*]*(?:\s|$))")
+_ABBREVIATIONS = frozenset(
+    "e.g i.e etc vs mr mrs ms dr prof inc ltd co corp jr sr st no fig al approx u.s u.k".split()
+)
+_MIN_SENTENCE_TOKENS = 4
+
+
+@dataclass
+class Source:
+    """
+    A cited source, merged across the documents that share its URL.
+
+    Attributes:
+        url: Source URL, or None when the documents had `source_url: N/A`.
+        title: Title from the document header, if any.
+        paths: Documents the source was read from.
+        text: Combined document text (without headers).
+        retrieved_at: Unix time the source was first retrieved, when every
+            document was reused from earlier research (`retrieved_at:`
+            header); None when any document was fetched by this run.
+    """
+
+    url: str | None
+    title: str
+    paths: list[Path] = field(default_factory=list)
+    text: str = ""
+    retrieved_at: float | None = None
+
+    @property
+    def label(self) -> str:
+        """Reference list entry for the source."""
+        if self.url:
+            return self.url
+        return self.title or self.paths[0].name
+
+
+@dataclass
+class Sentence:
+    """
+    A citable sentence of the report.
+
+    Attributes:
+        line: Index of the report line containing the sentence.
+        insert_at: Offset in the line where the citation marker goes.
+        text: Sentence text.
+        tokens: Content tokens of the sentence.
+    """
+
+    line: int
+    insert_at: int
+    text: str
+    tokens: list[str]
+
+
+@dataclass
+class Candidate:
+    """
+    A source that may support a sentence.
+
+    Attributes:
+        source_id: Index of the source.
+        confidence: Coverage score between 0 and 1.
+        passage: Best matching passage of the source.
+    """
+
+    source_id: int
+    confidence: float
+    passage: str
+
+
+@dataclass
+class PendingSentence:
+    """
+    A low-confidence sentence handed to the fallback resolver.
+
+    Attributes:
+        sentence_id: Index of the sentence in the report.
+        text: Sentence text.
+        candidates: Best matching sources.
+    """
+
+    sentence_id: int
+    text: str
+    candidates: list[Candidate]
+
+
+Resolver = Callable[[list[PendingSentence]], dict[int, list[int]]]
+
+
+@dataclass
+class CitationResult:
+    """
+    Outcome of citing a report.
+
+    Attributes:
+        text: Report text with citations and References section.
+        sentences: Citable sentences found in the report.
+        cited: Sentences cited from confident local matches.
+        resolved_by_fallback: Low-confidence sentences cited by the resolver.
+        uncited_low_confidence: Low-confidence sentences left without citation.
+        references: Reference labels in citation order.
+    """
+
+    text: str
+    sentences: int = 0
+    cited: int = 0
+    resolved_by_fallback: int = 0
+    uncited_low_confidence: int = 0
+    references: list[str] = field(default_factory=list)
+
+
+def _parse_source_document(path: Path) -> tuple[str | None, str, float | None, str]:
+    url, title, retrieved_at = None, "", None
+    lines = path.read_text(encoding="utf-8", errors="replace").splitlines()
+    body_start = 0
+    for i, line in enumerate(lines):
+        key, _, value = line.partition(":")
+        key = key.strip().lower()
+        if key == "source_url" and i == body_start:
+            value = value.strip()
+            url = value if value and value.upper() != "N/A" else None
+        elif key in ("title", "query") and i == body_start:
+            if key == "title":
+                title = value.strip()
+        elif key == "retrieved_at" and i == body_start:
+            try:
+                retrieved_at = float(value)
+            except ValueError:
+                pass
+        else:
+            break
+        body_start = i + 1
+    return url, title, retrieved_at, "\n".join(lines[body_start:]).strip()
+
+
+def load_sources(working_dir: Path) -> list[Source]:
+    """
+    Read every research_documents_*/source_*.md document under a directory.
+
+    Documents with the same source_url are merged into one source.
+
+    Args:
+        working_dir: Directory containing research_documents_* directories.
+
+    Returns:
+        Sources in a stable (path) order.
+    """
+    by_key: dict[str, Source] = {}
+    paths = sorted(Path(working_dir).glob(f"{RESEARCH_DOCUMENTS_PATTERN}*/*.md"))
+    for path in paths:
+        url, title, retrieved_at, body = _parse_source_document(path)
+        key = url or str(path)
+        if key not in by_key:
+            by_key[key] = Source(url=url, title=title, retrieved_at=retrieved_at)
+        source = by_key[key]
+        if source.retrieved_at is not None:
+            # A document fetched by this run makes the whole source fresh
+            source.retrieved_at = (
+                min(source.retrieved_at, retrieved_at) if retrieved_at is not None else None
+            )
+        source.paths.append(path)
+        source.title = source.title or title
+        source.text = f"{source.text}\n{body}" if source.text else body
+    return list(by_key.values())
+
+
+def _sentence_ends(line: str) -> list[int]:
+    ends = []
+    for match in _SENTENCE_END_RE.finditer(line):
+        pos = match.start()
+        if line[pos] == ".":
+            word = re.search(r"([A-Za-z.]+)$", line[:pos])
+            if word:
+                previous = word.group(1).lower()
+                if previous in _ABBREVIATIONS or len(previous) == 1:
+                    continue
+        ends.append(pos)
+    return ends
+
+
+def split_sentences(report: str) -> list[Sentence]:
+    """
+    Find the citable sentences of a Markdown report.
+
+    Headings, tables, code blocks, the References section, very short
+    sentences, lines ending in a colon and sentences that already carry a
+    citation are skipped.
+
+    Args:
+        report: Report text.
+
+    Returns:
+        Sentences in report order.
+    """
+    sentences = []
+    in_code = False
+    for line_index, line in enumerate(report.split("\n")):
+        stripped = line.strip()
+        if stripped.startswith("```"):
+            in_code = not in_code
+            continue
+        if REFERENCES_HEADING_RE.match(stripped):
+            break
+        if (
+            in_code
+            or not stripped
+            or stripped.startswith(("#", "|", "<", "---", "***", ">"))
+        ):
+            continue
+
+        start = len(line) - len(line.lstrip())
+        spans = []
+        for end in _sentence_ends(line):
+            spans.append((start, end))
+            start = end + 1
+        tail = line[start:].rstrip()
+        if tail.strip() and not tail.rstrip().endswith(":"):
+            spans.append((start, start + len(tail)))
+
+        for span_start, insert_at in spans:
+            text = line[span_start:insert_at].strip()
+            if _CITATION_MARKER_RE.search(text):
+                continue
+            tokens = tokenize(text)
+            if len(tokens) < _MIN_SENTENCE_TOKENS:
+                continue
+            sentences.append(Sentence(line_index, insert_at, text, tokens))
+    return sentences
+
+
+class CitationEngine:
+    """Cites report sentences from a BM25 index over source documents."""
+
+    def __init__(
+        self,
+        sources: list[Source],
+        min_confidence: float = 0.55,
+        fallback_min_confidence: float = 0.3,
+        max_sources_per_sentence: int = 2,
+    ):
+        """
+        Index the sources.
+
+        Args:
+            sources: Sources to cite from.
+            min_confidence: Coverage at or above which a source is cited directly.
+            fallback_min_confidence: Coverage at or above which a sentence below
+                min_confidence is handed to the resolver; below it the sentence
+                is left uncited.
+            max_sources_per_sentence: Maximum sources cited per sentence.
+        """
+        self.sources = sources
+        self.min_confidence = min_confidence
+        self.fallback_min_confidence = fallback_min_confidence
+        self.max_sources_per_sentence = max_sources_per_sentence
+        self.index = BM25Index()
+        for source_id, source in enumerate(sources):
+            self.index.add_source(source_id, f"{source.title}\n{source.text}")
+
+    @classmethod
+    def from_directory(cls, working_dir: Path, **kwargs) -> "CitationEngine":
+        """Build an engine over the source documents under a directory."""
+        return cls(load_sources(working_dir), **kwargs)
+
+    def candidates(self, sentence: Sentence, top_k: int = 3) -> list[Candidate]:
+        """
+        Best supporting sources for a sentence, one entry per source.
+
+        Args:
+            sentence: Sentence to match.
+            top_k: Number of sources returned.
+
+        Returns:
+            Candidates sorted by confidence, best first.
+        """
+        best: dict[int, Candidate] = {}
+        for passage, _ in self.index.search(sentence.tokens, top_k=top_k * 4):
+            confidence = self.index.coverage(sentence.tokens, passage)
+            current = best.get(passage.source_id)
+            if current is None or confidence > current.confidence:
+                best[passage.source_id] = Candidate(
+                    passage.source_id, confidence, passage.text
+                )
+        ranked = sorted(best.values(), key=lambda c: c.confidence, reverse=True)
+        return ranked[:top_k]
+
+    def cite(self, report: str, resolver: Resolver | None = None) -> CitationResult:
+        """
+        Add inline citations and a References section to a report.
+
+        Existing text and whitespace are preserved; markers are inserted
+        before each cited sentence's final punctuation.
+
+        Args:
+            report: Report text without citations.
+            resolver: Optional callable deciding low-confidence sentences.
+
+        Returns:
+            CitationResult with the cited report and counters.
+        """
+        sentences = split_sentences(report)
+        result = CitationResult(text=report, sentences=len(sentences))
+        chosen: dict[int, list[int]] = {}
+        pending: list[PendingSentence] = []
+
+        for sentence_id, sentence in enumerate(sentences):
+            candidates = self.candidates(sentence)
+            if not candidates:
+                continue
+            confident = [
+                c.source_id
+                for c in candidates
+                if c.confidence >= self.min_confidence
+            ][: self.max_sources_per_sentence]
+            if confident:
+                chosen[sentence_id] = confident
+                result.cited += 1
+            elif candidates[0].confidence >= self.fallback_min_confidence:
+                pending.append(PendingSentence(sentence_id, sentence.text, candidates))
+
+        if pending and resolver is not None:
+            resolved = resolver(pending)
+            for item in pending:
+                allowed = {c.source_id for c in item.candidates}
+                source_ids = [s for s in resolved.get(item.sentence_id, []) if s in allowed]
+                if source_ids:
+                    chosen[item.sentence_id] = source_ids[: self.max_sources_per_sentence]
+                    result.resolved_by_fallback += 1
+        result.uncited_low_confidence = len(pending) - result.resolved_by_fallback
+
+        if not chosen:
+            return result
+
+        # Number sources by first appearance in the report
+        numbers: dict[int, int] = {}
+        for sentence_id in sorted(chosen):
+            for source_id in chosen[sentence_id]:
+                numbers.setdefault(source_id, len(numbers) + 1)
+
+        lines = report.split("\n")
+        for sentence_id in sorted(chosen, reverse=True):
+            sentence = sentences[sentence_id]
+            marker = ", ".join(str(n) for n in sorted(numbers[s] for s in chosen[sentence_id]))
+            line = lines[sentence.line]
+            lines[sentence.line] = (
+                f"{line[: sentence.insert_at]} [{marker}]{line[sentence.insert_at :]}"
+            )
+
+        result.references = [
+            self.sources[source_id].label
+            for source_id, _ in sorted(numbers.items(), key=lambda item: item[1])
+        ]
+        reference_lines = "\n".join(
+            f"[{number}] {label}" for number, label in enumerate(result.references, 1)
+        )
+        text = "\n".join(lines).rstrip("\n")
+        result.text = f"{text}\n\n## References\n\n{reference_lines}\n"
+        return result
+
+
+def has_references(report: str) -> bool:
+    """Check whether a report already ends with a References/Sources section."""
+    return any(REFERENCES_HEADING_RE.match(line.strip()) for line in report.split("\n"))
@@ -0,0 +1,100 @@
+"""
+LLM fallback for low-confidence citation matches.
+
+Only the uncertain sentences and their top candidate passages are sent to the
+model, in batches, instead of the whole report and every source document.
+"""
+
+import logging
+import re
+
+from strands import Agent
+
+from deepresearch.citations.engine import PendingSentence
+from deepresearch.prompts.citations_agent import CITATION_FALLBACK_PROMPT
+
+logger = logging.getLogger("deepsearch.citations")
+
+_REPLY_LINE_RE = re.compile(r"^\s*(\d+)\s*:\s*(.+?)\s*$")
+
+
+def build_fallback_request(pending: list[PendingSentence], passage_chars: int = 600) -> str:
+    """
+    Render low-confidence sentences and their candidates for the model.
+
+    Args:
+        pending: Sentences to decide.
+        passage_chars: Maximum characters per candidate passage.
+
+    Returns:
+        Prompt text.
+    """
+    blocks = []
+    for item in pending:
+        candidates = "\n".join(
+            f'<candidate source="{candidate.source_id}">'
+            f"{candidate.passage[:passage_chars]}</candidate>"
+            for candidate in item.candidates
+        )
+        blocks.append(
+            f'<sentence id="{item.sentence_id}">{item.text}</sentence>\n{candidates}'
+        )
+    return "\n\n".join(blocks)
+
+
+def parse_fallback_reply(reply: str) -> dict[int, list[int]]:
+    """
+    Parse `<sentence id>: <source ids>` lines.
+
+    Args:
+        reply: Model reply.
+
+    Returns:
+        Dictionary mapping sentence ids to chosen source ids.
+    """
+    decisions = {}
+    for line in reply.splitlines():
+        match = _REPLY_LINE_RE.match(line)
+        if not match:
+            continue
+        decisions[int(match.group(1))] = [
+            int(value) for value in re.findall(r"\d+", match.group(2))
+        ]
+    return decisions
+
+
+class LLMCitationResolver:
+    """Resolves low-confidence sentences with a model, batch by batch."""
+
+    def __init__(self, model, batch_size: int = 30):
+        """
+        Initialize the resolver.
+
+        Args:
+            model: Strands model used for the decisions.
+            batch_size: Sentences sent per model call.
+        """
+        self.model = model
+        self.batch_size = batch_size
+        self.usage = {"calls": 0, "inputTokens": 0, "outputTokens": 0}
+
+    def __call__(self, pending: list[PendingSentence]) -> dict[int, list[int]]:
+        decisions: dict[int, list[int]] = {}
+        for start in range(0, len(pending), self.batch_size):
+            batch = pending[start : start + self.batch_size]
+            agent = Agent(
+                model=self.model,
+                system_prompt=CITATION_FALLBACK_PROMPT,
+                callback_handler=None,
+            )
+            try:
+                result = agent(build_fallback_request(batch))
+            except Exception as e:
+                logger.warning(f"Citation fallback failed, leaving {len(batch)} sentences uncited: {e}")
+                continue
+            usage = result.metrics.accumulated_usage
+            self.usage["calls"] += 1
+            self.usage["inputTokens"] += usage.get("inputTokens", 0)
+            self.usage["outputTokens"] += usage.get("outputTokens", 0)
+            decisions.update(parse_fallback_reply(str(result)))
+        return decisions
@@ -0,0 +1,158 @@
+"""
+Lexical index over source documents for citation matching.
+
+Sources are split into overlapping word-window passages and indexed with
+BM25. Candidates found by BM25 are then scored with an IDF-weighted term and
+bigram-shingle coverage, which is bounded to [0, 1] and so can be compared
+against fixed confidence thresholds.
+"""
+
+import math
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+
+from deepresearch.utils.text import tokenize
+
+
+def shingles(tokens: list[str]) -> set[tuple[str, str]]:
+    """Adjacent token pairs (2-shingles) of a token list."""
+    return set(zip(tokens, tokens[1:]))
+
+
+@dataclass
+class Passage:
+    """
+    A window of a source document.
+
+    Attributes:
+        source_id: Index of the source the passage belongs to.
+        text: Passage text.
+        tokens: Content tokens of the passage.
+    """
+
+    source_id: int
+    text: str
+    tokens: list[str]
+    term_set: set[str] = field(init=False)
+    shingle_set: set[tuple[str, str]] = field(init=False)
+
+    def __post_init__(self):
+        self.term_set = set(self.tokens)
+        self.shingle_set = shingles(self.tokens)
+
+
+def split_passages(text: str, window: int = 80, stride: int = 40) -> list[str]:
+    """
+    Split text into overlapping word windows.
+
+    Args:
+        text: Source text.
+        window: Words per passage.
+        stride: Words between passage starts.
+
+    Returns:
+        Passage texts; a single passage for short texts.
+    """
+    words = text.split()
+    if len(words) <= window:
+        return [" ".join(words)] if words else []
+    return [
+        " ".join(words[start : start + window])
+        for start in range(0, len(words) - window + stride, stride)
+    ]
+
+
+class BM25Index:
+    """BM25 index over source passages."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """
+        Initialize an empty index.
+
+        Args:
+            k1: Term frequency saturation.
+            b: Length normalization strength.
+        """
+        self.k1 = k1
+        self.b = b
+        self.passages: list[Passage] = []
+        self._postings: dict[str, dict[int, int]] = defaultdict(dict)
+        self._total_length = 0
+
+    def add_source(self, source_id: int, text: str) -> None:
+        """
+        Index a source document as overlapping passages.
+
+        Args:
+            source_id: Index of the source.
+            text: Source text.
+        """
+        for passage_text in split_passages(text):
+            tokens = tokenize(passage_text)
+            if not tokens:
+                continue
+            passage_id = len(self.passages)
+            self.passages.append(Passage(source_id, passage_text, tokens))
+            self._total_length += len(tokens)
+            for term, count in Counter(tokens).items():
+                self._postings[term][passage_id] = count
+
+    def idf(self, term: str) -> float:
+        """BM25 inverse document frequency of a term (0 for unknown terms)."""
+        df = len(self._postings.get(term, ()))
+        if df == 0:
+            return 0.0
+        n = len(self.passages)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def search(self, tokens: list[str], top_k: int = 5) -> list[tuple[Passage, float]]:
+        """
+        Rank passages against query tokens.
+
+        Args:
+            tokens: Query tokens.
+            top_k: Number of passages returned.
+
+        Returns:
+            (passage, bm25 score) pairs, best first.
+        """
+        if not self.passages:
+            return []
+        avg_length = self._total_length / len(self.passages)
+        scores: dict[int, float] = defaultdict(float)
+        for term in set(tokens):
+            idf = self.idf(term)
+            for passage_id, tf in self._postings.get(term, {}).items():
+                length = len(self.passages[passage_id].tokens)
+                norm = self.k1 * (1 - self.b + self.b * length / avg_length)
+                scores[passage_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return [(self.passages[pid], score) for pid, score in ranked[:top_k]]
+
+    def coverage(self, tokens: list[str], passage: Passage) -> float:
+        """
+        Confidence that a passage supports a sentence.
+
+        Blends the IDF-weighted share of the sentence's terms found in the
+        passage with the share of its 2-shingles found there.
+
+        Args:
+            tokens: Sentence tokens.
+            passage: Candidate passage.
+
+        Returns:
+            Score between 0 and 1.
+        """
+        terms = set(tokens)
+        # Terms absent from every source weigh like a moderately rare term
+        unknown_weight = 0.5 * math.log(1 + (len(self.passages) - 0.5) / 1.5)
+        weights = {term: self.idf(term) or unknown_weight for term in terms}
+        total = sum(weights.values())
+        if total == 0:
+            return 0.0
+        unigram = sum(w for term, w in weights.items() if term in passage.term_set) / total
+        sentence_shingles = shingles(tokens)
+        if not sentence_shingles:
+            return unigram
+        bigram = len(sentence_shingles & passage.shingle_set) / len(sentence_shingles)
+        return 0.7 * unigram + 0.3 * bigram
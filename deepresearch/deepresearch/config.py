@@ -9,6 +9,9 @@ API Rate Limit: 10 queries per second
 
 import os
 
+# Default spacing between search API calls (see rate limit notes above)
+DEFAULT_MIN_TIME_BETWEEN_CALLS = 0.15
+
 
 def is_memory_enabled() -> bool:
     """Check if AgentCore memory is enabled via environment variable."""
@@ -38,3 +41,510 @@ def get_memory_config(session_id: str) -> dict[str, str] | None:
         "actor_id": os.environ.get("AGENTCORE_ACTOR_ID", "deepsearch-agent"),
         "region_name": os.environ.get("AWS_REGION"),
     }
+
+
+def get_search_cache_config() -> dict:
+    """
+    Get search result cache configuration from environment variables.
+
+    Environment variables:
+        SEARCH_CACHE_ENABLED: "true" (default) or "false".
+        SEARCH_CACHE_TTL_SECONDS: Entry lifetime in seconds (default: 86400).
+        SEARCH_CACHE_MAX_ENTRIES: In-process LRU size (default: 1024).
+        SEARCH_CACHE_PATH: SQLite file for the on-disk tier (disabled if unset).
+        SEARCH_CACHE_MAX_DISK_ENTRIES: On-disk LRU size (default: 50000).
+
+    Returns:
+        Dictionary with search cache configuration.
+    """
+    return {
+        "enabled": os.environ.get("SEARCH_CACHE_ENABLED", "true").lower() == "true",
+        "ttl_seconds": float(os.environ.get("SEARCH_CACHE_TTL_SECONDS", "86400")),
+        "max_entries": int(os.environ.get("SEARCH_CACHE_MAX_ENTRIES", "1024")),
+        "disk_path": os.environ.get("SEARCH_CACHE_PATH") or None,
+        "max_disk_entries": int(
+            os.environ.get("SEARCH_CACHE_MAX_DISK_ENTRIES", "50000")
+        ),
+    }
+
+
+def get_http_pool_config() -> dict:
+    """
+    Get HTTP connection pool configuration for search provider clients.
+
+    Environment variables:
+        SEARCH_HTTP_MAX_CONNECTIONS: Maximum open connections per provider (default: 20).
+        SEARCH_HTTP_MAX_KEEPALIVE: Maximum idle keep-alive connections (default: 10).
+        SEARCH_HTTP_KEEPALIVE_EXPIRY: Seconds before an idle connection is closed (default: 30).
+        SEARCH_HTTP_TIMEOUT_SECONDS: Connect, read and write timeout of provider
+            requests (default: 30).
+
+    Returns:
+        Dictionary with connection pool configuration.
+    """
+    return {
+        "max_connections": int(os.environ.get("SEARCH_HTTP_MAX_CONNECTIONS", "20")),
+        "max_keepalive_connections": int(
+            os.environ.get("SEARCH_HTTP_MAX_KEEPALIVE", "10")
+        ),
+        "keepalive_expiry": float(
+            os.environ.get("SEARCH_HTTP_KEEPALIVE_EXPIRY", "30")
+        ),
+        "timeout": float(os.environ.get("SEARCH_HTTP_TIMEOUT_SECONDS", "30")),
+    }
+
+
+def get_rate_limit_config(provider: str) -> dict[str, float]:
+    """
+    Get token-bucket rate limit configuration for a search provider.
+
+    Provider-specific variables take precedence over the global ones, e.g.
+    LINKUP_RATE_LIMIT_QPS overrides SEARCH_RATE_LIMIT_QPS for Linkup.
+
+    Environment variables:
+        {PROVIDER}_RATE_LIMIT_QPS / SEARCH_RATE_LIMIT_QPS: Sustained queries per
+            second (default: 1 / DEFAULT_MIN_TIME_BETWEEN_CALLS, ~6.67).
+        {PROVIDER}_RATE_LIMIT_BURST / SEARCH_RATE_LIMIT_BURST: Bucket capacity,
+            i.e. how many calls may be issued back to back (default: 1).
+
+    Args:
+        provider: Search provider name (e.g. "linkup").
+
+    Returns:
+        Dictionary with 'qps' and 'burst' keys.
+    """
+    prefix = provider.upper()
+    qps = os.environ.get(f"{prefix}_RATE_LIMIT_QPS") or os.environ.get(
+        "SEARCH_RATE_LIMIT_QPS", str(1 / DEFAULT_MIN_TIME_BETWEEN_CALLS)
+    )
+    burst = os.environ.get(f"{prefix}_RATE_LIMIT_BURST") or os.environ.get(
+        "SEARCH_RATE_LIMIT_BURST", "1"
+    )
+    return {"qps": float(qps), "burst": float(burst)}
+
+
+def get_subagent_concurrency_config() -> dict:
+    """
+    Get research subagent concurrency configuration.
+
+    Environment variables:
+        PARALLEL_SUBAGENTS: "true" to run independent subagent tasks
+            concurrently, "false" (default) to run them one at a time.
+        MAX_CONCURRENT_SUBAGENTS: Maximum subagents running at once in
+            parallel mode (default: 4).
+
+    Returns:
+        Dictionary with 'parallel' and 'max_concurrent_subagents' keys.
+    """
+    return {
+        "parallel": os.environ.get("PARALLEL_SUBAGENTS", "false").lower() == "true",
+        "max_concurrent_subagents": int(
+            os.environ.get("MAX_CONCURRENT_SUBAGENTS", "4")
+        ),
+    }
+
+
+def get_subagent_supervision_config() -> dict:
+    """
+    Get retry and budget settings for supervised subagent runs.
+
+    Environment variables:
+        SUBAGENT_MAX_RETRIES: Retries of a subagent after transient errors (default: 2).
+        SUBAGENT_RETRY_BASE_SECONDS: Upper bound of the first backoff delay (default: 1).
+        SUBAGENT_RETRY_MAX_SECONDS: Cap on backoff delays (default: 20).
+        SUBAGENT_TIMEOUT_SECONDS: Wall-clock budget per subagent, retries
+            included (default: 600; 0 disables).
+        SUBAGENT_MAX_TOOL_CALLS: Tool calls per subagent attempt (default: 40; 0 disables).
+        SUBAGENT_WRAPUP_TURNS: Model turns a subagent gets to write its
+            findings once a budget is spent (default: 2).
+
+    Returns:
+        Dictionary with max_retries, retry_base_seconds, retry_max_seconds,
+        timeout_seconds, max_tool_calls and wrapup_turns.
+    """
+    return {
+        "max_retries": int(os.environ.get("SUBAGENT_MAX_RETRIES", "2")),
+        "retry_base_seconds": float(os.environ.get("SUBAGENT_RETRY_BASE_SECONDS", "1")),
+        "retry_max_seconds": float(os.environ.get("SUBAGENT_RETRY_MAX_SECONDS", "20")),
+        "timeout_seconds": float(os.environ.get("SUBAGENT_TIMEOUT_SECONDS", "600")),
+        "max_tool_calls": int(os.environ.get("SUBAGENT_MAX_TOOL_CALLS", "40")),
+        "wrapup_turns": int(os.environ.get("SUBAGENT_WRAPUP_TURNS", "2")),
+    }
+
+
+def get_search_routing_config() -> dict:
+    """
+    Get search provider routing configuration.
+
+    Environment variables:
+        SEARCH_PROVIDERS: Comma-separated provider names to route between
+            (default: "linkup"; e.g. "linkup,tavily").
+        SEARCH_HEDGING: "true" to fire a second provider when the first is slower
+            than its p95 latency (default: "false").
+        SEARCH_HEDGE_MIN_DELAY: Lower bound on the hedge delay in seconds (default: 0.5).
+        SEARCH_ROUTER_WINDOW: Number of recent calls tracked per provider (default: 100).
+        SEARCH_CIRCUIT_FAILURES: Consecutive failures that open a provider's
+            circuit breaker (default: 3).
+        SEARCH_CIRCUIT_COOLDOWN_SECONDS: Seconds before an open circuit lets a
+            trial request through (default: 30).
+
+    Returns:
+        Dictionary with search routing configuration.
+    """
+    providers = os.environ.get("SEARCH_PROVIDERS", "linkup")
+    return {
+        "providers": [name.strip() for name in providers.split(",") if name.strip()],
+        "hedging": os.environ.get("SEARCH_HEDGING", "false").lower() == "true",
+        "hedge_min_delay": float(os.environ.get("SEARCH_HEDGE_MIN_DELAY", "0.5")),
+        "window": int(os.environ.get("SEARCH_ROUTER_WINDOW", "100")),
+        "failure_threshold": int(os.environ.get("SEARCH_CIRCUIT_FAILURES", "3")),
+        "cooldown_seconds": float(
+            os.environ.get("SEARCH_CIRCUIT_COOLDOWN_SECONDS", "30")
+        ),
+    }
+
+
+def get_search_batch_max_queries() -> int:
+    """
+    Get the maximum number of distinct queries per batch search call.
+
+    Environment variables:
+        SEARCH_BATCH_MAX_QUERIES: Maximum queries per batch (default: 10).
+
+    Returns:
+        Maximum number of queries searched per batch.
+    """
+    return int(os.environ.get("SEARCH_BATCH_MAX_QUERIES", "10"))
+
+
+def get_search_timeout() -> float | None:
+    """
+    Get the time a sync caller waits for a search on the search event loop.
+
+    Environment variables:
+        SEARCH_TIMEOUT_SECONDS: Maximum seconds per search call, rate limiter
+            waits and failover included (default: 120; 0 disables).
+
+    Returns:
+        Timeout in seconds, or None for no timeout.
+    """
+    timeout = float(os.environ.get("SEARCH_TIMEOUT_SECONDS", "120"))
+    return timeout if timeout > 0 else None
+
+
+def get_query_dedup_config() -> dict:
+    """
+    Get configuration for near-duplicate search suppression.
+
+    Environment variables:
+        QUERY_DEDUP_ENABLED: Serve near-duplicate queries of a session from
+            its earlier or in-flight searches (default: true).
+        QUERY_DEDUP_THRESHOLD: Estimated Jaccard similarity of the canonical
+            query terms from which two queries are duplicates (default: 0.8).
+        QUERY_DEDUP_MAX_QUERIES: Searches remembered per session (default: 1000).
+
+    Returns:
+        Dictionary with enabled, threshold and max_queries.
+    """
+    return {
+        "enabled": os.environ.get("QUERY_DEDUP_ENABLED", "true").lower() == "true",
+        "threshold": float(os.environ.get("QUERY_DEDUP_THRESHOLD", "0.8")),
+        "max_queries": int(os.environ.get("QUERY_DEDUP_MAX_QUERIES", "1000")),
+    }
+
+
+def get_source_store_config() -> dict:
+    """
+    Get configuration for source documents saved by the search tools and the
+    character budgets of the results they return.
+
+    The budgets only apply when sources are saved, since the full text is
+    then in the source documents.
+
+    Environment variables:
+        SEARCH_SAVE_SOURCES: Search tools write source documents themselves
+            and return handles and snippets (default: true).
+        SEARCH_SOURCE_SNIPPET_CHARS: Snippet length shown per source (default: 300).
+        SEARCH_ANSWER_CHARS: Length of the provider's answer shown (default: 1500).
+        SEARCH_RESULT_MAX_CHARS: Characters of answer and snippets per result;
+            sources past it are listed without a snippet (default: 3000).
+
+    Returns:
+        Dictionary with enabled, snippet_chars, answer_chars and max_chars.
+    """
+    return {
+        "enabled": os.environ.get("SEARCH_SAVE_SOURCES", "true").lower() == "true",
+        "snippet_chars": int(os.environ.get("SEARCH_SOURCE_SNIPPET_CHARS", "300")),
+        "answer_chars": int(os.environ.get("SEARCH_ANSWER_CHARS", "1500")),
+        "max_chars": int(os.environ.get("SEARCH_RESULT_MAX_CHARS", "3000")),
+    }
+
+
+def get_citation_config() -> dict:
+    """
+    Get configuration for the citation stage.
+
+    Environment variables:
+        CITATION_MODE: "local" for the deterministic citation engine with LLM
+            fallback, "agent" for the LLM citations agent (default: local).
+        CITATION_MIN_CONFIDENCE: Match confidence cited without the LLM (default: 0.55).
+        CITATION_FALLBACK_MIN_CONFIDENCE: Lowest confidence sent to the LLM
+            fallback; weaker matches stay uncited (default: 0.3).
+        CITATION_LLM_FALLBACK: Use the LLM for low-confidence sentences (default: true).
+        CITATION_MAX_SOURCES_PER_SENTENCE: Maximum sources cited per sentence (default: 2).
+
+    Returns:
+        Dictionary with mode, min_confidence, fallback_min_confidence,
+        llm_fallback and max_sources_per_sentence.
+    """
+    return {
+        "mode": os.environ.get("CITATION_MODE", "local").lower(),
+        "min_confidence": float(os.environ.get("CITATION_MIN_CONFIDENCE", "0.55")),
+        "fallback_min_confidence": float(
+            os.environ.get("CITATION_FALLBACK_MIN_CONFIDENCE", "0.3")
+        ),
+        "llm_fallback": os.environ.get("CITATION_LLM_FALLBACK", "true").lower() == "true",
+        "max_sources_per_sentence": int(
+            os.environ.get("CITATION_MAX_SOURCES_PER_SENTENCE", "2")
+        ),
+    }
+
+
+def get_workspace_config() -> dict:
+    """
+    Get configuration for per-session workspaces in the runtime.
+
+    Environment variables:
+        SESSION_WORKSPACES: Give each runtime session its own directory (default: true).
+        SESSION_WORKSPACE_ROOT: Base directory for workspaces (default: system temp dir).
+        SESSION_WORKSPACE_MAX_MB: Per-session size quota in MB, 0 for none (default: 500).
+        SESSION_WORKSPACE_TTL_SECONDS: Remove workspaces unused for this long,
+            0 to keep them (default: 86400).
+        SESSION_WORKSPACE_CLEANUP_AFTER_UPLOAD: Remove a workspace once all its
+            outputs are uploaded to S3 (default: false).
+
+    Returns:
+        Dictionary with enabled, root, max_bytes, ttl_seconds and cleanup_after_upload.
+    """
+    max_mb = float(os.environ.get("SESSION_WORKSPACE_MAX_MB", "500"))
+    ttl_seconds = float(os.environ.get("SESSION_WORKSPACE_TTL_SECONDS", "86400"))
+    return {
+        "enabled": os.environ.get("SESSION_WORKSPACES", "true").lower() == "true",
+        "root": os.environ.get("SESSION_WORKSPACE_ROOT") or None,
+        "max_bytes": int(max_mb * 1024 * 1024) if max_mb > 0 else None,
+        "ttl_seconds": ttl_seconds if ttl_seconds > 0 else None,
+        "cleanup_after_upload": os.environ.get(
+            "SESSION_WORKSPACE_CLEANUP_AFTER_UPLOAD", "false"
+        ).lower()
+        == "true",
+    }
+
+
+def get_s3_upload_config() -> dict:
+    """
+    Get configuration for uploading outputs to S3.
+
+    Environment variables:
+        S3_UPLOAD_MAX_WORKERS: Files uploaded concurrently (default: 16).
+        S3_MAX_POOL_CONNECTIONS: HTTP connections kept by the shared S3 client
+            (default: S3_UPLOAD_MAX_WORKERS).
+        S3_MULTIPART_THRESHOLD_MB: Size from which files use multipart upload (default: 8).
+        S3_MULTIPART_CHUNKSIZE_MB: Multipart part size (default: 8).
+
+    Returns:
+        Dictionary with max_workers, max_pool_connections,
+        multipart_threshold and multipart_chunksize (bytes).
+    """
+    max_workers = int(os.environ.get("S3_UPLOAD_MAX_WORKERS", "16"))
+    return {
+        "max_workers": max_workers,
+        "max_pool_connections": int(
+            os.environ.get("S3_MAX_POOL_CONNECTIONS", str(max_workers))
+        ),
+        "multipart_threshold": int(
+            float(os.environ.get("S3_MULTIPART_THRESHOLD_MB", "8")) * 1024 * 1024
+        ),
+        "multipart_chunksize": int(
+            float(os.environ.get("S3_MULTIPART_CHUNKSIZE_MB", "8")) * 1024 * 1024
+        ),
+    }
+
+
+def get_checkpoint_config() -> dict:
+    """
+    Get configuration for checkpointing research runs and resuming them.
+
+    Environment variables:
+        CHECKPOINTS_ENABLED: "true" (default) writes a checkpoint after every
+            conversation and subagent step; "false" retries from scratch.
+        CHECKPOINT_MAX_RESUMES: Automatic resumes after transient errors (default: 2).
+        CHECKPOINT_RETRY_DELAY_SECONDS: Wait before resuming (default: 5).
+
+    Returns:
+        Dictionary with enabled, max_resumes and retry_delay.
+    """
+    return {
+        "enabled": os.environ.get("CHECKPOINTS_ENABLED", "true").lower() == "true",
+        "max_resumes": int(os.environ.get("CHECKPOINT_MAX_RESUMES", "2")),
+        "retry_delay": float(os.environ.get("CHECKPOINT_RETRY_DELAY_SECONDS", "5")),
+    }
+
+
+def get_secrets_refresh_config() -> dict:
+    """
+    Get configuration for loading and refreshing Secrets Manager values.
+
+    Environment variables:
+        SECRETS_REFRESH_SECONDS: Time between background refreshes of the
+            secrets in SECRETS_CONFIG (default: 3600; 0 disables refresh).
+        SECRETS_MAX_WORKERS: Secrets fetched concurrently (default: 8).
+
+    Returns:
+        Dictionary with refresh_seconds and max_workers.
+    """
+    return {
+        "refresh_seconds": float(os.environ.get("SECRETS_REFRESH_SECONDS", "3600")),
+        "max_workers": int(os.environ.get("SECRETS_MAX_WORKERS", "8")),
+    }
+
+
+def get_output_sync_config() -> dict:
+    """
+    Get configuration for syncing outputs to S3 while the agent runs.
+
+    Environment variables:
+        OUTPUTS_SYNC: "true" (default) uploads source documents and findings
+            as they are written; "false" uploads everything after the run.
+        OUTPUTS_SYNC_INTERVAL_SECONDS: Workspace polling interval (default: 2).
+
+    Returns:
+        Dictionary with enabled and interval_seconds.
+    """
+    return {
+        "enabled": os.environ.get("OUTPUTS_SYNC", "true").lower() == "true",
+        "interval_seconds": float(os.environ.get("OUTPUTS_SYNC_INTERVAL_SECONDS", "2")),
+    }
+
+
+def get_output_format() -> str:
+    """
+    Get the storage format for intermediate research documents in S3.
+
+    Environment variables:
+        OUTPUTS_FORMAT: "files" (default) uploads each source document as its
+            own object; "archive" packs them into one compressed archive plus
+            an index per session.
+
+    Returns:
+        "files" or "archive".
+    """
+    output_format = os.environ.get("OUTPUTS_FORMAT", "files").lower()
+    return output_format if output_format in ("files", "archive") else "files"
+
+
+def get_performance_config() -> dict:
+    """
+    Get configuration for the per-run performance summary and metrics.
+
+    Environment variables:
+        PERFORMANCE_SUMMARY: "true" (default) records model, tool and upload
+            timings of every run and writes performance_summary.json with
+            its outputs.
+        PERFORMANCE_METRICS: "true" (default) exports the timings as OTEL
+            metrics when telemetry uses an OTLP collector. Langfuse only
+            ingests traces, so metrics are not sent to its endpoint.
+
+    Returns:
+        Dictionary with summary and metrics flags.
+    """
+    return {
+        "summary": os.environ.get("PERFORMANCE_SUMMARY", "true").lower() == "true",
+        "metrics": os.environ.get("PERFORMANCE_METRICS", "true").lower() == "true",
+    }
+
+
+def get_findings_digest_config() -> dict:
+    """
+    Get configuration for the lead agent's findings digest.
+
+    Environment variables:
+        FINDINGS_DIGEST_ENABLED: Give the lead read_findings_digest to read
+            all findings files as one bounded digest (default: true).
+        FINDINGS_DIGEST_MAX_CHARS: Length of the whole digest (default: 20000).
+        FINDINGS_DIGEST_FINDING_CHARS: Summary length per findings file (default: 1200).
+        FINDINGS_DIGEST_CLUSTER_CHARS: Summary length per cluster of related
+            findings (default: 2000).
+        FINDINGS_DIGEST_CLUSTER_SIMILARITY: Minimum TF-IDF cosine similarity
+            for a findings file to join a cluster (default: 0.2).
+
+    Returns:
+        Dictionary with enabled, max_chars, finding_chars, cluster_chars and
+        similarity.
+    """
+    return {
+        "enabled": os.environ.get("FINDINGS_DIGEST_ENABLED", "true").lower() == "true",
+        "max_chars": int(os.environ.get("FINDINGS_DIGEST_MAX_CHARS", "20000")),
+        "finding_chars": int(os.environ.get("FINDINGS_DIGEST_FINDING_CHARS", "1200")),
+        "cluster_chars": int(os.environ.get("FINDINGS_DIGEST_CLUSTER_CHARS", "2000")),
+        "similarity": float(
+            os.environ.get("FINDINGS_DIGEST_CLUSTER_SIMILARITY", "0.2")
+        ),
+    }
+
+
+def get_lead_compaction_config() -> dict:
+    """
+    Get the context compaction policy of the lead agent's conversation.
+
+    Environment variables:
+        LEAD_COMPACTION_ENABLED: Compact the lead's conversation (default: true).
+        LEAD_KEEP_RECENT_MESSAGES: Latest messages never compacted (default: 6).
+        LEAD_COMPACT_RESULT_CHARS: Older tool results and file_write contents
+            above this length are replaced by an extractive summary of this
+            length (default: 1500).
+        LEAD_MAX_CONTEXT_CHARS: Conversation size above which every message but
+            the newest is compacted (default: 200000).
+        LEAD_WINDOW_SIZE: Messages kept by the sliding window when compaction
+            is not enough (default: 40).
+
+    Returns:
+        Dictionary with enabled, keep_recent_messages, result_chars,
+        max_context_chars and window_size.
+    """
+    return {
+        "enabled": os.environ.get("LEAD_COMPACTION_ENABLED", "true").lower() == "true",
+        "keep_recent_messages": int(os.environ.get("LEAD_KEEP_RECENT_MESSAGES", "6")),
+        "result_chars": int(os.environ.get("LEAD_COMPACT_RESULT_CHARS", "1500")),
+        "max_context_chars": int(os.environ.get("LEAD_MAX_CONTEXT_CHARS", "200000")),
+        "window_size": int(os.environ.get("LEAD_WINDOW_SIZE", "40")),
+    }
+
+
+def get_knowledge_store_config() -> dict:
+    """
+    Get configuration for the cross-session research knowledge store.
+
+    Environment variables:
+        KNOWLEDGE_STORE_PATH: SQLite file indexing the findings and sources of
+            completed runs (disabled if unset).
+        KNOWLEDGE_MAX_AGE_DAYS: Default age limit of passages returned by
+            lookup_prior_research (default: 30).
+        KNOWLEDGE_RETENTION_DAYS: Passages older than this are deleted
+            (default: 180).
+        KNOWLEDGE_MAX_RESULTS: Passages returned per lookup (default: 5).
+        KNOWLEDGE_EMBEDDING_MODEL: sentence-transformers model for the vector
+            index, e.g. "all-MiniLM-L6-v2" (keyword lookups only if unset).
+        KNOWLEDGE_MIN_SIMILARITY: Minimum cosine similarity of vector
+            matches (default: 0.5).
+
+    Returns:
+        Dictionary with knowledge store configuration.
+    """
+    return {
+        "path": os.environ.get("KNOWLEDGE_STORE_PATH") or None,
+        "max_age_days": float(os.environ.get("KNOWLEDGE_MAX_AGE_DAYS", "30")),
+        "retention_days": float(os.environ.get("KNOWLEDGE_RETENTION_DAYS", "180")),
+        "max_results": int(os.environ.get("KNOWLEDGE_MAX_RESULTS", "5")),
+        "embedding_model": os.environ.get("KNOWLEDGE_EMBEDDING_MODEL") or None,
+        "min_similarity": float(os.environ.get("KNOWLEDGE_MIN_SIMILARITY", "0.5")),
+    }
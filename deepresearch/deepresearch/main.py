@@ -8,17 +8,58 @@ This example demonstrates a sophisticated research agent architecture with:
 """
 
 import argparse
+import json
 import logging
 import os
-import time
-
+from dataclasses import dataclass
+from typing import Any
+
+from .config import (
+    get_checkpoint_config,
+    get_citation_config,
+    get_findings_digest_config,
+    get_knowledge_store_config,
+    get_lead_compaction_config,
+    get_performance_config,
+    get_source_store_config,
+    get_subagent_concurrency_config,
+    get_subagent_supervision_config,
+)
 from .prompts.citations_agent import CITATIONS_AGENT_PROMPT
-from .prompts.research_lead import RESEARCH_LEAD_PROMPT
-from .prompts.research_subagent import RESEARCH_SUBAGENT_PROMPT
-from strands.types.exceptions import EventLoopException
-from strands_tools import file_read, file_write
-from .tools import internet_search
-from urllib3.exceptions import ProtocolError
+from .prompts.research_lead import (
+    CITATION_TOOL_FINAL_STEP,
+    CITATION_TOOL_STEP,
+    CITATIONS_AGENT_FINAL_STEP,
+    CITATIONS_AGENT_STEP,
+    DIGEST_FINDINGS_STEP,
+    FILE_READ_FINDINGS_STEP,
+    PRIOR_RESEARCH_LEAD_SECTION,
+    RESEARCH_LEAD_PROMPT,
+)
+from .prompts.research_subagent import (
+    AUTOMATIC_SOURCE_DOCUMENTS_SECTION,
+    BATCH_SEARCH_PROMPT_SECTION,
+    MANUAL_SOURCE_DOCUMENTS_SECTION,
+    PRIOR_RESEARCH_PROMPT_SECTION,
+    RESEARCH_SUBAGENT_PROMPT,
+)
+from .tools import internet_search, internet_search_batch
+from .tools.citations import create_citation_tool
+from .tools.findings_digest import read_findings_digest
+from .tools.parallel_task import limit_subagent_concurrency
+from .tools.supervised_task import supervise_subagents
+from .tools.workspace_files import file_read, file_write, use_workspace_file_tools
+from .utils.checkpoint import CheckpointStore, run_with_checkpoints
+from .utils.compaction import CompactingConversationManager
+from .utils.events import track_subagents
+from .utils.performance import (
+    LEAD_AGENT,
+    PERFORMANCE_SUMMARY_NAME,
+    PerformanceHooks,
+    PerformanceRecorder,
+    bind_performance_recorder,
+)
+from .utils.retry import is_retryable_error
 
 from strands_deep_agents import SubAgent, create_deep_agent
 from strands_deep_agents.ai_models import basic_claude_haiku_4_5, get_default_model
@@ -40,7 +81,33 @@ strands_logger.setLevel(logging.WARNING)  # Reduce noise
 deepagents_logger = logging.getLogger("strands_deep_agents")
 deepagents_logger.setLevel(logging.INFO)  # Reduce from DEBUG
 
-print(f"Logging to: {log_file}")
+
+@dataclass(frozen=True)
+class AgentBlueprint:
+    """
+    Immutable parts of the DeepSearch agent, built once and shared by every agent.
+
+    Attributes:
+        lead_prompt: Formatted research lead instructions.
+        subagents: Subagent definitions (prompts, tools and model clients).
+        lead_tools: Tools of the research lead besides the deep agent defaults.
+        lead_model: Model client of the research lead.
+        parallel_subagents: Run independent subagent tasks concurrently.
+        max_concurrent_subagents: Cap on concurrently running subagents.
+        supervision: Subagent retry and budget settings
+            (see get_subagent_supervision_config).
+        compaction: Context compaction policy of the lead's conversation
+            (see get_lead_compaction_config).
+    """
+
+    lead_prompt: str
+    subagents: tuple[Any, ...]
+    lead_tools: tuple[Any, ...]
+    lead_model: Any
+    parallel_subagents: bool
+    max_concurrent_subagents: int
+    supervision: dict
+    compaction: dict
 
 
 def create_deepsearch_agent(
@@ -48,6 +115,14 @@ def create_deepsearch_agent(
     tool_name: str | None = None,
     session_manager=None,
     session_id: str | None = None,
+    parallel_subagents: bool | None = None,
+    max_concurrent_subagents: int | None = None,
+    lead_model=None,
+    subagent_model=None,
+    citations_model=None,
+    batch_research_tool=None,
+    research_tool_saves_sources: bool = False,
+    citation_mode: str | None = None,
 ):
     """
     Create a DeepSearch agent with research capabilities.
@@ -57,10 +132,66 @@ def create_deepsearch_agent(
         tool_name: Name of the tool to use in prompts (auto-detected if not provided).
         session_manager: Optional session manager for memory integration.
         session_id: Optional session ID for tracing/telemetry.
+        parallel_subagents: Run independent subagent tasks concurrently.
+            Defaults to the PARALLEL_SUBAGENTS environment variable.
+        max_concurrent_subagents: Cap on concurrently running subagents in parallel
+            mode. Defaults to the MAX_CONCURRENT_SUBAGENTS environment variable.
+        lead_model: Optional model override for the research lead.
+        subagent_model: Optional model override for research subagents.
+        citations_model: Optional model override for the citations agent.
+        batch_research_tool: Optional multi-query variant of research_tool given to
+            research subagents alongside it (e.g. internet_search_batch).
+        research_tool_saves_sources: The research tools write source documents
+            themselves (internet_search with SEARCH_SAVE_SOURCES), so subagents
+            are told not to save them with file_write.
+        citation_mode: "local" gives the lead the add_citations tool (deterministic
+            citation engine, citations_model only for low-confidence sentences),
+            "agent" delegates to the LLM citations agent. Defaults to the
+            CITATION_MODE environment variable.
 
     Returns:
         Configured DeepSearch agent.
     """
+    blueprint = build_agent_blueprint(
+        research_tool,
+        tool_name=tool_name,
+        parallel_subagents=parallel_subagents,
+        max_concurrent_subagents=max_concurrent_subagents,
+        lead_model=lead_model,
+        subagent_model=subagent_model,
+        citations_model=citations_model,
+        batch_research_tool=batch_research_tool,
+        research_tool_saves_sources=research_tool_saves_sources,
+        citation_mode=citation_mode,
+    )
+    return create_agent_from_blueprint(
+        blueprint, session_manager=session_manager, session_id=session_id
+    )
+
+
+def build_agent_blueprint(
+    research_tool,
+    tool_name: str | None = None,
+    parallel_subagents: bool | None = None,
+    max_concurrent_subagents: int | None = None,
+    lead_model=None,
+    subagent_model=None,
+    citations_model=None,
+    batch_research_tool=None,
+    research_tool_saves_sources: bool = False,
+    citation_mode: str | None = None,
+) -> AgentBlueprint:
+    """
+    Build the session-independent parts of a DeepSearch agent.
+
+    Formats the prompts, creates the model clients and assembles the subagent
+    definitions and lead tools. A blueprint can be turned into any number of
+    agents with create_agent_from_blueprint; see create_deepsearch_agent for
+    the arguments.
+
+    Returns:
+        AgentBlueprint shared by the agents created from it.
+    """
     if tool_name is None:
         if hasattr(research_tool, "__name__"):
             tool_name = research_tool.__name__
@@ -69,8 +200,58 @@ def create_deepsearch_agent(
                 "Tool name not provided and could not be auto-detected, pass it as a string"
             )
 
-    lead_prompt = RESEARCH_LEAD_PROMPT.format(internet_tool_name=tool_name)
-    subagent_prompt = RESEARCH_SUBAGENT_PROMPT.format(internet_tool_name=tool_name)
+    citation_config = get_citation_config()
+    if citation_mode is None:
+        citation_mode = citation_config["mode"]
+    if citation_mode not in ("local", "agent"):
+        raise ValueError(f"Unknown citation mode: {citation_mode}")
+
+    if citation_mode == "local":
+        citation_step, final_citation_step = CITATION_TOOL_STEP, CITATION_TOOL_FINAL_STEP
+    else:
+        citation_step, final_citation_step = CITATIONS_AGENT_STEP, CITATIONS_AGENT_FINAL_STEP
+    digest_enabled = get_findings_digest_config()["enabled"]
+    lead_prompt = RESEARCH_LEAD_PROMPT.format(
+        internet_tool_name=tool_name,
+        citation_step=citation_step,
+        final_citation_step=final_citation_step,
+        findings_reading_step=(
+            DIGEST_FINDINGS_STEP if digest_enabled else FILE_READ_FINDINGS_STEP
+        ),
+    )
+    source_section = (
+        AUTOMATIC_SOURCE_DOCUMENTS_SECTION
+        if research_tool_saves_sources
+        else MANUAL_SOURCE_DOCUMENTS_SECTION
+    )
+    subagent_prompt = RESEARCH_SUBAGENT_PROMPT.format(
+        internet_tool_name=tool_name,
+        source_document_management=source_section.format(internet_tool_name=tool_name),
+    )
+
+    # One default model client for every role not overridden
+    default_model = None
+    if lead_model is None or subagent_model is None:
+        default_model = get_default_model()
+
+    subagent_tools = [research_tool, file_write]
+    if batch_research_tool is not None:
+        subagent_prompt += BATCH_SEARCH_PROMPT_SECTION.format(
+            internet_tool_name=tool_name,
+            batch_tool_name=batch_research_tool.tool_name,
+        )
+        subagent_tools.insert(1, batch_research_tool)
+
+    lead_tools = [file_read, file_write]
+    if digest_enabled:
+        lead_tools.append(read_findings_digest)
+    if get_knowledge_store_config()["path"]:
+        from .tools.prior_research import lookup_prior_research
+
+        subagent_prompt += PRIOR_RESEARCH_PROMPT_SECTION.format(internet_tool_name=tool_name)
+        lead_prompt += PRIOR_RESEARCH_LEAD_SECTION
+        subagent_tools.insert(0, lookup_prior_research)
+        lead_tools.append(lookup_prior_research)
 
     research_subagent = SubAgent(
         name="research_subagent",
@@ -82,30 +263,81 @@ def create_deepsearch_agent(
             "Source documents are saved to research_documents_[topic]/ directories for citation purposes."
         ),
         prompt=subagent_prompt,
-        tools=[research_tool, file_write],
-        model=get_default_model(),
+        tools=subagent_tools,
+        model=subagent_model or default_model,
     )
 
-    citations_agent = SubAgent(
-        name="citations_agent",
-        description=(
-            "Specialized agent for adding citations to research reports. "
-            "Use this agent after completing a research report to add proper source citations. "
-            "This agent reads the synthesized report and all source documents from research_documents_[topic]/ directories. "
-            "It then adds proper inline citations and a references section."
-        ),
-        model=basic_claude_haiku_4_5(),
-        prompt=CITATIONS_AGENT_PROMPT,
-        tools=[file_read, file_write],
+    subagents = [research_subagent]
+    if citation_mode == "local":
+        lead_tools.append(
+            create_citation_tool(fallback_model=citations_model or basic_claude_haiku_4_5())
+        )
+    else:
+        subagents.append(
+            SubAgent(
+                name="citations_agent",
+                description=(
+                    "Specialized agent for adding citations to research reports. "
+                    "Use this agent after completing a research report to add proper source citations. "
+                    "This agent reads the synthesized report and all source documents from research_documents_[topic]/ directories. "
+                    "It then adds proper inline citations and a references section."
+                ),
+                model=citations_model or basic_claude_haiku_4_5(),
+                prompt=CITATIONS_AGENT_PROMPT,
+                tools=[file_read, file_write],
+            )
+        )
+
+    concurrency_config = get_subagent_concurrency_config()
+    if parallel_subagents is None:
+        parallel_subagents = concurrency_config["parallel"]
+    if max_concurrent_subagents is None:
+        max_concurrent_subagents = concurrency_config["max_concurrent_subagents"]
+
+    return AgentBlueprint(
+        lead_prompt=lead_prompt,
+        subagents=tuple(subagents),
+        lead_tools=tuple(lead_tools),
+        lead_model=lead_model or default_model,
+        parallel_subagents=parallel_subagents,
+        max_concurrent_subagents=max_concurrent_subagents,
+        supervision=get_subagent_supervision_config(),
+        compaction=get_lead_compaction_config(),
     )
 
+
+def create_agent_from_blueprint(
+    blueprint: AgentBlueprint, session_manager=None, session_id: str | None = None
+):
+    """
+    Create a DeepSearch agent from a blueprint, binding per-session state.
+
+    Args:
+        blueprint: Shared agent parts from build_agent_blueprint.
+        session_manager: Optional session manager for memory integration.
+        session_id: Optional session ID for tracing/telemetry.
+
+    Returns:
+        Configured DeepSearch agent with its own conversation and tool registry.
+    """
     agent_kwargs = {
-        "instructions": lead_prompt,
-        "subagents": [research_subagent, citations_agent],
-        "tools": [file_read, file_write],
-        "disable_parallel_tool_calling": True,
+        "instructions": blueprint.lead_prompt,
+        "subagents": list(blueprint.subagents),
+        "tools": list(blueprint.lead_tools),
+        "model": blueprint.lead_model,
+        "disable_parallel_tool_calling": not blueprint.parallel_subagents,
     }
 
+    compaction = None
+    if blueprint.compaction["enabled"]:
+        compaction = CompactingConversationManager(
+            keep_recent_messages=blueprint.compaction["keep_recent_messages"],
+            result_chars=blueprint.compaction["result_chars"],
+            max_context_chars=blueprint.compaction["max_context_chars"],
+            window_size=blueprint.compaction["window_size"],
+        )
+        agent_kwargs["conversation_manager"] = compaction
+
     if session_manager is not None:
         agent_kwargs["session_manager"] = session_manager
 
@@ -115,7 +347,29 @@ def create_deepsearch_agent(
             "langfuse.tags": ["DeepResearch"],
         }
 
-    return create_deep_agent(**agent_kwargs)
+    agent = create_deep_agent(**agent_kwargs)
+    PerformanceHooks(LEAD_AGENT).attach(agent)
+    if compaction is not None:
+        compaction.attach(agent)
+    use_workspace_file_tools(agent)
+    supervise_subagents(
+        agent,
+        blueprint.subagents,
+        disable_parallel_tool_calling=not blueprint.parallel_subagents,
+        config=blueprint.supervision,
+    )
+    track_subagents(agent)
+
+    if blueprint.parallel_subagents:
+        logger.info(
+            f"Parallel subagent mode enabled "
+            f"(max {blueprint.max_concurrent_subagents} concurrent)"
+        )
+        limit_subagent_concurrency(
+            agent, max_concurrency=blueprint.max_concurrent_subagents
+        )
+
+    return agent
 
 
 def main():
@@ -130,57 +384,70 @@ def main():
         type=str,
         default="""Current state of AI safety in 2025.""",
     )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the last unfinished run of the session from its checkpoint",
+    )
+    parser.add_argument(
+        "--session-id",
+        type=str,
+        default="local",
+        help="Session whose checkpoint is written and resumed",
+    )
     args = parser.parse_args()
     prompt = args.prompt
 
-    # Create DeepSearch agent (no memory for local execution)
-    agent = create_deepsearch_agent(research_tool=internet_search, session_manager=None)
+    agent = None
+
+    def create_agent():
+        nonlocal agent
+        # Create DeepSearch agent (no memory for local execution)
+        agent = create_deepsearch_agent(
+            research_tool=internet_search,
+            batch_research_tool=internet_search_batch,
+            research_tool_saves_sources=get_source_store_config()["enabled"],
+            session_manager=None,
+        )
+        return agent
+
+    def run(research_agent, agent_input):
+        logger.info("Starting agent execution...")
+        return research_agent(agent_input)
+
+    # Transient streaming errors resume from the last checkpoint instead of restarting
+    checkpoint_config = get_checkpoint_config()
+    store = None
+    if checkpoint_config["enabled"]:
+        store = CheckpointStore(os.getcwd(), args.session_id)
+        logger.info(f"Checkpointing to {store.path}")
+
+    recorder = None
+    if get_performance_config()["summary"]:
+        recorder = PerformanceRecorder(args.session_id)
+        bind_performance_recorder(recorder)
 
-    # Wrap agent execution in a retry loop for ProtocolError
-    max_retries = 3
-    retry_delay = 5
     result = None
-
-    for attempt in range(max_retries):
-        try:
-            logger.info(
-                f"Starting agent execution (attempt {attempt + 1}/{max_retries})..."
-            )
-            result = agent(prompt)
-            logger.info("Agent execution completed successfully!")
-            break  # Success, exit retry loop
-        except (ProtocolError, EventLoopException) as e:
-            # Check if it's a streaming/connection error
-            error_msg = str(e).lower()
-            is_retryable = any(
-                keyword in error_msg
-                for keyword in [
-                    "response ended prematurely",
-                    "protocol error",
-                    "connection",
-                    "timeout",
-                ]
+    try:
+        result = run_with_checkpoints(
+            create_agent=create_agent,
+            prompt=prompt,
+            run=run,
+            store=store,
+            resume=args.resume,
+            max_resumes=checkpoint_config["max_resumes"],
+            retry_delay=checkpoint_config["retry_delay"],
+            is_retryable=is_retryable_error,
+        )
+        logger.info("Agent execution completed successfully!")
+    except Exception as e:
+        logger.error(f"Agent execution failed: {e}")
+        if store is not None:
+            logger.error(
+                f"Continue from the last checkpoint with "
+                f"--resume --session-id {args.session_id}"
             )
-
-            if is_retryable:
-                logger.warning(
-                    f"Streaming error encountered (attempt {attempt + 1}/{max_retries}): {e}"
-                )
-                if attempt < max_retries - 1:
-                    logger.info(f"Retrying in {retry_delay} seconds...")
-                    time.sleep(retry_delay)
-                else:
-                    logger.error(
-                        "All retry attempts exhausted. Please try again later."
-                    )
-                    raise
-            else:
-                # Non-retryable error, re-raise immediately
-                logger.error(f"Non-retryable error: {e}")
-                raise
-        except Exception as e:
-            logger.error(f"Unexpected error during agent execution: {e}")
-            raise  # Re-raise other exceptions
+        raise
 
     if result is None:
         logger.error("Agent execution failed after all retries")
@@ -189,6 +456,20 @@ def main():
     logger.info("\nResearch completed successfully!")
     logger.info(f"Agent response: {result}")
 
+    if recorder is not None:
+        summary = recorder.summary()
+        with open(PERFORMANCE_SUMMARY_NAME, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        logger.info(
+            f"Performance summary written to {PERFORMANCE_SUMMARY_NAME} "
+            f"(critical path: {summary['critical_path']})"
+        )
+
+    if get_knowledge_store_config()["path"]:
+        from .utils.knowledge_store import index_research_outputs
+
+        index_research_outputs(os.getcwd(), args.session_id)
+
     # Show the research plan
     todos = agent.state.get("todos")
     if todos:
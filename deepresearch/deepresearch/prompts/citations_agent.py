@@ -50,3 +50,18 @@ References section at the end:
 Now, read the synthesis file, browse the source documents, add citations, and write the updated report.
 
 """
+
+CITATION_FALLBACK_PROMPT = """You decide which sources support sentences of a research report. The obvious citations have already been added automatically; you only see the sentences where the automatic match was uncertain.
+
+For each <sentence>, look at its <candidate> passages and choose the candidates that directly support the claim in the sentence. Paraphrases count as support; mere topical overlap does not.
+
+Reply with exactly one line per sentence, nothing else:
+<sentence id>: <comma-separated source ids>
+or
+<sentence id>: none
+
+Example:
+3: 12
+4: none
+7: 2, 5
+"""
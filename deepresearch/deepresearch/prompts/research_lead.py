@@ -85,12 +85,9 @@ Before providing a final answer:
 2. Reflect on whether these facts can answer the query sufficiently
 3. Provide a final answer in the format that is best for the user's query
 4. Output the final result in Markdown
-5. **Do not include ANY Markdown citations** - a separate citations agent will add these later
+5. **Do not include ANY Markdown citations** - citations are added in a separate step later
 6. Never include a list of references or sources at the end of the report
-7. After synthesizing the report, delegate to the citations_agent to add proper citations
-   - The citations_agent will read the synthesized report and all source documents
-   - Source documents are stored in `./research_documents_[topic]/` directories by research subagents
-   - Provide the filename of your synthesized report when calling citations_agent
+{citation_step}
 </answer_formatting>
 
 <important_guidelines>
@@ -107,15 +104,41 @@ Before providing a final answer:
 **File Organization**:
 - Research subagents write their findings to files (./research_findings_*.md) in the current directory to keep context lean
 - Research subagents also save all source documents to subdirectories (./research_documents_[topic]/) for citation purposes
-- When ready to synthesize, use file_read to read the research findings files from the current directory (./research_findings_*.md)
+{findings_reading_step}
 - Synthesize all findings into a comprehensive report
 - Write the final report to the requested filename using file_write with current directory prefix (e.g., ./ai_safety_2025_comprehensive_report.md)
 - ALWAYS use the current directory prefix `./` for all file paths
 
 **Final Citation Step**:
-- At the end, delegate to the citations_agent to add citations by reading the source documents and updating the report
-- When calling citations_agent, provide the filename of the synthesized report so it knows which file to update
+{final_citation_step}
 </context_management>
 
 You should do your best to thoroughly accomplish the user's task. No clarifications will be given, use your best judgment. Before starting, review these instructions and plan how you will efficiently use subagents and parallel tool calls.
 """
+
+FILE_READ_FINDINGS_STEP = """- When ready to synthesize, use file_read to read the research findings files from the current directory (./research_findings_*.md)"""
+
+DIGEST_FINDINGS_STEP = """- When ready to synthesize, call read_findings_digest once: it returns a bounded digest of all research findings files, grouped into clusters of related findings with a summary per cluster and the key sentences of each file
+- Only use file_read on a specific findings file when the digest lacks detail you need for the report (figures, dates, names); do not read every findings file
+- Older tool results in your conversation (except the findings digest) are compacted to summaries as the research goes on; the findings and source files still hold the full text"""
+
+CITATIONS_AGENT_STEP = """7. After synthesizing the report, delegate to the citations_agent to add proper citations
+   - The citations_agent will read the synthesized report and all source documents
+   - Source documents are stored in `./research_documents_[topic]/` directories by research subagents
+   - Provide the filename of your synthesized report when calling citations_agent"""
+
+CITATIONS_AGENT_FINAL_STEP = """- At the end, delegate to the citations_agent to add citations by reading the source documents and updating the report
+- When calling citations_agent, provide the filename of the synthesized report so it knows which file to update"""
+
+CITATION_TOOL_STEP = """7. After synthesizing the report, call the add_citations tool to add proper citations
+   - add_citations matches the report against the source documents in `./research_documents_[topic]/` directories and writes inline citations and a References section into the same file
+   - Provide the filename of your synthesized report as report_path
+   - Do not edit the report after add_citations has run"""
+
+CITATION_TOOL_FINAL_STEP = """- At the end, call add_citations with the filename of the synthesized report to add citations and a references section"""
+
+PRIOR_RESEARCH_LEAD_SECTION = """
+<prior_research>
+lookup_prior_research returns passages of earlier research runs with their age. Before deploying subagents, look up the user's question once: tell each subagent which parts recent findings already cover, so it focuses its searches on what is missing or outdated. Subagents can look up prior research themselves.
+</prior_research>
+"""
@@ -70,30 +70,63 @@ When you get to around 15 tool calls or 100 sources, STOP gathering sources and
 When you see diminishing returns (no longer finding new relevant information), STOP using tools and compose your report.
 </maximum_tool_call_limit>
 
-<source_document_management>
+{source_document_management}
+
+Follow the research process and guidelines to accomplish the task. Continue using tools until the task is fully accomplished and all necessary information is gathered. As soon as you have the necessary information, complete the task rather than continuing research unnecessarily.
+
+**CRITICAL - Report Delivery**:
+When your research is complete, you MUST write your findings to a file using the file_write tool with filename pattern: `./research_findings_[topic].md`
+- Use a descriptive topic-based filename (e.g., `./research_findings_ai_safety_challenges.md`)
+- ALWAYS use the current directory prefix `./` for all file paths
+- Write your complete, detailed research report to this file
+- After writing the file, return ONLY a brief summary (2-3 sentences) confirming what you researched and the filename
+- DO NOT return your full report in your response - it's already in the file
+- Remember: Source documents belong in `./research_documents_[topic]/`, using the same topic as your findings file
+"""
+
+BATCH_SEARCH_PROMPT_SECTION = """
+<batch_search>
+You also have **{batch_tool_name}**, which runs several independent queries in one call:
+- When you already know 2 or more queries you want to run (e.g. the opening queries of your plan, or several angles on the same question), send them together to {batch_tool_name} instead of calling {internet_tool_name} repeatedly
+- Duplicate queries are merged and the searches run concurrently, so batching is faster and cheaper than sequential calls
+- The result has one `### <query>` section per query; source documents are handled as described in source_document_management
+- Use {internet_tool_name} for single follow-up queries that depend on earlier results
+</batch_search>
+"""
+
+MANUAL_SOURCE_DOCUMENTS_SECTION = """<source_document_management>
 You MUST save all source documents (tool call results) as you gather them:
 - Create a subdirectory: `./research_documents_[topic]/` where [topic] matches your research findings filename
-- For each {internet_tool_name} tool call result, save it immediately as: `./research_documents_[topic]/source_[number].md`
+- {internet_tool_name} results list an `answer:` followed by numbered sources as `[number] title - url`, each followed by its text
+- Save each source immediately as: `./research_documents_[topic]/source_[number].md`
 - Number sources sequentially (source_1.md, source_2.md, etc.)
-- At the TOP of each source file, include: `source_url: [URL if available]` or `source_url: N/A` if no URL
-- Save the full tool call result as-is after the source_url line
+- At the TOP of each source file, include: `source_url: [the source's url]` or `source_url: N/A` if no URL
+- Save the source's title and full text as-is after the source_url line
 - This ensures the citations agent can reference the actual source documents later
 
 Example source file structure:
 ```
 source_url: https://example.com/article
-[Full tool call result content here...]
+title: [Source title]
+
+[Full source text here...]
 ```
-</source_document_management>
+</source_document_management>"""
 
-Follow the research process and guidelines to accomplish the task. Continue using tools until the task is fully accomplished and all necessary information is gathered. As soon as you have the necessary information, complete the task rather than continuing research unnecessarily.
+AUTOMATIC_SOURCE_DOCUMENTS_SECTION = """<source_document_management>
+{internet_tool_name} saves every source it returns for you - do NOT save search results with file_write:
+- Pass `topic` on every {internet_tool_name} call, matching your research findings filename (e.g. topic="ai_safety_challenges" for `./research_findings_ai_safety_challenges.md`)
+- Each source is written to `./research_documents_[topic]/source_[number].md` with its `source_url:` at the top, ready for the citations agent
+- The tool result lists every saved source as `[research_documents_[topic]/source_N.md] title - url` followed by a short snippet; the file holds the full text, read it with file_read when the snippet is not enough
+- Repeated URLs are saved only once per topic
+</source_document_management>"""
 
-**CRITICAL - Report Delivery**:
-When your research is complete, you MUST write your findings to a file using the file_write tool with filename pattern: `./research_findings_[topic].md`
-- Use a descriptive topic-based filename (e.g., `./research_findings_ai_safety_challenges.md`)
-- ALWAYS use the current directory prefix `./` for all file paths
-- Write your complete, detailed research report to this file
-- After writing the file, return ONLY a brief summary (2-3 sentences) confirming what you researched and the filename
-- DO NOT return your full report in your response - it's already in the file
-- Remember: Source documents should be saved in `./research_documents_[topic]/` as you gather them
+PRIOR_RESEARCH_PROMPT_SECTION = """
+<prior_research>
+You also have **lookup_prior_research**, which searches the findings and source documents of earlier research runs:
+- Call it once with the core question of your task before your first {internet_tool_name} call, passing the same `topic`
+- Every passage shows its age: reuse facts that are recent enough for the subject, and only search the web for what is missing, outdated or needs verification
+- For fast-moving subjects (news, prices, releases, ongoing events), pass a small `max_age_days`
+- Reused sources are saved as source documents like search results; findings passages are not sources, so confirm their key claims with a search before relying on them
+</prior_research>
 """
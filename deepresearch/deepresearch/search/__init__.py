@@ -0,0 +1,63 @@
+"""Async search provider layer for DeepSearch agent."""
+
+from typing import TYPE_CHECKING
+
+from deepresearch.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from deepresearch.search.base import SearchProvider, SearchResult, SearchSource
+    from deepresearch.search.loop import (
+        bind_search_deadline,
+        get_search_loop,
+        search_timeout,
+        unbind_search_deadline,
+    )
+    from deepresearch.search.providers import (
+        LinkupProvider,
+        TavilyProvider,
+        get_search_provider,
+        register_search_provider,
+    )
+    from deepresearch.search.router import (
+        SearchRouter,
+        get_search_router,
+        timed_upstream_call,
+    )
+
+# Providers pull in httpx and the Linkup SDK; import them on first use
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "SearchProvider": "deepresearch.search.base",
+        "SearchResult": "deepresearch.search.base",
+        "SearchSource": "deepresearch.search.base",
+        "LinkupProvider": "deepresearch.search.providers",
+        "TavilyProvider": "deepresearch.search.providers",
+        "SearchRouter": "deepresearch.search.router",
+        "bind_search_deadline": "deepresearch.search.loop",
+        "get_search_loop": "deepresearch.search.loop",
+        "get_search_provider": "deepresearch.search.providers",
+        "get_search_router": "deepresearch.search.router",
+        "register_search_provider": "deepresearch.search.providers",
+        "search_timeout": "deepresearch.search.loop",
+        "timed_upstream_call": "deepresearch.search.router",
+        "unbind_search_deadline": "deepresearch.search.loop",
+    },
+)
+
+__all__ = [
+    "SearchProvider",
+    "SearchResult",
+    "SearchSource",
+    "LinkupProvider",
+    "TavilyProvider",
+    "SearchRouter",
+    "bind_search_deadline",
+    "get_search_loop",
+    "get_search_provider",
+    "get_search_router",
+    "register_search_provider",
+    "search_timeout",
+    "timed_upstream_call",
+    "unbind_search_deadline",
+]
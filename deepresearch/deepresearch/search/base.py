@@ -0,0 +1,64 @@
+"""
+Async search provider interface.
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+
+
+@dataclass
+class SearchSource:
+    """A single web source returned by a search provider."""
+
+    title: str
+    url: str
+    snippet: str = ""
+
+
+@dataclass
+class SearchResult:
+    """
+    Provider-independent search result.
+
+    Attributes:
+        provider: Name of the provider that answered.
+        query: The query that was searched.
+        text: Plain result text, shown to the agent when the provider returns
+            neither an answer nor structured sources.
+        answer: Synthesized answer, if the provider returns one.
+        sources: Structured sources supporting the result.
+    """
+
+    provider: str
+    query: str
+    text: str
+    answer: str | None = None
+    sources: list[SearchSource] = field(default_factory=list)
+
+
+class SearchProvider(ABC):
+    """
+    Base class for async search backends.
+
+    Attributes:
+        name: Provider name used for caching, rate limiting and routing.
+        depth: Search depth requested from the provider, part of the cache key.
+    """
+
+    name: str = ""
+    depth: str = "standard"
+
+    @abstractmethod
+    async def search(self, query: str) -> SearchResult:
+        """
+        Search the web.
+
+        Args:
+            query: The query to search for.
+
+        Returns:
+            SearchResult for the query.
+        """
+
+    async def aclose(self) -> None:
+        """Release network resources held by the provider."""
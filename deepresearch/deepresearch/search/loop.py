@@ -0,0 +1,158 @@
+"""
+Long-lived event loop for async search providers.
+
+Sync callers (the `@tool` functions, which strands runs in worker threads)
+submit coroutines to one background loop per process instead of building and
+tearing down a loop with `asyncio.run` on every search. Submitting works the
+same whether or not the caller is itself inside a running event loop. Blocking
+callers wait at most SEARCH_TIMEOUT_SECONDS by default, so a hung upstream
+call cannot block a tool thread forever, and never past the deadline bound
+for their context (a supervised subagent's wall-clock budget).
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from contextvars import ContextVar, Token
+from functools import lru_cache
+from typing import Any, Coroutine, TypeVar
+
+from deepresearch.config import get_search_timeout
+
+logger = logging.getLogger("deepsearch.search_loop")
+
+T = TypeVar("T")
+
+
+class SearchLoop:
+    """Event loop running forever in a daemon thread."""
+
+    def __init__(self, default_timeout: float | None = None):
+        """
+        Start the loop thread.
+
+        Args:
+            default_timeout: Seconds run() waits when given no timeout, or None
+                to wait indefinitely.
+        """
+        self.default_timeout = default_timeout
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run, name="deepsearch-search-loop", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> Future[T]:
+        """
+        Schedule a coroutine on the loop.
+
+        Args:
+            coro: Coroutine to run.
+
+        Returns:
+            concurrent.futures.Future resolving to the coroutine's result.
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: float | None = None) -> T:
+        """
+        Run a coroutine on the loop and block until it completes.
+
+        Args:
+            coro: Coroutine to run.
+            timeout: Timeout in seconds (defaults to default_timeout).
+
+        Returns:
+            The coroutine's result.
+
+        Raises:
+            TimeoutError: If the coroutine did not complete in time; it is
+                cancelled.
+        """
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("SearchLoop.run cannot be called from the loop thread")
+        if timeout is None:
+            timeout = self.default_timeout
+        future = self.submit(coro)
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            if not future.done():
+                future.cancel()
+                raise TimeoutError(f"Search did not complete within {timeout:.1f}s") from None
+            raise
+
+
+_search_deadline: ContextVar[float | None] = ContextVar(
+    "deepsearch_search_deadline", default=None
+)
+
+
+def bind_search_deadline(deadline: float) -> Token:
+    """
+    Make searches of this context (one subagent's run) end by a deadline.
+
+    Context variables are copied into agent and tool threads, so the search
+    tools called by the subagent see it.
+
+    Args:
+        deadline: time.monotonic() deadline.
+
+    Returns:
+        Token to pass to unbind_search_deadline.
+    """
+    return _search_deadline.set(deadline)
+
+
+def unbind_search_deadline(token: Token) -> None:
+    """Restore the deadline that was current before bind_search_deadline."""
+    _search_deadline.reset(token)
+
+
+def search_timeout() -> float | None:
+    """
+    Get the time a search started now may take.
+
+    Must be called from the caller's thread, not on the search event loop.
+
+    Returns:
+        SEARCH_TIMEOUT_SECONDS, capped by the time left before the bound
+        deadline; None when neither applies.
+    """
+    timeout = get_search_timeout()
+    deadline = _search_deadline.get()
+    if deadline is None:
+        return timeout
+    remaining = max(0.0, deadline - time.monotonic())
+    return remaining if timeout is None else min(timeout, remaining)
+
+
+_search_loop_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def get_search_loop() -> SearchLoop:
+    """
+    Get the process-wide search event loop, starting it on first use.
+
+    Parallel subagents search concurrently from their first turn; the lock
+    keeps them from each starting a loop, since searches coalesced by the
+    query log must all run on the same one.
+
+    Returns:
+        Shared SearchLoop instance.
+    """
+    with _search_loop_lock:
+        return _start_search_loop()
+
+
+@lru_cache(maxsize=1)
+def _start_search_loop() -> SearchLoop:
+    logger.info("Starting search event loop")
+    return SearchLoop(default_timeout=get_search_timeout())
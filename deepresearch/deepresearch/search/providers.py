@@ -0,0 +1,135 @@
+"""
+Linkup and Tavily adapters for the async search provider interface.
+"""
+
+import logging
+import os
+import threading
+from typing import Callable
+
+import httpx
+
+from deepresearch.search.base import SearchProvider, SearchResult, SearchSource
+from deepresearch.utils.clients import (
+    get_client_registry,
+    get_http_limits,
+    get_http_timeout,
+    get_linkup_client,
+)
+
+logger = logging.getLogger("deepsearch.search_providers")
+
+TAVILY_API_BASE_URL = "https://api.tavily.com"
+
+
+class LinkupProvider(SearchProvider):
+    """Linkup sourced-answer search over the shared pooled client."""
+
+    name = "linkup"
+    depth = "standard"
+
+    async def search(self, query: str) -> SearchResult:
+        response = await get_linkup_client().async_search(
+            query=query,
+            depth=self.depth,
+            output_type="sourcedAnswer",
+            include_images=False,
+            include_inline_citations=False,
+        )
+        return SearchResult(
+            provider=self.name,
+            query=query,
+            text=response.answer or "",
+            answer=response.answer,
+            sources=[
+                SearchSource(title=source.name, url=source.url, snippet=source.snippet)
+                for source in response.sources
+            ],
+        )
+
+
+class TavilyProvider(SearchProvider):
+    """Tavily search over a pooled async HTTP client."""
+
+    name = "tavily"
+    depth = "basic"
+
+    def __init__(self):
+        """Initialize the pooled HTTP client."""
+        self._http = httpx.AsyncClient(
+            base_url=TAVILY_API_BASE_URL,
+            limits=get_http_limits(),
+            timeout=get_http_timeout(),
+        )
+
+    async def search(self, query: str) -> SearchResult:
+        api_key = os.environ.get("TAVILY_API_KEY")
+        if not api_key:
+            raise ValueError("TAVILY_API_KEY environment variable is required")
+
+        response = await self._http.post(
+            "/search",
+            json={"query": query, "search_depth": self.depth},
+            headers={"Authorization": f"Bearer {api_key}"},
+        )
+        response.raise_for_status()
+        data = response.json()
+        return SearchResult(
+            provider=self.name,
+            query=query,
+            text=data.get("answer") or "",
+            answer=data.get("answer"),
+            sources=[
+                SearchSource(
+                    title=result.get("title", ""),
+                    url=result.get("url", ""),
+                    snippet=result.get("content", ""),
+                )
+                for result in data.get("results", [])
+            ],
+        )
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+
+_provider_factories: dict[str, Callable[[], SearchProvider]] = {
+    "linkup": LinkupProvider,
+    "tavily": TavilyProvider,
+}
+_provider_factories_lock = threading.Lock()
+
+
+def register_search_provider(
+    name: str, factory: Callable[[], SearchProvider]
+) -> None:
+    """
+    Register a search provider factory under a name.
+
+    Args:
+        name: Provider name, matching the provider's `name` attribute.
+        factory: Zero-argument callable building the provider.
+    """
+    with _provider_factories_lock:
+        _provider_factories[name] = factory
+    get_client_registry().reset(f"search_provider:{name}")
+
+
+def get_search_provider(name: str) -> SearchProvider:
+    """
+    Get the shared instance of a search provider.
+
+    Args:
+        name: Provider name (e.g. "linkup").
+
+    Returns:
+        SearchProvider created once per process.
+
+    Raises:
+        ValueError: If no provider is registered under the name.
+    """
+    with _provider_factories_lock:
+        factory = _provider_factories.get(name)
+    if factory is None:
+        raise ValueError(f"Unknown search provider: {name}")
+    return get_client_registry().get(f"search_provider:{name}", factory)
@@ -0,0 +1,399 @@
+"""
+Latency- and health-aware routing between search providers.
+
+The router tracks rolling latency percentiles and error rates per provider,
+sends each query to the fastest healthy provider, fails over to the next one
+on errors, and opens a circuit breaker on providers that keep failing. With
+hedging enabled, a second provider is fired when the first has not answered
+within its own p95 latency, and whichever answers first wins.
+
+Latency is the provider's network call only: search functions mark it with
+`timed_upstream_call()`, so cache hits and rate limiter waits neither skew the
+percentiles nor start the hedge timer while a request is still queued.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Awaitable, Callable, Iterator
+
+from deepresearch.config import get_search_routing_config
+from deepresearch.search.base import SearchResult
+
+logger = logging.getLogger("deepsearch.search_router")
+
+SearchFn = Callable[[str, str], Awaitable[SearchResult]]
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+@dataclass
+class AttemptTiming:
+    """
+    Timing of one routed attempt, filled in by timed_upstream_call.
+
+    Attributes:
+        started: Set when the provider's network call starts.
+        upstream_start: Monotonic time the network call started, if it did.
+        latency: Duration of the network call, once it succeeded.
+    """
+
+    started: asyncio.Event = field(default_factory=asyncio.Event)
+    upstream_start: float | None = None
+    latency: float | None = None
+
+
+_current_attempt: ContextVar[AttemptTiming | None] = ContextVar(
+    "deepsearch_search_attempt", default=None
+)
+
+
+@contextmanager
+def timed_upstream_call() -> Iterator[None]:
+    """
+    Mark the provider's network call of the current routed attempt.
+
+    Search functions passed to SearchRouter.search wrap their upstream call in
+    this; only the time spent inside is recorded as the provider's latency.
+    An attempt that never enters it (e.g. a cache hit) records no latency.
+    Outside a routed attempt it does nothing.
+    """
+    timing = _current_attempt.get()
+    if timing is None:
+        yield
+        return
+    timing.upstream_start = time.monotonic()
+    timing.started.set()
+    yield
+    timing.latency = time.monotonic() - timing.upstream_start
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of a list of values.
+
+    Args:
+        values: Sample values.
+        pct: Percentile between 0 and 100.
+
+    Returns:
+        The percentile, or 0.0 for an empty list.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class ProviderHealth:
+    """Rolling latency/error window and circuit breaker for one provider."""
+
+    def __init__(
+        self, name: str, window: int, failure_threshold: int, cooldown_seconds: float
+    ):
+        """
+        Initialize an empty, closed health record.
+
+        Args:
+            name: Provider name, used in logs.
+            window: Number of recent calls kept.
+            failure_threshold: Consecutive failures that open the circuit.
+            cooldown_seconds: Time an open circuit waits before a trial call.
+        """
+        self.name = name
+        self.latencies: deque[float] = deque(maxlen=window)
+        self.outcomes: deque[bool] = deque(maxlen=window)
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.consecutive_failures = 0
+        self.trial_in_flight = False
+
+    def available(self, now: float) -> bool:
+        """Check whether the provider may take a request, half-opening after cooldown."""
+        if self.state == OPEN and now - self.opened_at >= self.cooldown_seconds:
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN:
+            return not self.trial_in_flight
+        return self.state == CLOSED
+
+    def begin_attempt(self) -> None:
+        """Mark a request as sent; in HALF_OPEN it is the single trial request."""
+        if self.state == HALF_OPEN:
+            self.trial_in_flight = True
+
+    def cancel_attempt(self) -> None:
+        """Forget a request that was cancelled before completing."""
+        self.trial_in_flight = False
+
+    def record_success(self, latency: float) -> None:
+        """Record a successful request and close the circuit."""
+        self.latencies.append(latency)
+        self.outcomes.append(True)
+        self.consecutive_failures = 0
+        self.trial_in_flight = False
+        if self.state != CLOSED:
+            logger.info(f"Search provider '{self.name}' recovered, closing circuit")
+        self.state = CLOSED
+
+    def record_failure(self, now: float) -> None:
+        """Record a failed request, opening the circuit past the threshold."""
+        self.outcomes.append(False)
+        self.consecutive_failures += 1
+        self.trial_in_flight = False
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != OPEN:
+                logger.warning(f"Opening circuit for search provider '{self.name}'")
+            self.state = OPEN
+            self.opened_at = now
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def stats(self) -> dict:
+        latencies = list(self.latencies)
+        return {
+            "state": self.state,
+            "calls": len(self.outcomes),
+            "error_rate": self.error_rate,
+            "p50_seconds": percentile(latencies, 50),
+            "p95_seconds": percentile(latencies, 95),
+        }
+
+
+class SearchRouter:
+    """Routes searches to the fastest healthy provider, with optional hedging."""
+
+    def __init__(
+        self,
+        providers: list[str],
+        hedging: bool = False,
+        hedge_min_delay: float = 0.5,
+        window: int = 100,
+        failure_threshold: int = 3,
+        cooldown_seconds: float = 30,
+    ):
+        """
+        Initialize the router.
+
+        Args:
+            providers: Provider names to route between, in tie-break order.
+            hedging: Fire a second provider after the primary's p95 latency.
+            hedge_min_delay: Lower bound on the hedge delay in seconds.
+            window: Number of recent calls tracked per provider.
+            failure_threshold: Consecutive failures that open a circuit.
+            cooldown_seconds: Time an open circuit waits before a trial call.
+        """
+        if not providers:
+            raise ValueError("SearchRouter needs at least one provider")
+        self.providers = list(providers)
+        self.hedging = hedging
+        self.hedge_min_delay = hedge_min_delay
+        self.health = {
+            name: ProviderHealth(name, window, failure_threshold, cooldown_seconds)
+            for name in self.providers
+        }
+        self._lock = threading.Lock()
+        self._hedges_fired = 0
+        self._hedges_won = 0
+
+    def rank(self) -> tuple[list[str], list[str]]:
+        """
+        Order providers for the next request.
+
+        Returns:
+            Tuple of (available, blocked) provider names. Available providers are
+            sorted fastest p50 first; providers without samples sort first so
+            they get measured. Blocked providers have an open circuit and are
+            only tried as a last resort, soonest-opened first.
+        """
+        now = time.monotonic()
+        with self._lock:
+            available = [
+                name for name in self.providers if self.health[name].available(now)
+            ]
+            blocked = [name for name in self.providers if name not in available]
+            available.sort(
+                key=lambda name: (
+                    percentile(list(self.health[name].latencies), 50),
+                    self.health[name].error_rate,
+                )
+            )
+            blocked.sort(key=lambda name: self.health[name].opened_at)
+        return available, blocked
+
+    def hedge_delay(self, provider: str) -> float:
+        """
+        Delay before hedging a request sent to a provider.
+
+        Args:
+            provider: Primary provider name.
+
+        Returns:
+            The provider's p95 latency, at least hedge_min_delay.
+        """
+        with self._lock:
+            p95 = percentile(list(self.health[provider].latencies), 95)
+        return max(p95, self.hedge_min_delay)
+
+    async def search(self, query: str, search_fn: SearchFn) -> SearchResult:
+        """
+        Run a query against the best provider, failing over and hedging as configured.
+
+        Args:
+            query: The query to search for.
+            search_fn: Async callable (query, provider) performing one search,
+                with its network call wrapped in timed_upstream_call().
+
+        Returns:
+            The first successful SearchResult.
+
+        Raises:
+            Exception: The last provider error if every provider failed.
+        """
+        available, blocked = self.rank()
+        candidates = available + blocked
+        primary = candidates[0]
+        pending: dict[asyncio.Task, str] = {}
+        timings: dict[asyncio.Task, AttemptTiming] = {}
+        hedged = False
+        last_error: Exception | None = None
+
+        def launch() -> None:
+            provider = candidates.pop(0)
+            with self._lock:
+                self.health[provider].begin_attempt()
+            timing = AttemptTiming()
+            task = asyncio.create_task(self._attempt(query, provider, search_fn, timing))
+            pending[task] = provider
+            timings[task] = timing
+
+        launch()
+        try:
+            while pending:
+                timeout = None
+                waiting_for_start = None
+                can_hedge = self.hedging and candidates and candidates[0] in available
+                if can_hedge and len(pending) == 1:
+                    task, provider = next(iter(pending.items()))
+                    timing = timings[task]
+                    if timing.upstream_start is None:
+                        # Still queued in the rate limiter: the hedge timer
+                        # starts with the network call
+                        waiting_for_start = asyncio.create_task(timing.started.wait())
+                    else:
+                        delay = self.hedge_delay(provider)
+                        timeout = max(0.0, timing.upstream_start + delay - time.monotonic())
+
+                waits = set(pending) | ({waiting_for_start} if waiting_for_start else set())
+                try:
+                    done, _ = await asyncio.wait(
+                        waits, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                    )
+                finally:
+                    if waiting_for_start is not None:
+                        waiting_for_start.cancel()
+                done.discard(waiting_for_start)
+                if not done and waiting_for_start is not None:
+                    continue
+                if not done:
+                    logger.info(f"Hedging search after {delay:.2f}s with {candidates[0]}")
+                    hedged = True
+                    with self._lock:
+                        self._hedges_fired += 1
+                    launch()
+                    continue
+
+                for task in done:
+                    provider = pending.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        if hedged and provider != primary:
+                            with self._lock:
+                                self._hedges_won += 1
+                        return task.result()
+                    last_error = error
+                    logger.warning(f"Search provider '{provider}' failed: {error}")
+
+                if not pending and candidates:
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise last_error
+
+    async def _attempt(
+        self, query: str, provider: str, search_fn: SearchFn, timing: AttemptTiming
+    ) -> SearchResult:
+        # Runs in its own task, so the binding is only seen by this attempt
+        _current_attempt.set(timing)
+        try:
+            result = await search_fn(query, provider)
+        except asyncio.CancelledError:
+            with self._lock:
+                self.health[provider].cancel_attempt()
+            raise
+        except Exception:
+            with self._lock:
+                self.health[provider].record_failure(time.monotonic())
+            raise
+        with self._lock:
+            if timing.latency is None:
+                # Answered without calling the provider (e.g. from the cache)
+                self.health[provider].cancel_attempt()
+            else:
+                self.health[provider].record_success(timing.latency)
+        return result
+
+    def stats(self) -> dict:
+        """
+        Get routing metrics.
+
+        Returns:
+            Dictionary with per-provider health stats and hedge counters.
+        """
+        with self._lock:
+            return {
+                "providers": {
+                    name: health.stats() for name, health in self.health.items()
+                },
+                "hedges_fired": self._hedges_fired,
+                "hedges_won": self._hedges_won,
+            }
+
+
+@lru_cache(maxsize=1)
+def get_search_router() -> SearchRouter:
+    """
+    Get the process-wide search router built from configuration.
+
+    Returns:
+        Shared SearchRouter instance.
+    """
+    config = get_search_routing_config()
+    logger.info(
+        f"Routing searches between {config['providers']} "
+        f"(hedging={'on' if config['hedging'] else 'off'})"
+    )
+    return SearchRouter(
+        providers=config["providers"],
+        hedging=config["hedging"],
+        hedge_min_delay=config["hedge_min_delay"],
+        window=config["window"],
+        failure_threshold=config["failure_threshold"],
+        cooldown_seconds=config["cooldown_seconds"],
+    )
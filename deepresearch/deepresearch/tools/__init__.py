@@ -1,6 +1,6 @@
 """Tools for DeepSearch agent."""
 
-from deepresearch.tools.internet_search import internet_search
+from deepresearch.tools.internet_search import internet_search, internet_search_batch
 from deepresearch.utils.s3_outputs import (
     upload_session_outputs,
     upload_single_file,
@@ -8,6 +8,7 @@ from deepresearch.utils.s3_outputs import (
 
 __all__ = [
     "internet_search",
+    "internet_search_batch",
     "upload_session_outputs",
     "upload_single_file",
 ]
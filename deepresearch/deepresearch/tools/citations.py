@@ -0,0 +1,78 @@
+"""
+Tool adding citations to the final report with the local citation engine.
+"""
+
+import logging
+
+from strands import tool
+
+from deepresearch.citations import CitationEngine, LLMCitationResolver, has_references
+from deepresearch.config import get_citation_config
+from deepresearch.utils.workspace import WorkspaceError, get_working_dir, resolve_path
+
+logger = logging.getLogger("deepsearch.citations")
+
+
+def create_citation_tool(fallback_model=None):
+    """
+    Create the add_citations tool for the research lead.
+
+    Args:
+        fallback_model: Model deciding low-confidence sentences. None, or
+            CITATION_LLM_FALLBACK=false, leaves them uncited.
+
+    Returns:
+        The add_citations tool.
+    """
+
+    @tool
+    def add_citations(report_path: str) -> str:
+        """Add inline citations and a References section to a research report
+
+        Matches every sentence of the report against the saved source documents
+        in ./research_documents_*/ and rewrites the report file in place.
+
+        Args:
+            report_path: Path of the synthesized report, e.g. ./ai_safety_report.md
+
+        Returns:
+            A short summary of the citations added
+        """
+        try:
+            path = resolve_path(report_path)
+        except WorkspaceError as e:
+            return str(e)
+        if not path.is_file():
+            return f"Report not found: {report_path}"
+
+        report = path.read_text(encoding="utf-8")
+        if has_references(report):
+            return f"{report_path} already has a References section, nothing to do"
+
+        config = get_citation_config()
+        engine = CitationEngine.from_directory(
+            get_working_dir(),
+            min_confidence=config["min_confidence"],
+            fallback_min_confidence=config["fallback_min_confidence"],
+            max_sources_per_sentence=config["max_sources_per_sentence"],
+        )
+        if not engine.sources:
+            return "No source documents found in ./research_documents_*/, report left unchanged"
+
+        resolver = None
+        if fallback_model is not None and config["llm_fallback"]:
+            resolver = LLMCitationResolver(fallback_model)
+
+        result = engine.cite(report, resolver=resolver)
+        path.write_text(result.text, encoding="utf-8")
+
+        summary = (
+            f"Cited {result.cited + result.resolved_by_fallback} of {result.sentences} "
+            f"sentences in {report_path} from {len(result.references)} sources "
+            f"({result.resolved_by_fallback} via LLM fallback, "
+            f"{result.uncited_low_confidence} low-confidence left uncited)"
+        )
+        logger.info(summary)
+        return summary
+
+    return add_citations
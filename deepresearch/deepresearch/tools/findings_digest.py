@@ -0,0 +1,45 @@
+"""
+Tool giving the lead agent a bounded digest of all findings files
+(see utils/findings_digest.py).
+"""
+
+import logging
+
+from strands import tool
+
+from deepresearch.config import get_findings_digest_config
+from deepresearch.utils.findings_digest import (
+    build_findings_digest,
+    render_findings_digest,
+)
+from deepresearch.utils.workspace import get_working_dir
+
+logger = logging.getLogger("deepsearch.findings_digest")
+
+
+@tool
+def read_findings_digest() -> str:
+    """Read a digest of every research findings file at once, instead of each file in full
+
+    Findings are grouped into clusters of related topics. Each cluster has a
+    summary of what its findings agree on, followed by the key sentences of
+    each findings file. The findings files themselves are unchanged; read one
+    with file_read when you need its full detail.
+
+    Returns:
+        The findings digest
+    """
+    config = get_findings_digest_config()
+    clusters = build_findings_digest(
+        get_working_dir(),
+        finding_chars=config["finding_chars"],
+        cluster_chars=config["cluster_chars"],
+        similarity=config["similarity"],
+        max_chars=config["max_chars"],
+    )
+    digest = render_findings_digest(clusters, max_chars=config["max_chars"])
+    logger.info(
+        f"Findings digest: {sum(len(c.findings) for c in clusters)} findings in "
+        f"{len(clusters)} clusters, {len(digest)} chars"
+    )
+    return digest
@@ -3,13 +3,34 @@ Tools for searching the web using Linkup and Tavily.
 """
 
 import asyncio
+import dataclasses
+import json
 import logging
 import os
-import random
+import time
 
-from linkup import LinkupClient
 from strands import tool
-from strands_tools import tavily
+
+from deepresearch.config import get_search_batch_max_queries, get_source_store_config
+from deepresearch.search import (
+    SearchResult,
+    SearchSource,
+    get_search_loop,
+    get_search_provider,
+    get_search_router,
+    search_timeout,
+    timed_upstream_call,
+)
+from deepresearch.utils.events import emit_event
+from deepresearch.utils.query_log import QueryLog, get_query_log
+from deepresearch.utils.rate_limit import get_rate_limiter
+from deepresearch.utils.search_cache import (
+    get_search_cache,
+    make_cache_key,
+    normalize_query,
+)
+from deepresearch.utils.source_store import get_source_store
+from deepresearch.utils.workspace import WorkspaceQuotaError
 
 if os.environ.get("LOAD_DOTENV", "false").lower() == "true":
     from dotenv import load_dotenv
@@ -18,6 +39,318 @@ if os.environ.get("LOAD_DOTENV", "false").lower() == "true":
 
 logger = logging.getLogger(__name__)
 
+# Extra wait for a batch over its per-query timeout
+BATCH_TIMEOUT_GRACE_SECONDS = 1.0
+
+
+def _load_cached_result(value: str) -> SearchResult | None:
+    try:
+        data = json.loads(value)
+        data["sources"] = [SearchSource(**source) for source in data["sources"]]
+        return SearchResult(**data)
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+async def search_async(query: str, provider: str) -> SearchResult:
+    """
+    Search with a provider through the result cache and rate limiter.
+
+    Cache hits are returned immediately; misses wait for the provider's
+    rate limiter before calling upstream. Only the upstream call counts as the
+    provider's latency for routing.
+
+    Args:
+        query: The query to search for.
+        provider: Registered search provider name (e.g. "linkup").
+
+    Returns:
+        The (possibly cached) search result.
+    """
+    search_provider = get_search_provider(provider)
+    cache = get_search_cache()
+    key = None
+    if cache is not None:
+        key = make_cache_key(
+            query=query, provider=search_provider.name, depth=search_provider.depth
+        )
+        cached = await cache.get_async(key)
+        if cached is not None:
+            result = _load_cached_result(cached)
+            if result is not None:
+                logger.info("Search cache hit for %s query: %s", provider, query)
+                return result
+
+    waited = await get_rate_limiter(provider).acquire_async()
+    if waited > 0:
+        logger.info("Rate limiter delayed %s search by %.3fs", provider, waited)
+
+    start = time.perf_counter()
+    with timed_upstream_call():
+        result = await search_provider.search(query)
+    if cache is not None:
+        cache.record_upstream_call(time.perf_counter() - start)
+        await cache.set_async(key, json.dumps(dataclasses.asdict(result)))
+    return result
+
+
+def search(query: str, provider: str | None = None, force: bool = False) -> SearchResult:
+    """
+    Blocking wrapper around search_async for sync callers such as tools.
+
+    Runs on the process-wide search event loop. Without an explicit provider,
+    the query is routed by the shared SearchRouter (fastest healthy provider,
+    with failover and optional hedging), through the session's query log so
+    near-duplicates of earlier or in-flight searches are not searched again.
+    The wait is bounded by search_timeout(): the configured search timeout,
+    capped by the calling subagent's remaining time budget.
+
+    Args:
+        query: The query to search for.
+        provider: Registered search provider name, or None to route.
+        force: Search even if a near-duplicate was already searched.
+
+    Returns:
+        The (possibly cached) search result. A near-duplicate gets the earlier
+        search's result, whose query differs from the one given.
+
+    Raises:
+        TimeoutError: If the search did not complete in time.
+    """
+    if provider is None:
+        coro = routed_search_async(query, get_query_log(), force=force)
+    else:
+        coro = search_async(query=query, provider=provider)
+    return get_search_loop().run(coro, timeout=search_timeout())
+
+
+async def routed_search_async(
+    query: str, query_log: QueryLog | None, force: bool = False
+) -> SearchResult:
+    """
+    Route a query, through the session's query log when there is one.
+
+    Args:
+        query: The query to search for.
+        query_log: Query log of the session (from get_query_log, resolved in
+            the caller's thread), or None to always search.
+        force: Search even if the log holds a near-duplicate.
+
+    Returns:
+        The search result, possibly of an earlier near-duplicate query.
+    """
+    router = get_search_router()
+    if query_log is None:
+        return await router.search(query, search_fn=search_async)
+    return await query_log.search(
+        query, lambda q: router.search(q, search_fn=search_async), force=force
+    )
+
+
+def duplicate_note(query: str, result: SearchResult) -> str | None:
+    """
+    Tell the model when a result was served for an earlier, similar query.
+
+    Args:
+        query: Query as searched by the agent.
+        result: Result returned for it.
+
+    Returns:
+        Note naming the earlier query, or None if the result is the query's own.
+    """
+    if normalize_query(result.query) == normalize_query(query):
+        return None
+    return (
+        f"Note: this is a near-duplicate of the earlier search {result.query!r}, "
+        "whose results are shown. Search for a different angle instead, or search "
+        "again with force=true if the difference between the two queries matters."
+    )
+
+
+def dedupe_queries(queries: list[str]) -> list[str]:
+    """
+    Drop queries that normalize to the same search, keeping the first spelling.
+
+    Args:
+        queries: Queries as written by the agent.
+
+    Returns:
+        Distinct, non-empty queries in their original order.
+    """
+    unique: dict[str, str] = {}
+    for query in queries:
+        normalized = normalize_query(query)
+        if normalized and normalized not in unique:
+            unique[normalized] = query.strip()
+    return list(unique.values())
+
+
+async def search_batch_async(
+    queries: list[str],
+    query_log: QueryLog | None = None,
+    force: bool = False,
+    timeout: float | None = None,
+) -> dict[str, SearchResult | Exception]:
+    """
+    Route several queries concurrently, searching each distinct query once.
+
+    All searches still go through the cache and the per-provider rate limiter,
+    so concurrency never exceeds the configured QPS budget. With a query log,
+    near-duplicate queries in the batch share one upstream call.
+
+    Args:
+        queries: Queries to search for.
+        query_log: Query log of the session, or None to search every query.
+        force: Search every distinct query, even near-duplicates in the log.
+        timeout: Seconds each query may take; a slower query maps to a
+            TimeoutError while the others keep their results.
+
+    Returns:
+        Dictionary mapping each distinct query to its result, or to the
+        exception raised while searching it.
+    """
+    unique = dedupe_queries(queries)
+    results = await asyncio.gather(
+        *(
+            asyncio.wait_for(routed_search_async(query, query_log, force=force), timeout)
+            for query in unique
+        ),
+        return_exceptions=True,
+    )
+    return dict(zip(unique, results))
+
+
+def _trim(text: str, limit: int | None) -> str:
+    text = " ".join(text.split())
+    if limit is None or len(text) <= limit:
+        return text
+    return text[:limit].rstrip() + "..."
+
+
+def format_compact(
+    result: SearchResult,
+    handles: list[str] | None = None,
+    snippet_chars: int | None = None,
+    answer_chars: int | None = None,
+    max_chars: int | None = None,
+) -> str:
+    """
+    Render a search result as compact structured text.
+
+    The answer comes first, then one line per source with its label (the
+    saved file, or its position), title and URL, followed by its snippet.
+    Results with neither answer nor sources fall back to the provider's raw
+    text.
+
+    Args:
+        result: Search result to render.
+        handles: Saved file of each source, used as its label.
+        snippet_chars: Maximum characters per snippet, None for the full snippet.
+        answer_chars: Maximum characters of the answer, None for the full answer.
+        max_chars: Characters of answer and snippets after which sources are
+            listed without their snippet, None for no limit.
+
+    Returns:
+        Compact result text.
+    """
+    if not result.answer and not result.sources:
+        return _trim(result.text, max_chars) or "No results found."
+
+    lines = []
+    used = 0
+    if result.answer:
+        answer = _trim(result.answer, answer_chars)
+        lines.append(f"answer: {answer}")
+        used += len(answer)
+    if result.sources:
+        lines.append("sources:")
+    labels = handles or [str(i) for i in range(1, len(result.sources) + 1)]
+    skipped = 0
+    for label, source in zip(labels, result.sources):
+        lines.append(f"[{label}] {source.title or 'Untitled'} - {source.url or 'N/A'}")
+        if not source.snippet:
+            continue
+        snippet = _trim(source.snippet, snippet_chars)
+        if max_chars is not None and used + len(snippet) > max_chars:
+            skipped += 1
+            continue
+        lines.append(f"  {snippet}")
+        used += len(snippet)
+    if skipped:
+        lines.append(
+            f"({skipped} snippets left out to keep this result short, "
+            "their files hold the full text)"
+        )
+    return "\n".join(lines)
+
+
+def render_result(result: SearchResult, topic: str | None) -> str:
+    """
+    Render a search result for the model.
+
+    With source saving enabled, every source is written to the session's
+    source store and the model gets the compact result labelled with the saved
+    files, within the configured character budgets: the full text stays in the
+    files. Otherwise, or when the workspace quota leaves no room to save them,
+    the compact result keeps full snippets.
+
+    Args:
+        result: Search result to render.
+        topic: Research topic the sources are filed under.
+
+    Returns:
+        Text returned by the search tool.
+    """
+    config = get_source_store_config()
+    if not config["enabled"]:
+        return format_compact(result)
+
+    budgets = {
+        "snippet_chars": config["snippet_chars"],
+        "answer_chars": config["answer_chars"],
+        "max_chars": config["max_chars"],
+    }
+    try:
+        saved = get_source_store().save_all(
+            result.sources, topic=topic, query=result.query
+        )
+    except WorkspaceQuotaError as e:
+        logger.warning(f"Not saving sources: {e}")
+        # Nothing on disk holds the full text, so nothing is trimmed
+        return (
+            f"{format_compact(result)}\n\nNote: sources were not saved ({e}); "
+            "their full snippets are shown above"
+        )
+    return format_compact(result, handles=[item.handle for item in saved], **budgets)
+
+
+def format_batch_results(
+    results: dict[str, SearchResult | Exception], topic: str | None = None
+) -> str:
+    """
+    Combine batch results into one compact text keyed by query.
+
+    Args:
+        results: Output of search_batch_async.
+        topic: Research topic the sources are filed under.
+
+    Returns:
+        One section per query, headed by the query itself.
+    """
+    sections = []
+    for query, result in results.items():
+        if isinstance(result, TimeoutError):
+            body = "Search failed: timed out"
+        elif isinstance(result, Exception):
+            body = f"Search failed: {result}"
+        else:
+            body = render_result(result, topic=topic)
+            note = duplicate_note(query, result)
+            if note is not None:
+                body = f"{note}\n{body}"
+        sections.append(f"### {query}\n{body}")
+    return "\n\n".join(sections)
+
 
 @tool
 def linkup_search(query: str) -> str:
@@ -27,46 +360,78 @@ def linkup_search(query: str) -> str:
         query: The query to search for
 
     Returns:
-        The search results
+        The answer and sources (title, url and snippet of each)
     """
-    client = LinkupClient()
-
-    response = client.search(
-        query=query,
-        depth="standard",
-        output_type="sourcedAnswer",
-        include_images=False,
-        include_inline_citations=False,
-    )
-
-    return str(response)
+    return format_compact(search(query=query, provider="linkup"))
 
 
 @tool
-def internet_search(query: str) -> str:
+def internet_search(query: str, topic: str = "general", force: bool = False) -> str:
     """Search the web using the internet
 
     Args:
         query: The query to search for
+        topic: Short snake_case research topic the sources are saved under,
+            matching your research_findings_[topic].md file
+        force: Search even if a near-duplicate query was already searched; only
+            use it when told a result is a near-duplicate and the difference matters
 
     Returns:
         The search results
     """
-    internet_tools = [
-        "linkup_search",
-        # "tavily_search", # If you have tavily credits, you can use it here, just uncomment the row, and make sure to add the tavily api key in secrets manager
-        # Add your favorite internet tools here, make sure to add the api key in secrets manager, and in the variables file
-    ]
-    selected_tool = random.choice(internet_tools)
-    logger.info("Using search tool: %s", selected_tool)
-
-    match selected_tool:
-        case "linkup_search":
-            return linkup_search(query=query)
-        case "tavily_search":
-            return asyncio.run(tavily.tavily_search(query=query))
-        case _:
-            raise ValueError(f"Unknown search tool: {selected_tool}")
+    # Providers are routed by latency and health, configure them with SEARCH_PROVIDERS
+    # (e.g. "linkup,tavily"), make sure to add their api keys in secrets manager, and in the variables file
+    emit_event("search", queries=[query], topic=topic)
+    try:
+        result = search(query=query, force=force)
+    except TimeoutError as e:
+        logger.warning("Search timed out: %s", query)
+        return f"Search failed: {e}"
+    text = render_result(result, topic=topic)
+    note = duplicate_note(query, result)
+    return text if note is None else f"{note}\n{text}"
+
+
+@tool
+def internet_search_batch(
+    queries: list[str], topic: str = "general", force: bool = False
+) -> str:
+    """Search the web for several queries at once
+
+    Duplicate queries are merged and the searches run concurrently, so one call
+    replaces several sequential internet_search calls.
+
+    Args:
+        queries: The queries to search for
+        topic: Short snake_case research topic the sources are saved under,
+            matching your research_findings_[topic].md file
+        force: Search even queries that are near-duplicates of earlier searches;
+            only use it when told a result is a near-duplicate and the difference matters
+
+    Returns:
+        The search results, one section per distinct query
+    """
+    unique = dedupe_queries(queries)
+    max_queries = get_search_batch_max_queries()
+    notes = []
+    if len(unique) < len(queries):
+        notes.append(f"{len(queries) - len(unique)} duplicate queries were merged.")
+    if len(unique) > max_queries:
+        notes.append(
+            f"Only the first {max_queries} queries were searched, "
+            f"skipped: {unique[max_queries:]}"
+        )
+        unique = unique[:max_queries]
+
+    logger.info("Batch searching %d queries", len(unique))
+    emit_event("search", queries=unique, topic=topic)
+    timeout = search_timeout()
+    results = get_search_loop().run(
+        search_batch_async(unique, get_query_log(), force=force, timeout=timeout),
+        # Slow queries time out first, so the batch keeps the completed ones
+        timeout=None if timeout is None else timeout + BATCH_TIMEOUT_GRACE_SECONDS,
+    )
+    return "\n\n".join([format_batch_results(results, topic=topic), *notes])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,64 @@
+"""
+Bounded parallel execution of subagent tasks.
+
+With parallel tool calling enabled, the lead agent runs every `task` call of a
+turn concurrently. This module caps how many of those subagents run at once and
+gives each research subagent a unique file suffix so concurrent subagents never
+write to the same paths in the shared working directory.
+"""
+
+import logging
+import threading
+
+from strands import tool
+
+logger = logging.getLogger("deepsearch.parallel_task")
+
+PARALLEL_FILE_NAMING_NOTE = """
+
+<parallel_execution>
+Other research subagents are running at the same time as you in the same working directory.
+Append the suffix `{suffix}` to your [topic] in EVERY file path you write, for example
+`./research_findings_[topic]{suffix}.md` and `./research_documents_[topic]{suffix}/source_1.md`.
+</parallel_execution>"""
+
+
+def limit_subagent_concurrency(agent, max_concurrency: int) -> None:
+    """
+    Replace the agent's `task` tool with a concurrency-bounded wrapper.
+
+    Args:
+        agent: Deep agent created by create_deep_agent.
+        max_concurrency: Maximum number of subagents running at once.
+    """
+    if max_concurrency < 1:
+        raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+
+    task_tool = agent.tool_registry.registry["task"]
+    slots = threading.BoundedSemaphore(max_concurrency)
+    task_ids_lock = threading.Lock()
+
+    @tool(name="task", description=task_tool.tool_spec["description"])
+    def task(description: str, subagent_type: str) -> str:
+        """
+        Launch an ephemeral subagent to handle a task.
+
+        Args:
+            description: The task or question for the specialized agent
+            subagent_type: The type of agent to use (e.g. custom agent names)
+
+        Returns:
+            The result from the subagent
+        """
+        # The counter lives in the agent state so a resumed run never reuses a suffix
+        with task_ids_lock:
+            task_id = (agent.state.get("subagent_tasks") or 0) + 1
+            agent.state.set("subagent_tasks", task_id)
+        if subagent_type == "research_subagent":
+            description += PARALLEL_FILE_NAMING_NOTE.format(suffix=f"_t{task_id}")
+
+        with slots:
+            logger.info(f"Subagent task {task_id} ({subagent_type}) acquired a slot")
+            return task_tool(description=description, subagent_type=subagent_type)
+
+    agent.tool_registry.registry["task"] = task
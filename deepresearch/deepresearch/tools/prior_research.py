@@ -0,0 +1,82 @@
+"""
+Lookup tool over the research knowledge store (see utils/knowledge_store.py).
+"""
+
+import logging
+
+from strands import tool
+
+from deepresearch.config import get_knowledge_store_config
+from deepresearch.search import SearchSource
+from deepresearch.utils.events import emit_event
+from deepresearch.utils.knowledge_store import get_knowledge_store
+from deepresearch.utils.source_store import get_source_store
+from deepresearch.utils.workspace import WorkspaceQuotaError
+
+logger = logging.getLogger("deepsearch.prior_research")
+
+# Characters of each passage returned to the model
+PASSAGE_CHARS = 1200
+
+
+@tool
+def lookup_prior_research(
+    query: str, topic: str = "general", max_age_days: float | None = None
+) -> str:
+    """Look up findings and sources from earlier research runs before searching the web
+
+    Returns passages of earlier findings files and source documents on the
+    same subject, with their age. Reused sources are saved to this run's
+    source documents so they can be cited like search results.
+
+    Args:
+        query: The topic or question to look up
+        topic: Short snake_case research topic reused sources are saved under,
+            matching your research_findings_[topic].md file
+        max_age_days: Only return research at most this many days old; use a
+            small value for fast-moving subjects (defaults to the configured limit)
+
+    Returns:
+        Matching passages from earlier research, most relevant first
+    """
+    store = get_knowledge_store()
+    if store is None:
+        return "No prior research is available, search the web instead."
+
+    config = get_knowledge_store_config()
+    max_age = config["max_age_days"]
+    if max_age_days is not None:
+        max_age = max(0.0, min(float(max_age_days), max_age))
+    hits = store.search(
+        query,
+        max_age_seconds=max_age * 86400,
+        limit=config["max_results"],
+        min_similarity=config["min_similarity"],
+    )
+    emit_event("prior_research", query=query, topic=topic, hits=len(hits))
+    if not hits:
+        return f"No prior research on this within {max_age:g} days, search the web instead."
+
+    logger.info(f"Found {len(hits)} prior research passages for: {query}")
+    lines = [f"{len(hits)} passages from earlier research (max age {max_age:g} days):"]
+    for hit in hits:
+        text = " ".join(hit.text.split())
+        if len(text) > PASSAGE_CHARS:
+            text = text[:PASSAGE_CHARS].rstrip() + "..."
+        age = f"{hit.age_days:.1f} days old"
+        if hit.kind == "source":
+            try:
+                saved = get_source_store().save(
+                    SearchSource(title=hit.title, url=hit.url or "", snippet=hit.text),
+                    topic=topic,
+                    query=query,
+                    retrieved_at=hit.indexed_at,
+                )
+                location = f"saved as {saved.handle}"
+            except WorkspaceQuotaError as e:
+                location = f"not saved, {e}"
+            lines.append(f"[source, {age}] {hit.title} - {hit.url or 'N/A'} ({location})")
+        else:
+            lines.append(f"[findings on {hit.topic}, {age}]")
+        lines.append(f"  {text}")
+    return "\n".join(lines)
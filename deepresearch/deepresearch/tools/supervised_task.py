@@ -0,0 +1,266 @@
+"""
+Supervised execution of subagent tasks.
+
+The stock `task` tool runs a subagent once and turns any exception into an
+error string, discarding whatever the subagent had already found. The
+supervised tool instead:
+
+- retries a subagent that failed on a transient error (dropped model stream,
+  throttling, timeouts), with exponential backoff and jitter;
+- gives every subagent a wall-clock budget (retries included) and a tool-call
+  budget per attempt. Once a budget is spent, further searches are refused
+  and the subagent gets a few turns to write down its findings; file writes
+  are always allowed. A search in flight is bounded by the time left, so a
+  hung provider call cannot outlive the budget;
+- returns a partial result (the subagent's last findings text and the files
+  it wrote) when it is stopped or keeps failing, so the lead can synthesize
+  with what succeeded.
+"""
+
+import logging
+import threading
+import time
+
+from strands import Agent, tool
+from strands.hooks import BeforeModelCallEvent, BeforeToolCallEvent
+from strands.tools.executors import SequentialToolExecutor
+
+from deepresearch.search import bind_search_deadline, unbind_search_deadline
+from deepresearch.utils.events import emit_event
+from deepresearch.utils.performance import PerformanceHooks
+from deepresearch.utils.retry import backoff_delay, is_retryable_error
+
+logger = logging.getLogger("deepsearch.supervised_task")
+
+# Tools a subagent may still use after its budget is spent, to save findings
+WRAPUP_TOOLS = frozenset({"file_write", "editor"})
+
+BUDGET_EXHAUSTED_NOTE = (
+    "Your {budget} budget for this task is spent, so this call was not run. "
+    "Do not search any further: write your findings so far to your findings file "
+    "now and finish with a short summary."
+)
+
+
+class SubagentBudgetExceeded(Exception):
+    """Raised inside a subagent that kept working after its budget was spent."""
+
+
+class SubagentBudget:
+    """Wall-clock and tool-call budget of one subagent attempt."""
+
+    def __init__(
+        self,
+        deadline: float | None,
+        max_tool_calls: int,
+        wrapup_turns: int,
+    ):
+        """
+        Initialize the budget.
+
+        Args:
+            deadline: time.monotonic() deadline shared by all attempts, or None.
+            max_tool_calls: Tool calls allowed in this attempt (0 for no limit).
+            wrapup_turns: Model turns allowed once the budget is spent.
+        """
+        self.deadline = deadline
+        self.max_tool_calls = max_tool_calls
+        self.wrapup_turns = wrapup_turns
+        self.tool_calls = 0
+        self.wrapup_calls = 0
+        self.refused_calls = 0
+        self._lock = threading.Lock()
+
+    def exhausted(self) -> str | None:
+        """Name of the spent budget ("time" or "tool call"), or None."""
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return "time"
+        if self.max_tool_calls and self.tool_calls >= self.max_tool_calls:
+            return "tool call"
+        return None
+
+    def before_tool_call(self, event: BeforeToolCallEvent) -> None:
+        with self._lock:
+            budget = self.exhausted()
+            if budget is not None and event.tool_use["name"] not in WRAPUP_TOOLS:
+                self.refused_calls += 1
+                event.cancel_tool = BUDGET_EXHAUSTED_NOTE.format(budget=budget)
+                return
+            self.tool_calls += 1
+
+    def before_model_call(self, event: BeforeModelCallEvent) -> None:
+        with self._lock:
+            budget = self.exhausted()
+            # Wrap-up turns start once the subagent has been told its budget is spent
+            if budget is None or (budget == "tool call" and not self.refused_calls):
+                return
+            if self.wrapup_calls >= self.wrapup_turns:
+                raise SubagentBudgetExceeded(f"{budget} budget exhausted")
+            self.wrapup_calls += 1
+
+    def attach(self, agent) -> None:
+        """Enforce the budget on an agent through its hooks."""
+        agent.hooks.add_callback(BeforeToolCallEvent, self.before_tool_call)
+        agent.hooks.add_callback(BeforeModelCallEvent, self.before_model_call)
+
+
+def _budget_error(error: BaseException) -> SubagentBudgetExceeded | None:
+    while error is not None:
+        if isinstance(error, SubagentBudgetExceeded):
+            return error
+        error = error.__cause__ or error.__context__
+    return None
+
+
+def partial_result(agent, reason: str) -> str | None:
+    """
+    Summarize what an interrupted subagent produced.
+
+    Args:
+        agent: The subagent.
+        reason: Why it was interrupted.
+
+    Returns:
+        Its last findings text and the files it wrote, or None if it produced
+        neither.
+    """
+    last_text = ""
+    files = []
+    for message in agent.messages:
+        if message["role"] != "assistant":
+            continue
+        texts = [block["text"] for block in message["content"] if block.get("text")]
+        if texts:
+            last_text = "\n".join(texts)
+        for block in message["content"]:
+            tool_use = block.get("toolUse")
+            if tool_use and tool_use["name"] in WRAPUP_TOOLS:
+                path = tool_use.get("input", {}).get("path")
+                if path and path not in files:
+                    files.append(path)
+
+    if not last_text and not files:
+        return None
+    parts = [f"[Partial result: the subagent was stopped ({reason})]"]
+    if last_text:
+        parts.append(last_text)
+    if files:
+        parts.append("Files written:\n" + "\n".join(f"- {path}" for path in files))
+    return "\n\n".join(parts)
+
+
+def supervise_subagents(
+    agent,
+    subagents,
+    disable_parallel_tool_calling: bool,
+    config: dict,
+) -> None:
+    """
+    Replace the agent's `task` tool with a supervised one for the given subagents.
+
+    Subagent types not listed are still run by the original tool. Apply before
+    the other `task` wrappers (events, concurrency, checkpoints).
+
+    Args:
+        agent: Deep agent created by create_deep_agent.
+        subagents: SubAgent definitions (name, prompt, tools, model).
+        disable_parallel_tool_calling: Run each subagent's tool calls sequentially.
+        config: Settings from get_subagent_supervision_config.
+    """
+    task_tool = agent.tool_registry.registry["task"]
+    configs = {subagent["name"]: subagent for subagent in subagents}
+
+    def create_subagent(subagent_type: str):
+        subagent = configs[subagent_type]
+        agent_kwargs = {
+            "system_prompt": subagent.get("prompt", ""),
+            "tools": subagent["tools"],
+            "model": subagent["model"],
+        }
+        if subagent.get("disable_parallel_tool_calling", disable_parallel_tool_calling):
+            agent_kwargs["tool_executor"] = SequentialToolExecutor()
+        subagent = Agent(**agent_kwargs)
+        PerformanceHooks(subagent_type).attach(subagent)
+        return subagent
+
+    def run_supervised(description: str, subagent_type: str, deadline: float | None) -> str:
+        # Attempts of one task, retried within its wall-clock deadline
+        partial = None
+        error = None
+        for attempt in range(1, config["max_retries"] + 2):
+            subagent = create_subagent(subagent_type)
+            budget = SubagentBudget(
+                deadline, config["max_tool_calls"], config["wrapup_turns"]
+            )
+            budget.attach(subagent)
+            try:
+                result = str(subagent(description))
+                if budget.refused_calls:
+                    logger.info(
+                        f"Subagent '{subagent_type}' finished after its budget was spent "
+                        f"({budget.tool_calls} tool calls, {budget.refused_calls} refused)"
+                    )
+                return result
+            except Exception as e:
+                error = e
+                partial = partial_result(subagent, reason=str(e)) or partial
+                if _budget_error(e) is not None:
+                    logger.warning(f"Subagent '{subagent_type}' stopped: {e}")
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if (
+                    not is_retryable_error(e)
+                    or attempt > config["max_retries"]
+                    or (remaining is not None and remaining <= 0)
+                ):
+                    logger.error(f"Subagent '{subagent_type}' failed: {e}")
+                    break
+                delay = backoff_delay(
+                    attempt, config["retry_base_seconds"], config["retry_max_seconds"]
+                )
+                if remaining is not None:
+                    delay = min(delay, remaining)
+                logger.warning(
+                    f"Subagent '{subagent_type}' failed on a transient error "
+                    f"(attempt {attempt}): {e}; retrying in {delay:.1f}s"
+                )
+                emit_event(
+                    "subagent_retry",
+                    subagent_type=subagent_type,
+                    attempt=attempt,
+                    delay=round(delay, 2),
+                    error=str(e)[:200],
+                )
+                time.sleep(delay)
+
+        if partial is not None:
+            return partial
+        return f"Error in {subagent_type}: {error}"
+
+    @tool(name="task", description=task_tool.tool_spec["description"])
+    def task(description: str, subagent_type: str) -> str:
+        """
+        Launch an ephemeral subagent to handle a task.
+
+        Args:
+            description: The task or question for the specialized agent
+            subagent_type: The type of agent to use (e.g. custom agent names)
+
+        Returns:
+            The result from the subagent
+        """
+        if subagent_type not in configs:
+            return task_tool(description=description, subagent_type=subagent_type)
+
+        deadline = None
+        if config["timeout_seconds"] > 0:
+            deadline = time.monotonic() + config["timeout_seconds"]
+
+        token = bind_search_deadline(deadline) if deadline is not None else None
+        try:
+            return run_supervised(description, subagent_type, deadline)
+        finally:
+            if token is not None:
+                unbind_search_deadline(token)
+
+    agent.tool_registry.registry["task"] = task
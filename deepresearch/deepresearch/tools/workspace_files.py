@@ -0,0 +1,134 @@
+"""
+Workspace-aware versions of the strands file tools (file_read, file_write, editor).
+
+The tools keep their names and specs, but resolve every path against the
+session workspace bound for the current invocation (see utils/workspace.py),
+reject paths outside it and enforce its size quota. Without a bound workspace
+(local runs) they behave exactly like the originals.
+
+create_deep_agent always adds the stock file tools to the lead agent, so they
+are swapped in afterwards with use_workspace_file_tools.
+"""
+
+import logging
+from typing import Any
+
+from strands.tools.tools import PythonAgentTool
+from strands.types._events import ToolResultEvent
+from strands.types.tools import AgentTool, ToolGenerator, ToolResult, ToolSpec, ToolUse
+from strands_tools import editor as strands_editor
+from strands_tools import file_read as strands_file_read
+from strands_tools import file_write as strands_file_write
+
+from deepresearch.utils.workspace import WorkspaceError, get_current_workspace
+
+logger = logging.getLogger("deepsearch.workspace")
+
+
+def _error(tool: ToolUse, message: str) -> ToolResult:
+    return {
+        "toolUseId": tool["toolUseId"],
+        "status": "error",
+        "content": [{"text": message}],
+    }
+
+
+def _with_input(tool: ToolUse, tool_input: dict[str, Any]) -> ToolUse:
+    return {**tool, "input": tool_input}
+
+
+def _file_read(tool: ToolUse, **kwargs: Any) -> ToolResult:
+    workspace = get_current_workspace()
+    if workspace is None:
+        return strands_file_read.file_read(tool, **kwargs)
+
+    tool_input = dict(tool["input"])
+    try:
+        if tool_input.get("path"):
+            tool_input["path"] = ",".join(
+                str(workspace.resolve(part.strip()))
+                for part in tool_input["path"].split(",")
+            )
+        if tool_input.get("comparison_path"):
+            tool_input["comparison_path"] = str(
+                workspace.resolve(tool_input["comparison_path"])
+            )
+    except WorkspaceError as e:
+        return _error(tool, str(e))
+    return strands_file_read.file_read(_with_input(tool, tool_input), **kwargs)
+
+
+def _file_write(tool: ToolUse, **kwargs: Any) -> ToolResult:
+    workspace = get_current_workspace()
+    if workspace is None:
+        return strands_file_write.file_write(tool, **kwargs)
+
+    tool_input = dict(tool["input"])
+    try:
+        path = workspace.resolve(tool_input["path"])
+        workspace.ensure_capacity(
+            len(tool_input.get("content", "").encode("utf-8")), replacing=path
+        )
+    except WorkspaceError as e:
+        logger.warning(f"Rejected file_write: {e}")
+        return _error(tool, str(e))
+    tool_input["path"] = str(path)
+    return strands_file_write.file_write(_with_input(tool, tool_input), **kwargs)
+
+
+class _WorkspaceEditor(AgentTool):
+    """The strands editor tool, with paths resolved against the bound workspace."""
+
+    def __init__(self, tool: AgentTool):
+        super().__init__()
+        self._tool = tool
+
+    @property
+    def tool_name(self) -> str:
+        return self._tool.tool_name
+
+    @property
+    def tool_spec(self) -> ToolSpec:
+        return self._tool.tool_spec
+
+    @property
+    def tool_type(self) -> str:
+        return self._tool.tool_type
+
+    async def stream(
+        self, tool_use: ToolUse, invocation_state: dict[str, Any], **kwargs: Any
+    ) -> ToolGenerator:
+        workspace = get_current_workspace()
+        if workspace is not None:
+            tool_input = dict(tool_use["input"])
+            try:
+                path = workspace.resolve(tool_input["path"])
+                added = tool_input.get("file_text") or tool_input.get("new_str") or ""
+                workspace.ensure_capacity(
+                    len(added.encode("utf-8")),
+                    replacing=path if tool_input.get("command") == "create" else None,
+                )
+            except WorkspaceError as e:
+                logger.warning(f"Rejected editor call: {e}")
+                yield ToolResultEvent(_error(tool_use, str(e)))
+                return
+            tool_input["path"] = str(path)
+            tool_use = _with_input(tool_use, tool_input)
+        async for event in self._tool.stream(tool_use, invocation_state, **kwargs):
+            yield event
+
+
+file_read = PythonAgentTool("file_read", strands_file_read.TOOL_SPEC, _file_read)
+file_write = PythonAgentTool("file_write", strands_file_write.TOOL_SPEC, _file_write)
+editor = _WorkspaceEditor(strands_editor.editor)
+
+
+def use_workspace_file_tools(agent) -> None:
+    """
+    Replace the stock file tools registered on an agent with the workspace-aware ones.
+
+    Args:
+        agent: Agent created by create_deep_agent.
+    """
+    for workspace_tool in (file_read, file_write, editor):
+        agent.tool_registry.registry[workspace_tool.tool_name] = workspace_tool
@@ -0,0 +1,341 @@
+"""
+Durable checkpoints of a research run, and resuming from them.
+
+A run is checkpointed to one JSON file per session in its working directory
+(`.checkpoints/<session_id>.json`) every time a message is added to the lead
+agent's conversation and every time a subagent finishes. A checkpoint holds
+the conversation, the agent state (todos, subagent task counter), the results
+of completed subagent tasks and the findings files written so far.
+
+Resuming rebuilds the agent, restores its conversation and state, and
+continues the agent loop from the last checkpoint instead of starting over.
+Tool calls that were cut off by the failure get a tool result: the recorded
+subagent result if that subagent had finished, an "interrupted" note
+otherwise. A subagent task the lead issues again with the same description
+returns its recorded result without running the subagent a second time, and
+findings files stay on disk in the workspace.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from deepresearch.utils.events import emit_event
+from deepresearch.utils.s3_outputs import FINDINGS_PATTERN
+
+logger = logging.getLogger("deepsearch.checkpoint")
+
+CHECKPOINT_DIR = ".checkpoints"
+CHECKPOINT_VERSION = 1
+
+INTERRUPTED_TOOL_RESULT = (
+    "This tool call was interrupted by an error before it returned. "
+    "Call the tool again if its result is still needed."
+)
+
+
+def _task_key(subagent_type: str, description: str) -> str:
+    return hashlib.sha256(f"{subagent_type}\n{description}".encode()).hexdigest()[:16]
+
+
+class CheckpointStore:
+    """Atomic JSON checkpoint file of one session."""
+
+    def __init__(self, working_dir: Path | str, session_id: str):
+        """
+        Initialize the store.
+
+        Args:
+            working_dir: Directory of the run (the session workspace).
+            session_id: Session identifier, used as file name.
+        """
+        safe_id = re.sub(r"[^A-Za-z0-9_.-]", "_", session_id)
+        self.working_dir = Path(working_dir)
+        self.path = self.working_dir / CHECKPOINT_DIR / f"{safe_id}.json"
+
+    def load(self) -> dict | None:
+        """
+        Read the checkpoint.
+
+        Returns:
+            The checkpoint, or None if there is none or it cannot be read.
+        """
+        try:
+            checkpoint = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {self.path}: {e}")
+            return None
+        if checkpoint.get("version") != CHECKPOINT_VERSION:
+            logger.warning(f"Ignoring checkpoint {self.path} with unknown version")
+            return None
+        return checkpoint
+
+    def save(self, checkpoint: dict) -> None:
+        """
+        Write the checkpoint atomically (a crash never leaves a partial file).
+
+        Args:
+            checkpoint: JSON-serializable checkpoint.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(checkpoint), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+
+class AgentCheckpointer:
+    """Checkpoints one agent after every conversation and subagent step."""
+
+    def __init__(
+        self,
+        store: CheckpointStore,
+        prompt: str,
+        subagent_results: dict | None = None,
+    ):
+        """
+        Initialize the checkpointer.
+
+        Args:
+            store: Checkpoint file of the session.
+            prompt: Research question of the run.
+            subagent_results: Results of subagent tasks completed by earlier
+                attempts, keyed by task.
+        """
+        self.store = store
+        self.prompt = prompt
+        self.subagent_results: dict[str, dict] = dict(subagent_results or {})
+        self.agent = None
+        self._lock = threading.Lock()
+        self.saves = 0
+        self.reused_subagents = 0
+
+    def attach(self, agent) -> None:
+        """
+        Checkpoint the agent on every added message and completed subagent.
+
+        Apply after the other `task` tool wrappers, so recorded results are
+        returned before a subagent takes a concurrency slot.
+
+        Args:
+            agent: Deep agent created by create_deep_agent.
+        """
+        from strands import tool
+        from strands.hooks import MessageAddedEvent
+
+        self.agent = agent
+        agent.hooks.add_callback(MessageAddedEvent, lambda event: self.save())
+
+        task_tool = agent.tool_registry.registry["task"]
+
+        @tool(name="task", description=task_tool.tool_spec["description"])
+        def task(description: str, subagent_type: str) -> str:
+            """
+            Launch an ephemeral subagent to handle a task.
+
+            Args:
+                description: The task or question for the specialized agent
+                subagent_type: The type of agent to use (e.g. custom agent names)
+
+            Returns:
+                The result from the subagent
+            """
+            key = _task_key(subagent_type, description)
+            with self._lock:
+                recorded = self.subagent_results.get(key)
+            if recorded is not None:
+                self.reused_subagents += 1
+                logger.info(f"Reusing the recorded result of subagent task {key}")
+                return recorded["result"]
+
+            result = task_tool(description=description, subagent_type=subagent_type)
+            with self._lock:
+                self.subagent_results[key] = {
+                    "subagent_type": subagent_type,
+                    "description": description,
+                    "result": str(result),
+                }
+            self.save()
+            return result
+
+        agent.tool_registry.registry["task"] = task
+
+    def save(self, status: str = "running", error: str | None = None) -> None:
+        """
+        Write a checkpoint of the attached agent.
+
+        Args:
+            status: "running", "completed" or "failed".
+            error: Error that ended the attempt, for failed checkpoints.
+        """
+        from strands.types.session import encode_bytes_values
+
+        with self._lock:
+            checkpoint = {
+                "version": CHECKPOINT_VERSION,
+                "prompt": self.prompt,
+                "status": status,
+                "error": error,
+                "updated_at": time.time(),
+                "messages": encode_bytes_values(list(self.agent.messages)),
+                "state": self.agent.state.get(),
+                "subagent_results": self.subagent_results,
+                "findings": sorted(
+                    path.name
+                    for path in self.store.working_dir.glob(f"{FINDINGS_PATTERN}*")
+                ),
+            }
+            try:
+                self.store.save(checkpoint)
+                self.saves += 1
+            except (OSError, TypeError, ValueError) as e:
+                # A missed checkpoint only costs more work on resume; never fail the run
+                logger.warning(f"Failed to write checkpoint: {e}")
+
+    def restore(self, checkpoint: dict) -> None:
+        """
+        Restore the attached agent's conversation and state from a checkpoint.
+
+        Tool calls left without a result by the failure are answered with the
+        recorded subagent result, if any, or an "interrupted" note, so the
+        conversation ends with a user turn the agent loop can continue from.
+
+        Args:
+            checkpoint: Checkpoint read from the store.
+        """
+        from strands.types.session import decode_bytes_values
+
+        messages = decode_bytes_values(checkpoint["messages"])
+        if messages and messages[-1]["role"] == "assistant":
+            tool_results = []
+            for block in messages[-1]["content"]:
+                tool_use = block.get("toolUse")
+                if not tool_use:
+                    continue
+                text = INTERRUPTED_TOOL_RESULT
+                status = "error"
+                if tool_use["name"] == "task":
+                    tool_input = tool_use.get("input", {})
+                    recorded = self.subagent_results.get(
+                        _task_key(
+                            tool_input.get("subagent_type", ""),
+                            tool_input.get("description", ""),
+                        )
+                    )
+                    if recorded is not None:
+                        text, status = recorded["result"], "success"
+                tool_results.append(
+                    {
+                        "toolResult": {
+                            "toolUseId": tool_use["toolUseId"],
+                            "status": status,
+                            "content": [{"text": text}],
+                        }
+                    }
+                )
+            if tool_results:
+                messages.append({"role": "user", "content": tool_results})
+
+        self.agent.messages = messages
+        for key, value in checkpoint.get("state", {}).items():
+            self.agent.state.set(key, value)
+        logger.info(
+            f"Restored checkpoint with {len(messages)} messages, "
+            f"{len(self.subagent_results)} completed subagent tasks and "
+            f"{len(checkpoint.get('findings', []))} findings files"
+        )
+
+
+def is_resumable(checkpoint: dict | None) -> bool:
+    """Whether a checkpoint holds an unfinished run with progress to keep."""
+    return bool(
+        checkpoint and checkpoint.get("status") != "completed" and checkpoint.get("messages")
+    )
+
+
+def run_with_checkpoints(
+    create_agent: Callable[[], Any],
+    prompt: str,
+    run: Callable[[Any, str | None], Any],
+    store: CheckpointStore | None,
+    resume: bool = False,
+    max_resumes: int = 2,
+    retry_delay: float = 5.0,
+    is_retryable: Callable[[Exception], bool] = lambda e: False,
+) -> Any:
+    """
+    Run an agent, resuming from its last checkpoint after retryable errors.
+
+    Args:
+        create_agent: Builds a fresh agent for each attempt.
+        prompt: Research question (a resumed run keeps the checkpoint's).
+        run: Runs an agent with a prompt, or with None to continue its restored
+            conversation, and returns the result.
+        store: Checkpoint file of the session, or None to retry from scratch.
+        resume: Continue from an existing checkpoint of an earlier run.
+        max_resumes: Attempts after the first one, for retryable errors.
+        retry_delay: Seconds to wait before resuming.
+        is_retryable: Whether an error is transient and worth resuming after.
+
+    Returns:
+        The result of `run`.
+    """
+    checkpoint = store.load() if store is not None and resume else None
+    if resume and not is_resumable(checkpoint):
+        logger.info("No unfinished checkpoint to resume, starting a new run")
+        checkpoint = None
+    if checkpoint is not None:
+        prompt = checkpoint.get("prompt") or prompt
+
+    for attempt in range(max_resumes + 1):
+        agent = create_agent()
+        checkpointer = None
+        if store is not None:
+            checkpointer = AgentCheckpointer(
+                store,
+                prompt,
+                subagent_results=checkpoint.get("subagent_results") if checkpoint else None,
+            )
+            checkpointer.attach(agent)
+
+        if checkpointer is not None and is_resumable(checkpoint):
+            checkpointer.restore(checkpoint)
+            emit_event(
+                "resumed",
+                attempt=attempt + 1,
+                messages=len(checkpoint["messages"]),
+                subagents_completed=len(checkpointer.subagent_results),
+            )
+            agent_input = None
+        else:
+            agent_input = prompt
+
+        try:
+            result = run(agent, agent_input)
+        except Exception as e:
+            if checkpointer is not None:
+                checkpointer.save(status="failed", error=str(e))
+            if attempt >= max_resumes or not is_retryable(e):
+                raise
+            logger.warning(
+                f"Retryable error (attempt {attempt + 1}/{max_resumes + 1}): {e}; "
+                f"resuming from the last checkpoint in {retry_delay}s"
+            )
+            time.sleep(retry_delay)
+            checkpoint = store.load() if store is not None else None
+            continue
+
+        if checkpointer is not None:
+            checkpointer.save(status="completed")
+            logger.info(
+                f"Run completed with {checkpointer.saves} checkpoints, "
+                f"{checkpointer.reused_subagents} subagent results reused"
+            )
+        return result
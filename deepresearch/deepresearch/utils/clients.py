@@ -0,0 +1,140 @@
+"""
+Search provider client registry for DeepSearch agent.
+
+Each search backend client is created once per process and shared by every
+subagent and every invocation served by a warm runtime, so HTTP keep-alive
+connections are reused instead of paying a TLS handshake per search.
+
+The Linkup client lives in deepresearch.utils.linkup_client and is imported on
+first use, so a runtime that only searches with Tavily never loads the SDK.
+"""
+
+import logging
+import threading
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable
+
+import httpx
+
+from deepresearch.config import get_http_pool_config
+from deepresearch.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from deepresearch.utils.linkup_client import PooledLinkupClient
+
+__getattr__, __dir__ = lazy_exports(
+    __name__, {"PooledLinkupClient": "deepresearch.utils.linkup_client"}
+)
+
+logger = logging.getLogger("deepsearch.clients")
+
+CLIENT_CLOSE_TIMEOUT_SECONDS = 5.0
+
+
+def get_http_limits() -> httpx.Limits:
+    """
+    Build httpx pool limits from configuration.
+
+    Returns:
+        httpx.Limits for provider clients.
+    """
+    config = get_http_pool_config()
+    return httpx.Limits(
+        max_connections=config["max_connections"],
+        max_keepalive_connections=config["max_keepalive_connections"],
+        keepalive_expiry=config["keepalive_expiry"],
+    )
+
+
+def get_http_timeout() -> httpx.Timeout:
+    """
+    Build the httpx timeout of provider requests from configuration.
+
+    Returns:
+        httpx.Timeout for provider clients.
+    """
+    return httpx.Timeout(get_http_pool_config()["timeout"])
+
+
+def _close_client(name: str, client: Any) -> None:
+    if hasattr(client, "aclose"):
+        from deepresearch.search.loop import get_search_loop
+
+        try:
+            get_search_loop().run(client.aclose(), timeout=CLIENT_CLOSE_TIMEOUT_SECONDS)
+        except Exception as e:
+            logger.warning(f"Failed to close '{name}' client: {e}")
+    if hasattr(client, "close"):
+        client.close()
+
+
+class ClientRegistry:
+    """Thread-safe registry creating each named client exactly once."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._clients: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str, factory: Callable[[], Any]) -> Any:
+        """
+        Get a client by name, creating it with factory on first use.
+
+        Args:
+            name: Client name (e.g. "linkup").
+            factory: Zero-argument callable building the client.
+
+        Returns:
+            The shared client instance.
+        """
+        client = self._clients.get(name)
+        if client is not None:
+            return client
+
+        with self._lock:
+            client = self._clients.get(name)
+            if client is None:
+                logger.info(f"Creating shared '{name}' client")
+                client = factory()
+                self._clients[name] = client
+        return client
+
+    def reset(self, name: str | None = None) -> None:
+        """
+        Close and drop one client, or all clients if name is None.
+
+        Async clients (search providers, the Linkup client's async pool) are
+        closed on the search event loop they were used on.
+
+        Args:
+            name: Client name to reset, or None for every client.
+        """
+        with self._lock:
+            names = [name] if name is not None else list(self._clients)
+            dropped = [(n, self._clients.pop(n, None)) for n in names]
+        for client_name, client in dropped:
+            if client is not None:
+                _close_client(client_name, client)
+
+
+@lru_cache(maxsize=1)
+def get_client_registry() -> ClientRegistry:
+    """
+    Get the process-wide client registry.
+
+    Returns:
+        Shared ClientRegistry instance.
+    """
+    return ClientRegistry()
+
+
+def get_linkup_client() -> "PooledLinkupClient":
+    """
+    Get the shared, connection-pooled Linkup client.
+
+    Returns:
+        PooledLinkupClient instance.
+    """
+    from deepresearch.utils.linkup_client import PooledLinkupClient
+
+    return get_client_registry().get("linkup", PooledLinkupClient)
@@ -0,0 +1,169 @@
+"""
+Context compaction for the research lead's conversation.
+
+A lead run is a single agent invocation, so the conversation manager strands
+applies at the end of an invocation never trims it while it runs: every
+subagent report, findings file read and report draft stays in the context of
+every following model call. CompactingConversationManager bounds it:
+- Before each model call, tool results and file_write contents outside the
+  latest messages that are longer than a budget are replaced by an extractive
+  summary and a pointer to the full text (the file on disk, where there is one)
+- When the conversation is still above its size limit, every message but the
+  newest is compacted the same way
+- On a context window overflow, the newest message is compacted too, and only
+  then the sliding window drops the oldest messages
+
+The findings digest is already a bounded summary the lead synthesizes from, so
+it is left whole, and only compacted on a context window overflow, with a
+pointer to call read_findings_digest again.
+
+The files themselves are never changed, so the citation stage still works on
+the full source documents.
+"""
+
+import logging
+from typing import Any
+
+from strands.agent.conversation_manager import SlidingWindowConversationManager
+
+from deepresearch.utils.findings_digest import extract_summary
+
+logger = logging.getLogger("deepsearch.compaction")
+
+COMPACTED_PREFIX = "[Compacted "
+
+# Tools whose input holds a document written to disk
+_WRITE_TOOLS = frozenset({"file_write"})
+
+# Tools whose results are only compacted on a context window overflow
+_DIGEST_TOOLS = frozenset({"read_findings_digest"})
+
+
+def _pointer(tool_use: dict | None) -> str:
+    if tool_use is None:
+        return ""
+    path = tool_use.get("input", {}).get("path")
+    if tool_use.get("name") == "file_read" and path:
+        return f"; full text in {path}"
+    if tool_use.get("name") == "task":
+        return "; the subagent's findings file holds its full findings"
+    if tool_use.get("name") in _DIGEST_TOOLS:
+        return f"; call {tool_use['name']} again for the full digest"
+    return ""
+
+
+class CompactingConversationManager(SlidingWindowConversationManager):
+    """Sliding window that compacts large tool results before trimming messages."""
+
+    def __init__(
+        self,
+        keep_recent_messages: int = 6,
+        result_chars: int = 1500,
+        max_context_chars: int = 200000,
+        window_size: int = 40,
+    ):
+        """
+        Initialize the manager.
+
+        Args:
+            keep_recent_messages: Latest messages never compacted before a call.
+            result_chars: Length above which a tool result or file_write
+                content is compacted, and length of its summary.
+            max_context_chars: Conversation size above which all messages but
+                the newest are compacted.
+            window_size: Messages kept by the sliding window.
+        """
+        super().__init__(window_size=window_size, should_truncate_results=True)
+        self.keep_recent_messages = keep_recent_messages
+        self.result_chars = result_chars
+        self.max_context_chars = max_context_chars
+        self.compacted_chars = 0
+
+    def attach(self, agent) -> None:
+        """Compact the agent's conversation before each of its model calls."""
+        from strands.hooks import BeforeModelCallEvent
+
+        agent.hooks.add_callback(BeforeModelCallEvent, self.before_model_call)
+
+    def before_model_call(self, event) -> None:
+        messages = event.agent.messages
+        saved = self.compact(messages, keep_recent=self.keep_recent_messages)
+        if _conversation_chars(messages) > self.max_context_chars:
+            saved += self.compact(messages, keep_recent=1)
+        if saved:
+            logger.info(
+                f"Compacted {saved} chars of the lead conversation "
+                f"({_conversation_chars(messages)} chars left)"
+            )
+
+    def compact(
+        self, messages: list[dict], keep_recent: int, include_digest: bool = False
+    ) -> int:
+        """
+        Compact large tool results and file_write contents in place.
+
+        Args:
+            messages: Conversation to compact.
+            keep_recent: Number of latest messages left untouched.
+            include_digest: Compact findings digest results too.
+
+        Returns:
+            Number of characters removed.
+        """
+        tool_uses = {
+            block["toolUse"]["toolUseId"]: block["toolUse"]
+            for message in messages
+            for block in message["content"]
+            if "toolUse" in block
+        }
+        saved = 0
+        for message in messages[: max(0, len(messages) - keep_recent)]:
+            for block in message["content"]:
+                if "toolResult" in block:
+                    result = block["toolResult"]
+                    tool_use = tool_uses.get(result.get("toolUseId"))
+                    if not include_digest and tool_use and tool_use.get("name") in _DIGEST_TOOLS:
+                        continue
+                    pointer = _pointer(tool_use)
+                    for item in result.get("content", []):
+                        if "text" in item:
+                            saved += self._compact_text(item, "text", pointer)
+                elif "toolUse" in block and block["toolUse"].get("name") in _WRITE_TOOLS:
+                    tool_input = block["toolUse"].get("input", {})
+                    if isinstance(tool_input.get("content"), str):
+                        pointer = f"; written to {tool_input.get('path', 'a file')}"
+                        saved += self._compact_text(tool_input, "content", pointer)
+        self.compacted_chars += saved
+        return saved
+
+    def _compact_text(self, container: dict, key: str, pointer: str) -> int:
+        text = container[key]
+        if len(text) <= self.result_chars or text.startswith(COMPACTED_PREFIX):
+            return 0
+        summary = extract_summary(text, self.result_chars)
+        container[key] = f"{COMPACTED_PREFIX}from {len(text)} chars{pointer}]\n{summary}"
+        return len(text) - len(container[key])
+
+    def reduce_context(self, agent, e: Exception | None = None, **kwargs: Any) -> None:
+        """Compact the whole conversation, and only trim it if that saves nothing."""
+        if self.compact(agent.messages, keep_recent=0, include_digest=True):
+            logger.warning("Context window overflow, compacted the whole lead conversation")
+            return
+        super().reduce_context(agent, e=e, **kwargs)
+
+
+def _conversation_chars(messages: list[dict]) -> int:
+    total = 0
+    for message in messages:
+        for block in message["content"]:
+            if "text" in block:
+                total += len(block["text"])
+            elif "toolResult" in block:
+                total += sum(
+                    len(item.get("text", "")) for item in block["toolResult"].get("content", [])
+                )
+            elif "toolUse" in block:
+                content = block["toolUse"].get("input", {}).get("content")
+                if isinstance(content, str):
+                    total += len(content)
+    return total
@@ -0,0 +1,170 @@
+"""
+Structured progress events for streaming invocations.
+
+A streaming invocation binds an EventChannel for its context. The lead agent's
+stream, the search tools and the subagent `task` tool then emit events (todos
+written, subagent started/finished, search issued, report text, outputs) from
+whatever thread they run on, and the runtime entrypoint yields them to the
+caller as they arrive. Without a bound channel emit_event does nothing.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from contextvars import ContextVar, Token
+from typing import Any, AsyncIterator
+
+logger = logging.getLogger("deepsearch.events")
+
+_DESCRIPTION_PREVIEW_CHARS = 200
+
+
+class EventChannel:
+    """Thread-safe queue of events consumed on one asyncio event loop."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        """
+        Initialize the channel.
+
+        Args:
+            loop: Event loop the events are consumed on.
+        """
+        self._loop = loop
+        self._queue: asyncio.Queue[dict | None] = asyncio.Queue()
+        self._start = time.monotonic()
+        self.emitted = 0
+
+    def emit(self, event_type: str, **data: Any) -> None:
+        """
+        Publish an event. Safe to call from any thread.
+
+        Args:
+            event_type: Event type (e.g. "search", "subagent_started").
+            **data: JSON-serializable event fields.
+        """
+        event = {
+            "type": event_type,
+            "elapsed": round(time.monotonic() - self._start, 3),
+            **data,
+        }
+        self.emitted += 1
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, event)
+
+    def close(self) -> None:
+        """Mark the end of the stream. Safe to call from any thread."""
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, None)
+
+    async def events(self) -> AsyncIterator[dict]:
+        """Yield events until the channel is closed."""
+        while (event := await self._queue.get()) is not None:
+            yield event
+
+
+_current_channel: ContextVar[EventChannel | None] = ContextVar(
+    "deepsearch_event_channel", default=None
+)
+
+
+def bind_event_channel(channel: EventChannel) -> Token:
+    """
+    Make a channel the current one for this context (one streaming invocation).
+
+    Args:
+        channel: Channel of the invocation.
+
+    Returns:
+        Token to pass to unbind_event_channel.
+    """
+    return _current_channel.set(channel)
+
+
+def unbind_event_channel(token: Token) -> None:
+    """Restore the channel that was current before bind_event_channel."""
+    _current_channel.reset(token)
+
+
+def get_event_channel() -> EventChannel | None:
+    """Get the channel bound to this context, if any."""
+    return _current_channel.get()
+
+
+def emit_event(event_type: str, **data: Any) -> None:
+    """
+    Publish an event on the current channel, if the invocation is streaming.
+
+    Args:
+        event_type: Event type.
+        **data: JSON-serializable event fields.
+    """
+    channel = _current_channel.get()
+    if channel is not None:
+        channel.emit(event_type, **data)
+
+
+def emit_agent_event(event: dict) -> None:
+    """
+    Translate an event from the lead agent's stream_async into progress events.
+
+    Text deltas become "text" events and write_todos calls become "todos"
+    events; everything else is dropped.
+
+    Args:
+        event: Event yielded by Agent.stream_async.
+    """
+    if "data" in event and event["data"]:
+        emit_event("text", text=event["data"])
+    message = event.get("message")
+    if message and message.get("role") == "assistant":
+        for block in message.get("content", []):
+            tool_use = block.get("toolUse")
+            if tool_use and tool_use.get("name") == "write_todos":
+                emit_event("todos", todos=tool_use.get("input", {}).get("todos", []))
+
+
+def track_subagents(agent) -> None:
+    """
+    Wrap the agent's `task` tool so every subagent run emits start/finish events.
+
+    Apply before limit_subagent_concurrency so a subagent is reported as
+    started once it holds a concurrency slot.
+
+    Args:
+        agent: Deep agent created by create_deep_agent.
+    """
+    from strands import tool
+
+    task_tool = agent.tool_registry.registry["task"]
+    task_ids = itertools.count(1)
+
+    @tool(name="task", description=task_tool.tool_spec["description"])
+    def task(description: str, subagent_type: str) -> str:
+        """
+        Launch an ephemeral subagent to handle a task.
+
+        Args:
+            description: The task or question for the specialized agent
+            subagent_type: The type of agent to use (e.g. custom agent names)
+
+        Returns:
+            The result from the subagent
+        """
+        task_id = next(task_ids)
+        emit_event(
+            "subagent_started",
+            task_id=task_id,
+            subagent_type=subagent_type,
+            description=description[:_DESCRIPTION_PREVIEW_CHARS],
+        )
+        start = time.monotonic()
+        result = task_tool(description=description, subagent_type=subagent_type)
+        emit_event(
+            "subagent_finished",
+            task_id=task_id,
+            subagent_type=subagent_type,
+            seconds=round(time.monotonic() - start, 3),
+            result_chars=len(str(result)),
+        )
+        return result
+
+    agent.tool_registry.registry["task"] = task
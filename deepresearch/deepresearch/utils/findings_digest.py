@@ -0,0 +1,377 @@
+"""
+Hierarchical extractive digest of the research findings files.
+
+With many subagents, reading every research_findings_*.md file into the lead
+agent's context makes each synthesis turn slow and can overflow the context
+window. The digest gives the lead a bounded view of all of them instead:
+- Per finding: the most informative sentences of each findings file, scored
+  by TF-IDF weight against the other findings and kept in their original order
+- Per cluster: findings with similar vocabulary are grouped, and each cluster
+  gets a summary drawn from its findings' summaries, favouring terms several
+  findings agree on and dropping sentences repeated across findings
+
+Everything is computed locally. The findings files are left untouched on disk,
+so the lead can still read one in full, and citations keep matching against
+the full source documents.
+"""
+
+import logging
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from deepresearch.citations.engine import split_sentences
+from deepresearch.utils.s3_outputs import FINDINGS_PATTERN
+
+logger = logging.getLogger("deepsearch.findings_digest")
+
+# Sentences sharing this fraction of their terms with a picked one are repeats
+REDUNDANCY_THRESHOLD = 0.6
+
+_LIST_MARKER_RE = re.compile(r"^(?:[-*+]|\d+[.)])\s+")
+# URLs add nothing to a summary (citations match against the source documents)
+_URL_RE = re.compile(r"\(?(?:source:\s*)?https?://\S+\)?", re.IGNORECASE)
+_MIN_SENTENCE_TERMS = 3
+
+
+@dataclass
+class DigestSentence:
+    """
+    A candidate sentence for a summary.
+
+    Attributes:
+        text: Sentence text, without list markers.
+        terms: Distinct content terms of the sentence.
+        position: Index of the sentence in its document.
+    """
+
+    text: str
+    terms: frozenset[str]
+    position: int
+
+
+@dataclass
+class FindingDigest:
+    """
+    A findings file and its summary.
+
+    Attributes:
+        name: File name relative to the working directory.
+        chars: Size of the file in characters.
+        sentences: Candidate sentences of the file.
+        term_counts: Term frequencies of the file.
+        summary: Sentences picked for the file's summary.
+    """
+
+    name: str
+    chars: int
+    sentences: list[DigestSentence]
+    term_counts: Counter
+    summary: list[DigestSentence] = field(default_factory=list)
+
+
+@dataclass
+class FindingsCluster:
+    """
+    Findings on a common subject.
+
+    Attributes:
+        findings: Findings of the cluster.
+        label: Most characteristic terms of the cluster.
+        summary: Sentences picked for the cluster summary.
+    """
+
+    findings: list[FindingDigest]
+    label: list[str] = field(default_factory=list)
+    summary: list[DigestSentence] = field(default_factory=list)
+
+
+def extract_sentences(text: str) -> list[DigestSentence]:
+    """
+    Split Markdown text into candidate sentences.
+
+    Headings and tables are skipped, URLs removed, and what is left of a
+    sentence with fewer than three content terms is dropped.
+
+    Args:
+        text: Document text.
+
+    Returns:
+        Sentences in document order.
+    """
+    sentences = []
+    for sentence in split_sentences(_URL_RE.sub("", text)):
+        terms = frozenset(sentence.tokens)
+        if len(terms) < _MIN_SENTENCE_TERMS:
+            continue
+        sentences.append(
+            DigestSentence(
+                text=_LIST_MARKER_RE.sub("", sentence.text).strip(),
+                terms=terms,
+                position=len(sentences),
+            )
+        )
+    return sentences
+
+
+def select_sentences(
+    sentences: list[DigestSentence], weights: dict[str, float], max_chars: int
+) -> list[DigestSentence]:
+    """
+    Pick the highest-scoring sentences that fit in a character budget.
+
+    A sentence scores the summed weight of its distinct terms, normalized by
+    the square root of their number so long sentences are not favoured for
+    their length alone. Sentences that mostly repeat a picked one are skipped.
+
+    Args:
+        sentences: Candidate sentences.
+        weights: Weight of each term.
+        max_chars: Budget for the picked sentences' text.
+
+    Returns:
+        Picked sentences in their original order.
+    """
+
+    def score(sentence: DigestSentence) -> float:
+        if not sentence.terms:
+            return 0.0
+        return sum(weights.get(term, 0.0) for term in sentence.terms) / math.sqrt(
+            len(sentence.terms)
+        )
+
+    picked: list[DigestSentence] = []
+    used = 0
+    for sentence in sorted(sentences, key=score, reverse=True):
+        if used + len(sentence.text) > max_chars:
+            continue
+        if any(
+            len(sentence.terms & other.terms) / len(sentence.terms | other.terms)
+            >= REDUNDANCY_THRESHOLD
+            for other in picked
+        ):
+            continue
+        picked.append(sentence)
+        used += len(sentence.text) + 1
+    return sorted(picked, key=lambda sentence: sentence.position)
+
+
+def extract_summary(text: str, max_chars: int) -> str:
+    """
+    Summarize a text by its most central sentences.
+
+    Terms are weighted by their frequency in the text itself. Text without
+    sentences (tables, code, lists of links) is truncated instead.
+
+    Args:
+        text: Text to summarize.
+        max_chars: Maximum length of the summary.
+
+    Returns:
+        The summary, at most max_chars long.
+    """
+    if len(text) <= max_chars:
+        return text
+    sentences = extract_sentences(text)
+    counts = Counter(term for sentence in sentences for term in sentence.terms)
+    picked = select_sentences(sentences, counts, max_chars)
+    if not picked:
+        return text[: max_chars - 3].rstrip() + "..."
+    return " ".join(sentence.text for sentence in picked)
+
+
+def load_findings(working_dir: Path | str) -> list[FindingDigest]:
+    """
+    Read every research_findings_*.md file of a working directory.
+
+    Args:
+        working_dir: Directory holding the findings files.
+
+    Returns:
+        Findings in file name order, without summaries.
+    """
+    findings = []
+    for path in sorted(Path(working_dir).glob(f"{FINDINGS_PATTERN}*.md")):
+        try:
+            text = path.read_text(encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"Could not read findings file {path}: {e}")
+            continue
+        sentences = extract_sentences(text)
+        findings.append(
+            FindingDigest(
+                name=path.name,
+                chars=len(text),
+                sentences=sentences,
+                term_counts=Counter(
+                    term for sentence in sentences for term in sentence.terms
+                ),
+            )
+        )
+    return findings
+
+
+def _idf(findings: list[FindingDigest]) -> dict[str, float]:
+    document_frequency = Counter(
+        term for finding in findings for term in finding.term_counts
+    )
+    return {
+        term: math.log(1 + len(findings) / count)
+        for term, count in document_frequency.items()
+    }
+
+
+def _cosine(left: dict[str, float], right: dict[str, float]) -> float:
+    if len(left) > len(right):
+        left, right = right, left
+    dot = sum(weight * right.get(term, 0.0) for term, weight in left.items())
+    norms = math.sqrt(sum(w * w for w in left.values())) * math.sqrt(
+        sum(w * w for w in right.values())
+    )
+    return dot / norms if norms else 0.0
+
+
+def cluster_findings(
+    findings: list[FindingDigest], idf: dict[str, float], similarity: float
+) -> list[FindingsCluster]:
+    """
+    Group findings by the cosine similarity of their TF-IDF vectors.
+
+    Each finding joins the cluster whose centroid is most similar, if at least
+    `similarity`, and starts a new cluster otherwise.
+
+    Args:
+        findings: Findings to group.
+        idf: Inverse document frequency of each term across the findings.
+        similarity: Minimum similarity to join a cluster.
+
+    Returns:
+        Clusters in order of their first finding.
+    """
+    clusters: list[FindingsCluster] = []
+    centroids: list[Counter] = []
+    for finding in findings:
+        vector = {term: count * idf[term] for term, count in finding.term_counts.items()}
+        best, best_similarity = None, similarity
+        for index, centroid in enumerate(centroids):
+            score = _cosine(vector, centroid)
+            if score >= best_similarity:
+                best, best_similarity = index, score
+        if best is None:
+            clusters.append(FindingsCluster(findings=[finding]))
+            centroids.append(Counter(vector))
+        else:
+            clusters[best].findings.append(finding)
+            centroids[best].update(vector)
+    for cluster, centroid in zip(clusters, centroids):
+        cluster.label = [term for term, _ in centroid.most_common(4)]
+    return clusters
+
+
+def build_findings_digest(
+    working_dir: Path | str,
+    finding_chars: int = 1200,
+    cluster_chars: int = 2000,
+    similarity: float = 0.2,
+    max_chars: int = 20000,
+) -> list[FindingsCluster]:
+    """
+    Summarize every findings file, then every cluster of related findings.
+
+    The per-finding and per-cluster budgets shrink with the number of
+    findings and clusters so the rendered digest fits in max_chars.
+
+    Args:
+        working_dir: Directory holding the findings files.
+        finding_chars: Budget of each finding's summary.
+        cluster_chars: Budget of each cluster's summary.
+        similarity: Minimum TF-IDF cosine similarity to join a cluster.
+        max_chars: Budget of the whole digest.
+
+    Returns:
+        Clusters with their summaries and their findings' summaries.
+    """
+    findings = load_findings(working_dir)
+    if not findings:
+        return []
+    idf = _idf(findings)
+    finding_chars = min(finding_chars, max(200, max_chars // len(findings)))
+    for finding in findings:
+        weights = {term: count * idf[term] for term, count in finding.term_counts.items()}
+        finding.summary = select_sentences(finding.sentences, weights, finding_chars)
+
+    clusters = cluster_findings(findings, idf, similarity)
+    cluster_chars = min(cluster_chars, max(300, max_chars // (2 * len(clusters))))
+    for cluster in clusters:
+        if len(cluster.findings) == 1:
+            cluster.summary = cluster.findings[0].summary
+            continue
+        # Terms several findings report are the cluster's consensus
+        agreement = Counter(
+            term for finding in cluster.findings for term in finding.term_counts
+        )
+        weights = {term: count * idf[term] for term, count in agreement.items()}
+        candidates = []
+        for finding in cluster.findings:
+            for sentence in finding.summary:
+                candidates.append(
+                    DigestSentence(sentence.text, sentence.terms, len(candidates))
+                )
+        cluster.summary = select_sentences(candidates, weights, cluster_chars)
+    return clusters
+
+
+def render_findings_digest(
+    clusters: list[FindingsCluster], max_chars: int = 20000
+) -> str:
+    """
+    Render a digest for the lead agent within a character budget.
+
+    Clusters of several findings show their summary followed by each
+    finding's summary. When that does not fit, only the cluster summaries and
+    the file list are shown.
+
+    Args:
+        clusters: Output of build_findings_digest.
+        max_chars: Maximum length of the rendered digest.
+
+    Returns:
+        Markdown digest.
+    """
+    if not clusters:
+        return "No research findings files (./research_findings_*.md) found."
+
+    findings = sum(len(cluster.findings) for cluster in clusters)
+    total_chars = sum(f.chars for cluster in clusters for f in cluster.findings)
+    header = (
+        f"# Findings digest: {findings} findings files in {len(clusters)} "
+        f"cluster{'s' if len(clusters) > 1 else ''} "
+        f"({total_chars} chars on disk)\n"
+        "Extractive summaries; the full findings stay in the listed files. Read a "
+        "file with file_read only when you need detail the digest leaves out."
+    )
+
+    def render(with_findings: bool) -> str:
+        sections = [header]
+        for index, cluster in enumerate(clusters, start=1):
+            lines = [
+                f"## Cluster {index}: {', '.join(cluster.label)} "
+                f"({len(cluster.findings)} finding{'s' if len(cluster.findings) > 1 else ''})"
+            ]
+            if len(cluster.findings) > 1:
+                lines.extend(f"- {sentence.text}" for sentence in cluster.summary)
+            for finding in cluster.findings:
+                lines.append(f"### ./{finding.name} ({finding.chars} chars)")
+                if with_findings or len(cluster.findings) == 1:
+                    lines.extend(f"- {sentence.text}" for sentence in finding.summary)
+            sections.append("\n".join(lines))
+        return "\n\n".join(sections)
+
+    text = render(with_findings=True)
+    if len(text) > max_chars:
+        text = render(with_findings=False)
+    if len(text) > max_chars:
+        text = text[:max_chars].rsplit("\n", 1)[0] + "\n[Digest truncated to its budget]"
+    return text
@@ -0,0 +1,424 @@
+"""
+Local research knowledge store shared across sessions.
+
+When a research run completes, its findings files (`research_findings_*.md`)
+and source documents (`research_documents_{topic}/source_*.md`) are split
+into passages and indexed in one SQLite file: an inverted index (term
+postings, ranked with BM25) and, when a local embedding model is configured,
+a vector index of the passages. Later runs look passages up by topic with the
+`lookup_prior_research` tool and reuse fresh-enough findings instead of
+searching again.
+
+Every passage keeps the time it was last retrieved; lookups only return
+passages younger than a maximum age, and passages past the retention period
+are deleted at indexing time. Identical passages (the same source saved by
+several sessions) are stored once and refreshed when a later run fetches them
+again. Sources reused through `lookup_prior_research` carry their original
+retrieval time (a `retrieved_at:` header), so reuse never makes them fresh.
+"""
+
+import hashlib
+import logging
+import math
+import sqlite3
+import threading
+import time
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from deepresearch.citations.engine import load_sources
+from deepresearch.citations.index import split_passages
+from deepresearch.config import get_knowledge_store_config
+from deepresearch.utils.s3_outputs import FINDINGS_PATTERN, RESEARCH_DOCUMENTS_PATTERN
+from deepresearch.utils.text import tokenize
+
+logger = logging.getLogger("deepsearch.knowledge_store")
+
+# Words per indexed passage, and words between passage starts
+PASSAGE_WORDS = 200
+PASSAGE_STRIDE = 150
+
+# Reciprocal rank fusion constant for combining keyword and vector rankings
+RRF_K = 60
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+@dataclass
+class KnowledgeHit:
+    """
+    A passage from earlier research returned by a lookup.
+
+    Attributes:
+        kind: "findings" or "source".
+        topic: Research topic the document was filed under.
+        session_id: Session that produced it.
+        path: Document path relative to that session's working directory.
+        title: Source title (empty for findings).
+        url: Source URL, if any.
+        text: Passage text.
+        indexed_at: Unix time the passage was last retrieved.
+        score: Relevance score (higher is better).
+    """
+
+    kind: str
+    topic: str
+    session_id: str
+    path: str
+    title: str
+    url: str | None
+    text: str
+    indexed_at: float
+    score: float
+
+    @property
+    def age_days(self) -> float:
+        return max(0.0, (time.time() - self.indexed_at) / 86400)
+
+
+def _findings_topic(path: Path) -> str:
+    return path.stem[len(FINDINGS_PATTERN):] or "general"
+
+
+def _source_topic(path: Path) -> str:
+    return path.parent.name[len(RESEARCH_DOCUMENTS_PATTERN):] or "general"
+
+
+class KnowledgeStore:
+    """SQLite inverted index (and optional vector index) of past research."""
+
+    def __init__(self, path: Path | str, embedding_model: str | None = None):
+        """
+        Open or create the store.
+
+        Args:
+            path: SQLite file of the store.
+            embedding_model: sentence-transformers model name for the vector
+                index, or None for keyword lookups only.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.embedding_model = embedding_model
+        self._encoder = None
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS passages ("
+            " id INTEGER PRIMARY KEY,"
+            " content_hash TEXT UNIQUE NOT NULL,"
+            " kind TEXT NOT NULL,"
+            " topic TEXT NOT NULL,"
+            " session_id TEXT NOT NULL,"
+            " path TEXT NOT NULL,"
+            " title TEXT NOT NULL,"
+            " url TEXT,"
+            " text TEXT NOT NULL,"
+            " length INTEGER NOT NULL,"
+            " indexed_at REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS passages_indexed_at ON passages (indexed_at);"
+            "CREATE TABLE IF NOT EXISTS postings ("
+            " term TEXT NOT NULL,"
+            " passage_id INTEGER NOT NULL,"
+            " tf INTEGER NOT NULL,"
+            " PRIMARY KEY (term, passage_id)) WITHOUT ROWID;"
+            "CREATE INDEX IF NOT EXISTS postings_passage ON postings (passage_id);"
+            "CREATE TABLE IF NOT EXISTS vectors ("
+            " passage_id INTEGER PRIMARY KEY,"
+            " model TEXT NOT NULL,"
+            " embedding BLOB NOT NULL);"
+        )
+        self._conn.commit()
+
+    def _encode(self, texts: list[str]) -> list[array] | None:
+        """Normalized embeddings of texts, or None without a usable model."""
+        if not self.embedding_model or not texts:
+            return None
+        if self._encoder is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError:
+                logger.warning(
+                    "KNOWLEDGE_EMBEDDING_MODEL is set but sentence-transformers is not "
+                    "installed, using keyword lookups only"
+                )
+                self.embedding_model = None
+                return None
+            self._encoder = SentenceTransformer(self.embedding_model)
+        embeddings = self._encoder.encode(texts, normalize_embeddings=True)
+        return [array("f", [float(value) for value in embedding]) for embedding in embeddings]
+
+    def _documents(
+        self, working_dir: Path
+    ) -> list[tuple[str, str, str, str | None, str, str, float | None]]:
+        """(kind, topic, path, url, title, text, retrieved_at) of a session's outputs."""
+        documents = []
+        for path in sorted(working_dir.glob(f"{FINDINGS_PATTERN}*.md")):
+            text = path.read_text(encoding="utf-8", errors="replace")
+            documents.append(("findings", _findings_topic(path), path.name, None, "", text, None))
+        for source in load_sources(working_dir):
+            path = source.paths[0]
+            documents.append(
+                (
+                    "source",
+                    _source_topic(path),
+                    path.relative_to(working_dir).as_posix(),
+                    source.url,
+                    source.title,
+                    source.text,
+                    source.retrieved_at,
+                )
+            )
+        return documents
+
+    def index_session(self, working_dir: Path | str, session_id: str) -> int:
+        """
+        Index the findings and source documents of a completed run.
+
+        Args:
+            working_dir: Directory holding the run's outputs.
+            session_id: Session that produced them.
+
+        Returns:
+            Number of passages added or refreshed.
+        """
+        working_dir = Path(working_dir)
+        now = time.time()
+        passages = []
+        for kind, topic, path, url, title, text, retrieved_at in self._documents(working_dir):
+            indexed_at = min(retrieved_at, now) if retrieved_at is not None else now
+            for passage in split_passages(text, window=PASSAGE_WORDS, stride=PASSAGE_STRIDE):
+                content_hash = hashlib.sha256(
+                    f"{kind}\n{url or ''}\n{passage}".encode("utf-8")
+                ).hexdigest()
+                passages.append(
+                    (content_hash, kind, topic, path, url, title, passage, indexed_at)
+                )
+
+        new_passages = []
+        with self._lock:
+            for content_hash, kind, topic, path, url, title, passage, indexed_at in passages:
+                row = self._conn.execute(
+                    "SELECT id FROM passages WHERE content_hash = ?", (content_hash,)
+                ).fetchone()
+                if row is not None:
+                    # Only a newer retrieval refreshes a passage, never its reuse
+                    self._conn.execute(
+                        "UPDATE passages SET indexed_at = MAX(indexed_at, ?), session_id = ?,"
+                        " path = ? WHERE id = ?",
+                        (indexed_at, session_id, path, row[0]),
+                    )
+                    continue
+                tokens = tokenize(f"{title} {topic.replace('_', ' ')} {passage}")
+                cursor = self._conn.execute(
+                    "INSERT INTO passages (content_hash, kind, topic, session_id, path,"
+                    " title, url, text, length, indexed_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (content_hash, kind, topic, session_id, path, title, url, passage,
+                     len(tokens), indexed_at),
+                )
+                self._conn.executemany(
+                    "INSERT INTO postings (term, passage_id, tf) VALUES (?, ?, ?)",
+                    [(term, cursor.lastrowid, tf) for term, tf in Counter(tokens).items()],
+                )
+                new_passages.append((cursor.lastrowid, passage))
+            self._conn.commit()
+
+        embeddings = self._encode([passage for _, passage in new_passages])
+        if embeddings is not None:
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO vectors (passage_id, model, embedding)"
+                    " VALUES (?, ?, ?)",
+                    [
+                        (passage_id, self.embedding_model, embedding.tobytes())
+                        for (passage_id, _), embedding in zip(new_passages, embeddings)
+                    ],
+                )
+                self._conn.commit()
+
+        logger.info(
+            f"Indexed {len(passages)} passages of session {session_id} "
+            f"({len(new_passages)} new)"
+        )
+        return len(passages)
+
+    def _keyword_ranking(self, query: str, cutoff: float, limit: int) -> list[int]:
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        total, average_length = self._conn.execute(
+            "SELECT COUNT(*), AVG(length) FROM passages WHERE indexed_at >= ?", (cutoff,)
+        ).fetchone()
+        if not total:
+            return []
+        scores: Counter = Counter()
+        for term in terms:
+            rows = self._conn.execute(
+                "SELECT postings.passage_id, postings.tf, passages.length"
+                " FROM postings JOIN passages ON passages.id = postings.passage_id"
+                " WHERE postings.term = ? AND passages.indexed_at >= ?",
+                (term, cutoff),
+            ).fetchall()
+            if not rows:
+                continue
+            idf = math.log(1 + (total - len(rows) + 0.5) / (len(rows) + 0.5))
+            for passage_id, tf, length in rows:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * length / (average_length or 1))
+                scores[passage_id] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+        return [passage_id for passage_id, _ in scores.most_common(limit)]
+
+    def _vector_ranking(
+        self, query: str, cutoff: float, limit: int, min_similarity: float
+    ) -> list[int]:
+        embeddings = self._encode([query])
+        if embeddings is None:
+            return []
+        query_vector = embeddings[0]
+        rows = self._conn.execute(
+            "SELECT vectors.passage_id, vectors.embedding"
+            " FROM vectors JOIN passages ON passages.id = vectors.passage_id"
+            " WHERE vectors.model = ? AND passages.indexed_at >= ?",
+            (self.embedding_model, cutoff),
+        ).fetchall()
+        similarities = []
+        for passage_id, blob in rows:
+            vector = array("f")
+            vector.frombytes(blob)
+            similarity = sum(a * b for a, b in zip(query_vector, vector))
+            if similarity >= min_similarity:
+                similarities.append((similarity, passage_id))
+        similarities.sort(reverse=True)
+        return [passage_id for _, passage_id in similarities[:limit]]
+
+    def search(
+        self,
+        query: str,
+        max_age_seconds: float,
+        limit: int = 5,
+        min_similarity: float = 0.5,
+    ) -> list[KnowledgeHit]:
+        """
+        Find passages of earlier research relevant to a query.
+
+        Keyword (BM25) and vector rankings are combined with reciprocal rank
+        fusion; without an embedding model only the keyword ranking is used.
+
+        Args:
+            query: Topic or question to look up.
+            max_age_seconds: Only return passages indexed more recently than this.
+            limit: Maximum number of passages.
+            min_similarity: Minimum cosine similarity of vector matches.
+
+        Returns:
+            Matching passages, most relevant first.
+        """
+        cutoff = time.time() - max_age_seconds
+        with self._lock:
+            rankings = [self._keyword_ranking(query, cutoff, limit * 4)]
+        vector_ranking = self._vector_ranking(query, cutoff, limit * 4, min_similarity)
+        if vector_ranking:
+            rankings.append(vector_ranking)
+
+        fused: Counter = Counter()
+        for ranking in rankings:
+            for rank, passage_id in enumerate(ranking):
+                fused[passage_id] += 1 / (RRF_K + rank + 1)
+        if not fused:
+            return []
+
+        ids = [passage_id for passage_id, _ in fused.most_common(limit)]
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, kind, topic, session_id, path, title, url, text, indexed_at"
+                f" FROM passages WHERE id IN ({','.join('?' * len(ids))})",
+                ids,
+            ).fetchall()
+        by_id = {row[0]: row for row in rows}
+        return [
+            KnowledgeHit(*by_id[passage_id][1:], score=round(fused[passage_id], 4))
+            for passage_id in ids
+            if passage_id in by_id
+        ]
+
+    def prune(self, max_age_seconds: float) -> int:
+        """
+        Delete passages indexed longer ago than the retention period.
+
+        Args:
+            max_age_seconds: Retention period.
+
+        Returns:
+            Number of passages deleted.
+        """
+        cutoff = time.time() - max_age_seconds
+        with self._lock:
+            stale = "SELECT id FROM passages WHERE indexed_at < ?"
+            self._conn.execute(f"DELETE FROM postings WHERE passage_id IN ({stale})", (cutoff,))
+            self._conn.execute(f"DELETE FROM vectors WHERE passage_id IN ({stale})", (cutoff,))
+            deleted = self._conn.execute(
+                "DELETE FROM passages WHERE indexed_at < ?", (cutoff,)
+            ).rowcount
+            self._conn.commit()
+        if deleted:
+            logger.info(f"Pruned {deleted} passages past the retention period")
+        return deleted
+
+    def stats(self) -> dict:
+        """Number of passages, sessions and embedded passages in the store."""
+        with self._lock:
+            passages, sessions = self._conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT session_id) FROM passages"
+            ).fetchone()
+            vectors = self._conn.execute("SELECT COUNT(*) FROM vectors").fetchone()[0]
+        return {"passages": passages, "sessions": sessions, "vectors": vectors}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+@lru_cache(maxsize=1)
+def get_knowledge_store() -> KnowledgeStore | None:
+    """
+    Get the process-wide knowledge store built from configuration.
+
+    Returns:
+        Shared KnowledgeStore, or None if KNOWLEDGE_STORE_PATH is not set.
+    """
+    config = get_knowledge_store_config()
+    if not config["path"]:
+        return None
+    logger.info(f"Research knowledge store: {config['path']}")
+    return KnowledgeStore(config["path"], embedding_model=config["embedding_model"])
+
+
+def index_research_outputs(working_dir: Path | str, session_id: str) -> int:
+    """
+    Add a completed run's findings and sources to the knowledge store.
+
+    Does nothing when the store is disabled; indexing errors are logged and
+    never fail the run.
+
+    Args:
+        working_dir: Directory holding the run's outputs.
+        session_id: Session that produced them.
+
+    Returns:
+        Number of passages indexed.
+    """
+    store = get_knowledge_store()
+    if store is None:
+        return 0
+    config = get_knowledge_store_config()
+    try:
+        store.prune(config["retention_days"] * 86400)
+        return store.index_session(working_dir, session_id)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Failed to index research outputs: {e}")
+        return 0
+
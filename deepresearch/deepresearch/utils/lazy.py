@@ -0,0 +1,41 @@
+"""
+Lazy re-exports for package __init__ modules.
+
+Importing a package such as deepresearch.search or deepresearch.tools should
+not pull in the SDKs behind every name it re-exports (strands, httpx, the
+Linkup client, boto3). lazy_exports gives a package a module-level
+__getattr__ (PEP 562) that imports the defining submodule the first time a
+name is accessed.
+"""
+
+import importlib
+from typing import Any, Callable
+
+
+def lazy_exports(
+    package: str, exports: dict[str, str]
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """
+    Build __getattr__ and __dir__ for a package with lazily imported names.
+
+    Args:
+        package: The package's __name__.
+        exports: Exported name -> submodule defining it.
+
+    Returns:
+        (__getattr__, __dir__) to assign in the package's __init__.
+    """
+    module_globals = importlib.import_module(package).__dict__
+
+    def __getattr__(name: str) -> Any:
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module), name)
+        module_globals[name] = value
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(module_globals) | set(exports))
+
+    return __getattr__, __dir__
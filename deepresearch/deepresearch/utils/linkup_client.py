@@ -0,0 +1,91 @@
+"""
+Connection-pooled Linkup client.
+
+Kept apart from deepresearch.utils.clients so the Linkup SDK is only imported
+when the Linkup provider is actually used.
+"""
+
+import os
+from typing import Any
+
+import httpx
+from linkup import LinkupClient
+from pydantic import SecretStr
+
+from deepresearch.utils.clients import get_http_limits, get_http_timeout
+
+
+class PooledLinkupClient(LinkupClient):
+    """
+    LinkupClient that reuses one pooled httpx.Client for all requests.
+
+    The upstream SDK opens a new httpx.Client (and therefore new connections)
+    for every request, without a timeout; requests here time out after
+    SEARCH_HTTP_TIMEOUT_SECONDS so a hung call cannot block a search. The async
+    pool is created lazily and must only be used from a single event loop (see
+    deepresearch.search.loop).
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        base_url: str = "https://api.linkup.so/v1",
+        limits: httpx.Limits | None = None,
+        timeout: httpx.Timeout | None = None,
+    ):
+        """
+        Initialize the client and its connection pool.
+
+        Args:
+            api_key: Linkup API key. Defaults to the LINKUP_API_KEY env var.
+            base_url: Linkup API base URL.
+            limits: Connection pool limits. Defaults to get_http_limits().
+            timeout: Request timeout. Defaults to get_http_timeout().
+        """
+        super().__init__(api_key=api_key, base_url=base_url)
+        # A key read from the environment follows rotations by the secrets cache
+        self._api_key_from_env = api_key is None
+        self._limits = limits or get_http_limits()
+        self._timeout = timeout or get_http_timeout()
+        self._http = httpx.Client(
+            base_url=self._base_url, limits=self._limits, timeout=self._timeout
+        )
+        self._async_http: httpx.AsyncClient | None = None
+
+    def _headers(self) -> dict[str, str]:
+        if self._api_key_from_env:
+            api_key = os.environ.get("LINKUP_API_KEY")
+            if api_key and api_key != self._api_key.get_secret_value():
+                self._api_key = SecretStr(api_key)
+        return super()._headers()
+
+    def _request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        # The SDK passes timeout=None, which would disable the client's timeout
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self._timeout
+        return self._http.request(
+            method=method, url=url, headers=self._headers(), **kwargs
+        )
+
+    async def _async_request(
+        self, method: str, url: str, **kwargs: Any
+    ) -> httpx.Response:
+        if self._async_http is None:
+            self._async_http = httpx.AsyncClient(
+                base_url=self._base_url, limits=self._limits, timeout=self._timeout
+            )
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self._timeout
+        return await self._async_http.request(
+            method=method, url=url, headers=self._headers(), **kwargs
+        )
+
+    def close(self) -> None:
+        """Close pooled sync connections."""
+        self._http.close()
+
+    async def aclose(self) -> None:
+        """Close pooled async connections."""
+        if self._async_http is not None:
+            await self._async_http.aclose()
+            self._async_http = None
@@ -0,0 +1,193 @@
+"""
+Background sync of session outputs to S3 while the agent runs.
+
+Source documents and findings are written long before the run ends, so a
+polling thread uploads them as soon as they appear instead of leaving every
+upload until after the agent returns. At the end only the files that are new
+or changed since the last poll (normally the final report with its citations)
+still have to be uploaded. Unchanged files are recognized by content hash and
+never uploaded twice.
+
+With the archive output format, research documents are packed into the
+session archive once at the end; only findings are synced during the run.
+"""
+
+import hashlib
+import logging
+import threading
+from pathlib import Path
+
+from deepresearch.utils.s3_outputs import (
+    FINDINGS_PATTERN,
+    collect_output_files,
+    get_s3_client,
+    plan_uploads,
+    upload_documents_archive,
+    upload_files,
+)
+
+logger = logging.getLogger("deepsearch.output_sync")
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class OutputSyncer:
+    """Uploads new and changed output files of one session on a polling thread."""
+
+    def __init__(
+        self,
+        session_id: str,
+        bucket_name: str,
+        working_dir: Path | str,
+        region_name: str | None = None,
+        interval_seconds: float = 2.0,
+        output_format: str = "files",
+    ):
+        """
+        Initialize the syncer (call start() to begin polling).
+
+        Args:
+            session_id: Session identifier used as S3 prefix.
+            bucket_name: S3 bucket name for outputs.
+            working_dir: Directory the session writes its outputs to.
+            region_name: AWS region name.
+            interval_seconds: Time between workspace polls.
+            output_format: "files" or "archive" (see get_output_format).
+        """
+        self.session_id = session_id
+        self.bucket_name = bucket_name
+        self.working_dir = Path(working_dir)
+        self.region_name = region_name
+        self.interval_seconds = interval_seconds
+        self.output_format = output_format
+        # S3 key -> content hash of the last successful upload
+        self._uploaded: dict[str, str] = {}
+        # S3 key -> (mtime_ns, size) of the file when it was last hashed
+        self._seen: dict[str, tuple[int, int]] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self.uploads = 0
+        self.skipped_unchanged = 0
+
+    def start(self) -> None:
+        """Start polling the workspace in a daemon thread."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name=f"output-sync-{self.session_id}", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            f"Syncing outputs of session {self.session_id} every {self.interval_seconds}s"
+        )
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.sync(include_reports=False)
+            except Exception as e:
+                # Never let a sync failure end the thread; the final flush retries
+                logger.warning(f"Output sync failed: {e}")
+
+    def _changed(self, uploads: list[tuple[Path, str]]) -> list[tuple[Path, str, str]]:
+        changed = []
+        for path, key in uploads:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if self._seen.get(key) == signature and key in self._uploaded:
+                continue
+            digest = _file_digest(path)
+            self._seen[key] = signature
+            if self._uploaded.get(key) == digest:
+                self.skipped_unchanged += 1
+                continue
+            changed.append((path, key, digest))
+        return changed
+
+    def sync(self, include_reports: bool = True) -> dict[str, list[str]]:
+        """
+        Upload output files that are new or changed since their last upload.
+
+        Args:
+            include_reports: Also upload report files. Polls during the run skip
+                them because the report is rewritten until the run ends.
+
+        Returns:
+            Dictionary with 'uploaded' (S3 URIs) and 'failed' (local paths) of
+            this pass.
+        """
+        with self._lock:
+            outputs = collect_output_files(self.working_dir)
+            if self.output_format == "archive":
+                outputs["intermediate"] = []
+            if not include_reports:
+                outputs["final"] = [
+                    path for path in outputs["final"] if path.name.startswith(FINDINGS_PATTERN)
+                ]
+            changed = self._changed(plan_uploads(self.session_id, outputs))
+            if not changed:
+                return {"uploaded": [], "failed": []}
+
+            result = upload_files(
+                s3_client=get_s3_client(region_name=self.region_name),
+                uploads=[(path, key) for path, key, _ in changed],
+                bucket_name=self.bucket_name,
+            )
+            uploaded = set(result["uploaded"])
+            for _, key, digest in changed:
+                if f"s3://{self.bucket_name}/{key}" in uploaded:
+                    self._uploaded[key] = digest
+                else:
+                    # Re-hash and retry on the next pass
+                    self._seen.pop(key, None)
+            self.uploads += len(result["uploaded"])
+            return result
+
+    def finish(self) -> dict[str, list[str]]:
+        """
+        Stop polling and upload everything still missing or changed.
+
+        Returns:
+            Dictionary with 'uploaded' (S3 URIs of every output now in S3,
+            including those synced during the run) and 'failed' (local paths),
+            as returned by upload_session_outputs.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        flushed = self.sync(include_reports=True)
+
+        with self._lock:
+            outputs = collect_output_files(self.working_dir)
+            uploaded = []
+            if self.output_format == "archive":
+                archived = upload_documents_archive(
+                    get_s3_client(region_name=self.region_name),
+                    self.session_id,
+                    self.bucket_name,
+                    outputs.pop("intermediate"),
+                )
+                uploaded.extend(archived["uploaded"])
+                flushed["failed"].extend(archived["failed"])
+                outputs["intermediate"] = []
+            uploaded.extend(
+                f"s3://{self.bucket_name}/{key}"
+                for _, key in plan_uploads(self.session_id, outputs)
+                if key in self._uploaded
+            )
+        logger.info(
+            f"Output sync complete: {len(uploaded)} in S3, {len(flushed['uploaded'])} "
+            f"uploaded at the end, {len(flushed['failed'])} failed, "
+            f"{self.skipped_unchanged} unchanged files skipped"
+        )
+        return {"uploaded": uploaded, "failed": flushed["failed"]}
@@ -0,0 +1,417 @@
+"""
+Per-run performance instrumentation and summary.
+
+A research run binds a PerformanceRecorder for its context. Hooks attached to
+the lead agent and to every subagent then record each model call (latency,
+input and output tokens) and tool call (latency, input and result bytes):
+searches, subagent tasks and file reads and writes. The runtime adds the S3
+upload. Without a bound recorder the hooks do nothing.
+
+At the end of the run the recorder summarizes where the time went: totals and
+p50/p95 latency per stage, a breakdown of the lead agent's timeline (the
+critical path, since subagents and searches run inside its tool calls) and
+the parallelism achieved by subagents and searches. The runtime writes the
+summary to `performance_summary.json`, uploads it with the other outputs and
+exports the spans as OTEL metrics (see utils/telemetry.py).
+"""
+
+import json
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from typing import Iterator
+
+logger = logging.getLogger("deepsearch.performance")
+
+PERFORMANCE_SUMMARY_NAME = "performance_summary.json"
+
+# Agent label of the lead agent and of work done by the runtime itself
+LEAD_AGENT = "lead"
+RUNTIME = "runtime"
+
+SEARCH_TOOLS = frozenset({"internet_search", "internet_search_batch", "linkup_search"})
+FILE_TOOLS = frozenset({"file_read", "file_write", "editor"})
+
+# When lead spans overlap (parallel tool calls), the time goes to the first stage listed
+CRITICAL_PATH_STAGES = ("subagent", "search", "model", "file", "tool", "upload")
+
+
+@dataclass
+class Span:
+    """
+    One timed operation of a run.
+
+    Attributes:
+        stage: "model", "search", "subagent", "file", "tool" or "upload".
+        name: Tool name, model id or upload step.
+        agent: "lead", the subagent type, or "runtime".
+        start: time.monotonic() at the start.
+        end: time.monotonic() at the end.
+        bytes_in: Bytes sent (tool input, uploaded files).
+        bytes_out: Bytes received (tool result).
+        input_tokens: Model input tokens.
+        output_tokens: Model output tokens.
+        ok: False if the operation failed.
+    """
+
+    stage: str
+    name: str
+    agent: str
+    start: float
+    end: float = 0.0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    ok: bool = True
+
+    @property
+    def seconds(self) -> float:
+        return max(0.0, self.end - self.start)
+
+
+def tool_stage(tool_name: str) -> str:
+    """Stage a tool call is accounted under."""
+    if tool_name in SEARCH_TOOLS:
+        return "search"
+    if tool_name in FILE_TOOLS:
+        return "file"
+    if tool_name == "task":
+        return "subagent"
+    return "tool"
+
+
+def _percentile(values: list[float], q: float) -> float:
+    # Nearest-rank percentile of sorted values
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(values)))
+    return values[rank - 1]
+
+
+def _union_seconds(intervals: list[tuple[float, float]]) -> float:
+    total = 0.0
+    current_start = current_end = None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+def _max_concurrent(intervals: list[tuple[float, float]]) -> int:
+    # Ends sort before starts at the same instant, so back-to-back spans do not overlap
+    boundaries = sorted(
+        [(start, 1) for start, _ in intervals] + [(end, -1) for _, end in intervals]
+    )
+    running = peak = 0
+    for _, delta in boundaries:
+        running += delta
+        peak = max(peak, running)
+    return peak
+
+
+class PerformanceRecorder:
+    """Thread-safe collection of the spans of one run."""
+
+    def __init__(self, session_id: str):
+        """
+        Initialize the recorder; the run's wall clock starts now.
+
+        Args:
+            session_id: Session identifier of the run.
+        """
+        self.session_id = session_id
+        self.started = time.monotonic()
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def add(self, span: Span) -> Span:
+        """Record a finished span."""
+        with self._lock:
+            self.spans.append(span)
+        return span
+
+    @contextmanager
+    def measure(self, stage: str, name: str, agent: str = RUNTIME) -> Iterator[Span]:
+        """
+        Time a block of code as one span.
+
+        Args:
+            stage: Stage of the operation.
+            name: Name of the operation.
+            agent: Agent label.
+
+        Yields:
+            The span, for the block to fill in bytes or tokens.
+        """
+        span = Span(stage=stage, name=name, agent=agent, start=time.monotonic())
+        try:
+            yield span
+        except BaseException:
+            span.ok = False
+            raise
+        finally:
+            span.end = time.monotonic()
+            self.add(span)
+
+    def summary(self) -> dict:
+        """
+        Summarize the run so far.
+
+        Returns:
+            JSON-serializable dict with `wall_seconds`, per-`stages` and
+            per-`agents` aggregates, the `critical_path` breakdown of the lead
+            agent's timeline and the `parallelism` of subagents and searches.
+        """
+        end = time.monotonic()
+        with self._lock:
+            spans = list(self.spans)
+
+        stages = {}
+        for stage in sorted({span.stage for span in spans}):
+            stage_spans = [span for span in spans if span.stage == stage]
+            seconds = sorted(span.seconds for span in stage_spans)
+            stages[stage] = {
+                "count": len(stage_spans),
+                "errors": sum(1 for span in stage_spans if not span.ok),
+                "total_seconds": round(sum(seconds), 3),
+                "p50_seconds": round(_percentile(seconds, 50), 3),
+                "p95_seconds": round(_percentile(seconds, 95), 3),
+                "max_seconds": round(seconds[-1], 3),
+                "bytes_in": sum(span.bytes_in for span in stage_spans),
+                "bytes_out": sum(span.bytes_out for span in stage_spans),
+                "input_tokens": sum(span.input_tokens for span in stage_spans),
+                "output_tokens": sum(span.output_tokens for span in stage_spans),
+            }
+
+        agents = {}
+        for span in spans:
+            totals = agents.setdefault(
+                span.agent,
+                {
+                    "model_calls": 0,
+                    "model_seconds": 0.0,
+                    "tool_calls": 0,
+                    "tool_seconds": 0.0,
+                    "input_tokens": 0,
+                    "output_tokens": 0,
+                },
+            )
+            kind = "model" if span.stage == "model" else "tool"
+            totals[f"{kind}_calls"] += 1
+            totals[f"{kind}_seconds"] = round(totals[f"{kind}_seconds"] + span.seconds, 3)
+            totals["input_tokens"] += span.input_tokens
+            totals["output_tokens"] += span.output_tokens
+
+        parallelism = {}
+        for stage in ("subagent", "search"):
+            intervals = [(span.start, span.end) for span in spans if span.stage == stage]
+            if not intervals:
+                continue
+            busy = _union_seconds(intervals)
+            parallelism[stage] = {
+                "max_concurrent": _max_concurrent(intervals),
+                # Average number running while any was running (1.0 means sequential)
+                "average_concurrent": round(
+                    sum(end - start for start, end in intervals) / busy, 2
+                )
+                if busy
+                else 1.0,
+            }
+
+        return {
+            "session_id": self.session_id,
+            "wall_seconds": round(end - self.started, 3),
+            "stages": stages,
+            "agents": agents,
+            "critical_path": self._critical_path(spans, end),
+            "parallelism": parallelism,
+        }
+
+    def _critical_path(self, spans: list[Span], end: float) -> dict:
+        """Split the run's wall time by what the lead agent (or runtime) was doing."""
+        path_spans = [
+            span
+            for span in spans
+            if span.agent in (LEAD_AGENT, RUNTIME) and span.end > span.start
+        ]
+        boundaries = sorted(
+            {self.started, end}
+            | {min(max(span.start, self.started), end) for span in path_spans}
+            | {min(max(span.end, self.started), end) for span in path_spans}
+        )
+        breakdown = dict.fromkeys(CRITICAL_PATH_STAGES, 0.0)
+        breakdown["other"] = 0.0
+        for left, right in zip(boundaries, boundaries[1:]):
+            active = {
+                span.stage for span in path_spans if span.start <= left and span.end >= right
+            }
+            stage = next(
+                (stage for stage in CRITICAL_PATH_STAGES if stage in active), "other"
+            )
+            breakdown[stage] += right - left
+        return {stage: round(seconds, 3) for stage, seconds in breakdown.items() if seconds}
+
+
+_current_recorder: ContextVar[PerformanceRecorder | None] = ContextVar(
+    "deepsearch_performance_recorder", default=None
+)
+
+
+def bind_performance_recorder(recorder: PerformanceRecorder) -> Token:
+    """
+    Make a recorder the current one for this context (one research run).
+
+    Args:
+        recorder: Recorder of the run.
+
+    Returns:
+        Token to pass to unbind_performance_recorder.
+    """
+    return _current_recorder.set(recorder)
+
+
+def unbind_performance_recorder(token: Token) -> None:
+    """Restore the recorder that was current before bind_performance_recorder."""
+    _current_recorder.reset(token)
+
+
+def get_performance_recorder() -> PerformanceRecorder | None:
+    """Get the recorder bound to this context, if any."""
+    return _current_recorder.get()
+
+
+@contextmanager
+def measure(stage: str, name: str, agent: str = RUNTIME) -> Iterator[Span]:
+    """
+    Time a block of code on the current recorder, if one is bound.
+
+    Args:
+        stage: Stage of the operation.
+        name: Name of the operation.
+        agent: Agent label.
+
+    Yields:
+        The span (discarded when no recorder is bound).
+    """
+    recorder = _current_recorder.get()
+    if recorder is None:
+        yield Span(stage=stage, name=name, agent=agent, start=time.monotonic())
+        return
+    with recorder.measure(stage, name, agent=agent) as span:
+        yield span
+
+
+def _content_bytes(content: list) -> int:
+    size = 0
+    for block in content or []:
+        if "text" in block:
+            size += len(block["text"].encode("utf-8"))
+        elif "json" in block:
+            size += len(json.dumps(block["json"], default=str).encode("utf-8"))
+    return size
+
+
+class PerformanceHooks:
+    """Records the model and tool calls of one agent on the current recorder."""
+
+    def __init__(self, agent_name: str):
+        """
+        Initialize the hooks.
+
+        Args:
+            agent_name: Label of the agent ("lead" or the subagent type).
+        """
+        self.agent_name = agent_name
+        self._tool_starts: dict[str, float] = {}
+        self._model_start: float | None = None
+        # Model span waiting for its token counts, and usage totals before it
+        self._model_span: Span | None = None
+        self._usage_mark: tuple[int, int] = (0, 0)
+
+    def _usage(self, agent) -> tuple[int, int]:
+        usage = agent.event_loop_metrics.accumulated_usage
+        return usage.get("inputTokens", 0), usage.get("outputTokens", 0)
+
+    def _settle_tokens(self, agent) -> None:
+        # strands adds a call's usage to the agent metrics after AfterModelCallEvent,
+        # so a span gets its tokens when the next call starts or the invocation ends
+        usage = self._usage(agent)
+        if self._model_span is not None:
+            self._model_span.input_tokens = usage[0] - self._usage_mark[0]
+            self._model_span.output_tokens = usage[1] - self._usage_mark[1]
+            self._model_span = None
+        self._usage_mark = usage
+
+    def before_model_call(self, event) -> None:
+        self._settle_tokens(event.agent)
+        self._model_start = time.monotonic()
+
+    def after_model_call(self, event) -> None:
+        recorder = _current_recorder.get()
+        if recorder is None or self._model_start is None:
+            return
+        self._model_span = recorder.add(
+            Span(
+                stage="model",
+                name=str(event.agent.model.get_config().get("model_id", "model")),
+                agent=self.agent_name,
+                start=self._model_start,
+                end=time.monotonic(),
+                ok=event.exception is None,
+            )
+        )
+        self._model_start = None
+
+    def after_invocation(self, event) -> None:
+        self._settle_tokens(event.agent)
+
+    def before_tool_call(self, event) -> None:
+        self._tool_starts[event.tool_use["toolUseId"]] = time.monotonic()
+
+    def after_tool_call(self, event) -> None:
+        start = self._tool_starts.pop(event.tool_use["toolUseId"], None)
+        recorder = _current_recorder.get()
+        if recorder is None or start is None:
+            return
+        name = event.tool_use["name"]
+        recorder.add(
+            Span(
+                stage=tool_stage(name),
+                name=name,
+                agent=self.agent_name,
+                start=start,
+                end=time.monotonic(),
+                bytes_in=len(
+                    json.dumps(event.tool_use.get("input", {}), default=str).encode("utf-8")
+                ),
+                bytes_out=_content_bytes(event.result.get("content", [])),
+                ok=event.exception is None and event.result.get("status") != "error",
+            )
+        )
+
+    def attach(self, agent) -> None:
+        """Record the agent's model and tool calls through its hooks."""
+        from strands.hooks import (
+            AfterInvocationEvent,
+            AfterModelCallEvent,
+            AfterToolCallEvent,
+            BeforeModelCallEvent,
+            BeforeToolCallEvent,
+        )
+
+        agent.hooks.add_callback(BeforeModelCallEvent, self.before_model_call)
+        agent.hooks.add_callback(AfterModelCallEvent, self.after_model_call)
+        agent.hooks.add_callback(AfterInvocationEvent, self.after_invocation)
+        agent.hooks.add_callback(BeforeToolCallEvent, self.before_tool_call)
+        agent.hooks.add_callback(AfterToolCallEvent, self.after_tool_call)
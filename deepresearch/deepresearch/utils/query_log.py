@@ -0,0 +1,359 @@
+"""
+Per-session query log suppressing near-duplicate searches.
+
+Subagents researching overlapping topics in parallel often search for the
+same thing in different words ("AI safety 2025" and "2025 AI safety"). Every
+routed search of a session goes through its QueryLog, which:
+- Canonicalizes the query: lowercase content terms, stopwords dropped, light
+  stemming, sorted and deduplicated so word order does not matter. Negations
+  ("not", "without", ...) are kept as terms
+- Finds earlier queries whose terms are near-duplicates using MinHash
+  signatures and locality-sensitive hashing (banded buckets), so a lookup does
+  not compare against the whole log. Numbers (years, figures) and negations
+  change what a query asks, so a near-duplicate must have exactly the same ones
+- Returns the earlier result when the match has completed, or awaits the same
+  upstream call when it is still in flight (single-flight)
+
+A search can be forced past the log when the model judges that its query
+differs from the earlier one in a way that matters.
+
+The log lives on the search event loop: lookups and inserts happen in
+coroutines running on that single thread.
+"""
+
+import asyncio
+import hashlib
+import logging
+import random
+import re
+import threading
+from collections import OrderedDict
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Awaitable, Callable
+
+from deepresearch.config import get_query_dedup_config
+from deepresearch.utils.text import tokenize
+from deepresearch.utils.workspace import get_working_dir
+
+if TYPE_CHECKING:
+    from deepresearch.search.base import SearchResult
+
+logger = logging.getLogger("deepsearch.query_log")
+
+# 64 hash functions in 16 bands of 4 rows: queries with an estimated term
+# similarity of 0.8 share a bucket with probability above 0.999
+NUM_PERMUTATIONS = 64
+BAND_ROWS = 4
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(0x5EED)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+# Stopwords that reverse a query's meaning, kept as terms
+NEGATIONS = frozenset({"no", "not", "nor", "without", "against", "never", "cannot"})
+
+_CONTRACTED_NOT_RE = re.compile(r"(?:ca|wo)?n['’]t\b")
+
+
+def query_terms(query: str) -> list[str]:
+    """
+    Get the canonical terms of a query.
+
+    Args:
+        query: Raw search query.
+
+    Returns:
+        Sorted, distinct content tokens (see utils.text.tokenize),
+        negations included.
+    """
+    query = _CONTRACTED_NOT_RE.sub(" not", query.lower())
+    return sorted(set(tokenize(query, keep=NEGATIONS)))
+
+
+def anchor_terms(terms: list[str]) -> frozenset[str]:
+    """
+    Get the terms two queries must share exactly to be near-duplicates.
+
+    Args:
+        terms: Canonical terms of a query.
+
+    Returns:
+        Its numeric terms (years, figures, versions) and negations.
+    """
+    return frozenset(
+        term for term in terms if term in NEGATIONS or any(c.isdigit() for c in term)
+    )
+
+
+def canonicalize_query(query: str) -> str:
+    """
+    Canonicalize a query so reworded and reordered spellings compare equal.
+
+    Args:
+        query: Raw search query.
+
+    Returns:
+        Canonical query, empty if the query has no content terms.
+    """
+    return " ".join(query_terms(query))
+
+
+def minhash_signature(terms: list[str]) -> tuple[int, ...]:
+    """
+    Compute the MinHash signature of a set of terms.
+
+    The fraction of equal positions in two signatures estimates the Jaccard
+    similarity of the two term sets.
+
+    Args:
+        terms: Non-empty list of terms (the query's shingles).
+
+    Returns:
+        Tuple of NUM_PERMUTATIONS minimum hash values.
+    """
+    hashes = [
+        int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest(), "big")
+        for term in terms
+    ]
+    return tuple(
+        min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS
+    )
+
+
+def estimate_similarity(left: tuple[int, ...], right: tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures."""
+    return sum(1 for a, b in zip(left, right) if a == b) / len(left)
+
+
+@dataclass
+class LoggedQuery:
+    """
+    A search recorded in the log.
+
+    Attributes:
+        query: Query as first searched.
+        canonical: Its canonical form.
+        signature: MinHash signature of its terms.
+        anchors: Terms a near-duplicate must share exactly (see anchor_terms).
+        task: The upstream search, pending while in flight.
+    """
+
+    query: str
+    canonical: str
+    signature: tuple[int, ...]
+    anchors: frozenset[str]
+    task: asyncio.Future
+
+
+class QueryLog:
+    """Searches of one session, indexed for near-duplicate lookups."""
+
+    def __init__(self, threshold: float = 0.8, max_queries: int = 1000):
+        """
+        Initialize the log.
+
+        Args:
+            threshold: Estimated similarity from which a query is a duplicate.
+            max_queries: Searches remembered; the oldest are forgotten first.
+        """
+        self.threshold = threshold
+        self.max_queries = max_queries
+        self._entries: OrderedDict[str, LoggedQuery] = OrderedDict()
+        self._buckets: dict[tuple[int, tuple[int, ...]], set[str]] = {}
+        self._lock = threading.Lock()
+        self._counters = {"searches": 0, "upstream": 0, "reused": 0, "coalesced": 0}
+
+    @staticmethod
+    def _bands(signature: tuple[int, ...]) -> list[tuple[int, tuple[int, ...]]]:
+        return [
+            (start, signature[start : start + BAND_ROWS])
+            for start in range(0, len(signature), BAND_ROWS)
+        ]
+
+    def find(
+        self,
+        canonical: str,
+        signature: tuple[int, ...],
+        anchors: frozenset[str] = frozenset(),
+    ) -> LoggedQuery | None:
+        """
+        Find the logged search most similar to a query.
+
+        Args:
+            canonical: Canonical form of the query.
+            signature: MinHash signature of its terms.
+            anchors: Numbers and negations of the query, which a match must
+                have exactly.
+
+        Returns:
+            The best match at or above the threshold, or None.
+        """
+        with self._lock:
+            exact = self._entries.get(canonical)
+            if exact is not None:
+                return exact
+            candidates = set()
+            for band in self._bands(signature):
+                candidates.update(self._buckets.get(band, ()))
+            best, best_similarity = None, self.threshold
+            for key in candidates:
+                entry = self._entries[key]
+                if entry.anchors != anchors:
+                    continue
+                similarity = estimate_similarity(signature, entry.signature)
+                if similarity >= best_similarity:
+                    best, best_similarity = entry, similarity
+            return best
+
+    def add(self, entry: LoggedQuery) -> None:
+        """Record a search, forgetting the oldest ones beyond max_queries."""
+        with self._lock:
+            self._entries[entry.canonical] = entry
+            for band in self._bands(entry.signature):
+                self._buckets.setdefault(band, set()).add(entry.canonical)
+            while len(self._entries) > self.max_queries:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, canonical: str) -> None:
+        entry = self._entries.pop(canonical, None)
+        if entry is None:
+            return
+        for band in self._bands(entry.signature):
+            bucket = self._buckets.get(band)
+            if bucket is not None:
+                bucket.discard(canonical)
+                if not bucket:
+                    del self._buckets[band]
+
+    def _forget_failed(self, entry: LoggedQuery) -> None:
+        # Failed searches are not remembered, so a later duplicate searches again
+        if entry.task.cancelled() or entry.task.exception() is not None:
+            with self._lock:
+                if self._entries.get(entry.canonical) is entry:
+                    self._remove(entry.canonical)
+
+    async def search(
+        self,
+        query: str,
+        search_fn: Callable[[str], Awaitable["SearchResult"]],
+        force: bool = False,
+    ) -> "SearchResult":
+        """
+        Search through the log. Must run on the search event loop.
+
+        Args:
+            query: The query to search for.
+            search_fn: Coroutine function performing the upstream search.
+            force: Search upstream even when a near-duplicate is logged; the
+                forced search replaces an earlier one with the same canonical
+                form.
+
+        Returns:
+            The query's result, or the result of the earlier near-duplicate
+            search (whose `query` is the earlier query).
+        """
+        terms = query_terms(query)
+        with self._lock:
+            self._counters["searches"] += 1
+        if not terms:
+            return await search_fn(query)
+
+        canonical = " ".join(terms)
+        signature = minhash_signature(terms)
+        anchors = anchor_terms(terms)
+        match = None if force else self.find(canonical, signature, anchors)
+        if match is not None:
+            counter = "reused" if match.task.done() else "coalesced"
+            with self._lock:
+                self._counters[counter] += 1
+            logger.info(f"Query {query!r} {counter} the search for {match.query!r}")
+            # Shielded so a cancelled waiter does not cancel the shared search
+            return await asyncio.shield(match.task)
+
+        entry = LoggedQuery(
+            query=query,
+            canonical=canonical,
+            signature=signature,
+            anchors=anchors,
+            task=asyncio.ensure_future(search_fn(query)),
+        )
+        entry.task.add_done_callback(lambda _: self._forget_failed(entry))
+        with self._lock:
+            self._remove(canonical)
+        self.add(entry)
+        with self._lock:
+            self._counters["upstream"] += 1
+        return await asyncio.shield(entry.task)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Get dedup counters.
+
+        Returns:
+            Dictionary with searches, upstream calls, reused (served from a
+            completed search), coalesced (joined an in-flight search) and the
+            number of logged queries.
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            counters["queries"] = len(self._entries)
+        return counters
+
+
+def create_query_log() -> QueryLog:
+    """Create a query log from the QUERY_DEDUP_* configuration."""
+    config = get_query_dedup_config()
+    return QueryLog(threshold=config["threshold"], max_queries=config["max_queries"])
+
+
+_current_log: ContextVar[QueryLog | None] = ContextVar(
+    "deepsearch_query_log", default=None
+)
+_default_logs: dict[Path, QueryLog] = {}
+_default_logs_lock = threading.Lock()
+
+
+def bind_query_log(log: QueryLog) -> Token:
+    """
+    Make a log the current one for this context (one session's invocation).
+
+    Args:
+        log: Query log of the session.
+
+    Returns:
+        Token to pass to unbind_query_log.
+    """
+    return _current_log.set(log)
+
+
+def unbind_query_log(token: Token) -> None:
+    """Restore the log that was current before bind_query_log."""
+    _current_log.reset(token)
+
+
+def get_query_log() -> QueryLog | None:
+    """
+    Get the query log of the current session.
+
+    Must be called from the caller's thread, not on the search event loop,
+    which does not see the session's context. Falls back to a process-wide
+    log per working directory when no session log is bound.
+
+    Returns:
+        QueryLog of the session, or None if deduplication is disabled.
+    """
+    if not get_query_dedup_config()["enabled"]:
+        return None
+    log = _current_log.get()
+    if log is not None:
+        return log
+    root = get_working_dir()
+    with _default_logs_lock:
+        if root not in _default_logs:
+            _default_logs[root] = create_query_log()
+        return _default_logs[root]
@@ -0,0 +1,148 @@
+"""
+Client-side rate limiting for search providers.
+
+A token bucket per provider, shared by every subagent in the process, keeps
+bursts under the provider's QPS budget. Callers are never rejected: each one
+reserves the next free slot in arrival order and waits for it, so queued
+callers are served first come, first served.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+
+from deepresearch.config import get_rate_limit_config
+
+logger = logging.getLogger("deepsearch.rate_limit")
+
+
+class TokenBucket:
+    """Thread-safe token bucket usable from both sync and async callers."""
+
+    def __init__(self, qps: float, burst: float = 1, name: str = "search"):
+        """
+        Initialize a full bucket.
+
+        Args:
+            qps: Sustained refill rate in tokens (calls) per second.
+            burst: Bucket capacity, the number of calls allowed back to back.
+            name: Name used in logs and stats.
+        """
+        if qps <= 0:
+            raise ValueError(f"qps must be positive, got {qps}")
+        self.qps = qps
+        self.burst = max(burst, 1)
+        self.name = name
+        self._tokens = self.burst
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._throttled_calls = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def reserve(self) -> float:
+        """
+        Take one token, going into debt if the bucket is empty.
+
+        Returns:
+            Seconds the caller must wait before issuing its request.
+        """
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated_at
+            self._tokens = min(self.burst, self._tokens + elapsed * self.qps)
+            self._updated_at = now
+            self._tokens -= 1
+            wait = -self._tokens / self.qps if self._tokens < 0 else 0.0
+
+            self._calls += 1
+            if wait > 0:
+                self._throttled_calls += 1
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+        return wait
+
+    def acquire(self) -> float:
+        """
+        Block until the caller may issue a request.
+
+        Returns:
+            Seconds spent waiting.
+        """
+        wait = self.reserve()
+        if wait > 0:
+            logger.debug(f"Rate limiter '{self.name}' delaying call by {wait:.3f}s")
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """
+        Wait without blocking the event loop until the caller may issue a request.
+
+        Returns:
+            Seconds spent waiting.
+        """
+        wait = self.reserve()
+        if wait > 0:
+            logger.debug(f"Rate limiter '{self.name}' delaying call by {wait:.3f}s")
+            await asyncio.sleep(wait)
+        return wait
+
+    def stats(self) -> dict[str, float]:
+        """
+        Get wait-time metrics.
+
+        Returns:
+            Dictionary with call counts and total, mean and max wait seconds.
+        """
+        with self._lock:
+            return {
+                "calls": self._calls,
+                "throttled_calls": self._throttled_calls,
+                "total_wait_seconds": self._total_wait,
+                "mean_wait_seconds": self._total_wait / self._calls
+                if self._calls
+                else 0.0,
+                "max_wait_seconds": self._max_wait,
+            }
+
+
+_limiters: dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str) -> TokenBucket:
+    """
+    Get the process-wide rate limiter for a search provider.
+
+    Args:
+        provider: Search provider name (e.g. "linkup").
+
+    Returns:
+        Shared TokenBucket configured from get_rate_limit_config.
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            config = get_rate_limit_config(provider)
+            logger.info(
+                f"Rate limiting '{provider}' searches to {config['qps']:.2f} QPS "
+                f"(burst={config['burst']:g})"
+            )
+            limiter = TokenBucket(qps=config["qps"], burst=config["burst"], name=provider)
+            _limiters[provider] = limiter
+        return limiter
+
+
+def get_rate_limit_stats() -> dict[str, dict[str, float]]:
+    """
+    Get wait-time metrics for every provider limiter created so far.
+
+    Returns:
+        Dictionary mapping provider names to TokenBucket.stats().
+    """
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {provider: limiter.stats() for provider, limiter in limiters.items()}
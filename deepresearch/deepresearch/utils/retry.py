@@ -0,0 +1,105 @@
+"""
+Retry policy shared by the lead agent and the subagent supervisor.
+
+Errors are classified by type and service error code, following the cause
+chain (strands wraps model errors in EventLoopException), instead of matching
+keywords in the message. Delays use exponential backoff with full jitter so
+subagents failing together do not retry in lockstep.
+"""
+
+import http.client
+import random
+
+# Bedrock / AWS error codes worth retrying
+RETRYABLE_ERROR_CODES = frozenset(
+    {
+        "ThrottlingException",
+        "TooManyRequestsException",
+        "ServiceUnavailableException",
+        "InternalServerException",
+        "ModelStreamErrorException",
+        "ModelNotReadyException",
+        "ModelTimeoutException",
+        "RequestTimeout",
+        "RequestTimeoutException",
+    }
+)
+
+# HTTP statuses worth retrying (search providers)
+RETRYABLE_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+def _error_chain(error: BaseException):
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        yield error
+        error = error.__cause__ or error.__context__
+
+
+def _is_retryable_single(error: BaseException) -> bool:
+    # Network level: dropped streams, resets, timeouts
+    if isinstance(error, (ConnectionError, TimeoutError, http.client.IncompleteRead)):
+        return True
+
+    from urllib3.exceptions import ProtocolError, ReadTimeoutError
+
+    if isinstance(error, (ProtocolError, ReadTimeoutError)):
+        return True
+
+    from strands.types.exceptions import ModelThrottledException
+
+    if isinstance(error, ModelThrottledException):
+        return True
+
+    from botocore.exceptions import ClientError, HTTPClientError
+    from botocore.exceptions import ConnectionError as BotocoreConnectionError
+
+    if isinstance(error, (BotocoreConnectionError, HTTPClientError)):
+        return True
+    if isinstance(error, ClientError):
+        return error.response.get("Error", {}).get("Code") in RETRYABLE_ERROR_CODES
+
+    import httpx
+
+    if isinstance(error, httpx.TransportError):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRYABLE_STATUS_CODES
+    return False
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """
+    Whether an error is transient, so retrying the same work is likely to succeed.
+
+    Args:
+        error: Exception raised by an agent, model or tool.
+
+    Returns:
+        True if the error or one of its causes is a dropped connection or
+        stream, a timeout, throttling or a server-side error.
+    """
+    return any(_is_retryable_single(cause) for cause in _error_chain(error))
+
+
+def backoff_delay(
+    attempt: int,
+    base_seconds: float = 1.0,
+    max_seconds: float = 20.0,
+    rng: random.Random | None = None,
+) -> float:
+    """
+    Delay before a retry, exponential backoff with full jitter.
+
+    Args:
+        attempt: Number of the retry, starting at 1.
+        base_seconds: Upper bound of the first delay.
+        max_seconds: Cap on the upper bound.
+        rng: Random generator (for reproducible delays).
+
+    Returns:
+        Seconds to wait, uniform in [0, min(max_seconds, base_seconds * 2**(attempt - 1))].
+    """
+    ceiling = min(max_seconds, base_seconds * 2 ** (attempt - 1))
+    return (rng or random).uniform(0, ceiling)
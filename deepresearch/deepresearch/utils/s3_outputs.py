@@ -2,15 +2,26 @@
 S3 output uploader for DeepSearch agent.
 
 Uploads all research outputs (documents, findings, reports) to S3
-with a session-based prefix for organization.
+with a session-based prefix for organization. Files are uploaded concurrently
+through one cached S3 client per region. boto3 is imported on first upload, so
+importing this module for its constants stays cheap.
+
+With OUTPUTS_FORMAT=archive, intermediate research documents are packed into
+one archive per session instead of one object each. The archive is a JSONL
+file where every line is compressed as its own gzip member: the whole object
+still decompresses as a regular .jsonl.gz, and the index records the byte
+range of each member so a single document can be fetched with a ranged GET.
 """
 
+import gzip
+import io
+import json
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-import boto3
-from botocore.exceptions import ClientError
+from deepresearch.config import get_output_format, get_s3_upload_config
 
 logger = logging.getLogger("deepsearch.s3_outputs")
 
@@ -20,10 +31,17 @@ RESEARCH_DOCUMENTS_PATTERN = "research_documents_"
 FINDINGS_PATTERN = "research_findings_"
 REPORT_PATTERN = "_report"
 
+# Archive output format for intermediate documents
+ARCHIVE_NAME = "documents.jsonl.gz"
+ARCHIVE_INDEX_NAME = "documents_index.json"
+
 
 def get_s3_client(region_name: str | None = None):
     """
-    Get S3 client for uploads.
+    Get the shared S3 client for uploads.
+
+    The client is created once per region and process, with a connection pool
+    sized for the concurrent uploader. boto3 clients are thread-safe.
 
     Args:
         region_name: AWS region name. If not provided, uses default region.
@@ -31,8 +49,52 @@ def get_s3_client(region_name: str | None = None):
     Returns:
         boto3 S3 client.
     """
+    # The registry module also holds the search clients (httpx, linkup)
+    from deepresearch.utils.clients import get_client_registry
+
     region = region_name or os.environ.get("AWS_REGION")
-    return boto3.client("s3", region_name=region)
+    config = get_s3_upload_config()
+
+    def create_client():
+        import boto3
+        from botocore.config import Config
+
+        return boto3.client(
+            "s3",
+            region_name=region,
+            config=Config(
+                max_pool_connections=config["max_pool_connections"],
+                retries={"max_attempts": 5, "mode": "standard"},
+                tcp_keepalive=True,
+            ),
+        )
+
+    return get_client_registry().get(f"s3:{region or 'default'}", create_client)
+
+
+def get_transfer_config(file_size: int):
+    """
+    Transfer settings for one file.
+
+    Small files are sent with a single PUT on the calling thread (parallelism
+    comes from uploading many files at once); files past the multipart
+    threshold are split into parts uploaded concurrently.
+
+    Args:
+        file_size: Size of the file in bytes.
+
+    Returns:
+        TransferConfig for boto3 upload_file.
+    """
+    from boto3.s3.transfer import TransferConfig
+
+    config = get_s3_upload_config()
+    return TransferConfig(
+        multipart_threshold=config["multipart_threshold"],
+        multipart_chunksize=config["multipart_chunksize"],
+        use_threads=file_size >= config["multipart_threshold"],
+        max_concurrency=4,
+    )
 
 
 def upload_file_to_s3(
@@ -53,21 +115,235 @@ def upload_file_to_s3(
     Returns:
         True if upload successful, False otherwise.
     """
+    from boto3.exceptions import S3UploadFailedError
+    from botocore.exceptions import BotoCoreError, ClientError
+
     try:
-        content_type = "text/markdown" if file_path.suffix == ".md" else "text/plain"
+        content_type = {".md": "text/markdown", ".json": "application/json"}.get(
+            file_path.suffix, "text/plain"
+        )
         s3_client.upload_file(
             str(file_path),
             bucket_name,
             s3_key,
             ExtraArgs={"ContentType": content_type},
+            Config=get_transfer_config(file_path.stat().st_size),
         )
         logger.info(f"Uploaded {file_path.name} to s3://{bucket_name}/{s3_key}")
         return True
-    except ClientError as e:
+    except (ClientError, BotoCoreError, S3UploadFailedError, OSError) as e:
         logger.error(f"Failed to upload {file_path.name}: {e}")
         return False
 
 
+def upload_files(
+    s3_client,
+    uploads: list[tuple[Path, str]],
+    bucket_name: str,
+    max_workers: int | None = None,
+) -> dict[str, list[str]]:
+    """
+    Upload files concurrently on a bounded thread pool.
+
+    Args:
+        s3_client: boto3 S3 client (shared by all workers).
+        uploads: (local path, S3 key) pairs.
+        bucket_name: S3 bucket name.
+        max_workers: Concurrent uploads. Defaults to S3_UPLOAD_MAX_WORKERS.
+
+    Returns:
+        Dictionary with 'uploaded' (S3 URIs) and 'failed' (local paths) lists,
+        in the order of `uploads`.
+    """
+    result = {"uploaded": [], "failed": []}
+    if not uploads:
+        return result
+
+    if max_workers is None:
+        max_workers = get_s3_upload_config()["max_workers"]
+    workers = max(1, min(max_workers, len(uploads)))
+
+    def upload(item: tuple[Path, str]) -> bool:
+        file_path, s3_key = item
+        return upload_file_to_s3(
+            s3_client=s3_client,
+            file_path=file_path,
+            bucket_name=bucket_name,
+            s3_key=s3_key,
+        )
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="s3-upload") as pool:
+        outcomes = list(pool.map(upload, uploads))
+
+    for (file_path, s3_key), ok in zip(uploads, outcomes):
+        if ok:
+            result["uploaded"].append(f"s3://{bucket_name}/{s3_key}")
+        else:
+            result["failed"].append(str(file_path))
+    return result
+
+
+def upload_bytes_to_s3(
+    s3_client,
+    data: bytes,
+    bucket_name: str,
+    s3_key: str,
+    content_type: str,
+) -> bool:
+    """
+    Upload in-memory data to S3.
+
+    Args:
+        s3_client: boto3 S3 client.
+        data: Object content.
+        bucket_name: S3 bucket name.
+        s3_key: S3 object key.
+        content_type: Content-Type of the object.
+
+    Returns:
+        True if upload succeeded, False otherwise.
+    """
+    from boto3.exceptions import S3UploadFailedError
+    from botocore.exceptions import BotoCoreError, ClientError
+
+    try:
+        s3_client.upload_fileobj(
+            io.BytesIO(data),
+            bucket_name,
+            s3_key,
+            ExtraArgs={"ContentType": content_type},
+            Config=get_transfer_config(len(data)),
+        )
+        logger.info(f"Uploaded {len(data)} bytes to s3://{bucket_name}/{s3_key}")
+        return True
+    except (ClientError, BotoCoreError, S3UploadFailedError) as e:
+        logger.error(f"Failed to upload s3://{bucket_name}/{s3_key}: {e}")
+        return False
+
+
+def build_documents_archive(files: list[Path]) -> tuple[bytes, dict]:
+    """
+    Pack research documents into a JSONL archive of independent gzip members.
+
+    Each line is `{"topic", "name", "content"}`. Index entries are keyed by
+    `{topic}/{name}`, the suffix the document would have had as its own
+    object, and hold the member's byte `offset` and `length` in the archive.
+
+    Args:
+        files: Research documents (research_documents_{topic}/...).
+
+    Returns:
+        Archive bytes and the index.
+    """
+    archive = io.BytesIO()
+    documents = {}
+    for file_path in files:
+        topic = file_path.parent.name.replace(RESEARCH_DOCUMENTS_PATTERN, "")
+        content = file_path.read_text(encoding="utf-8", errors="replace")
+        line = json.dumps({"topic": topic, "name": file_path.name, "content": content})
+        member = gzip.compress(f"{line}\n".encode("utf-8"), mtime=0)
+        documents[f"{topic}/{file_path.name}"] = {
+            "offset": archive.tell(),
+            "length": len(member),
+            "size": len(content.encode("utf-8")),
+        }
+        archive.write(member)
+    index = {"archive": ARCHIVE_NAME, "documents": documents}
+    return archive.getvalue(), index
+
+
+def upload_documents_archive(
+    s3_client,
+    session_id: str,
+    bucket_name: str,
+    files: list[Path],
+) -> dict[str, list[str]]:
+    """
+    Upload research documents as one archive plus its index.
+
+    Objects are written to `{session_id}/intermediate/documents.jsonl.gz` and
+    `{session_id}/intermediate/documents_index.json`.
+
+    Args:
+        s3_client: boto3 S3 client.
+        session_id: Session identifier used as S3 prefix.
+        bucket_name: S3 bucket name.
+        files: Research documents to pack.
+
+    Returns:
+        Dictionary with 'uploaded' (archive and index URIs) and 'failed'
+        (every document, if either object could not be uploaded).
+    """
+    if not files:
+        return {"uploaded": [], "failed": []}
+    try:
+        data, index = build_documents_archive(files)
+    except OSError as e:
+        logger.error(f"Failed to build documents archive: {e}")
+        return {"uploaded": [], "failed": [str(path) for path in files]}
+
+    archive_key = f"{session_id}/intermediate/{ARCHIVE_NAME}"
+    index_key = f"{session_id}/intermediate/{ARCHIVE_INDEX_NAME}"
+    if upload_bytes_to_s3(
+        s3_client, data, bucket_name, archive_key, "application/gzip"
+    ) and upload_bytes_to_s3(
+        s3_client,
+        json.dumps(index).encode("utf-8"),
+        bucket_name,
+        index_key,
+        "application/json",
+    ):
+        return {
+            "uploaded": [
+                f"s3://{bucket_name}/{archive_key}",
+                f"s3://{bucket_name}/{index_key}",
+            ],
+            "failed": [],
+        }
+    return {"uploaded": [], "failed": [str(path) for path in files]}
+
+
+def fetch_archived_document(
+    session_id: str,
+    bucket_name: str,
+    document: str,
+    index: dict | None = None,
+    region_name: str | None = None,
+) -> str:
+    """
+    Read one research document from a session archive with a ranged GET.
+
+    Args:
+        session_id: Session identifier used as S3 prefix.
+        bucket_name: S3 bucket name.
+        document: Document key within the archive, `{topic}/{name}`.
+        index: Archive index, if already loaded (fetched from S3 otherwise).
+        region_name: AWS region name.
+
+    Returns:
+        Document content.
+
+    Raises:
+        KeyError: If the document is not in the archive.
+    """
+    s3_client = get_s3_client(region_name=region_name)
+    if index is None:
+        response = s3_client.get_object(
+            Bucket=bucket_name, Key=f"{session_id}/intermediate/{ARCHIVE_INDEX_NAME}"
+        )
+        index = json.loads(response["Body"].read())
+
+    entry = index["documents"][document]
+    start = entry["offset"]
+    end = start + entry["length"] - 1
+    response = s3_client.get_object(
+        Bucket=bucket_name,
+        Key=f"{session_id}/intermediate/{index['archive']}",
+        Range=f"bytes={start}-{end}",
+    )
+    return json.loads(gzip.decompress(response["Body"].read()))["content"]
+
+
 def collect_output_files(working_dir: Path) -> dict[str, list[Path]]:
     """
     Collect all output files from the working directory.
@@ -102,6 +378,34 @@ def collect_output_files(working_dir: Path) -> dict[str, list[Path]]:
     return outputs
 
 
+def plan_uploads(
+    session_id: str, outputs: dict[str, list[Path]]
+) -> list[tuple[Path, str]]:
+    """
+    Map collected output files to their S3 keys.
+
+    Args:
+        session_id: Session identifier used as S3 prefix.
+        outputs: Files from collect_output_files.
+
+    Returns:
+        (local path, S3 key) pairs, intermediate outputs first.
+    """
+    uploads = []
+
+    # Intermediate outputs (research documents)
+    for file_path in outputs["intermediate"]:
+        # Extract topic from parent directory name (research_documents_{topic})
+        topic = file_path.parent.name.replace(RESEARCH_DOCUMENTS_PATTERN, "")
+        uploads.append((file_path, f"{session_id}/intermediate/{topic}/{file_path.name}"))
+
+    # Final outputs (findings and reports)
+    for file_path in outputs["final"]:
+        uploads.append((file_path, f"{session_id}/final/{file_path.name}"))
+
+    return uploads
+
+
 def upload_session_outputs(
     session_id: str,
     bucket_name: str,
@@ -113,6 +417,8 @@ def upload_session_outputs(
 
     Uploads are organized as:
     - {session_id}/intermediate/{research_topic}/{source_file.md}
+      (or {session_id}/intermediate/documents.jsonl.gz and
+      documents_index.json with OUTPUTS_FORMAT=archive)
     - {session_id}/final/{findings_or_report.md}
 
     Args:
@@ -132,37 +438,21 @@ def upload_session_outputs(
     s3_client = get_s3_client(region_name=region_name)
 
     outputs = collect_output_files(working_dir=work_path)
-    result = {"uploaded": [], "failed": []}
-
-    # Upload intermediate outputs (research documents)
-    for file_path in outputs["intermediate"]:
-        # Extract topic from parent directory name (research_documents_{topic})
-        topic = file_path.parent.name.replace(RESEARCH_DOCUMENTS_PATTERN, "")
-        s3_key = f"{session_id}/intermediate/{topic}/{file_path.name}"
-
-        if upload_file_to_s3(
-            s3_client=s3_client,
-            file_path=file_path,
-            bucket_name=bucket_name,
-            s3_key=s3_key,
-        ):
-            result["uploaded"].append(f"s3://{bucket_name}/{s3_key}")
-        else:
-            result["failed"].append(str(file_path))
 
-    # Upload final outputs (findings and reports)
-    for file_path in outputs["final"]:
-        s3_key = f"{session_id}/final/{file_path.name}"
-
-        if upload_file_to_s3(
+    if get_output_format() == "archive":
+        result = upload_documents_archive(
+            s3_client, session_id, bucket_name, outputs["intermediate"]
+        )
+        final = upload_files(
             s3_client=s3_client,
-            file_path=file_path,
+            uploads=plan_uploads(session_id, {"intermediate": [], "final": outputs["final"]}),
             bucket_name=bucket_name,
-            s3_key=s3_key,
-        ):
-            result["uploaded"].append(f"s3://{bucket_name}/{s3_key}")
-        else:
-            result["failed"].append(str(file_path))
+        )
+        result["uploaded"].extend(final["uploaded"])
+        result["failed"].extend(final["failed"])
+    else:
+        uploads = plan_uploads(session_id, outputs)
+        result = upload_files(s3_client=s3_client, uploads=uploads, bucket_name=bucket_name)
 
     logger.info(
         f"S3 upload complete: {len(result['uploaded'])} uploaded, "
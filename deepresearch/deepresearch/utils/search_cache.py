@@ -0,0 +1,341 @@
+"""
+Search result cache for DeepSearch agent.
+
+Results are content-addressed by the normalized query, the search provider and
+the search depth. Two tiers are available:
+- An in-process LRU tier, bounded by entry count and TTL
+- An optional SQLite tier that survives runtime restarts
+
+The async methods used by the search tools run the SQLite tier in a worker
+thread, so a slow disk does not stall the searches sharing the event loop.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+
+from deepresearch.config import get_search_cache_config
+
+logger = logging.getLogger("deepsearch.search_cache")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a search query for cache lookups.
+
+    Lowercases the query, collapses whitespace and strips surrounding
+    punctuation so trivially different spellings share a cache entry.
+
+    Args:
+        query: Raw search query.
+
+    Returns:
+        Normalized query string.
+    """
+    return " ".join(query.lower().split()).strip(" ?!.,;:")
+
+
+def make_cache_key(query: str, provider: str, depth: str = "standard") -> str:
+    """
+    Build a content-addressed cache key for a search request.
+
+    Args:
+        query: Raw search query.
+        provider: Search provider name (e.g. "linkup").
+        depth: Search depth requested from the provider.
+
+    Returns:
+        Hex SHA-256 digest identifying the request.
+    """
+    payload = json.dumps(
+        {"query": normalize_query(query), "provider": provider, "depth": depth},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SqliteCacheTier:
+    """On-disk cache tier backed by a single SQLite table, safe to share across threads."""
+
+    def __init__(self, path: Path | str, max_entries: int, ttl_seconds: float):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS search_cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS search_cache_accessed"
+            " ON search_cache (accessed_at)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str, now: float) -> tuple[str, float] | None:
+        """(value, created_at) of a live entry, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE search_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            return value, created_at
+
+    def set(self, key: str, value: str, now: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, value, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM search_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+            self._conn.execute(
+                "DELETE FROM search_cache WHERE key IN ("
+                " SELECT key FROM search_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM search_cache")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class SearchCache:
+    """
+    Two-tier search result cache with TTL and LRU eviction.
+
+    All methods are thread-safe so the cache can be shared by every subagent
+    running in the process.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 86400,
+        max_entries: int = 1024,
+        disk_path: Path | str | None = None,
+        max_disk_entries: int = 50000,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl_seconds: Lifetime of a cached result in seconds.
+            max_entries: Maximum number of results kept in memory.
+            disk_path: Optional SQLite file for the persistent tier.
+            max_disk_entries: Maximum number of results kept on disk.
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._memory: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = (
+            SqliteCacheTier(disk_path, max_disk_entries, ttl_seconds)
+            if disk_path
+            else None
+        )
+        self._counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "upstream_calls": 0,
+            "upstream_seconds": 0.0,
+        }
+
+    def get(self, key: str) -> str | None:
+        """
+        Look up a cached result, promoting disk hits into memory.
+
+        Args:
+            key: Cache key from make_cache_key.
+
+        Returns:
+            Cached result or None on a miss.
+        """
+        now = time.time()
+        value = self._get_from_memory(key, now)
+        if value is None and self._disk is not None:
+            value = self._promote(key, self._disk.get(key, now))
+        if value is None:
+            self._count_miss()
+        return value
+
+    async def get_async(self, key: str) -> str | None:
+        """
+        Look up a cached result without blocking the event loop on disk reads.
+
+        Args:
+            key: Cache key from make_cache_key.
+
+        Returns:
+            Cached result or None on a miss.
+        """
+        now = time.time()
+        value = self._get_from_memory(key, now)
+        if value is None and self._disk is not None:
+            value = self._promote(key, await asyncio.to_thread(self._disk.get, key, now))
+        if value is None:
+            self._count_miss()
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Store a result in every configured tier.
+
+        Args:
+            key: Cache key from make_cache_key.
+            value: Search result to cache.
+        """
+        now = time.time()
+        with self._lock:
+            self._store_in_memory(key, value, now)
+        if self._disk is not None:
+            self._disk.set(key, value, now)
+
+    async def set_async(self, key: str, value: str) -> None:
+        """
+        Store a result in every configured tier, writing to disk in a worker thread.
+
+        Args:
+            key: Cache key from make_cache_key.
+            value: Search result to cache.
+        """
+        now = time.time()
+        with self._lock:
+            self._store_in_memory(key, value, now)
+        if self._disk is not None:
+            await asyncio.to_thread(self._disk.set, key, value, now)
+
+    def record_upstream_call(self, elapsed_seconds: float) -> None:
+        """
+        Record the latency of a search that missed the cache.
+
+        Used to estimate how much time the cache hits have saved.
+
+        Args:
+            elapsed_seconds: Wall-clock duration of the upstream request.
+        """
+        with self._lock:
+            self._counters["upstream_calls"] += 1
+            self._counters["upstream_seconds"] += elapsed_seconds
+
+    def stats(self) -> dict[str, float]:
+        """
+        Get cache hit/miss counters.
+
+        Returns:
+            Dictionary with hit, miss and eviction counts, the hit rate and
+            the estimated upstream seconds saved by cache hits.
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            counters["entries"] = len(self._memory)
+
+        hits = counters["memory_hits"] + counters["disk_hits"]
+        lookups = hits + counters["misses"]
+        avg_upstream = (
+            counters["upstream_seconds"] / counters["upstream_calls"]
+            if counters["upstream_calls"]
+            else 0.0
+        )
+        counters["hits"] = hits
+        counters["hit_rate"] = hits / lookups if lookups else 0.0
+        counters["estimated_seconds_saved"] = hits * avg_upstream
+        return counters
+
+    def clear(self) -> None:
+        """Remove every entry from all tiers."""
+        with self._lock:
+            self._memory.clear()
+            if self._disk is not None:
+                self._disk.clear()
+
+    def _get_from_memory(self, key: str, now: float) -> str | None:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            created_at, value = entry
+            if now - created_at <= self.ttl_seconds:
+                self._memory.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                return value
+            del self._memory[key]
+            return None
+
+    def _promote(self, key: str, entry: tuple[str, float] | None) -> str | None:
+        if entry is None:
+            return None
+        value, created_at = entry
+        with self._lock:
+            # Keeps the disk entry's age, so it expires from memory on time
+            self._store_in_memory(key, value, created_at)
+            self._counters["disk_hits"] += 1
+        return value
+
+    def _count_miss(self) -> None:
+        with self._lock:
+            self._counters["misses"] += 1
+
+    def _store_in_memory(self, key: str, value: str, created_at: float) -> None:
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._counters["evictions"] += 1
+
+
+@lru_cache(maxsize=1)
+def get_search_cache() -> SearchCache | None:
+    """
+    Get the process-wide search cache.
+
+    Returns:
+        Shared SearchCache instance, or None if caching is disabled.
+    """
+    config = get_search_cache_config()
+    if not config["enabled"]:
+        logger.info("Search cache is disabled")
+        return None
+
+    logger.info(
+        f"Search cache enabled (ttl={config['ttl_seconds']}s, "
+        f"max_entries={config['max_entries']}, disk_path={config['disk_path']})"
+    )
+    return SearchCache(
+        ttl_seconds=config["ttl_seconds"],
+        max_entries=config["max_entries"],
+        disk_path=config["disk_path"],
+        max_disk_entries=config["max_disk_entries"],
+    )
@@ -1,47 +1,234 @@
-from functools import lru_cache
+"""
+Secrets Manager cache for provider API keys.
+
+SECRETS_CONFIG maps environment variable names to secret names. All secrets
+are fetched concurrently, so startup time does not grow with the number of
+configured providers, and exported to the environment where the providers
+read them. A background thread refreshes them on a TTL so rotated keys are
+picked up without a restart; when a refresh fails the last good value stays
+in place.
+"""
+
 import json
-import os
-import boto3
 import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from deepresearch.config import get_secrets_refresh_config
 
 logger = logging.getLogger(__name__)
 
 
+class SecretsCache:
+    """Concurrently fetched, periodically refreshed Secrets Manager values."""
+
+    def __init__(
+        self,
+        secrets_config: dict[str, str],
+        region_name: str | None = None,
+        refresh_seconds: float = 3600,
+        max_workers: int = 8,
+    ):
+        """
+        Initialize the cache (nothing is fetched until load()).
+
+        Args:
+            secrets_config: Env var name -> secret name.
+            region_name: AWS region name.
+            refresh_seconds: Time between background refreshes; 0 disables them.
+            max_workers: Secrets fetched concurrently.
+        """
+        self.secrets_config = dict(secrets_config)
+        self.region_name = region_name
+        self.refresh_seconds = refresh_seconds
+        self.max_workers = max_workers
+        self._values: dict[str, str] = {}
+        self._loaded_at: float | None = None
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._client = None
+        self.refreshes = 0
+        self.failures = 0
+
+    def _get_client(self):
+        if self._client is None:
+            import boto3
+
+            self._client = boto3.client("secretsmanager", region_name=self.region_name)
+        return self._client
+
+    def _fetch(self, secret_name: str) -> str:
+        response = self._get_client().get_secret_value(SecretId=secret_name)
+        return response["SecretString"]
+
+    def refresh(self) -> dict[str, str]:
+        """
+        Fetch every configured secret concurrently and export the values.
+
+        A secret that fails to load keeps its last good value.
+
+        Returns:
+            Env var name -> error message for the secrets that failed.
+        """
+        names = list(self.secrets_config.items())
+        self._get_client()  # create once, before the worker threads share it
+        errors: dict[str, str] = {}
+        start = time.perf_counter()
+
+        def fetch(item: tuple[str, str]) -> tuple[str, str | None, str | None]:
+            env_var_name, secret_name = item
+            try:
+                return env_var_name, self._fetch(secret_name), None
+            except Exception as e:
+                return env_var_name, None, str(e)
+
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(names)) or 1,
+            thread_name_prefix="secrets",
+        ) as executor:
+            results = list(executor.map(fetch, names))
+
+        with self._lock:
+            for env_var_name, value, error in results:
+                secret_name = self.secrets_config[env_var_name]
+                if error is not None:
+                    errors[env_var_name] = error
+                    self.failures += 1
+                    if env_var_name in self._values:
+                        logger.warning(
+                            f"Failed to refresh secret '{secret_name}', keeping the last "
+                            f"good value: {error}"
+                        )
+                    else:
+                        logger.error(f"Failed to load secret '{secret_name}': {error}")
+                    continue
+                if self._values.get(env_var_name) not in (None, value):
+                    logger.info(f"Secret '{secret_name}' rotated")
+                self._values[env_var_name] = value
+                os.environ[env_var_name] = value
+            self._loaded_at = time.time()
+            self.refreshes += 1
+
+        logger.info(
+            f"Loaded {len(names) - len(errors)}/{len(names)} secrets from Secrets Manager "
+            f"in {(time.perf_counter() - start) * 1000:.0f} ms"
+        )
+        return errors
+
+    def load(self) -> dict[str, str]:
+        """
+        Get the secret values, fetching any that were never loaded.
+
+        The first successful load starts the background refresh.
+
+        Returns:
+            Env var name -> secret value.
+
+        Raises:
+            RuntimeError: If a secret has never been loaded successfully.
+        """
+        # Concurrent first calls wait for one fetch instead of each starting one
+        with self._load_lock:
+            with self._lock:
+                missing = [name for name in self.secrets_config if name not in self._values]
+            if missing:
+                errors = self.refresh()
+                unavailable = {name: errors[name] for name in missing if name in errors}
+                if unavailable:
+                    raise RuntimeError(
+                        "Failed to load secrets: "
+                        + ", ".join(
+                            f"'{self.secrets_config[name]}' ({error})"
+                            for name, error in unavailable.items()
+                        )
+                    )
+        self.start()
+        with self._lock:
+            return dict(self._values)
+
+    def start(self) -> None:
+        """Start the background refresh thread (once; no-op when disabled)."""
+        if self.refresh_seconds <= 0:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="secrets-refresh", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background refresh thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.refresh_seconds):
+            try:
+                self.refresh()
+            except Exception as e:
+                # Keep serving the last good values and try again next interval
+                logger.warning(f"Secrets refresh failed: {e}")
+
+    def stats(self) -> dict:
+        """Refresh counters and the age of the last refresh."""
+        with self._lock:
+            age = None if self._loaded_at is None else round(time.time() - self._loaded_at, 1)
+            return {
+                "secrets": len(self.secrets_config),
+                "loaded": len(self._values),
+                "refreshes": self.refreshes,
+                "failures": self.failures,
+                "age_seconds": age,
+            }
+
+
 @lru_cache(maxsize=1)
-def load_secrets_from_secrets_manager() -> dict[str, str]:
+def get_secrets_cache() -> SecretsCache | None:
     """
-    Load secrets from AWS Secrets Manager based on SECRETS_CONFIG environment variable.
+    Get the process-wide secrets cache for SECRETS_CONFIG.
 
     The SECRETS_CONFIG is a JSON map of env var names to secret names.
     Example: {"LINKUP_API_KEY": "linkup/api-key", "TAVILY_API_KEY": "tavily/api-key"}
 
     Returns:
-        Dictionary mapping environment variable names to their secret values.
+        SecretsCache, or None if no secrets are configured.
     """
-    secrets_config_json = os.environ.get("SECRETS_CONFIG")
-    if not secrets_config_json:
-        logger.info("No SECRETS_CONFIG found, skipping secrets loading")
-        return {}
-
-    secrets_config = json.loads(secrets_config_json)
+    secrets_config = json.loads(os.environ.get("SECRETS_CONFIG") or "{}")
     if not secrets_config:
-        return {}
+        return None
+
+    config = get_secrets_refresh_config()
+    return SecretsCache(
+        secrets_config,
+        region_name=os.environ.get("AWS_REGION", os.environ.get("AWS_DEFAULT_REGION")),
+        refresh_seconds=config["refresh_seconds"],
+        max_workers=config["max_workers"],
+    )
 
-    logger.info(f"Loading {len(secrets_config)} secrets from Secrets Manager")
 
-    region_name = os.environ.get("AWS_REGION", os.environ.get("AWS_DEFAULT_REGION"))
-    secrets_client = boto3.client("secretsmanager", region_name=region_name)
-    loaded_secrets = {}
+def load_secrets_from_secrets_manager() -> dict[str, str]:
+    """
+    Load secrets from AWS Secrets Manager based on SECRETS_CONFIG environment variable.
 
-    for env_var_name, secret_name in secrets_config.items():
-        try:
-            response = secrets_client.get_secret_value(SecretId=secret_name)
-            secret_value = response["SecretString"]
-            loaded_secrets[env_var_name] = secret_value
-            os.environ[env_var_name] = secret_value
-            logger.info(f"Loaded secret '{secret_name}' into {env_var_name}")
-        except Exception as e:
-            logger.error(f"Failed to load secret '{secret_name}': {e}")
-            raise
+    Safe to call on every invocation: values are fetched once, concurrently,
+    then refreshed in the background (see SecretsCache).
 
-    return loaded_secrets
+    Returns:
+        Dictionary mapping environment variable names to their secret values.
+
+    Raises:
+        RuntimeError: If a configured secret could never be loaded.
+    """
+    cache = get_secrets_cache()
+    if cache is None:
+        logger.debug("No SECRETS_CONFIG found, skipping secrets loading")
+        return {}
+    return cache.load()
@@ -0,0 +1,202 @@
+"""
+Per-session store for source documents returned by search tools.
+
+Search tools write every source they return straight to disk as
+`research_documents_{topic}/source_{n}.md` with a `source_url:` header, the
+same layout subagents used to produce with file_write, so the citations agent
+and `collect_output_files` pick them up unchanged. The model only sees a short
+handle (the file path) and snippet per source.
+"""
+
+import logging
+import re
+import threading
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from pathlib import Path
+
+from deepresearch.search.base import SearchSource
+from deepresearch.utils.s3_outputs import RESEARCH_DOCUMENTS_PATTERN
+from deepresearch.utils.workspace import SessionWorkspace, get_working_dir
+
+logger = logging.getLogger("deepsearch.source_store")
+
+DEFAULT_TOPIC = "general"
+
+_SOURCE_FILE_RE = re.compile(r"^source_(\d+)\.md$")
+
+
+def normalize_topic(topic: str | None) -> str:
+    """
+    Turn a free-form topic into a safe directory suffix.
+
+    Args:
+        topic: Topic as given by the agent (e.g. "AI Safety Challenges").
+
+    Returns:
+        Lowercase snake_case topic, or DEFAULT_TOPIC if nothing is left.
+    """
+    topic = (topic or "").lower()
+    if topic.startswith(RESEARCH_DOCUMENTS_PATTERN):
+        topic = topic[len(RESEARCH_DOCUMENTS_PATTERN):]
+    topic = re.sub(r"[^a-z0-9]+", "_", topic).strip("_")
+    return topic or DEFAULT_TOPIC
+
+
+@dataclass
+class SavedSource:
+    """
+    A source document written to the store.
+
+    Attributes:
+        handle: Path of the document relative to the store root.
+        source: The search source it was written from.
+    """
+
+    handle: str
+    source: SearchSource
+
+
+class SourceStore:
+    """Writes numbered source documents under a session's working directory."""
+
+    def __init__(self, root: Path | str, workspace: SessionWorkspace | None = None):
+        """
+        Initialize the store.
+
+        Args:
+            root: Directory holding the research_documents_{topic}/ directories.
+            workspace: Session workspace whose size quota applies to writes.
+        """
+        self.root = Path(root)
+        self.workspace = workspace
+        self._lock = threading.Lock()
+        self._counters: dict[str, int] = {}
+        self._saved: dict[tuple[str, str], str] = {}
+
+    def topic_dir(self, topic: str) -> Path:
+        """Directory holding the source documents of a topic."""
+        return self.root / f"{RESEARCH_DOCUMENTS_PATTERN}{topic}"
+
+    def _next_number(self, topic: str) -> int:
+        if topic not in self._counters:
+            # Continue after documents already on disk (e.g. saved by file_write)
+            existing = [
+                int(match.group(1))
+                for path in self.topic_dir(topic).glob("source_*.md")
+                if (match := _SOURCE_FILE_RE.match(path.name))
+            ]
+            self._counters[topic] = max(existing, default=0)
+        self._counters[topic] += 1
+        return self._counters[topic]
+
+    def save(
+        self,
+        source: SearchSource,
+        topic: str | None,
+        query: str,
+        retrieved_at: float | None = None,
+    ) -> SavedSource:
+        """
+        Write a source document, reusing the existing file for a repeated URL.
+
+        Args:
+            source: Structured source from a search result.
+            topic: Research topic, matching the subagent's findings filename.
+            query: Query that returned the source.
+            retrieved_at: Unix time a source reused from earlier research was
+                first retrieved, kept so reuse does not make it look fresh.
+
+        Returns:
+            The saved source with its handle.
+
+        Raises:
+            WorkspaceQuotaError: If the document would exceed the workspace quota.
+        """
+        topic = normalize_topic(topic)
+        key = (topic, source.url)
+        with self._lock:
+            if source.url and key in self._saved:
+                return SavedSource(handle=self._saved[key], source=source)
+
+            header = f"source_url: {source.url or 'N/A'}\ntitle: {source.title}\nquery: {query}\n"
+            if retrieved_at is not None:
+                header += f"retrieved_at: {retrieved_at:.0f}\n"
+            document = f"{header}\n{source.snippet}\n"
+            if self.workspace is not None:
+                self.workspace.ensure_capacity(len(document.encode("utf-8")))
+            directory = self.topic_dir(topic)
+            directory.mkdir(parents=True, exist_ok=True)
+            path = directory / f"source_{self._next_number(topic)}.md"
+            path.write_text(document, encoding="utf-8")
+            handle = path.relative_to(self.root).as_posix()
+            if source.url:
+                self._saved[key] = handle
+
+        logger.debug(f"Saved source {source.url} to {handle}")
+        return SavedSource(handle=handle, source=source)
+
+    def save_all(
+        self, sources: list[SearchSource], topic: str | None, query: str
+    ) -> list[SavedSource]:
+        """
+        Write every source of a search result.
+
+        Args:
+            sources: Structured sources from a search result.
+            topic: Research topic.
+            query: Query that returned the sources.
+
+        Returns:
+            Saved sources in the original order.
+        """
+        return [self.save(source, topic=topic, query=query) for source in sources]
+
+
+_current_store: ContextVar[SourceStore | None] = ContextVar(
+    "deepsearch_source_store", default=None
+)
+_default_stores: dict[Path, SourceStore] = {}
+_default_stores_lock = threading.Lock()
+
+
+def bind_source_store(store: SourceStore) -> Token:
+    """
+    Make a store the current one for this context (one session's invocation).
+
+    Context variables are copied into agent and tool threads, so every
+    subagent of the invocation writes to the same store.
+
+    Args:
+        store: Store of the session.
+
+    Returns:
+        Token to pass to unbind_source_store.
+    """
+    return _current_store.set(store)
+
+
+def unbind_source_store(token: Token) -> None:
+    """Restore the store that was current before bind_source_store."""
+    _current_store.reset(token)
+
+
+def get_source_store() -> SourceStore:
+    """
+    Get the store of the current session.
+
+    Falls back to a process-wide store rooted at the working directory (the
+    bound session workspace, or the current directory for local runs of
+    main.py) when no session store is bound.
+
+    Returns:
+        SourceStore to write source documents to.
+    """
+    store = _current_store.get()
+    if store is not None:
+        return store
+    root = get_working_dir()
+    with _default_stores_lock:
+        if root not in _default_stores:
+            _default_stores[root] = SourceStore(root)
+        return _default_stores[root]
@@ -5,14 +5,20 @@ Utility functions for Telemetry tracing.
 import base64
 import logging
 import os
-from strands.telemetry import StrandsTelemetry
+import threading
+from functools import lru_cache
+
+from deepresearch.config import get_performance_config
 
 logger = logging.getLogger(__name__)
 
+# The runtime warms up in a background thread while requests may already arrive
+_telemetry_lock = threading.Lock()
+
 
 def initialize_telemetry() -> bool:
     """
-    Initialize Strands telemetry with OTLP exporter.
+    Initialize Strands telemetry with OTLP exporter, once per process.
 
     When deployed via AgentCore, OTEL env vars (OTEL_EXPORTER_OTLP_ENDPOINT,
     OTEL_EXPORTER_OTLP_HEADERS) are already configured via Terraform.
@@ -23,6 +29,12 @@ def initialize_telemetry() -> bool:
     Returns:
         True if telemetry was initialized, False if skipped due to missing config.
     """
+    with _telemetry_lock:
+        return _setup_telemetry()
+
+
+@lru_cache(maxsize=1)
+def _setup_telemetry() -> bool:
     # Check if OTEL endpoint is already configured (e.g., via Terraform in AgentCore)
     has_otel_endpoint = "OTEL_EXPORTER_OTLP_ENDPOINT" in os.environ
 
@@ -52,9 +64,79 @@ def initialize_telemetry() -> bool:
             os.environ["LANGFUSE_HOST"] + "/api/public/otel"
         )
 
+    from strands.telemetry import StrandsTelemetry
+
     strands_telemetry = StrandsTelemetry()
     strands_telemetry.setup_otlp_exporter()
+    # Langfuse only ingests traces; metrics need a collector endpoint
+    if has_otel_endpoint and get_performance_config()["metrics"]:
+        strands_telemetry.setup_meter(enable_otlp_exporter=True)
     logger.info(
         f"Telemetry initialized with endpoint: {os.environ.get('OTEL_EXPORTER_OTLP_ENDPOINT')}"
     )
     return True
+
+
+@lru_cache(maxsize=1)
+def _performance_instruments() -> dict:
+    from opentelemetry import metrics
+
+    meter = metrics.get_meter("deepsearch")
+    return {
+        "duration": meter.create_histogram(
+            "deepsearch.stage.duration",
+            unit="s",
+            description="Latency of model calls, tool calls and uploads",
+        ),
+        "bytes": meter.create_counter(
+            "deepsearch.stage.bytes",
+            unit="By",
+            description="Bytes sent to and received from tools and uploads",
+        ),
+        "tokens": meter.create_counter(
+            "deepsearch.model.tokens",
+            unit="{token}",
+            description="Model input and output tokens",
+        ),
+        "run_duration": meter.create_histogram(
+            "deepsearch.run.duration",
+            unit="s",
+            description="Wall time of research runs",
+        ),
+        "parallelism": meter.create_histogram(
+            "deepsearch.run.parallelism",
+            description="Average number of concurrently running subagents or searches",
+        ),
+    }
+
+
+def record_performance_metrics(spans, summary: dict) -> None:
+    """
+    Export the spans and summary of a run as OTEL metrics.
+
+    Without a configured meter provider (telemetry skipped or metrics
+    disabled) the OpenTelemetry API drops the measurements.
+
+    Args:
+        spans: Spans of the run (see utils/performance.py).
+        summary: PerformanceRecorder.summary() of the run.
+    """
+    if not get_performance_config()["metrics"]:
+        return
+    instruments = _performance_instruments()
+    for span in spans:
+        attributes = {"stage": span.stage, "agent": span.agent, "ok": span.ok}
+        instruments["duration"].record(span.seconds, attributes)
+        if span.bytes_in:
+            instruments["bytes"].add(span.bytes_in, {**attributes, "direction": "in"})
+        if span.bytes_out:
+            instruments["bytes"].add(span.bytes_out, {**attributes, "direction": "out"})
+        if span.input_tokens:
+            instruments["tokens"].add(span.input_tokens, {**attributes, "type": "input"})
+        if span.output_tokens:
+            instruments["tokens"].add(span.output_tokens, {**attributes, "type": "output"})
+    instruments["run_duration"].record(summary["wall_seconds"])
+    for stage, parallelism in summary["parallelism"].items():
+        instruments["parallelism"].record(
+            parallelism["average_concurrent"], {"stage": stage}
+        )
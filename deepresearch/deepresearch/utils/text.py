@@ -0,0 +1,56 @@
+"""
+Text normalization shared by the citation index, the knowledge store and the
+search query log.
+
+Tokens are lowercase words and numbers with stopwords dropped and a light
+plural stemming, so "Transformers" and "transformer" compare equal.
+"""
+
+import re
+
+STOPWORDS = frozenset(
+    """
+    a about above after again against all also am an and any are as at be because
+    been before being below between both but by can could did do does doing down
+    during each few for from further had has have having he her here hers herself
+    him himself his how i if in into is it its itself just me more most my myself
+    no nor not now of off on once only or other our ours ourselves out over own
+    same she should so some such than that the their theirs them themselves then
+    there these they this those through to too under until up very was we were
+    what when where which while who whom why will with would you your yours
+    yourself yourselves may might must shall within without across among per via
+    """.split()
+)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[.,][0-9]+)*")
+
+
+def _stem(token: str) -> str:
+    if token.isdigit() or len(token) <= 3:
+        return token
+    if token.endswith("ies") and len(token) > 4:
+        return token[:-3] + "y"
+    if token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str, keep: frozenset[str] = frozenset()) -> list[str]:
+    """
+    Split text into lowercase, lightly stemmed content tokens.
+
+    Stopwords are dropped; numbers (including decimals like 3.5) are kept since
+    they are often the fact being cited or searched for.
+
+    Args:
+        text: Text to tokenize.
+        keep: Stopwords to keep as tokens.
+
+    Returns:
+        List of tokens in order.
+    """
+    return [
+        _stem(token)
+        for token in _TOKEN_RE.findall(text.lower())
+        if (token not in STOPWORDS or token in keep) and (len(token) > 1 or token.isdigit())
+    ]
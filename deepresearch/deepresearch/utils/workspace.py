@@ -0,0 +1,317 @@
+"""
+Per-session workspaces for research outputs.
+
+Every runtime invocation gets its own directory, derived from the session id,
+that the file tools, the search tools' source store, the citation stage and
+the S3 uploader resolve paths against. Concurrent sessions in one container
+therefore never see each other's files. Workspaces have a size quota and are
+removed after a TTL (and optionally right after their outputs are uploaded).
+
+Paths are resolved with symlinks followed, so a link inside a workspace cannot
+point a tool outside it. The quota is checked against a running byte total
+that writes update, re-measured from disk periodically and before a write is
+refused, instead of walking the workspace on every write.
+"""
+
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from contextvars import ContextVar, Token
+from functools import lru_cache
+from pathlib import Path
+
+from deepresearch.config import get_workspace_config
+
+logger = logging.getLogger("deepsearch.workspace")
+
+# Age after which the running size total is re-measured from disk, to pick up
+# files written without a quota check (checkpoints, reports of other stages)
+USAGE_RESYNC_SECONDS = 30
+
+
+class WorkspaceError(ValueError):
+    """Raised when a path resolves outside the session workspace."""
+
+
+class WorkspaceQuotaError(WorkspaceError):
+    """Raised when a write would exceed the workspace size quota."""
+
+
+def _directory_size(path: Path) -> int:
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, filename))
+            except OSError:
+                continue
+    return total
+
+
+class SessionWorkspace:
+    """Directory holding one session's files, with a size quota."""
+
+    def __init__(self, session_id: str, path: Path, max_bytes: int | None = None):
+        """
+        Initialize the workspace (the directory is created if missing).
+
+        Args:
+            session_id: Session the workspace belongs to.
+            path: Workspace directory.
+            max_bytes: Size quota in bytes, or None for no limit.
+        """
+        self.session_id = session_id
+        self.path = Path(path).resolve()
+        self.max_bytes = max_bytes
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._used_bytes: int | None = None
+        self._measured_at = 0.0
+        self._lock = threading.Lock()
+
+    def resolve(self, path: str | Path) -> Path:
+        """
+        Resolve a path against the workspace.
+
+        Relative paths (including `./...`) are taken relative to the workspace;
+        absolute paths must already point inside it. Symlinks are followed, so
+        a link to a location outside the workspace is rejected.
+
+        Args:
+            path: Path given by an agent or tool.
+
+        Returns:
+            Absolute path inside the workspace, with symlinks resolved.
+
+        Raises:
+            WorkspaceError: If the path escapes the workspace.
+        """
+        candidate = Path(os.path.expanduser(str(path)))
+        if not candidate.is_absolute():
+            candidate = self.path / candidate
+        resolved = Path(os.path.realpath(candidate))
+        if not resolved.is_relative_to(self.path):
+            raise WorkspaceError(f"Path {path} is outside the session workspace")
+        return resolved
+
+    def usage_bytes(self) -> int:
+        """Total size of the files in the workspace, measured on disk."""
+        return _directory_size(self.path)
+
+    def _measure(self) -> int:
+        self._used_bytes = self.usage_bytes()
+        self._measured_at = time.monotonic()
+        return self._used_bytes
+
+    def ensure_capacity(self, size: int, replacing: Path | None = None) -> None:
+        """
+        Check that writing `size` bytes stays within the quota, and count them.
+
+        The check uses the running total of the workspace size; it is only
+        re-measured from disk when older than USAGE_RESYNC_SECONDS or before
+        refusing a write.
+
+        Args:
+            size: Bytes about to be written.
+            replacing: File being overwritten, whose current size is freed.
+
+        Raises:
+            WorkspaceQuotaError: If the quota would be exceeded.
+        """
+        if self.max_bytes is None:
+            return
+        freed = 0
+        if replacing is not None and replacing.is_file():
+            freed = replacing.stat().st_size
+        with self._lock:
+            measured = (
+                self._used_bytes is None
+                or time.monotonic() - self._measured_at > USAGE_RESYNC_SECONDS
+            )
+            used = self._measure() if measured else self._used_bytes
+            if used - freed + size > self.max_bytes and not measured:
+                # The running total may have drifted (e.g. edits that shrank files)
+                used = self._measure()
+            if used - freed + size > self.max_bytes:
+                raise WorkspaceQuotaError(
+                    f"Workspace quota exceeded: {used - freed + size} of {self.max_bytes} "
+                    f"bytes for session {self.session_id}"
+                )
+            self._used_bytes = used - freed + size
+
+    def cleanup(self) -> None:
+        """Delete the workspace directory and everything in it."""
+        shutil.rmtree(self.path, ignore_errors=True)
+        logger.info(f"Removed workspace of session {self.session_id}")
+
+
+class WorkspaceManager:
+    """Creates session workspaces under one base directory and expires old ones."""
+
+    def __init__(
+        self,
+        base_dir: Path | str,
+        max_bytes: int | None = None,
+        ttl_seconds: float | None = None,
+    ):
+        """
+        Initialize the manager.
+
+        Args:
+            base_dir: Directory holding one subdirectory per session.
+            max_bytes: Per-session size quota in bytes, or None for no limit.
+            ttl_seconds: Age after which an untouched workspace is removed,
+                or None to keep workspaces until released.
+        """
+        self.base_dir = Path(base_dir)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._active: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def directory_name(session_id: str) -> str:
+        """Filesystem-safe directory name for a session id."""
+        name = re.sub(r"[^A-Za-z0-9_.-]", "_", session_id).strip(".")
+        return name or "session"
+
+    def acquire(self, session_id: str) -> SessionWorkspace:
+        """
+        Get the workspace of a session, creating it if needed.
+
+        Invocations of the same session share the workspace, so later turns can
+        read earlier findings. Expired workspaces are swept first.
+
+        Args:
+            session_id: Session identifier.
+
+        Returns:
+            The session's workspace.
+        """
+        self.cleanup_expired()
+        with self._lock:
+            self._active[session_id] = self._active.get(session_id, 0) + 1
+        workspace = SessionWorkspace(
+            session_id,
+            self.base_dir / self.directory_name(session_id),
+            max_bytes=self.max_bytes,
+        )
+        os.utime(workspace.path)
+        return workspace
+
+    def release(self, workspace: SessionWorkspace, remove: bool = False) -> None:
+        """
+        Mark an invocation as finished with a workspace.
+
+        Args:
+            workspace: Workspace returned by acquire.
+            remove: Delete the workspace if no other invocation is using it.
+        """
+        with self._lock:
+            remaining = self._active.get(workspace.session_id, 1) - 1
+            if remaining > 0:
+                self._active[workspace.session_id] = remaining
+                return
+            self._active.pop(workspace.session_id, None)
+        os.utime(workspace.path)
+        if remove:
+            workspace.cleanup()
+
+    def cleanup_expired(self) -> list[str]:
+        """
+        Remove workspaces not used for longer than the TTL.
+
+        Returns:
+            Directory names of the removed workspaces.
+        """
+        if self.ttl_seconds is None or not self.base_dir.is_dir():
+            return []
+        with self._lock:
+            active = {self.directory_name(session_id) for session_id in self._active}
+        cutoff = time.time() - self.ttl_seconds
+        removed = []
+        for entry in self.base_dir.iterdir():
+            if entry.is_dir() and entry.name not in active and entry.stat().st_mtime < cutoff:
+                shutil.rmtree(entry, ignore_errors=True)
+                removed.append(entry.name)
+        if removed:
+            logger.info(f"Removed {len(removed)} expired session workspaces")
+        return removed
+
+
+@lru_cache(maxsize=1)
+def get_workspace_manager() -> WorkspaceManager:
+    """
+    Get the process-wide workspace manager built from configuration.
+
+    Returns:
+        Shared WorkspaceManager instance.
+    """
+    config = get_workspace_config()
+    base_dir = config["root"] or Path(tempfile.gettempdir()) / "deepsearch_sessions"
+    return WorkspaceManager(
+        base_dir=base_dir,
+        max_bytes=config["max_bytes"],
+        ttl_seconds=config["ttl_seconds"],
+    )
+
+
+_current_workspace: ContextVar[SessionWorkspace | None] = ContextVar(
+    "deepsearch_workspace", default=None
+)
+
+
+def bind_workspace(workspace: SessionWorkspace) -> Token:
+    """
+    Make a workspace the current one for this context (one invocation).
+
+    Args:
+        workspace: Workspace of the session.
+
+    Returns:
+        Token to pass to unbind_workspace.
+    """
+    return _current_workspace.set(workspace)
+
+
+def unbind_workspace(token: Token) -> None:
+    """Restore the workspace that was current before bind_workspace."""
+    _current_workspace.reset(token)
+
+
+def get_current_workspace() -> SessionWorkspace | None:
+    """Get the workspace bound to this context, if any."""
+    return _current_workspace.get()
+
+
+def get_working_dir() -> Path:
+    """
+    Directory outputs are read from and written to.
+
+    Returns:
+        The bound session workspace, or the current directory for local runs.
+    """
+    workspace = _current_workspace.get()
+    return workspace.path if workspace is not None else Path.cwd()
+
+
+def resolve_path(path: str | Path) -> Path:
+    """
+    Resolve a tool path against the current workspace.
+
+    Args:
+        path: Path given by an agent or tool.
+
+    Returns:
+        Path inside the bound workspace, or the path unchanged for local runs.
+
+    Raises:
+        WorkspaceError: If the path escapes the bound workspace.
+    """
+    workspace = _current_workspace.get()
+    if workspace is None:
+        return Path(path)
+    return workspace.resolve(path)
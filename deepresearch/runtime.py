@@ -2,18 +2,73 @@
 DeepSearch Agent implementation using Strands DeepAgents.
 """
 
+import asyncio
+import json
 import logging
 import os
 import sys
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, AsyncIterator
 
 from bedrock_agentcore import BedrockAgentCoreApp
 
-from deepresearch.tools import internet_search
-from deepresearch.utils.s3_outputs import upload_session_outputs
-from deepresearch.utils.telemetry import initialize_telemetry
+from deepresearch.config import (
+    get_checkpoint_config,
+    get_knowledge_store_config,
+    get_output_format,
+    get_output_sync_config,
+    get_performance_config,
+    get_source_store_config,
+    get_workspace_config,
+)
+from deepresearch.utils.checkpoint import CheckpointStore, run_with_checkpoints
+from deepresearch.utils.events import (
+    EventChannel,
+    bind_event_channel,
+    emit_agent_event,
+    emit_event,
+    get_event_channel,
+)
+from deepresearch.utils.performance import (
+    PERFORMANCE_SUMMARY_NAME,
+    PerformanceRecorder,
+    bind_performance_recorder,
+    measure,
+    unbind_performance_recorder,
+)
+from deepresearch.utils.query_log import (
+    bind_query_log,
+    create_query_log,
+    unbind_query_log,
+)
+from deepresearch.utils.rate_limit import get_rate_limit_stats
+from deepresearch.utils.s3_outputs import (
+    REPORT_PATTERN,
+    collect_output_files,
+    upload_session_outputs,
+    upload_single_file,
+)
+from deepresearch.utils.search_cache import get_search_cache
+from deepresearch.utils.source_store import (
+    SourceStore,
+    bind_source_store,
+    unbind_source_store,
+)
+from deepresearch.utils.telemetry import initialize_telemetry, record_performance_metrics
+from deepresearch.utils.workspace import (
+    bind_workspace,
+    get_workspace_manager,
+    unbind_workspace,
+)
 from deepresearch.utils.session import get_session_id, create_session_manager
 from deepresearch.utils.secrets import load_secrets_from_secrets_manager
 
+if TYPE_CHECKING:
+    from deepresearch.utils.output_sync import OutputSyncer
+
 # Configure Python logging to output to stdout (captured by runtime-logs)
 logging.basicConfig(
     level=logging.INFO,
@@ -24,6 +79,46 @@ logger = logging.getLogger("deepsearch")
 
 app = BedrockAgentCoreApp(debug=True)
 
+# Characters of the final report per streamed "report" event
+REPORT_CHUNK_CHARS = 4000
+
+
+# Serializes the first blueprint build between the warm-up thread and requests
+_blueprint_lock = threading.Lock()
+
+
+def get_agent_blueprint():
+    """
+    Build the immutable parts of the agent once per process.
+
+    Prompts, model clients, subagent definitions and lead tools are shared by
+    every invocation served by this runtime; only per-session state is bound
+    in create_agent. A request arriving while the warm-up thread is still
+    building waits for that build instead of starting a second one.
+
+    Returns:
+        AgentBlueprint for the DeepSearch agent.
+    """
+    with _blueprint_lock:
+        return _build_agent_blueprint()
+
+
+@lru_cache(maxsize=1)
+def _build_agent_blueprint():
+    # strands, the model clients and the search SDKs are first imported here
+    from deepresearch.main import build_agent_blueprint
+    from deepresearch.tools import internet_search, internet_search_batch
+
+    start = time.perf_counter()
+    blueprint = build_agent_blueprint(
+        research_tool=internet_search,
+        tool_name="internet_search",
+        batch_research_tool=internet_search_batch,
+        research_tool_saves_sources=get_source_store_config()["enabled"],
+    )
+    logger.info(f"Agent blueprint built in {(time.perf_counter() - start) * 1000:.0f} ms")
+    return blueprint
+
 
 def create_agent(session_id: str):
     """
@@ -35,27 +130,62 @@ def create_agent(session_id: str):
     Returns:
         Configured DeepSearch agent.
     """
-    # load_secrets_from_secrets_manager already has @lru_cache, safe to call multiple times
+    # Secrets are fetched once and refreshed in the background; cheap to call per request
     load_secrets_from_secrets_manager()
 
-    logger.info("Initializing DeepSearch agent...")
-    from deepresearch.main import create_deepsearch_agent
+    from deepresearch.main import create_agent_from_blueprint
 
+    start = time.perf_counter()
     session_manager = create_session_manager(session_id=session_id)
-
-    agent = create_deepsearch_agent(
-        research_tool=internet_search,
-        tool_name="internet_search",
+    agent = create_agent_from_blueprint(
+        get_agent_blueprint(),
         session_manager=session_manager,
         session_id=session_id,
     )
-    logger.info("DeepSearch agent initialized successfully")
+    logger.info(
+        f"DeepSearch agent initialized in {(time.perf_counter() - start) * 1000:.0f} ms"
+    )
     return agent
 
 
+def warm_up() -> None:
+    """Load secrets, telemetry and the agent blueprint before serving requests."""
+    start = time.perf_counter()
+    try:
+        load_secrets_from_secrets_manager()
+    except Exception as e:
+        # Requests retry the secrets that are still missing
+        logger.error(f"Loading secrets during warm-up failed: {e}")
+    initialize_telemetry()
+    get_agent_blueprint()
+    logger.info(f"Runtime warm-up took {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+def start_warm_up() -> threading.Thread:
+    """
+    Run warm_up in a background thread.
+
+    The heavy SDKs are imported lazily, so the server can start listening (and
+    answer health checks) while the blueprint is still being built.
+
+    Returns:
+        The warm-up thread.
+    """
+    thread = threading.Thread(target=warm_up, name="runtime-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
 @app.entrypoint
 def invoke(payload, context=None):
-    """Process user prompt and return agent response."""
+    """
+    Process user prompt and return agent response.
+
+    With `"stream": true` in the payload, returns an async generator of
+    progress events instead, which the runtime streams as server-sent events.
+    With `"resume": true`, continues the session's last unfinished run from its
+    checkpoint (its prompt is kept) instead of starting a new one.
+    """
     user_message = payload.get("prompt", "Current state of AI safety in 2025.")
     logger.info(f"Processing user message: {user_message}")
 
@@ -64,13 +194,189 @@ def invoke(payload, context=None):
     session_id = get_session_id(context=context)
     logger.info(f"Session ID: {session_id}")
 
+    resume = bool(payload.get("resume", False))
+    if payload.get("stream", False):
+        return stream_research(
+            user_message=user_message, session_id=session_id, resume=resume
+        )
+    return run_research(user_message=user_message, session_id=session_id, resume=resume)
+
+
+async def stream_research(
+    user_message: str, session_id: str, resume: bool = False
+) -> AsyncIterator[dict]:
+    """
+    Run the research in a worker thread and yield its progress events as they happen.
+
+    Events are dicts with a `type` and the seconds `elapsed` since the start:
+    started, resumed (continuing from a checkpoint), todos, subagent_started,
+    subagent_retry, subagent_finished, search, prior_research (knowledge store
+    lookups), text (lead agent output), report (final report in chunks),
+    outputs (S3 uploads), and done (with the agent's final message) or error.
+
+    Args:
+        user_message: Research question.
+        session_id: Session ID of the invocation.
+        resume: Continue the session's last unfinished run.
+
+    Yields:
+        Event dicts.
+    """
+    channel = EventChannel(asyncio.get_running_loop())
+
+    async def produce():
+        bind_event_channel(channel)
+        try:
+            channel.emit("started", session_id=session_id)
+            response = await asyncio.to_thread(
+                run_research, user_message, session_id, resume
+            )
+            if "error" in response:
+                channel.emit("error", error=response["error"])
+            else:
+                channel.emit("done", result=response["result"])
+        finally:
+            channel.close()
+
+    producer = asyncio.create_task(produce())
+    async for event in channel.events():
+        yield event
+    await producer
+
+
+def run_agent(agent, user_message: str | None):
+    """
+    Run the agent, streaming its progress if the invocation has an event channel.
+
+    Args:
+        agent: DeepSearch agent.
+        user_message: Research question, or None to continue a restored conversation.
+
+    Returns:
+        The agent result.
+    """
+    if get_event_channel() is None:
+        return agent(user_message)
+
+    async def consume():
+        result = None
+        async for event in agent.stream_async(user_message):
+            emit_agent_event(event)
+            result = event.get("result", result)
+        return result
+
+    return asyncio.run(consume())
+
+
+def emit_report(working_dir: Path) -> None:
+    """Emit the final report files of a streaming invocation in chunks."""
+    if get_event_channel() is None:
+        return
+    for path in collect_output_files(working_dir)["final"]:
+        if REPORT_PATTERN not in path.name:
+            continue
+        text = path.read_text(encoding="utf-8", errors="replace")
+        for start in range(0, len(text), REPORT_CHUNK_CHARS):
+            emit_event(
+                "report",
+                name=path.name,
+                text=text[start : start + REPORT_CHUNK_CHARS],
+                last=start + REPORT_CHUNK_CHARS >= len(text),
+            )
+
+
+def run_research(user_message: str, session_id: str, resume: bool = False) -> dict:
+    """
+    Run one research invocation in its session workspace and upload its outputs.
+
+    The run is checkpointed as it goes; transient model stream errors resume
+    from the last checkpoint instead of failing the invocation.
+
+    Args:
+        user_message: Research question.
+        session_id: Session ID of the invocation.
+        resume: Continue the session's last unfinished run from its checkpoint.
+
+    Returns:
+        Dictionary with the agent's final message and the uploaded outputs,
+        or with an error.
+    """
+    # Each session gets its own workspace so concurrent invocations never mix files;
+    # file tools, search tools, citations and the uploader all resolve paths against it
+    workspace_config = get_workspace_config()
+    workspace = workspace_token = None
+    working_dir = Path.cwd()
+    if workspace_config["enabled"]:
+        workspace = get_workspace_manager().acquire(session_id)
+        workspace_token = bind_workspace(workspace)
+        working_dir = workspace.path
+        logger.info(f"Session workspace: {working_dir}")
+    source_store_token = bind_source_store(SourceStore(working_dir, workspace=workspace))
+    query_log = create_query_log()
+    query_log_token = bind_query_log(query_log)
+    recorder = recorder_token = None
+    if get_performance_config()["summary"]:
+        recorder = PerformanceRecorder(session_id)
+        recorder_token = bind_performance_recorder(recorder)
+
+    # Upload source documents and findings while the agent is still running
+    syncer = start_output_sync(session_id=session_id, working_dir=working_dir)
+
+    uploaded_outputs = None
     try:
-        agent = create_agent(session_id=session_id)
-        result = agent(user_message)
+        from deepresearch.utils.retry import is_retryable_error
+
+        checkpoint_config = get_checkpoint_config()
+        result = run_with_checkpoints(
+            create_agent=lambda: create_agent(session_id=session_id),
+            prompt=user_message,
+            run=run_agent,
+            store=(
+                CheckpointStore(working_dir, session_id)
+                if checkpoint_config["enabled"]
+                else None
+            ),
+            resume=resume,
+            max_resumes=checkpoint_config["max_resumes"],
+            retry_delay=checkpoint_config["retry_delay"],
+            is_retryable=is_retryable_error,
+        )
         logger.info("Agent completed successfully")
 
-        # Upload outputs to S3
-        uploaded_outputs = upload_outputs_to_s3(session_id=session_id)
+        if get_knowledge_store_config()["path"]:
+            # Later runs can reuse these findings through lookup_prior_research
+            from deepresearch.utils.knowledge_store import index_research_outputs
+
+            index_research_outputs(working_dir, session_id)
+
+        search_cache = get_search_cache()
+        if search_cache is not None:
+            logger.info(f"Search cache stats: {search_cache.stats()}")
+        logger.info(f"Search query dedup stats: {query_log.stats()}")
+        logger.info(f"Search rate limiter stats: {get_rate_limit_stats()}")
+        from deepresearch.search import get_search_router
+
+        logger.info(f"Search router stats: {get_search_router().stats()}")
+
+        # Upload outputs to S3 (with sync, only what changed since the last poll)
+        with measure("upload", "session_outputs") as span:
+            if syncer is not None:
+                uploaded_outputs = syncer.finish()
+            else:
+                uploaded_outputs = upload_outputs_to_s3(
+                    session_id=session_id, working_dir=working_dir
+                )
+            span.bytes_in = sum(
+                path.stat().st_size
+                for files in collect_output_files(working_dir).values()
+                for path in files
+            )
+        if recorder is not None:
+            summary_uri = write_performance_summary(recorder, session_id, working_dir)
+            if summary_uri is not None:
+                uploaded_outputs["uploaded"].append(summary_uri)
+        emit_report(working_dir)
+        emit_event("outputs", **uploaded_outputs)
 
         return {
             "result": result.message,
@@ -79,14 +385,113 @@ def invoke(payload, context=None):
     except Exception as e:
         logger.error(f"Error during agent invocation: {e}", exc_info=True)
         return {"error": str(e)}
+    finally:
+        if syncer is not None and uploaded_outputs is None:
+            # The run failed: stop syncing, keeping whatever outputs it produced
+            try:
+                syncer.finish()
+            except Exception as e:
+                logger.warning(f"Final output sync failed: {e}")
+        if recorder_token is not None:
+            unbind_performance_recorder(recorder_token)
+        unbind_query_log(query_log_token)
+        unbind_source_store(source_store_token)
+        if workspace is not None:
+            unbind_workspace(workspace_token)
+            all_uploaded = bool(
+                uploaded_outputs
+                and uploaded_outputs["uploaded"]
+                and not uploaded_outputs["failed"]
+            )
+            get_workspace_manager().release(
+                workspace,
+                remove=workspace_config["cleanup_after_upload"] and all_uploaded,
+            )
+
+
+def write_performance_summary(
+    recorder: PerformanceRecorder, session_id: str, working_dir: Path
+) -> str | None:
+    """
+    Write a run's performance summary next to its outputs, upload it and export its metrics.
+
+    Args:
+        recorder: Recorder of the run.
+        session_id: Session ID to use as S3 key prefix.
+        working_dir: Directory holding the outputs (the session workspace).
+
+    Returns:
+        S3 URI of the uploaded summary, or None if it was not uploaded.
+    """
+    summary = recorder.summary()
+    logger.info(
+        f"Performance: {summary['wall_seconds']:.1f}s wall, "
+        f"critical path {summary['critical_path']}, "
+        f"parallelism {summary['parallelism']}"
+    )
+    try:
+        record_performance_metrics(recorder.spans, summary)
+    except Exception as e:
+        logger.warning(f"Failed to export performance metrics: {e}")
+
+    path = working_dir / PERFORMANCE_SUMMARY_NAME
+    try:
+        path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    except OSError as e:
+        logger.warning(f"Failed to write performance summary: {e}")
+        return None
+    bucket_name = os.environ.get("OUTPUTS_BUCKET_NAME", "")
+    if not bucket_name:
+        return None
+    return upload_single_file(
+        session_id=session_id,
+        bucket_name=bucket_name,
+        file_path=path,
+        output_type="final",
+        region_name=os.environ.get("AWS_REGION"),
+    )
+
+
+def start_output_sync(session_id: str, working_dir: Path) -> "OutputSyncer | None":
+    """
+    Start syncing a session's outputs to S3 in the background.
+
+    Args:
+        session_id: Session ID to use as S3 key prefix.
+        working_dir: Directory holding the outputs (the session workspace).
+
+    Returns:
+        The running syncer, or None if no bucket is configured or sync is disabled.
+    """
+    bucket_name = os.environ.get("OUTPUTS_BUCKET_NAME", "")
+    sync_config = get_output_sync_config()
+    if not bucket_name or not sync_config["enabled"]:
+        return None
+
+    from deepresearch.utils.output_sync import OutputSyncer
+
+    syncer = OutputSyncer(
+        session_id=session_id,
+        bucket_name=bucket_name,
+        working_dir=working_dir,
+        region_name=os.environ.get("AWS_REGION"),
+        interval_seconds=sync_config["interval_seconds"],
+        output_format=get_output_format(),
+    )
+    syncer.start()
+    return syncer
 
 
-def upload_outputs_to_s3(session_id: str) -> dict[str, list[str]]:
+def upload_outputs_to_s3(
+    session_id: str, working_dir: Path | None = None
+) -> dict[str, list[str]]:
     """
     Upload all session outputs to S3.
 
     Args:
         session_id: Session ID to use as S3 key prefix.
+        working_dir: Directory holding the outputs (the session workspace).
+            Defaults to the current directory.
 
     Returns:
         Dictionary with 'uploaded' and 'failed' keys containing lists of S3 URIs.
@@ -104,9 +509,11 @@ def upload_outputs_to_s3(session_id: str) -> dict[str, list[str]]:
     return upload_session_outputs(
         session_id=session_id,
         bucket_name=bucket_name,
+        working_dir=working_dir,
         region_name=os.environ.get("AWS_REGION"),
     )
 
 
 if __name__ == "__main__":
+    start_warm_up()
     app.run()
@@ -0,0 +1,24 @@
+"""Cold-start budget of the runtime entrypoint (see benchmarks/cold_start.py)."""
+
+import statistics
+
+from benchmarks.cold_start import DEFERRED_MODULES, measure_import
+
+MAX_MS = 600
+RUNS = 3
+
+
+def test_runtime_import_stays_within_budget():
+    runs = [measure_import("runtime") for _ in range(RUNS)]
+    median_ms = statistics.median(run["runtime"][0] / 1000 for run in runs)
+    assert median_ms <= MAX_MS
+
+
+def test_runtime_import_defers_heavy_sdks():
+    loaded = measure_import("runtime")
+    deferred = sorted(
+        name
+        for name in loaded
+        if any(name == module or name.startswith(module + ".") for module in DEFERRED_MODULES)
+    )
+    assert deferred == []
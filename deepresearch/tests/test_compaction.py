@@ -0,0 +1,76 @@
+"""Tests for lead context compaction (deepresearch/utils/compaction.py)."""
+
+from deepresearch.utils.compaction import COMPACTED_PREFIX, CompactingConversationManager
+
+LONG_TEXT = " ".join(f"Sentence {i} about the research topic." for i in range(200))
+
+
+def tool_call(tool_use_id, name, tool_input, result):
+    return [
+        {
+            "role": "assistant",
+            "content": [{"toolUse": {"toolUseId": tool_use_id, "name": name, "input": tool_input}}],
+        },
+        {
+            "role": "user",
+            "content": [
+                {"toolResult": {"toolUseId": tool_use_id, "content": [{"text": result}]}}
+            ],
+        },
+    ]
+
+
+def result_text(messages, tool_use_id):
+    for message in messages:
+        for block in message["content"]:
+            if block.get("toolResult", {}).get("toolUseId") == tool_use_id:
+                return block["toolResult"]["content"][0]["text"]
+
+
+def conversation():
+    return (
+        tool_call("read", "file_read", {"path": "research_findings_a.md"}, LONG_TEXT)
+        + tool_call("digest", "read_findings_digest", {}, LONG_TEXT)
+        + tool_call("write", "file_write", {"path": "report.md", "content": LONG_TEXT}, "ok")
+        + tool_call("recent", "file_read", {"path": "research_findings_b.md"}, LONG_TEXT)
+    )
+
+
+def test_compacts_old_results_with_a_pointer_to_the_file():
+    messages = conversation()
+    manager = CompactingConversationManager(result_chars=500)
+    saved = manager.compact(messages, keep_recent=2)
+
+    text = result_text(messages, "read")
+    assert saved > 0
+    assert text.startswith(COMPACTED_PREFIX)
+    assert "full text in research_findings_a.md" in text
+    assert len(text) < len(LONG_TEXT)
+
+    written = messages[4]["content"][0]["toolUse"]["input"]["content"]
+    assert written.startswith(COMPACTED_PREFIX)
+    assert "written to report.md" in written
+
+
+def test_leaves_recent_messages_and_the_digest_whole():
+    messages = conversation()
+    manager = CompactingConversationManager(result_chars=500)
+    manager.compact(messages, keep_recent=2)
+    assert result_text(messages, "recent") == LONG_TEXT
+    assert result_text(messages, "digest") == LONG_TEXT
+
+
+def test_compacts_the_digest_on_overflow():
+    messages = conversation()
+    manager = CompactingConversationManager(result_chars=500)
+    manager.compact(messages, keep_recent=0, include_digest=True)
+    text = result_text(messages, "digest")
+    assert text.startswith(COMPACTED_PREFIX)
+    assert "call read_findings_digest again" in text
+
+
+def test_compaction_is_idempotent():
+    messages = conversation()
+    manager = CompactingConversationManager(result_chars=500)
+    manager.compact(messages, keep_recent=2)
+    assert manager.compact(messages, keep_recent=2) == 0
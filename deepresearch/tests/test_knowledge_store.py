@@ -0,0 +1,66 @@
+"""Tests for indexing past research (deepresearch/utils/knowledge_store.py)."""
+
+import time
+
+import pytest
+
+from deepresearch.utils.knowledge_store import KnowledgeStore
+
+SOURCE_TEXT = (
+    "Quantum error correction encodes one logical qubit in many physical qubits "
+    "so that decoherence can be detected and corrected during computation."
+)
+
+
+def write_session(working_dir, retrieved_at=None):
+    documents = working_dir / "research_documents_quantum"
+    documents.mkdir(parents=True)
+    header = "source_url: https://example.com/qec\ntitle: Error correction\nquery: qec\n"
+    if retrieved_at is not None:
+        header += f"retrieved_at: {retrieved_at:.0f}\n"
+    (documents / "source_1.md").write_text(f"{header}\n{SOURCE_TEXT}\n", encoding="utf-8")
+    (working_dir / "research_findings_quantum.md").write_text(
+        "# Findings\n\nLogical qubits are encoded across physical qubits.\n", encoding="utf-8"
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = KnowledgeStore(tmp_path / "knowledge.sqlite3")
+    yield store
+    store.close()
+
+
+def source_hit(store):
+    hits = store.search("quantum error correction logical qubit", max_age_seconds=86400 * 365)
+    return next(hit for hit in hits if hit.kind == "source")
+
+
+def test_index_session_makes_findings_and_sources_searchable(store, tmp_path):
+    write_session(tmp_path / "session-a")
+    assert store.index_session(tmp_path / "session-a", "session-a") == 2
+    hits = store.search("logical qubits physical", max_age_seconds=3600)
+    assert {hit.kind for hit in hits} == {"findings", "source"}
+    assert source_hit(store).url == "https://example.com/qec"
+
+
+def test_reused_sources_keep_their_retrieval_time(store, tmp_path):
+    retrieved_at = time.time() - 20 * 86400
+    write_session(tmp_path / "session-a", retrieved_at=retrieved_at)
+    store.index_session(tmp_path / "session-a", "session-a")
+    assert source_hit(store).indexed_at == pytest.approx(retrieved_at, abs=1)
+    assert source_hit(store).age_days == pytest.approx(20, abs=0.01)
+
+
+def test_refetched_sources_are_refreshed_and_reuse_does_not_age_them(store, tmp_path):
+    old = time.time() - 20 * 86400
+    write_session(tmp_path / "session-a", retrieved_at=old)
+    store.index_session(tmp_path / "session-a", "session-a")
+
+    write_session(tmp_path / "session-b")
+    store.index_session(tmp_path / "session-b", "session-b")
+    assert source_hit(store).age_days < 0.01
+
+    write_session(tmp_path / "session-c", retrieved_at=old)
+    store.index_session(tmp_path / "session-c", "session-c")
+    assert source_hit(store).age_days < 0.01
@@ -0,0 +1,102 @@
+"""Tests for query canonicalization and near-duplicate lookups (deepresearch/utils/query_log.py)."""
+
+import asyncio
+import subprocess
+import sys
+
+from deepresearch.search.base import SearchResult
+from deepresearch.utils.query_log import (
+    LoggedQuery,
+    QueryLog,
+    anchor_terms,
+    canonicalize_query,
+    minhash_signature,
+    query_terms,
+)
+
+
+def log_query(log: QueryLog, query: str) -> LoggedQuery:
+    terms = query_terms(query)
+    entry = LoggedQuery(
+        query=query,
+        canonical=" ".join(terms),
+        signature=minhash_signature(terms),
+        anchors=anchor_terms(terms),
+        task=None,
+    )
+    log.add(entry)
+    return entry
+
+
+def find(log: QueryLog, query: str) -> LoggedQuery | None:
+    terms = query_terms(query)
+    return log.find(" ".join(terms), minhash_signature(terms), anchor_terms(terms))
+
+
+def test_canonical_form_ignores_order_case_and_stopwords():
+    assert canonicalize_query("AI safety 2025") == canonicalize_query("2025 ai SAFETY")
+    assert canonicalize_query("the safety of AI in 2025") == canonicalize_query(
+        "AI safety 2025"
+    )
+    assert canonicalize_query("the of and") == ""
+
+
+def test_canonical_form_keeps_negations():
+    assert canonicalize_query("AI safety without regulation") != canonicalize_query(
+        "AI safety regulation"
+    )
+    assert canonicalize_query("why models don't generalize") == canonicalize_query(
+        "why models do not generalize"
+    )
+
+
+def test_find_matches_reworded_queries():
+    log = QueryLog()
+    entry = log_query(log, "large language model evaluation benchmarks 2025")
+    assert find(log, "2025 benchmarks for evaluation of large language models") is entry
+
+
+def test_find_requires_the_same_numbers():
+    log = QueryLog()
+    log_query(log, "large language model evaluation benchmarks 2024")
+    assert find(log, "large language model evaluation benchmarks 2025") is None
+
+
+def test_find_requires_the_same_negations():
+    log = QueryLog()
+    log_query(log, "open source language model evaluation benchmarks")
+    assert find(log, "not open source language model evaluation benchmarks") is None
+
+
+def test_search_reuses_a_duplicate_unless_forced():
+    log = QueryLog()
+    calls = []
+
+    async def search_fn(query):
+        calls.append(query)
+        return SearchResult(provider="test", query=query, text=query)
+
+    async def scenario():
+        await log.search("AI safety research 2025", search_fn)
+        reused = await log.search("2025 AI safety research", search_fn)
+        forced = await log.search("2025 AI safety research", search_fn, force=True)
+        return reused, forced
+
+    reused, forced = asyncio.run(scenario())
+    assert reused.query == "AI safety research 2025"
+    assert forced.query == "2025 AI safety research"
+    assert calls == ["AI safety research 2025", "2025 AI safety research"]
+
+
+def test_dedup_does_not_load_the_citation_engine():
+    code = (
+        "import sys\n"
+        "from deepresearch.utils.query_log import canonicalize_query\n"
+        "canonicalize_query('AI safety 2025')\n"
+        "print(sorted(m for m in sys.modules"
+        " if m.split('.')[0] == 'strands' or m.startswith('deepresearch.citations')))\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert completed.stdout.strip() == "[]"
@@ -0,0 +1,70 @@
+"""Tests for the retry policy (deepresearch/utils/retry.py)."""
+
+import random
+
+import httpx
+import pytest
+from botocore.exceptions import ClientError
+
+from deepresearch.utils.retry import backoff_delay, is_retryable_error
+
+
+def client_error(code: str) -> ClientError:
+    return ClientError({"Error": {"Code": code, "Message": code}}, "ConverseStream")
+
+
+def status_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "https://api.example.com/search")
+    response = httpx.Response(status, request=request)
+    return httpx.HTTPStatusError(str(status), request=request, response=response)
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        ConnectionResetError("reset"),
+        TimeoutError("timed out"),
+        client_error("ThrottlingException"),
+        client_error("ServiceUnavailableException"),
+        httpx.ReadTimeout("timed out"),
+        status_error(429),
+        status_error(503),
+    ],
+)
+def test_transient_errors_are_retryable(error):
+    assert is_retryable_error(error)
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        ValueError("bad input"),
+        client_error("ValidationException"),
+        client_error("AccessDeniedException"),
+        status_error(400),
+        status_error(401),
+        RuntimeError("throttling mentioned in a message is not enough"),
+    ],
+)
+def test_permanent_errors_are_not_retryable(error):
+    assert not is_retryable_error(error)
+
+
+def test_wrapped_errors_are_classified_by_their_cause():
+    try:
+        try:
+            raise client_error("ThrottlingException")
+        except ClientError as e:
+            raise RuntimeError("model call failed") from e
+    except RuntimeError as wrapped:
+        assert is_retryable_error(wrapped)
+
+
+def test_backoff_delay_is_jittered_and_capped():
+    rng = random.Random(0)
+    delays = [
+        backoff_delay(attempt, base_seconds=1.0, max_seconds=4.0, rng=rng)
+        for attempt in range(1, 8)
+    ]
+    assert all(0 <= delay <= 4.0 for delay in delays)
+    assert backoff_delay(1, base_seconds=1.0, rng=rng) <= 1.0
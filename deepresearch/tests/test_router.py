@@ -0,0 +1,80 @@
+"""Tests for search routing (deepresearch/search/router.py)."""
+
+import asyncio
+
+from benchmarks.router_simulation import SCENARIOS, simulate
+from deepresearch.search.base import SearchResult
+from deepresearch.search.router import SearchRouter, timed_upstream_call
+
+QUERIES = 200
+CONCURRENCY = 8
+SEED = 7
+
+
+def run_simulation(mode: str, scenario: str) -> dict:
+    return asyncio.run(simulate(mode, SCENARIOS[scenario], QUERIES, CONCURRENCY, SEED))
+
+
+def test_routing_prefers_the_faster_provider():
+    random_choice = run_simulation("random", "fast_vs_slow")
+    routed = run_simulation("routed", "fast_vs_slow")
+    assert routed["p50"] < random_choice["p50"]
+    assert routed["extra_calls"] == 0
+
+
+def test_routing_fails_over_during_an_outage():
+    random_choice = run_simulation("random", "outage")
+    routed = run_simulation("routed", "outage")
+    assert random_choice["failures"] > 0
+    assert routed["failures"] < random_choice["failures"] / 4
+
+
+def test_hedging_trims_the_tail():
+    routed = run_simulation("routed", "fast_vs_slow")
+    hedged = run_simulation("routed+hedged", "fast_vs_slow")
+    assert hedged["p99"] < routed["p99"]
+    assert hedged["extra_calls"] < QUERIES / 4
+
+
+def test_fails_over_to_the_next_provider():
+    router = SearchRouter(["linkup", "tavily"])
+
+    async def search_fn(query, provider):
+        with timed_upstream_call():
+            if provider == "linkup":
+                raise ConnectionError("linkup down")
+            return SearchResult(provider=provider, query=query, text="ok")
+
+    result = asyncio.run(router.search("query", search_fn))
+    assert result.provider == "tavily"
+    stats = router.stats()["providers"]
+    assert stats["linkup"]["error_rate"] == 1.0
+    assert stats["tavily"]["calls"] == 1
+
+
+def test_answers_without_an_upstream_call_record_no_latency():
+    router = SearchRouter(["linkup"])
+
+    async def cached_search_fn(query, provider):
+        return SearchResult(provider=provider, query=query, text="cached")
+
+    asyncio.run(router.search("query", cached_search_fn))
+    assert router.stats()["providers"]["linkup"]["calls"] == 0
+
+
+def test_queued_requests_are_not_hedged():
+    router = SearchRouter(["linkup", "tavily"], hedging=True, hedge_min_delay=0.02)
+    calls = []
+
+    async def search_fn(query, provider):
+        calls.append(provider)
+        # Waiting in the rate limiter for longer than the hedge delay
+        await asyncio.sleep(0.1)
+        with timed_upstream_call():
+            await asyncio.sleep(0.005)
+        return SearchResult(provider=provider, query=query, text="ok")
+
+    result = asyncio.run(router.search("query", search_fn))
+    assert result.provider == "linkup"
+    assert calls == ["linkup"]
+    assert router.stats()["hedges_fired"] == 0
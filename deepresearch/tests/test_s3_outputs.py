@@ -0,0 +1,71 @@
+"""Tests for concurrent S3 output uploads (deepresearch/utils/s3_outputs.py), against moto."""
+
+import boto3
+import pytest
+from botocore.exceptions import ClientError
+from moto import mock_aws
+
+from deepresearch.utils.clients import get_client_registry
+from deepresearch.utils.s3_outputs import get_s3_client, upload_files, upload_session_outputs
+
+REGION = "us-east-1"
+BUCKET = "deepsearch-outputs"
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", REGION)
+    monkeypatch.delenv("OUTPUTS_FORMAT", raising=False)
+    with mock_aws():
+        get_client_registry().reset(f"s3:{REGION}")
+        boto3.client("s3", region_name=REGION).create_bucket(Bucket=BUCKET)
+        yield get_s3_client(REGION)
+        get_client_registry().reset(f"s3:{REGION}")
+
+
+def write_outputs(root):
+    documents = root / "research_documents_topic"
+    documents.mkdir(parents=True)
+    for i in range(1, 6):
+        (documents / f"source_{i}.md").write_text(f"source {i}\n", encoding="utf-8")
+    (root / "research_findings_topic.md").write_text("findings\n", encoding="utf-8")
+    return sorted(root.rglob("*.md"))
+
+
+def fail_put_object(key):
+    def handler(params, **kwargs):
+        if params["Key"] == key:
+            raise ClientError(
+                {"Error": {"Code": "InternalError", "Message": "injected"}}, "PutObject"
+            )
+
+    return handler
+
+
+def test_one_failed_upload_does_not_abort_the_batch(s3, tmp_path):
+    files = write_outputs(tmp_path)
+    uploads = [(path, f"session/{path.name}") for path in files]
+    failing_path, failing_key = uploads[2]
+    s3.meta.events.register("provide-client-params.s3.PutObject", fail_put_object(failing_key))
+
+    result = upload_files(s3, uploads, BUCKET, max_workers=4)
+
+    assert result["failed"] == [str(failing_path)]
+    assert len(result["uploaded"]) == len(uploads) - 1
+    listed = s3.list_objects_v2(Bucket=BUCKET)["Contents"]
+    assert failing_key not in {item["Key"] for item in listed}
+
+
+@pytest.mark.parametrize("output_format", ["files", "archive"])
+def test_missing_bucket_reports_failed_uploads(s3, tmp_path, monkeypatch, output_format):
+    monkeypatch.setenv("OUTPUTS_FORMAT", output_format)
+    files = write_outputs(tmp_path)
+
+    result = upload_session_outputs("session", "missing-bucket", tmp_path, REGION)
+
+    assert result["uploaded"] == []
+    assert result["failed"]
+    if output_format == "files":
+        assert sorted(result["failed"]) == sorted(str(path) for path in files)
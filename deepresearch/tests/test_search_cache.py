@@ -0,0 +1,74 @@
+"""Tests for the two-tier search result cache (deepresearch/utils/search_cache.py)."""
+
+import asyncio
+import threading
+
+import pytest
+
+from deepresearch.utils import search_cache
+from deepresearch.utils.search_cache import SearchCache, make_cache_key
+
+TTL = 100
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(search_cache.time, "time", lambda: now[0])
+    return now
+
+
+def test_keys_ignore_case_whitespace_and_punctuation():
+    assert make_cache_key("AI  safety?", "linkup") == make_cache_key("ai safety", "linkup")
+    assert make_cache_key("ai safety", "linkup") != make_cache_key("ai safety", "tavily")
+    assert make_cache_key("ai safety", "linkup") != make_cache_key(
+        "ai safety", "linkup", depth="deep"
+    )
+
+
+def test_disk_hits_keep_their_age_in_memory(tmp_path, clock):
+    path = tmp_path / "cache.sqlite3"
+    SearchCache(ttl_seconds=TTL, disk_path=path).set("key", "result")
+
+    # A restarted process finds the entry on disk, close to its expiry
+    clock[0] += TTL - 10
+    cache = SearchCache(ttl_seconds=TTL, disk_path=path)
+    assert cache.get("key") == "result"
+    assert cache.stats()["disk_hits"] == 1
+
+    clock[0] += 20
+    assert cache.get("key") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_async_lookups_read_the_disk_off_the_event_loop(tmp_path, clock):
+    path = tmp_path / "cache.sqlite3"
+    SearchCache(ttl_seconds=TTL, disk_path=path).set("key", "result")
+    cache = SearchCache(ttl_seconds=TTL, disk_path=path)
+    disk_threads = []
+    disk_get = cache._disk.get
+
+    def recording_get(key, now):
+        disk_threads.append(threading.current_thread())
+        return disk_get(key, now)
+
+    cache._disk.get = recording_get
+
+    async def lookup():
+        return threading.current_thread(), await cache.get_async("key")
+
+    loop_thread, value = asyncio.run(lookup())
+    assert value == "result"
+    assert disk_threads and loop_thread not in disk_threads
+
+    # Promoted into memory: the next lookup does not touch the disk
+    assert asyncio.run(cache.get_async("key")) == "result"
+    assert len(disk_threads) == 1
+
+
+def test_async_set_writes_both_tiers(tmp_path, clock):
+    path = tmp_path / "cache.sqlite3"
+    cache = SearchCache(ttl_seconds=TTL, disk_path=path)
+    asyncio.run(cache.set_async("key", "result"))
+    assert cache.get("key") == "result"
+    assert SearchCache(ttl_seconds=TTL, disk_path=path).get("key") == "result"
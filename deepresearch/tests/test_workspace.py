@@ -0,0 +1,41 @@
+"""Tests for session workspaces (deepresearch/utils/workspace.py)."""
+
+import pytest
+
+from deepresearch.utils.workspace import SessionWorkspace, WorkspaceError, WorkspaceQuotaError
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    return SessionWorkspace("session", tmp_path / "session", max_bytes=1000)
+
+
+def test_resolves_relative_paths_inside_the_workspace(workspace):
+    assert workspace.resolve("report.md") == workspace.path / "report.md"
+    assert workspace.resolve("./docs/a.md") == workspace.path / "docs" / "a.md"
+    assert workspace.resolve(workspace.path / "b.md") == workspace.path / "b.md"
+
+
+def test_rejects_paths_outside_the_workspace(workspace, tmp_path):
+    with pytest.raises(WorkspaceError):
+        workspace.resolve("../other/report.md")
+    with pytest.raises(WorkspaceError):
+        workspace.resolve(tmp_path / "other.md")
+    with pytest.raises(WorkspaceError):
+        workspace.resolve("/etc/passwd")
+
+
+def test_rejects_symlinks_leading_outside_the_workspace(workspace, tmp_path):
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (workspace.path / "link").symlink_to(outside, target_is_directory=True)
+    with pytest.raises(WorkspaceError):
+        workspace.resolve("link/secret.md")
+
+
+def test_quota_counts_writes_and_freed_bytes(workspace):
+    workspace.ensure_capacity(600)
+    (workspace.path / "a.md").write_bytes(b"x" * 600)
+    with pytest.raises(WorkspaceQuotaError):
+        workspace.ensure_capacity(600)
+    workspace.ensure_capacity(900, replacing=workspace.path / "a.md")
@@ -0,0 +1,61 @@
+"""Tests for the workspace-aware file tools (deepresearch/tools/workspace_files.py)."""
+
+import asyncio
+
+import pytest
+from strands_tools import editor as strands_editor
+
+from deepresearch.tools.workspace_files import editor
+from deepresearch.utils.workspace import SessionWorkspace, bind_workspace, unbind_workspace
+
+
+@pytest.fixture(autouse=True)
+def bypass_consent(monkeypatch):
+    monkeypatch.setenv("BYPASS_TOOL_CONSENT", "true")
+
+
+def run_tool(tool, tool_input):
+    async def collect():
+        tool_use = {"toolUseId": "call", "name": tool.tool_name, "input": tool_input}
+        return [event async for event in tool.stream(tool_use, {})]
+
+    return asyncio.run(collect())[-1].tool_result
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    workspace = SessionWorkspace("session", tmp_path / "session", max_bytes=1000)
+    token = bind_workspace(workspace)
+    yield workspace
+    unbind_workspace(token)
+
+
+def test_editor_without_a_workspace_is_the_original_tool(tmp_path):
+    assert editor.tool_spec == strands_editor.editor.tool_spec
+    path = tmp_path / "notes.md"
+    tool_input = {"command": "create", "path": str(path), "file_text": "notes\n"}
+    result = run_tool(editor, tool_input)
+    path.unlink()
+    assert result == run_tool(strands_editor.editor, tool_input)
+    assert result["status"] == "success"
+
+
+def test_editor_writes_relative_paths_into_the_workspace(workspace):
+    result = run_tool(editor, {"command": "create", "path": "notes.md", "file_text": "notes\n"})
+    assert result["status"] == "success"
+    assert (workspace.path / "notes.md").read_text() == "notes\n"
+
+
+def test_editor_rejects_paths_outside_the_workspace(workspace, tmp_path):
+    result = run_tool(
+        editor, {"command": "create", "path": "../escape.md", "file_text": "escape\n"}
+    )
+    assert result["status"] == "error"
+    assert "outside the session workspace" in result["content"][0]["text"]
+    assert not (tmp_path / "escape.md").exists()
+
+
+def test_editor_enforces_the_quota(workspace):
+    result = run_tool(editor, {"command": "create", "path": "big.md", "file_text": "x" * 2000})
+    assert result["status"] == "error"
+    assert not (workspace.path / "big.md").exists()
@@ -1,5 +1,6 @@
 import argparse
 import json
+import sys
 import uuid
 
 import boto3
@@ -10,6 +11,7 @@ def invoke_agent_runtime(
     prompt: str,
     region: str = "us-east-1",
     session_id: str | None = None,
+    resume: bool = False,
 ) -> dict:
     """
     Invoke a Bedrock AgentCore runtime with a given prompt.
@@ -20,6 +22,7 @@ def invoke_agent_runtime(
         region: AWS region where the agent is deployed.
         session_id: Optional session ID for conversation continuity.
                    If not provided, a new session is created.
+        resume: Continue the session's last unfinished run from its checkpoint.
 
     Returns:
         The parsed JSON response from the agent.
@@ -27,7 +30,7 @@ def invoke_agent_runtime(
     client = boto3.client("bedrock-agentcore", region_name=region)
 
     runtime_session_id = session_id or f"session-{uuid.uuid4()}"
-    payload = json.dumps({"prompt": prompt})
+    payload = json.dumps({"prompt": prompt, "resume": resume})
 
     response = client.invoke_agent_runtime(
         agentRuntimeArn=agent_runtime_arn,
@@ -40,6 +43,110 @@ def invoke_agent_runtime(
     return json.loads(response_body)
 
 
+def stream_agent_runtime(
+    agent_runtime_arn: str,
+    prompt: str,
+    region: str = "us-east-1",
+    session_id: str | None = None,
+    resume: bool = False,
+):
+    """
+    Invoke a Bedrock AgentCore runtime in streaming mode.
+
+    Args:
+        agent_runtime_arn: The ARN of the agent runtime to invoke.
+        prompt: The prompt to send to the agent.
+        region: AWS region where the agent is deployed.
+        session_id: Optional session ID for conversation continuity.
+                   If not provided, a new session is created.
+        resume: Continue the session's last unfinished run from its checkpoint.
+
+    Yields:
+        Progress events (dicts with a "type") as the runtime sends them. A
+        runtime without streaming support yields its JSON response once,
+        as a "done" event.
+    """
+    client = boto3.client("bedrock-agentcore", region_name=region)
+
+    runtime_session_id = session_id or f"session-{uuid.uuid4()}"
+    payload = json.dumps({"prompt": prompt, "stream": True, "resume": resume})
+
+    response = client.invoke_agent_runtime(
+        agentRuntimeArn=agent_runtime_arn,
+        runtimeSessionId=runtime_session_id,
+        payload=payload,
+        qualifier="DEFAULT",
+    )
+
+    if "text/event-stream" not in response.get("contentType", ""):
+        body = json.loads(response["response"].read())
+        yield {"type": "error", **body} if "error" in body else {"type": "done", **body}
+        return
+
+    for line in response["response"].iter_lines(chunk_size=1024):
+        line = line.decode("utf-8")
+        if line.startswith("data: "):
+            yield json.loads(line[len("data: ") :])
+
+
+def render_event(event: dict) -> None:
+    """Print one streamed event for a terminal."""
+    event_type = event.get("type")
+    elapsed = f"[{event.get('elapsed', 0):7.1f}s]"
+
+    if event_type == "text":
+        sys.stdout.write(event["text"])
+    elif event_type == "started":
+        print(f"{elapsed} Session {event['session_id']} started")
+    elif event_type == "resumed":
+        print(
+            f"{elapsed} Resumed from checkpoint ({event['subagents_completed']} "
+            f"subagents already completed)"
+        )
+    elif event_type == "todos":
+        print(f"\n{elapsed} Plan:")
+        for todo in event["todos"]:
+            print(f"    [{todo.get('status', 'pending')}] {todo.get('content', '')}")
+    elif event_type == "subagent_started":
+        first_line = event["description"].splitlines()[0] if event["description"] else ""
+        print(
+            f"\n{elapsed} Subagent {event['task_id']} ({event['subagent_type']}) "
+            f"started: {first_line}"
+        )
+    elif event_type == "subagent_finished":
+        print(
+            f"\n{elapsed} Subagent {event['task_id']} finished in {event['seconds']:.1f}s"
+        )
+    elif event_type == "subagent_retry":
+        print(
+            f"{elapsed}   {event['subagent_type']} retry {event['attempt']} "
+            f"in {event['delay']:.1f}s: {event['error']}"
+        )
+    elif event_type == "search":
+        print(f"{elapsed}   search ({event['topic']}): {'; '.join(event['queries'])}")
+    elif event_type == "prior_research":
+        print(
+            f"{elapsed}   prior research ({event['topic']}): {event['query']} "
+            f"-> {event['hits']} passages"
+        )
+    elif event_type == "report":
+        sys.stdout.write(event["text"])
+        if event.get("last"):
+            print()
+    elif event_type == "outputs":
+        print(
+            f"\n{elapsed} Outputs: {len(event['uploaded'])} uploaded, "
+            f"{len(event['failed'])} failed"
+        )
+        for uri in event["uploaded"]:
+            print(f"    {uri}")
+    elif event_type == "done":
+        print(f"\n{elapsed} Done")
+    elif "error" in event:
+        print(f"\n{elapsed} Error: {event['error']}")
+    sys.stdout.flush()
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description="Invoke a Bedrock AgentCore runtime with a prompt"
@@ -57,14 +164,34 @@ if __name__ == "__main__":
         default=None,
         help="Session ID for conversation continuity",
     )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the session's last unfinished run from its checkpoint",
+    )
+    parser.add_argument(
+        "--no-stream",
+        action="store_true",
+        help="Wait for the complete response instead of streaming progress events",
+    )
 
     args = parser.parse_args()
 
-    response_data = invoke_agent_runtime(
-        agent_runtime_arn=args.agent_arn,
-        prompt=args.prompt,
-        region=args.region,
-        session_id=args.session_id,
-    )
-
-    print("Agent Response:", response_data)
+    if args.no_stream:
+        response_data = invoke_agent_runtime(
+            agent_runtime_arn=args.agent_arn,
+            prompt=args.prompt,
+            region=args.region,
+            session_id=args.session_id,
+            resume=args.resume,
+        )
+        print("Agent Response:", response_data)
+    else:
+        for event in stream_agent_runtime(
+            agent_runtime_arn=args.agent_arn,
+            prompt=args.prompt,
+            region=args.region,
+            session_id=args.session_id,
+            resume=args.resume,
+        ):
+            render_event(event)
@@ -12,6 +12,7 @@ module "deepsearch_agentcore" {
 
   environment_variables = merge(var.environment_variables, {
     "OUTPUTS_BUCKET_NAME" = var.create_outputs_bucket ? coalesce(var.outputs_bucket_name, "agentcore-outputs-${replace(var.agent_name, "-", "_")}-${data.aws_caller_identity.current.account_id}-${var.region}") : ""
+    "OUTPUTS_FORMAT"      = var.outputs_format
   })
   secrets_names = var.secrets_names
   network_mode  = var.network_mode
@@ -88,6 +88,17 @@ variable "outputs_bucket_name" {
   default     = null
 }
 
+variable "outputs_format" {
+  type        = string
+  description = "How intermediate research documents are stored: \"files\" (one object each) or \"archive\" (one compressed archive plus index per session)"
+  default     = "files"
+
+  validation {
+    condition     = contains(["files", "archive"], var.outputs_format)
+    error_message = "outputs_format must be \"files\" or \"archive\"."
+  }
+}
+
 variable "outputs_retention_days" {
   type        = number
   description = "Number of days to retain outputs in S3 (0 = never expire)"